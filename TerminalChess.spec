@@ -1,4 +1,9 @@
 # -*- mode: python ; coding: utf-8 -*-
+import os
+import sys
+sys.path.insert(0, os.path.join(SPECPATH, 'chess'))
+from build_tables import write_tables
+write_tables() # precomputed board tables, see chess/build_tables.py
 
 
 a = Analysis(
@@ -10,7 +15,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['unittest', 'doctest', 'pdb', 'pydoc', 'tkinter', 'test', 'lib2to3'], # tests and dev tools only
     noarchive=False,
     optimize=0,
 )
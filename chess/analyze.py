@@ -0,0 +1,238 @@
+import argparse
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from helpers.game_helpers import convert_color_to_player
+from minimax import minimax, SearchContext
+from misc.constants import *
+from pgn import read_games, play_san, move_to_san
+from search import iterative_deepening
+
+'''
+Batch analysis of a PGN archive. Every position of every game is searched
+with the minimax engine, to a fixed depth or within a time budget per
+position, and each game's per ply scores, best moves and blunder flags are
+appended to a JSONL file (one JSON object per game) as soon as it's done.
+Games are spread across a process pool, each worker reusing one Game
+through reset_to_fen. A rerun with the same output file skips the games
+already in it, so an interrupted run picks up where it left off.
+'''
+
+DEFAULT_DEPTH = 2
+DEFAULT_BLUNDER = 200 # centipawns lost by the played move, compared to the best move
+MAX_TIMED_DEPTH = 20 # depth cap of time budgeted searches
+
+_worker_game = None # Game of a pool worker, reused for each of its games
+
+
+def search_position(game, depth: int, movetime=None, soft_time=None) -> list:
+    '''
+    Searches the position of game for the side to move, up to depth, or until
+    movetime seconds elapse if given (keeping the deepest lines found).
+    soft_time: Optional seconds after which no new depth is started.
+    Depth 0 is the static evaluation.
+    Returns: [absolute score (>0 is good for WHITE), best move or None, nodes, depth reached].
+    The score of a position without legal moves is its checkmate or stalemate score.
+    '''
+    player = convert_color_to_player(game, game.turn)
+    if len(player.get_all_legal_moves()) == 0:
+        if player.in_check:
+            return [-MAX if player.color == WHITE else MAX, None, 0, 0]
+        return [float(0), None, 0, 0]
+    if depth == 0:
+        score, _ = minimax(game, player, 0, player.color == WHITE, first_call=False)
+        return [score, None, 1, 0]
+    start = time.monotonic()
+    ctx = SearchContext(deadline=start + movetime if movetime != None else None,
+                        soft_deadline=start + soft_time if soft_time != None else None)
+    result = iterative_deepening(game, player, depth, ctx)
+    return [result.score, result.best_move, result.nodes, result.depth]
+
+
+def analyze_game(task: list) -> dict:
+    '''
+    Analyzes one game. task is [game index, start FEN, SAN moves, depth,
+    movetime or None, blunder threshold], plain data so it pickles cheaply.
+    Each position is searched for its best move and score. Unless the best
+    move was played, the position after the played move is then searched one
+    level less deep, so both moves are scored at the same depth, and the
+    difference is the played move's loss.
+    Returns: the game's JSONL record, with per ply 'plies' entries of the
+    played move, best move, their scores, the loss and the blunder flag.
+    A game whose moves can't be replayed gets an 'error' instead.
+    '''
+    global _worker_game
+    index, fen, moves, depth, movetime, blunder_threshold = task
+    if _worker_game == None:
+        from game import Game
+        _worker_game = Game.from_fen(fen)
+    game = _worker_game
+    start = time.perf_counter()
+    game.reset_to_fen(fen)
+    game.eval_cache.clear()
+    plies = []
+    nodes = 0
+    try:
+        for ply in range(len(moves)):
+            color = game.turn
+            score, best_move, position_nodes, reached = search_position(game, depth, movetime)
+            nodes += position_nodes
+            best_san = move_to_san(game, best_move) if best_move != None else None
+            move = play_san(game, moves[ply])
+            played_score = score
+            if move != best_move:
+                played_score, _, position_nodes, _ = search_position(game, max(reached - 1, 0))
+                nodes += position_nodes
+            polarity = 1 if color == WHITE else -1
+            loss = max(float(0), polarity * (score - played_score))
+            plies.append({'ply': ply + 1, 'color': color, 'move': moves[ply], 'best': best_san,
+                          'score': score, 'played_score': played_score, 'loss': loss,
+                          'depth': reached, 'blunder': loss >= blunder_threshold})
+    except Exception as error:
+        return {'game': index, 'error': 'ply '+str(len(plies) + 1)+': '+str(error)}
+    return {'game': index, 'plies': plies, 'positions': len(plies), 'nodes': nodes,
+            'seconds': round(time.perf_counter() - start, 3)}
+
+
+def load_progress(path) -> set:
+    '''
+    Indices of games already in the JSONL file at path. A partly written last
+    line, left by an interrupted run, is cut off so appending can resume cleanly.
+    '''
+    done = set()
+    if not os.path.exists(path):
+        return done
+    with open(path, 'rb+') as file:
+        valid_length = 0
+        for line in file:
+            if not line.endswith(b'\n'):
+                break
+            try:
+                done.add(json.loads(line)['game'])
+            except (ValueError, KeyError):
+                break
+            valid_length += len(line)
+        file.truncate(valid_length)
+    return done
+
+
+def make_tasks(source, done: set, depth: int, movetime, blunder_threshold, limit=None):
+    '''
+    Generator of [task, PgnGame] for the games of source not in done.
+    '''
+    for index, pgn_game in enumerate(read_games(source)):
+        if limit != None and index >= limit:
+            return
+        if index in done:
+            continue
+        yield [[index, pgn_game.fen, pgn_game.moves, depth, movetime, blunder_threshold], pgn_game]
+
+
+class Throughput:
+    '''
+    Running totals of an analysis run.
+    '''
+    def __init__(self, skipped: int):
+        self.start = time.perf_counter()
+        self.games = 0
+        self.errors = 0
+        self.positions = 0
+        self.nodes = 0
+        self.blunders = 0
+        self.skipped = skipped # games done by earlier runs
+
+    def add(self, record: dict):
+        self.games += 1
+        if 'error' in record:
+            self.errors += 1
+            return
+        self.positions += record['positions']
+        self.nodes += record['nodes']
+        self.blunders += sum(1 for ply in record['plies'] if ply['blunder'])
+
+    def __str__(self):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        return (str(self.games)+' games ('+str(self.errors)+' errors, '+str(self.skipped)+' skipped), '
+                +str(self.positions)+' positions, '+str(self.blunders)+' blunders in '+str(round(elapsed, 1))+'s: '
+                +str(round(self.games / elapsed, 2))+' games/sec, '+str(round(self.positions / elapsed, 1))
+                +' positions/sec, '+str(int(self.nodes / elapsed))+' nodes/sec')
+
+
+def analyze_archive(source, output, depth=DEFAULT_DEPTH, movetime=None, workers=None,
+                    blunder_threshold=DEFAULT_BLUNDER, limit=None, report_interval=10.0,
+                    verbose=True) -> Throughput:
+    '''
+    Analyzes the games of PGN source (see pgn.read_games), appending a record
+    per game to JSONL file output in completion order, and skipping games
+    already recorded there.
+    workers: Number of processes, os.cpu_count() if None. With 1, games are
+    analyzed in this process.
+    Returns: the run's Throughput.
+    '''
+    done = load_progress(output)
+    throughput = Throughput(len(done))
+    workers = workers if workers != None else (os.cpu_count() or 1)
+    tasks = make_tasks(source, done, depth, movetime, blunder_threshold, limit=limit)
+    last_report = time.perf_counter()
+
+    with open(output, 'a') as out:
+        def record_done(record, pgn_game):
+            nonlocal last_report
+            for tag in ['White', 'Black', 'Result']:
+                if tag in pgn_game.headers:
+                    record[tag.lower()] = pgn_game.headers[tag]
+            out.write(json.dumps(record)+'\n')
+            out.flush()
+            throughput.add(record)
+            if verbose and time.perf_counter() - last_report >= report_interval:
+                last_report = time.perf_counter()
+                print(throughput)
+
+        if workers == 1:
+            for task, pgn_game in tasks:
+                record_done(analyze_game(task), pgn_game)
+        else:
+            # at most 2 games per worker in flight, so memory stays flat on any archive size
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = {}
+                try:
+                    for task, pgn_game in tasks:
+                        while len(pending) >= 2 * workers:
+                            finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                            for future in finished:
+                                record_done(future.result(), pending.pop(future))
+                        pending[pool.submit(analyze_game, task)] = pgn_game
+                    for future in list(pending):
+                        record_done(future.result(), pending.pop(future))
+                except KeyboardInterrupt:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+    if verbose:
+        print(throughput)
+    return throughput
+
+
+if __name__ == "__main__":
+    # usage: python analyze.py games.pgn[.gz] out.jsonl [--depth N | --movetime S] [--workers N]
+    parser = argparse.ArgumentParser(description='Analyze every position of a PGN archive with the engine.')
+    parser.add_argument('pgn', help='.pgn or gzip compressed .pgn.gz file')
+    parser.add_argument('output', help='JSONL file, appended to; games already in it are skipped')
+    parser.add_argument('--depth', type=int, default=None,
+                        help='search depth per position (default '+str(DEFAULT_DEPTH)+')')
+    parser.add_argument('--movetime', type=float, default=None,
+                        help='seconds per position, searching up to --depth (default '+str(MAX_TIMED_DEPTH)+')')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: CPU count)')
+    parser.add_argument('--blunder', type=float, default=DEFAULT_BLUNDER, help='centipawn loss flagged as a blunder')
+    parser.add_argument('--limit', type=int, default=None, help='analyze only the first N games of the archive')
+    parser.add_argument('--report', type=float, default=10.0, help='seconds between progress lines')
+    parser.add_argument('--restart', action='store_true', help='discard the output file instead of resuming')
+    args = parser.parse_args()
+    if args.restart and os.path.exists(args.output):
+        os.remove(args.output)
+    depth = args.depth if args.depth != None else (MAX_TIMED_DEPTH if args.movetime != None else DEFAULT_DEPTH)
+    try:
+        analyze_archive(args.pgn, args.output, depth=depth, movetime=args.movetime, workers=args.workers,
+                        blunder_threshold=args.blunder, limit=args.limit, report_interval=args.report)
+    except KeyboardInterrupt:
+        print('Interrupted, rerun the same command to resume.')
@@ -0,0 +1,247 @@
+import argparse
+import hashlib
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from game import Game
+from perft import make_named_position, perft
+from search import analyze_position
+from helpers.game_helpers import convert_color_to_player
+from helpers.general_helpers import move_to_notation
+from misc.constants import *
+
+'''
+Benchmark suite of fixed positions, for search and move generation.
+Every case records nodes, nodes/sec, wall time and peak memory. Results are
+saved to a JSON baseline, and reruns are compared against it: a case is a
+regression if its time or memory grew by more than a threshold, and the node
+count signature changes if search or move generation visits different nodes.
+The suite also times importing the entry point (main) in a fresh
+interpreter, which has a fixed budget besides the baseline comparison.
+'''
+
+SEARCH = 'SEARCH'
+PERFT = 'PERFT'
+BASELINE_VERSION = 1
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+DEFAULT_THRESHOLD = 0.10 # fraction of growth in time or memory that counts as a regression
+IMPORT_MODULE = 'main'
+IMPORT_BUDGET = 0.05 # seconds to import IMPORT_MODULE with cached bytecode
+DEFAULT_IMPORT_RUNS = 5
+
+# Italian game after 3...Nf6, white to move
+MIDDLEGAME_MOVES = [[[5, 2], [5, 4]], [[5, 7], [5, 5]], [[7, 1], [6, 3]], [[2, 8], [3, 6]],
+                    [[6, 1], [3, 4]], [[7, 8], [6, 6]]]
+
+
+def make_benchmark_position(name):
+    '''
+    Sets up a benchmark position: 'opening', 'middlegame', 'tactical' or 'endgame'.
+    '''
+    if name == 'opening':
+        return make_named_position('initial')
+    elif name == 'middlegame':
+        game = Game()
+        for move in MIDDLEGAME_MOVES:
+            assert(convert_color_to_player(game, game.turn).attempt_action(move))
+        return game
+    elif name == 'tactical':
+        return make_named_position('kiwipete')
+    elif name == 'endgame':
+        return make_named_position('position3')
+    raise Exception('Unknown benchmark position '+str(name))
+
+
+class BenchmarkCase:
+    def __init__(self, name: str, kind: str, position: str, depth: int, multipv=1):
+        '''
+        name: Unique case name, the key of its results in the baseline.
+        kind: SEARCH for a minimax search, PERFT for a perft count.
+        position: Benchmark position name, see make_benchmark_position.
+        depth: Search or perft depth.
+        multipv: Number of principal variations searched, for SEARCH.
+        '''
+        assert(kind in [SEARCH, PERFT])
+        self.name = name
+        self.kind = kind
+        self.position = position
+        self.depth = depth
+        self.multipv = multipv
+
+    def run(self) -> list:
+        '''
+        Runs the case once on a fresh position.
+        Returns: [nodes, best move notation or None].
+        '''
+        game = make_benchmark_position(self.position)
+        if self.kind == PERFT:
+            return [perft(game, self.depth), None]
+        player = convert_color_to_player(game, game.turn)
+        result = analyze_position(game, player, self.depth, multipv=self.multipv)
+        return [result.nodes, move_to_notation(result.best_move, player.color)]
+
+
+CASES = [BenchmarkCase('opening-search-d3', SEARCH, 'opening', 3),
+         BenchmarkCase('middlegame-search-d2', SEARCH, 'middlegame', 2),
+         BenchmarkCase('middlegame-multipv3-d2', SEARCH, 'middlegame', 2, multipv=3),
+         BenchmarkCase('tactical-search-d2', SEARCH, 'tactical', 2),
+         BenchmarkCase('endgame-search-d3', SEARCH, 'endgame', 3),
+         BenchmarkCase('opening-perft-d3', PERFT, 'opening', 3),
+         BenchmarkCase('tactical-perft-d2', PERFT, 'tactical', 2),
+         BenchmarkCase('endgame-perft-d3', PERFT, 'endgame', 3)]
+
+
+def run_case(case: BenchmarkCase, repeat=1, measure_memory=True) -> dict:
+    '''
+    Runs case repeat times, keeping the fastest wall time, then once more under
+    tracemalloc for peak memory (tracing slows the run, so it isn't timed).
+    '''
+    wall_time = None
+    for i in range(repeat):
+        start = time.perf_counter()
+        nodes, best_move = case.run()
+        elapsed = time.perf_counter() - start
+        wall_time = elapsed if wall_time == None else min(wall_time, elapsed)
+    peak_memory = None
+    if measure_memory:
+        tracemalloc.start()
+        case.run()
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+    return {'nodes': nodes,
+            'nps': nodes / wall_time if wall_time > 0 else 0.0,
+            'wall_time': wall_time,
+            'peak_memory': peak_memory,
+            'best_move': best_move}
+
+
+def measure_import_time(module=IMPORT_MODULE, runs=DEFAULT_IMPORT_RUNS) -> float:
+    '''
+    Fastest of runs imports of module, each in a fresh interpreter. Bytecode
+    caching is on, as in installed and frozen builds, and an untimed first
+    run fills the cache.
+    '''
+    env = dict(os.environ)
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    code = 'import time; start = time.perf_counter(); import '+module+'; print(time.perf_counter() - start)'
+    best = None
+    for i in range(runs + 1):
+        output = subprocess.run([sys.executable, '-c', code], cwd=os.path.dirname(os.path.abspath(__file__)),
+                                env=env, capture_output=True, text=True, check=True).stdout
+        elapsed = float(output.split()[-1])
+        if i > 0:
+            best = elapsed if best == None else min(best, elapsed)
+    return best
+
+
+def node_signature(results: dict) -> str:
+    '''
+    Hash of every case's node count and best move, which changes whenever
+    search or move generation visits a different tree.
+    '''
+    signed = [[name, results[name]['nodes'], results[name]['best_move']] for name in sorted(results)]
+    return hashlib.sha256(json.dumps(signed).encode()).hexdigest()[:16]
+
+
+def run_suite(cases=CASES, repeat=1, measure_memory=True, verbose=True, import_runs=DEFAULT_IMPORT_RUNS) -> dict:
+    '''
+    Runs every case, and times the entry point import unless import_runs is 0.
+    Returns the suite report, in baseline JSON form.
+    '''
+    results = {}
+    for case in cases:
+        results[case.name] = run_case(case, repeat=repeat, measure_memory=measure_memory)
+        if verbose:
+            print(format_result(case.name, results[case.name]))
+    import_time = measure_import_time(runs=import_runs) if import_runs > 0 else None
+    if verbose and import_time != None:
+        print('import '+IMPORT_MODULE+': '+str(round(import_time * 1000, 1))+' ms (budget '
+              +str(round(IMPORT_BUDGET * 1000))+' ms)')
+    return {'version': BASELINE_VERSION,
+            'python': platform.python_version(),
+            'machine': platform.machine(),
+            'signature': node_signature(results),
+            'import_time': import_time,
+            'cases': results}
+
+
+def format_result(name, result) -> str:
+    line = (name+': '+str(result['nodes'])+' nodes, '+str(round(result['wall_time'], 3))+'s, '
+            +str(int(result['nps']))+' nodes/sec')
+    if result['peak_memory'] != None:
+        line += ', peak '+str(round(result['peak_memory'] / 1024))+' KiB'
+    return line
+
+
+def compare(report: dict, baseline: dict, threshold=DEFAULT_THRESHOLD) -> list:
+    '''
+    Compares a suite report against a baseline report.
+    Returns: list of problem descriptions, empty if there are none. Cases
+    missing from either report are skipped.
+    '''
+    problems = []
+    for name, result in report['cases'].items():
+        if name not in baseline['cases']:
+            continue
+        base = baseline['cases'][name]
+        if result['nodes'] != base['nodes'] or result['best_move'] != base['best_move']:
+            problems.append(name+': nodes '+str(base['nodes'])+' -> '+str(result['nodes'])
+                            +', best move '+str(base['best_move'])+' -> '+str(result['best_move']))
+        for metric in ['wall_time', 'peak_memory']:
+            if result[metric] == None or base[metric] == None or base[metric] == 0:
+                continue
+            ratio = result[metric] / base[metric]
+            if ratio > 1 + threshold:
+                problems.append(name+': '+metric+' regressed '+str(round((ratio - 1) * 100, 1))+'% ('
+                                +str(round(base[metric], 4))+' -> '+str(round(result[metric], 4))+')')
+    import_time, base_import_time = report.get('import_time'), baseline.get('import_time')
+    if import_time != None:
+        if import_time > IMPORT_BUDGET:
+            problems.append('import time '+str(round(import_time * 1000, 1))+' ms is over the '
+                            +str(round(IMPORT_BUDGET * 1000))+' ms budget')
+        elif base_import_time and import_time / base_import_time > 1 + threshold:
+            problems.append('import time regressed '+str(round((import_time / base_import_time - 1) * 100, 1))+'% ('
+                            +str(round(base_import_time, 4))+' -> '+str(round(import_time, 4))+')')
+    if report['signature'] != baseline['signature'] and set(report['cases']) == set(baseline['cases']):
+        problems.append('node signature changed: '+baseline['signature']+' -> '+report['signature'])
+    return problems
+
+
+if __name__ == "__main__":
+    # usage: python benchmark.py [--save] [--baseline path] [--threshold 0.1] [--repeat N] [--cases a,b] [--import-runs N]
+    parser = argparse.ArgumentParser(description='Search and move generation benchmark suite.')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help='baseline JSON file')
+    parser.add_argument('--save', action='store_true', help='write results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='allowed fractional growth of time and memory')
+    parser.add_argument('--repeat', type=int, default=1, help='runs per case, fastest is kept')
+    parser.add_argument('--cases', default=None, help='comma separated case names to run')
+    parser.add_argument('--no-memory', action='store_true', help='skip the peak memory pass')
+    parser.add_argument('--import-runs', type=int, default=DEFAULT_IMPORT_RUNS,
+                        help='fresh interpreter imports of main timed, 0 to skip')
+    args = parser.parse_args()
+
+    cases = CASES
+    if args.cases != None:
+        names = args.cases.split(',')
+        cases = [case for case in CASES if case.name in names]
+    report = run_suite(cases, repeat=args.repeat, measure_memory=not args.no_memory, import_runs=args.import_runs)
+    print('signature: '+report['signature'])
+
+    if args.save:
+        with open(args.baseline, 'w') as f:
+            json.dump(report, f, indent=2)
+        print('baseline written to '+args.baseline)
+    elif os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        problems = compare(report, baseline, threshold=args.threshold)
+        for problem in problems:
+            print('REGRESSION '+problem)
+        if len(problems) > 0:
+            sys.exit(1)
+        print('no regressions against '+args.baseline)
@@ -93,24 +93,15 @@ class Board:
 
 
     def __str__(self):
-        c_map = {1:'A', 2:'B', 3:'C', 4:'D', 5:'E', 6:'F', 7:'G', 8:'H'}
-        string = ''
+        rows = []
         for i in range(8):
-            cur_string = str(8-i)+'  '
+            cells = []
             for j in range(8):
                 cur_piece = self.game_board[i][j]
                 if cur_piece == None:
-                    checkerboard_color = (i + j) % 2
-                    if checkerboard_color == 0: 
-                        cur_string += '[--] '
-                    else:
-                        cur_string += '[  ] '
+                    cells.append('[--] ' if (i + j) % 2 == 0 else '[  ] ') # checkerboard color
                 else:
-                    cur_string += '[' + cur_piece.visual + ' ] '
-            cur_string += '\n\n'
-            string += cur_string
-        string += '    Aa   Bb   Cc   Dd   Ee   Ff   Gg   Hh   \n'
-        return string
-
-
-
+                    cells.append('[' + cur_piece.visual + ' ] ')
+            rows.append(str(8-i) + '  ' + ''.join(cells) + '\n\n')
+        rows.append('    Aa   Bb   Cc   Dd   Ee   Ff   Gg   Hh   \n')
+        return ''.join(rows)
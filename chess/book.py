@@ -0,0 +1,218 @@
+import mmap
+import os
+import random
+import struct
+import sys
+import time
+from position_state import NO_SQUARE
+from misc.constants import *
+from misc.polyglot import *
+
+'''
+Polyglot (.bin) opening book support.
+A book is a file of 16 byte big-endian entries (key, move, weight, learn),
+sorted by key. PolyglotBook memory maps the file and binary searches it,
+so the file is never read into memory and lookups stay at O(log n) page reads.
+'''
+
+ENTRY_SIZE = 16
+ENTRY_STRUCT = struct.Struct('>QHHI') # key, move, weight, learn
+KEY_STRUCT = struct.Struct('>Q')
+
+
+def polyglot_key(game) -> int:
+    '''
+    Computes the 64 bit Polyglot key of game's current position.
+    En passant is only hashed if the side to move has a PAWN that could
+    pseudolegally capture en passant, as the format requires.
+    '''
+    key = 0
+    for player in [game.p1, game.p2]:
+        color_offset = 1 if player.color == WHITE else 0
+        for piece in player.pieces.values():
+            kind = 2 * POLYGLOT_KIND[piece.rank] + color_offset
+            key ^= POLYGLOT_RANDOM64[64 * kind + 8 * (piece.pos[1] - 1) + (piece.pos[0] - 1)]
+
+    castling = game.state.castling # bits are in Polyglot's KQkq order
+    for i in range(4):
+        if castling & (1 << i):
+            key ^= POLYGLOT_RANDOM64[CASTLE_OFFSET + i]
+
+    ep_square = game.state.ep_square
+    if ep_square != NO_SQUARE:
+        x, y = ep_square % 8 + 1, (4 if ep_square // 8 == 2 else 5) # two leaped PAWN's tile
+        for side_offset in [-1, 1]:
+            if x + side_offset - 1 not in range(8):
+                continue
+            adjacent = game.board.get_piece([x + side_offset, y])
+            if adjacent != None and adjacent.rank == PAWN and adjacent.color == game.turn:
+                key ^= POLYGLOT_RANDOM64[EN_PASSANT_OFFSET + x - 1]
+                break
+
+    if game.turn == WHITE:
+        key ^= POLYGLOT_RANDOM64[TURN_OFFSET]
+    return key
+
+
+def decode_move(game, raw_move: int):
+    '''
+    Converts a 16 bit Polyglot move into a move for the side to move in game,
+    ie [[x_0, y_0], [x_1, y_1]] or 'KING'/'QUEEN' for castles.
+    Returns None for underpromotions, which this engine can't play.
+    '''
+    to_file, to_row = raw_move & 7, (raw_move >> 3) & 7
+    from_file, from_row = (raw_move >> 6) & 7, (raw_move >> 9) & 7
+    promotion = (raw_move >> 12) & 7
+    if promotion not in [0, 4]:
+        return None
+    pos = [from_file + 1, from_row + 1]
+    dest = [to_file + 1, to_row + 1]
+    moving_piece = game.board.get_piece(pos)
+    if (moving_piece != None and moving_piece.rank == KING and pos[0] == 5
+        and pos[1] == dest[1] and dest[0] in [1, 8]):
+        # Polyglot encodes castling as KING capturing its own ROOK
+        target = game.board.get_piece(dest)
+        if target != None and target.rank == ROOK and target.color == moving_piece.color:
+            return KING if dest[0] == 8 else QUEEN
+    return [pos, dest]
+
+
+def encode_move(move, color: str) -> int:
+    '''
+    Converts a move of player with color into a 16 bit Polyglot move.
+    '''
+    if type(move) == str:
+        assert(move in KQSET)
+        row = 1 if color == WHITE else 8
+        move = [[5, row], [8 if move == KING else 1, row]]
+    pos, dest = move
+    return (dest[0] - 1) | ((dest[1] - 1) << 3) | ((pos[0] - 1) << 6) | ((pos[1] - 1) << 9)
+
+
+class BookEntry:
+    def __init__(self, key: int, raw_move: int, weight: int, learn: int):
+        self.key = key
+        self.raw_move = raw_move
+        self.weight = weight
+        self.learn = learn
+
+
+class PolyglotBook:
+    '''
+    Read only, memory mapped Polyglot book.
+    '''
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        size = os.fstat(self._file.fileno()).st_size
+        if size % ENTRY_SIZE != 0:
+            self._file.close()
+            raise Exception('Polyglot book size must be a multiple of '+str(ENTRY_SIZE)+' bytes')
+        self.num_entries = size // ENTRY_SIZE
+        self._data = None # empty files can't be memory mapped
+        if size > 0:
+            self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def __len__(self):
+        return self.num_entries
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        if self._data != None:
+            self._data.close()
+            self._data = None
+        self._file.close()
+
+    def _lower_bound(self, key: int) -> int:
+        '''
+        Index of first entry with entry key >= key.
+        '''
+        lo, hi = 0, self.num_entries
+        data = self._data
+        unpack_key = KEY_STRUCT.unpack_from
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if unpack_key(data, mid * ENTRY_SIZE)[0] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def find_entries(self, key: int) -> list[BookEntry]:
+        '''
+        Returns all entries of the book with the given position key.
+        '''
+        entries = []
+        if self._data == None:
+            return entries
+        i = self._lower_bound(key)
+        while i < self.num_entries:
+            entry = ENTRY_STRUCT.unpack_from(self._data, i * ENTRY_SIZE)
+            if entry[0] != key:
+                break
+            entries.append(BookEntry(*entry))
+            i += 1
+        return entries
+
+    def get_moves(self, game) -> list:
+        '''
+        Returns [move, weight] pairs of the book for game's current position,
+        skipping moves this engine can't play.
+        '''
+        moves = []
+        for entry in self.find_entries(polyglot_key(game)):
+            move = decode_move(game, entry.raw_move)
+            if move != None:
+                moves.append([move, entry.weight])
+        return moves
+
+    def pick_move(self, game, rng=None):
+        '''
+        Picks a book move for game's current position, randomly with
+        probability proportional to entry weight.
+        rng: Optional random.Random, module random is used otherwise.
+        Returns: Move, or None if the position is not in the book.
+        '''
+        moves = [move_weight for move_weight in self.get_moves(game) if move_weight[1] > 0]
+        if len(moves) == 0:
+            return None
+        rng = rng if rng != None else random
+        return rng.choices([move for move, weight in moves],
+                           weights=[weight for move, weight in moves])[0]
+
+
+def write_book(path, entries: list):
+    '''
+    Writes a Polyglot book from [key, raw_move, weight] or [key, raw_move, weight, learn]
+    entries, sorting them by key.
+    '''
+    entries = sorted(entries, key=lambda entry: (entry[0], -entry[2]))
+    with open(path, 'wb') as f:
+        for entry in entries:
+            learn = entry[3] if len(entry) > 3 else 0
+            f.write(ENTRY_STRUCT.pack(entry[0], entry[1], entry[2], learn))
+
+
+if __name__ == "__main__":
+    # usage: python book.py book.bin ; prints book moves of the initial position and lookup speed
+    from game import Game
+    game = Game()
+    with PolyglotBook(sys.argv[1]) as book:
+        key = polyglot_key(game)
+        print(str(len(book))+' entries, initial position key '+hex(key))
+        for move, weight in book.get_moves(game):
+            print('  '+str(move)+' weight '+str(weight))
+        n = 10000
+        start = time.perf_counter()
+        for i in range(n):
+            book.find_entries(key)
+        print('find_entries: '+str(round((time.perf_counter() - start) / n * 1e6, 2))+' us')
+        start = time.perf_counter()
+        for i in range(n):
+            polyglot_key(game)
+        print('polyglot_key: '+str(round((time.perf_counter() - start) / n * 1e6, 2))+' us')
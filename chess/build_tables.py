@@ -0,0 +1,121 @@
+import os
+import pprint
+
+'''
+Build time generation of constant board tables, written as literals to
+misc/board_tables.py so importing them costs no computation at startup.
+Regenerated by the PyInstaller specs on every build; run python
+build_tables.py after changing the tables here. Squares are 0-63, ie
+file + 8 * rank with A1 = 0.
+'''
+
+TABLES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'misc', 'board_tables.py')
+
+ORTHOGONAL = [[1, 0], [-1, 0], [0, 1], [0, -1]]
+DIAGONAL = [[1, 1], [1, -1], [-1, 1], [-1, -1]]
+
+# name: comment, in the order written
+TABLE_COMMENTS = {'KING_MOVES': 'squares a KING moves to from each square',
+                  'KNIGHT_MOVES': 'squares a KNIGHT moves to from each square',
+                  'KING_MASK': 'KING_MOVES as bitmasks',
+                  'KNIGHT_MASK': 'KNIGHT_MOVES as bitmasks',
+                  'PAWN_ATTACK_MASK': 'bitmasks of the squares a WHITE PAWN attacks from each square',
+                  'RAYS': '(sq, is_diagonal) -> list of rays, each a list of squares moving outwards',
+                  'LINE': '1 if orthogonally aligned, 2 if diagonally',
+                  'BETWEEN': 'bitmask of squares strictly between two aligned squares',
+                  'FILE_MASK': 'bitmask of each file',
+                  'ADJACENT_FILES_MASK': 'bitmask of the files next to each file',
+                  'WHITE_PASSED_MASK': 'bitmask of the squares ahead of a WHITE PAWN on its own and adjacent files',
+                  'BLACK_PASSED_MASK': 'bitmask of the squares ahead of a BLACK PAWN on its own and adjacent files',
+                  'WHITE_SHELTER_MASK': 'bitmask of the two ranks in front of a WHITE KING, on its own and adjacent files',
+                  'BLACK_SHELTER_MASK': 'bitmask of the two ranks in front of a BLACK KING, on its own and adjacent files'}
+
+
+def offset_table(offsets) -> list:
+    '''
+    Squares reached from each square by each of offsets, [file, rank] steps.
+    '''
+    table = []
+    for sq in range(64):
+        f, r = sq & 7, sq >> 3
+        table.append([nf + 8 * nr for nf, nr in ((f + df, r + dr) for df, dr in offsets)
+                      if 0 <= nf < 8 and 0 <= nr < 8])
+    return table
+
+
+def front_mask(sq: int, ranks) -> int:
+    '''
+    Bitmask of the squares on ranks, on the file of sq and its adjacent files.
+    '''
+    f = sq & 7
+    return sum(1 << (nf + 8 * r) for r in ranks for nf in [f - 1, f, f + 1] if 0 <= nf < 8 and 0 <= r < 8)
+
+
+def make_tables() -> dict:
+    '''
+    Returns: dict of table name -> table, see TABLE_COMMENTS.
+    '''
+    king_moves = offset_table([[1, 1], [1, -1], [-1, 1], [-1, -1], [1, 0], [-1, 0], [0, 1], [0, -1]])
+    knight_moves = offset_table([[1, 2], [2, 1], [-1, 2], [2, -1], [1, -2], [-2, 1], [-1, -2], [-2, -1]])
+    rays, line, between = {}, [[0] * 64 for sq in range(64)], [[0] * 64 for sq in range(64)]
+    for sq in range(64):
+        for is_diagonal, directions in [(False, ORTHOGONAL), (True, DIAGONAL)]:
+            square_rays = []
+            for df, dr in directions:
+                ray, crossed = [], 0
+                f, r = (sq & 7) + df, (sq >> 3) + dr
+                while 0 <= f < 8 and 0 <= r < 8:
+                    target = f + 8 * r
+                    ray.append(target)
+                    line[sq][target] = 2 if is_diagonal else 1
+                    between[sq][target] = crossed
+                    crossed |= 1 << target
+                    f, r = f + df, r + dr
+                square_rays.append(ray)
+            rays[(sq, is_diagonal)] = square_rays
+    file_mask = [sum(1 << (f + 8 * r) for r in range(8)) for f in range(8)]
+    return {'KING_MOVES': king_moves,
+            'KNIGHT_MOVES': knight_moves,
+            'KING_MASK': [sum(1 << t for t in moves) for moves in king_moves],
+            'KNIGHT_MASK': [sum(1 << t for t in moves) for moves in knight_moves],
+            'PAWN_ATTACK_MASK': [sum(1 << t for t in moves) for moves in offset_table([[1, 1], [-1, 1]])],
+            'RAYS': rays,
+            'LINE': line,
+            'BETWEEN': between,
+            'FILE_MASK': file_mask,
+            'ADJACENT_FILES_MASK': [(file_mask[f - 1] if f > 0 else 0) | (file_mask[f + 1] if f < 7 else 0)
+                                    for f in range(8)],
+            'WHITE_PASSED_MASK': [front_mask(sq, range((sq >> 3) + 1, 8)) for sq in range(64)],
+            'BLACK_PASSED_MASK': [front_mask(sq, range(0, sq >> 3)) for sq in range(64)],
+            'WHITE_SHELTER_MASK': [front_mask(sq, [(sq >> 3) + 1, (sq >> 3) + 2]) for sq in range(64)],
+            'BLACK_SHELTER_MASK': [front_mask(sq, [(sq >> 3) - 1, (sq >> 3) - 2]) for sq in range(64)]}
+
+
+def format_tables(tables: dict) -> str:
+    '''
+    Source of the board tables module.
+    '''
+    parts = ["'''Generated by build_tables.py, do not edit.'''\n"]
+    for name, comment in TABLE_COMMENTS.items():
+        parts.append('\n# '+comment+'\n'+name+' = '+pprint.pformat(tables[name], width=120, compact=True)+'\n')
+    return ''.join(parts)
+
+
+def write_tables(path=TABLES_PATH) -> bool:
+    '''
+    Writes the board tables module to path, unless it's up to date.
+    Returns: whether it was written.
+    '''
+    source = format_tables(make_tables())
+    if os.path.exists(path):
+        with open(path) as f:
+            if f.read() == source:
+                return False
+    with open(path, 'w') as f:
+        f.write(source)
+    return True
+
+
+if __name__ == "__main__":
+    # usage: python build_tables.py ; regenerates misc/board_tables.py
+    print(('wrote ' if write_tables() else 'up to date: ')+TABLES_PATH)
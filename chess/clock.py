@@ -0,0 +1,201 @@
+import time
+from misc.constants import *
+
+'''
+Chess clocks and engine time management.
+A TimeControl is an initial time with either a Fischer increment (added after
+every move) or a simple delay (the clock only starts running once the delay
+has passed). ChessClock keeps both players' time for Game.start and self-play.
+TimeManager turns the remaining time into a per-move search budget: a soft
+limit after which no new depth is started, and a hard limit at which the
+search is stopped (see SearchContext.deadline).
+All times are in seconds.
+'''
+
+DEFAULT_MOVES_TO_GO = 30 # moves the remaining time is spread over without movestogo
+INCREMENT_SHARE = 0.75 # share of the increment spent on top of the base budget
+HARD_FACTOR = 3.0 # hard limit as a multiple of the soft limit
+MAX_FRACTION = 0.5 # share of the remaining time a single move may use
+MIN_BUDGET = 0.001
+MOBILITY_NORM = 35 # pseudolegal move count of a position of average complexity
+MAX_CLOCKED_DEPTH = 20 # depth cap of searches limited by a clock
+
+
+class TimeControl:
+    def __init__(self, initial: float, increment=0.0, delay=0.0):
+        '''
+        initial: Starting time of each player.
+        increment: Fischer increment added after each move.
+        delay: Simple delay before each move's time starts running.
+        '''
+        if initial <= 0 or increment < 0 or delay < 0:
+            raise Exception('Invalid time control')
+        self.initial = initial
+        self.increment = increment
+        self.delay = delay
+
+    @classmethod
+    def parse(cls, spec: str):
+        '''
+        Parses '5+3' (5 minutes, 3 second increment), '5d3' (3 second delay)
+        or '5' (no increment). Minutes may be fractional, eg '0.5+0.1'.
+        Complains with Exception if spec is ill formed.
+        '''
+        try:
+            if '+' in spec:
+                minutes, increment = spec.split('+')
+                return cls(float(minutes) * 60, increment=float(increment))
+            if 'd' in spec:
+                minutes, delay = spec.split('d')
+                return cls(float(minutes) * 60, delay=float(delay))
+            return cls(float(spec) * 60)
+        except ValueError:
+            raise Exception('Invalid time control '+spec)
+
+    def __str__(self):
+        minutes = self.initial / 60
+        text = str(int(minutes)) if minutes == int(minutes) else str(minutes)
+        if self.increment > 0:
+            return text+'+'+format_number(self.increment)
+        if self.delay > 0:
+            return text+'d'+format_number(self.delay)
+        return text
+
+
+def format_number(value: float) -> str:
+    return str(int(value)) if value == int(value) else str(value)
+
+
+def format_time(seconds: float) -> str:
+    '''
+    Clock display of seconds, eg '1:02:03', '4:05' or '0:09.4' under ten seconds.
+    '''
+    seconds = max(seconds, 0.0)
+    if seconds < 10:
+        return '0:0'+str(int(seconds * 10) / 10)
+    whole = int(seconds)
+    hours, minutes = whole // 3600, whole // 60 % 60
+    text = str(minutes).zfill(2 if hours > 0 else 1)+':'+str(whole % 60).zfill(2)
+    return str(hours)+':'+text if hours > 0 else text
+
+
+class ChessClock:
+    '''
+    Both players' clocks. At most one runs at a time; press() stops the
+    running one, applies increment or delay, and starts the other.
+    now: Time source, time.monotonic by default (replaceable in tests).
+    '''
+    def __init__(self, control: TimeControl, now=time.monotonic):
+        self.control = control
+        self.now = now
+        self.remaining = {WHITE: control.initial, BLACK: control.initial}
+        self.moves = {WHITE: 0, BLACK: 0} # moves completed on each clock
+        self.running = None # color whose clock runs, or None
+        self._started = 0.0 # when the running clock was started
+
+    def start(self, color: str):
+        '''
+        Starts color's clock, stopping the other one without counting a move.
+        '''
+        if self.running != None:
+            self.remaining[self.running] = self.time_left(self.running)
+        self.running = color
+        self._started = self.now()
+
+    def stop(self):
+        '''
+        Pauses the running clock.
+        '''
+        if self.running != None:
+            self.remaining[self.running] = self.time_left(self.running)
+            self.running = None
+
+    def used(self) -> float:
+        '''
+        Seconds charged to the running clock so far this move.
+        '''
+        if self.running == None:
+            return 0.0
+        return max(self.now() - self._started - self.control.delay, 0.0)
+
+    def time_left(self, color: str) -> float:
+        '''
+        Remaining time of color, including the running move. Negative once flagged.
+        '''
+        if color != self.running:
+            return self.remaining[color]
+        return self.remaining[color] - self.used()
+
+    def flagged(self, color: str) -> bool:
+        return self.time_left(color) <= 0
+
+    def press(self) -> float:
+        '''
+        Ends the running player's move and starts the opponent's clock.
+        The increment is only added if the player hadn't flagged.
+        Returns: seconds charged for the move.
+        '''
+        color = self.running
+        assert(color != None)
+        used = self.used()
+        self.remaining[color] -= used
+        if self.remaining[color] > 0:
+            self.remaining[color] += self.control.increment
+        self.moves[color] += 1
+        self.running = None
+        self.start(BLACK if color == WHITE else WHITE)
+        return used
+
+    def __str__(self):
+        return ('WHITE '+format_time(self.time_left(WHITE))+('*' if self.running == WHITE else '')
+                +'  BLACK '+format_time(self.time_left(BLACK))+('*' if self.running == BLACK else ''))
+
+
+class TimeManager:
+    '''
+    Allocates search time per move.
+    overhead: Seconds kept back per move, for communication and move making.
+    '''
+    def __init__(self, moves_to_go=DEFAULT_MOVES_TO_GO, overhead=0.0):
+        self.moves_to_go = moves_to_go
+        self.overhead = overhead
+
+    def allocate(self, remaining: float, increment=0.0, delay=0.0, moves_to_go=None, complexity=1.0) -> list:
+        '''
+        Budget for the next move, from the remaining time, increment or delay,
+        moves until the next time control (or the default spread) and a
+        complexity factor (see complexity()).
+        Returns: [soft limit, hard limit] in seconds from now.
+        '''
+        moves_to_go = max(moves_to_go if moves_to_go != None else self.moves_to_go, 1)
+        cap = remaining * MAX_FRACTION + delay
+        base = (remaining / moves_to_go + INCREMENT_SHARE * increment) * complexity + delay
+        soft = max(min(base, cap) - self.overhead, MIN_BUDGET)
+        hard = max(min(base * HARD_FACTOR, cap) - self.overhead, soft)
+        return [soft, hard]
+
+    def allocate_clock(self, clock: ChessClock, color: str, complexity=1.0) -> list:
+        '''
+        allocate() for color's time on clock.
+        '''
+        control = clock.control
+        return self.allocate(clock.time_left(color), control.increment, control.delay, complexity=complexity)
+
+
+def deadlines(budget: list, start=None) -> list:
+    '''
+    [soft, hard] budget as time.monotonic() deadlines from start (now if None),
+    for SearchContext.
+    '''
+    start = time.monotonic() if start == None else start
+    return [start + budget[0], start + budget[1]]
+
+
+def complexity(player) -> float:
+    '''
+    Time scale factor of player's position from its mobility: positions with
+    many moves get more time, forced ones less. Counts pseudolegal moves only,
+    so it costs no check tests.
+    '''
+    mobility = len(player.get_all_psuedolegal_moves())
+    return min(max(0.5 + 0.5 * mobility / MOBILITY_NORM, 0.6), 1.5)
@@ -9,7 +9,7 @@ class Debug:
         corresponding piece name codes and initial position, eg K-A5 in board_state['BLACK'] corresponds to
         black's king in position A5. Empty array/no key means no pieces for said color.
 
-        turn_state: which color starts first (1 or 2)
+        turn_state: which color starts first (1 or 2, or WHITE or BLACK). WHITE if None.
         '''
 
         for key in board_state:
@@ -17,3 +17,17 @@ class Debug:
 
         self.board_state = board_state
         self.turn_state = turn_state
+
+
+def set_up_debug(white_pieces=[], black_pieces=[], turn_state=None):
+    '''
+    Debug with the given piece name codes of each color, eg ['K-A5', 'P-B2'].
+    '''
+    mapper = {}
+    for piece in white_pieces + black_pieces:
+        assert len(piece) == 4
+    if black_pieces != []:
+        mapper['BLACK'] = black_pieces
+    if white_pieces != []:
+        mapper['WHITE'] = white_pieces
+    return Debug(board_state=mapper, turn_state=turn_state)
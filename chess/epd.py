@@ -0,0 +1,196 @@
+import argparse
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from helpers.game_helpers import convert_color_to_player
+from minimax import SearchContext
+from pgn import san_to_move, move_to_san
+from search import iterative_deepening
+
+'''
+Extended Position Description (EPD) test suite runner. Each EPD line is a
+position (the first 4 FEN fields) followed by operations such as
+bm Qxf7+; (best moves) am e4; (moves to avoid) and id "WAC.001";.
+Every position is searched to a depth or for a time budget, spread across
+worker processes, and counts as solved when the final best move is one of
+its bm moves and none of its am moves. Time to solution is when the search
+last switched to a solving move. Solved count and total NPS under a fixed
+budget tell whether a search change helps.
+'''
+
+DEFAULT_DEPTH = 3
+MAX_TIMED_DEPTH = 20 # depth cap of time budgeted searches
+
+_worker_game = None # Game of a pool worker, reused for each of its positions
+
+
+def parse_operations(text: str) -> dict:
+    '''
+    Parses EPD operations, eg 'bm Nf3 Ng5; id "test 1";' -> {'bm': ['Nf3', 'Ng5'], 'id': ['test 1']}.
+    Semicolons inside quotes don't end an operation.
+    '''
+    operations = {}
+    operation = []
+    token = ''
+    quoted = False
+    for letter in text + ';':
+        if letter == '"':
+            quoted = not quoted
+            continue
+        if quoted:
+            token += letter
+            continue
+        if letter.isspace() or letter == ';':
+            if token != '':
+                operation.append(token)
+                token = ''
+            if letter == ';' and len(operation) > 0:
+                operations[operation[0]] = operation[1:]
+                operation = []
+            continue
+        token += letter
+    return operations
+
+
+def parse_epd(line: str) -> list | None:
+    '''
+    Parses an EPD line.
+    Returns: [FEN (with default move clocks), operations dict], or None for a
+    blank or comment line.
+    '''
+    line = line.strip()
+    if line == '' or line.startswith('#'):
+        return None
+    fields = line.split(None, 4)
+    if len(fields) < 4:
+        raise Exception('Invalid EPD, expected 4 position fields: '+line)
+    operations = parse_operations(fields[4]) if len(fields) == 5 else {}
+    return [' '.join(fields[:4]) + ' 0 1', operations]
+
+
+def read_epd(path) -> list:
+    '''
+    Returns: [FEN, operations] of every position in the EPD file at path.
+    '''
+    positions = []
+    with open(path) as file:
+        for line in file:
+            position = parse_epd(line)
+            if position != None:
+                positions.append(position)
+    return positions
+
+
+def solve_position(task: list) -> dict:
+    '''
+    Searches one test position. task is [index, FEN, operations, depth, movetime or None].
+    Returns: a dict of the index, id, whether it was solved, the engine's
+    move (SAN), time to solution (None if unsolved), depth reached, nodes
+    and search seconds. A position whose bm/am moves can't be decoded gets
+    an 'error' instead.
+    '''
+    global _worker_game
+    index, fen, operations, depth, movetime = task
+    name = operations.get('id', [str(index + 1)])[0]
+    if _worker_game == None:
+        from game import Game
+        _worker_game = Game.from_fen(fen)
+    game = _worker_game
+    try:
+        game.reset_to_fen(fen)
+        best_moves = [san_to_move(game, san) for san in operations.get('bm', [])]
+        avoid_moves = [san_to_move(game, san) for san in operations.get('am', [])]
+    except Exception as error:
+        return {'index': index, 'id': name, 'error': str(error)}
+    if len(best_moves) == 0 and len(avoid_moves) == 0:
+        return {'index': index, 'id': name, 'error': 'no bm or am operation'}
+
+    def solves(move) -> bool:
+        return ((len(best_moves) == 0 or move in best_moves) and move not in avoid_moves)
+
+    solved_since = None # elapsed seconds when the best move last became a solving move
+    def on_progress(event, force=False):
+        nonlocal solved_since
+        if not solves(event.pv[0]):
+            solved_since = None
+        elif solved_since == None:
+            solved_since = event.elapsed
+
+    player = convert_color_to_player(game, game.turn)
+    deadline = time.monotonic() + movetime if movetime != None else None
+    result = iterative_deepening(game, player, depth, SearchContext(deadline=deadline), report=on_progress)
+    solved = result.best_move != None and solves(result.best_move)
+    if solved and solved_since == None: # fallback move of a search stopped before any update
+        solved_since = result.elapsed
+    return {'index': index, 'id': name, 'solved': solved,
+            'move': move_to_san(game, result.best_move) if result.best_move != None else None,
+            'time_to_solution': solved_since if solved else None, 'depth': result.depth,
+            'nodes': result.nodes, 'seconds': result.elapsed}
+
+
+def run_suite(positions: list, depth=DEFAULT_DEPTH, movetime=None, workers=None) -> list:
+    '''
+    Solves every [FEN, operations] of positions, across worker processes
+    (os.cpu_count() if None, in this process if 1).
+    Returns: solve_position results, in the order of positions.
+    '''
+    workers = workers if workers != None else (os.cpu_count() or 1)
+    tasks = [[index, fen, operations, depth, movetime] for index, (fen, operations) in enumerate(positions)]
+    if workers == 1:
+        return [solve_position(task) for task in tasks]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(solve_position, tasks))
+
+
+def summarize(results: list, wall_time: float) -> dict:
+    '''
+    Totals of run_suite results: positions, solved, errors, nodes, search
+    seconds summed over positions, NPS (total nodes over summed search
+    seconds), mean time to solution of solved positions and wall seconds.
+    '''
+    searched = [result for result in results if 'error' not in result]
+    solved = [result for result in searched if result['solved']]
+    nodes = sum(result['nodes'] for result in searched)
+    seconds = sum(result['seconds'] for result in searched)
+    return {'positions': len(results), 'solved': len(solved), 'errors': len(results) - len(searched),
+            'nodes': nodes, 'seconds': seconds, 'nps': nodes / seconds if seconds > 0 else 0.0,
+            'mean_time_to_solution': (sum(result['time_to_solution'] for result in solved) / len(solved)
+                                      if len(solved) > 0 else None),
+            'wall_seconds': wall_time}
+
+
+def format_results(results: list, summary: dict) -> str:
+    lines = []
+    for result in results:
+        if 'error' in result:
+            lines.append(result['id'].ljust(16)+' error: '+result['error'])
+            continue
+        solution = ('solved in '+str(round(result['time_to_solution'], 3))+'s' if result['solved']
+                    else 'not solved')
+        lines.append(result['id'].ljust(16)+' '+str(result['move']).ljust(8)+solution.ljust(20)
+                     +'depth '+str(result['depth'])+', '+str(result['nodes'])+' nodes')
+    mean = summary['mean_time_to_solution']
+    lines.append('solved '+str(summary['solved'])+'/'+str(summary['positions'])
+                 +(' ('+str(summary['errors'])+' errors)' if summary['errors'] > 0 else '')
+                 +', mean time to solution '+(str(round(mean, 3))+'s' if mean != None else '-')
+                 +', '+str(summary['nodes'])+' nodes, '+str(int(summary['nps']))+' nps, '
+                 +str(round(summary['wall_seconds'], 2))+'s wall')
+    return '\n'.join(lines)
+
+
+if __name__ == "__main__":
+    # usage: python epd.py suite.epd [--depth N | --movetime S] [--workers N] [--limit N]
+    parser = argparse.ArgumentParser(description='Run an EPD test suite with bm/am operations.')
+    parser.add_argument('path', help='EPD file')
+    parser.add_argument('--depth', type=int, default=None,
+                        help='search depth per position (default '+str(DEFAULT_DEPTH)+')')
+    parser.add_argument('--movetime', type=float, default=None,
+                        help='seconds per position, searching up to --depth (default '+str(MAX_TIMED_DEPTH)+')')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: CPU count)')
+    parser.add_argument('--limit', type=int, default=None, help='run only the first N positions')
+    args = parser.parse_args()
+    depth = args.depth if args.depth != None else (MAX_TIMED_DEPTH if args.movetime != None else DEFAULT_DEPTH)
+    positions = read_epd(args.path)[:args.limit]
+    start = time.perf_counter()
+    results = run_suite(positions, depth=depth, movetime=args.movetime, workers=args.workers)
+    print(format_results(results, summarize(results, time.perf_counter() - start)))
@@ -0,0 +1,52 @@
+'''
+Direct mapped cache of static evaluations, keyed by the Zobrist key of the
+position (PositionState.key). Searches evaluate the same leaves many times,
+across iterative deepening iterations, multipv re-searches and
+transpositions, and a hit skips minimax.value's whole evaluation.
+A slot holds one key and its score; a colliding store replaces it, so the
+cache stays at a fixed size. Scores are absolute, >0 is good for WHITE.
+'''
+
+EVAL_CACHE_BITS = 16 # 65536 slots
+
+
+class EvalCache:
+    '''
+    Static evaluation cache of a Game, see the module docstring. Cleared
+    between games; slots are allocated on the first store, so Games that
+    never search stay small.
+    '''
+    def __init__(self, bits=EVAL_CACHE_BITS):
+        self.mask = (1 << bits) - 1
+        self.keys: list | None = None # key of the position in each slot, or None
+        self.scores: list | None = None # score of the position in each slot
+        self.probes = 0 # lookups so far
+        self.hits = 0 # lookups that found their position
+
+    def get(self, key: int) -> float | None:
+        '''
+        Returns: Cached score of the position with key, or None.
+        '''
+        self.probes += 1
+        if self.keys != None and self.keys[key & self.mask] == key:
+            self.hits += 1
+            return self.scores[key & self.mask]
+        return None
+
+    def store(self, key: int, score: float):
+        if self.keys == None:
+            self.keys = [None] * (self.mask + 1)
+            self.scores = [0.0] * (self.mask + 1)
+        self.keys[key & self.mask] = key
+        self.scores[key & self.mask] = score
+
+    def clear(self):
+        '''
+        Drops all entries and statistics, eg for a new game.
+        '''
+        self.keys, self.scores = None, None
+        self.probes, self.hits = 0, 0
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes > 0 else 0.0
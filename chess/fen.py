@@ -0,0 +1,133 @@
+from misc.constants import *
+from position_state import (NO_SQUARE, WHITE_KING_SIDE, WHITE_QUEEN_SIDE, BLACK_KING_SIDE,
+                            BLACK_QUEEN_SIDE)
+
+'''
+Forsyth-Edwards Notation (FEN) parsing and formatting.
+Game.from_fen, Game.reset_to_fen and Game.to_fen build on these.
+'''
+
+STARTING_FEN = 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1'
+
+FEN_RANKS = {'p': PAWN, 'n': KNIGHT, 'b': BISHOP, 'r': ROOK, 'q': QUEEN, 'k': KING}
+RANK_LETTERS = {PAWN: 'p', KNIGHT: 'n', BISHOP: 'b', ROOK: 'r', QUEEN: 'q', KING: 'k'}
+CASTLING_LETTERS = [['K', WHITE_KING_SIDE], ['Q', WHITE_QUEEN_SIDE],
+                    ['k', BLACK_KING_SIDE], ['q', BLACK_QUEEN_SIDE]]
+FILE_LETTERS = 'abcdefgh'
+SQUARE_NAMES = [FILE_LETTERS[i % 8].upper() + str(i // 8 + 1) for i in range(64)] # as in piece names, eg 'A1'
+
+
+def parse_fen(fen: str) -> list:
+    '''
+    Parses a FEN string. The halfmove and fullmove fields may be omitted,
+    as in EPD, and default to 0 and 1.
+    Returns: [placement, turn, castling, ep_square, halfmove_clock, fullmove_number],
+    where placement is a list of [color, rank, [x, y]] for every piece,
+    castling a castling rights bitmask and ep_square a square index or NO_SQUARE.
+    Complains with Exception if fen is ill formed.
+    '''
+    fields = fen.split()
+    if len(fields) not in [4, 6]:
+        raise Exception('Invalid FEN, expected 4 or 6 fields: '+fen)
+
+    placement = []
+    rows = fields[0].split('/')
+    if len(rows) != 8:
+        raise Exception('Invalid FEN, expected 8 rows: '+fen)
+    for i in range(8):
+        y = 8 - i
+        x = 1
+        for letter in rows[i]:
+            if letter.isdigit():
+                x += int(letter)
+                continue
+            rank = FEN_RANKS.get(letter.lower())
+            if rank == None or x > 8:
+                raise Exception('Invalid FEN row '+rows[i]+': '+fen)
+            placement.append([WHITE if letter.isupper() else BLACK, rank, [x, y]])
+            x += 1
+        if x != 9:
+            raise Exception('Invalid FEN row '+rows[i]+': '+fen)
+
+    if fields[1] not in ['w', 'b']:
+        raise Exception('Invalid FEN side to move: '+fen)
+    turn = WHITE if fields[1] == 'w' else BLACK
+
+    castling = 0
+    if fields[2] != '-':
+        for letter in fields[2]:
+            bits = [bit for castling_letter, bit in CASTLING_LETTERS if castling_letter == letter]
+            if len(bits) == 0:
+                raise Exception('Invalid FEN castling rights: '+fen)
+            castling |= bits[0]
+
+    ep_square = NO_SQUARE
+    if fields[3] != '-':
+        ep = fields[3]
+        if len(ep) != 2 or ep[0] not in FILE_LETTERS or ep[1] not in ['3', '6']:
+            raise Exception('Invalid FEN en passant square: '+fen)
+        ep_square = FILE_LETTERS.index(ep[0]) + 8 * (int(ep[1]) - 1)
+
+    halfmove_clock, fullmove_number = 0, 1
+    if len(fields) == 6:
+        if not fields[4].isdigit() or not fields[5].isdigit():
+            raise Exception('Invalid FEN move clocks: '+fen)
+        halfmove_clock, fullmove_number = int(fields[4]), int(fields[5])
+
+    return [placement, turn, castling, ep_square, halfmove_clock, fullmove_number]
+
+
+def format_fen(board, state) -> str:
+    '''
+    Formats the position of board and PositionState state as a FEN string.
+    '''
+    rows = []
+    for y in range(8, 0, -1):
+        row = ''
+        empty = 0
+        for x in range(1, 9):
+            piece = board.get_piece([x, y])
+            if piece == None:
+                empty += 1
+                continue
+            if empty > 0:
+                row += str(empty)
+                empty = 0
+            letter = RANK_LETTERS[piece.rank]
+            row += letter.upper() if piece.color == WHITE else letter
+        if empty > 0:
+            row += str(empty)
+        rows.append(row)
+
+    castling = ''.join(letter for letter, bit in CASTLING_LETTERS if state.castling & bit)
+    ep = '-'
+    if state.ep_square != NO_SQUARE:
+        ep = FILE_LETTERS[state.ep_square % 8] + str(state.ep_square // 8 + 1)
+    return ' '.join(['/'.join(rows), 'w' if state.turn == WHITE else 'b', castling if castling != '' else '-',
+                     ep, str(state.halfmove_clock), str(state.fullmove_number)])
+
+
+if __name__ == "__main__":
+    # usage: python fen.py ; prints FEN load speed through Game.reset_to_fen
+    import time
+    from game import Game
+    fens = [STARTING_FEN,
+            'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1',
+            '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1']
+    game = Game.from_fen(fens[0])
+    n = 3000
+    start = time.perf_counter()
+    for i in range(n):
+        game.reset_to_fen(fens[i % 3])
+    elapsed = time.perf_counter() - start
+    print('reset_to_fen: '+str(int(n / elapsed))+' positions/sec')
+    start = time.perf_counter()
+    for i in range(n // 10):
+        Game.from_fen(fens[i % 3])
+    elapsed = time.perf_counter() - start
+    print('from_fen: '+str(int(n // 10 / elapsed))+' positions/sec')
+    start = time.perf_counter()
+    for i in range(n // 10):
+        Game()
+    elapsed = time.perf_counter() - start
+    print('Game(): '+str(int(n // 10 / elapsed))+' positions/sec')
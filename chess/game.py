@@ -1,18 +1,30 @@
-import random
 from player import Player
 from board import Board
 from debug import Debug
-from helpers.general_helpers import algebraic_uniconverter, swap_colors, well_formed
-from helpers.game_helpers import (clear_terminal, convert_color_to_player, get_opponent)
+from helpers.general_helpers import (algebraic_uniconverter, swap_colors, well_formed, convert_coord,
+                                     move_to_notation)
+from helpers.game_helpers import (convert_color_to_player, get_opponent, has_legal_move)
 from helpers.state_helpers import (update_both_players_check, pawn_promotion, undo_pawn_promotion)
 from movement_zone import get_movement_zone
 from misc.constants import *
-from turn import Turn
+from turn import TurnLog
+from undo_stack import (UndoStack, to_square, from_square, PIECE, FROM, TO, CAPTURED, CAPTURED_SQUARE, FLAGS,
+                        PREV_CASTLING, PREV_EP_SQUARE, PREV_HALFMOVE_CLOCK, NO_PIECE, CASTLE_FLAG,
+                        PROMOTED_FLAG, FIRST_MOVE_FLAG, PSEUDOMOVE_FLAG, BLACK_TURN_FLAG,
+                        WHITE_CHECK_FLAG, BLACK_CHECK_FLAG)
+from position_state import PositionState, castling_bits
+from fen import parse_fen, format_fen, SQUARE_NAMES
+from piece import Piece
+from snapshot import pack_move, unpack_move
+from clock import ChessClock, TimeManager, MAX_CLOCKED_DEPTH, complexity, deadlines
+from renderer import TerminalRenderer
+from pawns import PawnTable
+from eval_cache import EvalCache
 
 '''File contains The Game logic.'''
 
 special_command_set = set(['PAUSE', 'EXIT', 'RESELECT', 
-                           'FORFEIT', 'RANDOM', 'R', 'B', 'U'])
+                           'FORFEIT', 'RANDOM', 'R', 'B', 'U', 'PROFILE'])
 class Game:
     def __init__(self, debug=None):
 
@@ -23,29 +35,344 @@ class Game:
         self.board = Board()
         self.p1 = Player(color=WHITE, board=self.board, game=self, debug=debug)
         self.p2 = Player(color=BLACK, board=self.board, game=self, debug=debug)
-        self.turn = self.p1.color  # 'WHITE' or 'BLACK'
+        self.state = PositionState(castling=self.initial_castling_rights()) # side to move, castling, en passant, clocks
+        if debug != None and debug.turn_state != None:
+            self.turn = self.p1.color if debug.turn_state in [1, WHITE] else self.p2.color
         self.winner = None # Should be either 'WHITE', 'BLACK', or 'DRAW'
-        self.turn_log: list[Turn] = [] # stack of Turns
+        self.pieces_by_id = list(self.p1.pieces.values()) + list(self.p2.pieces.values())
+        for piece_id, piece in enumerate(self.pieces_by_id):
+            piece.id = piece_id # how the undo stack refers to pieces
+        self.state.set_key(self.pieces_by_id)
+        self.undo_stack = UndoStack() # integer entries of the moves made, see undo_stack.py
+        self.turn_log = TurnLog(self) # Turn view of undo_stack
+        self.book: 'PolyglotBook | None' = None # opening book consulted by make_best_move
+        self.tablebase: 'Tablebases | None' = None # endgame tablebases probed by minimax
+        self.profile_next_search = False # set by hidden PROFILE command, profiles next B search
+        self.search_profiles: list | None = None # if a list, every B search is profiled into it
+        self.clock: ChessClock | None = None # players' clocks, or None for untimed play
+        self.renderer = TerminalRenderer() # draws render frames, redrawing only what changed
+        self.pawn_table = PawnTable() # pawn structure cache of the evaluation
+        self.eval_cache = EvalCache() # static scores of evaluated positions, cleared between games
+
+
+    @property
+    def turn(self) -> str:
+        '''
+        Color to move, 'WHITE' or 'BLACK'. Stored in state.
+        '''
+        return self.state.turn
+
+    @turn.setter
+    def turn(self, color: str):
+        self.state.turn = color
+
+
+    def initial_castling_rights(self) -> int:
+        '''
+        Castling rights bits of the initial setup, given for each KING on its starting tile 
+        together with a ROOK of its color on a starting tile.
+        '''
+        castling = 0
+        for player in [self.p1, self.p2]:
+            row = 1 if player.color == WHITE else 8
+            king = self.board.get_piece([5, row])
+            if king == None or king.rank != KING or king.color != player.color:
+                continue
+            for x, bit in zip([8, 1], castling_bits(player.color)):
+                rook = self.board.get_piece([x, row])
+                if rook != None and rook.rank == ROOK and rook.color == player.color:
+                    castling |= bit
+        return castling
+
+
+    @classmethod
+    def from_fen(cls, fen: str):
+        '''
+        Creates a Game set up from a FEN string.
+        '''
+        game = cls(debug=Debug(board_state={})) # no pieces
+        game.reset_to_fen(fen)
+        return game
+
+
+    def reset_to_fen(self, fen: str):
+        '''
+        Sets this game up from a FEN string, reusing its Board, Players, Piece
+        objects, undo stack and state instead of constructing new ones.
+        Loaded opening book and tablebases are kept, move history is cleared.
+        Castling rights without their KING and ROOK on starting tiles are dropped.
+        '''
+        self.reset_to_position(*parse_fen(fen))
+
+
+    def reset_to_position(self, placement: list, turn: str, castling: int, ep_square: int,
+                          halfmove_clock: int, fullmove_number: int, checks=None):
+        '''
+        reset_to_fen with the fields of parse_fen, for loaders of other formats
+        (see snapshot.py). placement is a list of [color, rank, [x, y]].
+        checks: [WHITE in check, BLACK in check] if known, else they're computed.
+        '''
+        grid = self.board.game_board
+        for row in grid:
+            for j in range(8):
+                row[j] = None
+        pool = self.pieces_by_id
+        self.pieces_by_id = []
+        for player in [self.p1, self.p2]:
+            player.pieces.clear()
+            player.king = None
+        for piece_id, (color, rank, pos) in enumerate(placement):
+            player = self.p1 if color == self.p1.color else self.p2
+            name = (rank[0] if rank != KNIGHT else 'N') + '-' + SQUARE_NAMES[to_square(pos)]
+            if piece_id < len(pool):
+                piece = pool[piece_id]
+                piece.reinit(color, rank, player, pos, name)
+            else:
+                piece = Piece(color=color, rank=rank, player=player, pos=pos)
+            piece.id = piece_id
+            piece.moved = not player.on_home_square(piece)
+            player.pieces[name] = piece
+            if rank == KING:
+                player.king = piece
+            x, y = convert_coord(pos)
+            grid[x][y] = piece
+            self.pieces_by_id.append(piece)
+
+        self.undo_stack.clear()
+        self.winner = None
+        state = self.state
+        state.turn = turn
+        state.castling = castling & self.initial_castling_rights()
+        state.ep_square = ep_square
+        state.halfmove_clock = halfmove_clock
+        state.fullmove_number = fullmove_number
+        state.set_key(self.pieces_by_id)
+        if checks == None:
+            update_both_players_check(self)
+        else:
+            white_check, black_check = checks
+            self.p1.in_check = white_check if self.p1.color == WHITE else black_check
+            self.p2.in_check = white_check if self.p2.color == WHITE else black_check
+
+
+    def draw_reason(self) -> str | None:
+        '''
+        Returns 'fifty moves' or 'threefold repetition' if the current position
+        is drawn by rule, else None. Checkmate and stalemate are left to the caller.
+        '''
+        if self.state.halfmove_clock >= 100:
+            return 'fifty moves'
+        if self.state.repetitions() >= 2:
+            return 'threefold repetition'
+        return None
+
+
+    def termination(self) -> str | None:
+        '''
+        Returns how the game has ended in the current position: 'checkmate',
+        'stalemate', 'fifty moves' or 'threefold repetition', or None if it goes on.
+        '''
+        player = convert_color_to_player(self, self.turn)
+        winner = self.winner # trying moves resets it, see restore_turn_start
+        legal = has_legal_move(player)
+        self.winner = winner
+        if not legal:
+            return 'checkmate' if player.in_check else 'stalemate'
+        return self.draw_reason()
+
+
+    def update_winner(self) -> str | None:
+        '''
+        Sets winner if the game has ended in the current position.
+        Returns: termination().
+        '''
+        termination = self.termination()
+        if termination == 'checkmate':
+            self.winner = swap_colors(self.turn)
+        elif termination != None:
+            self.winner = 'DRAW'
+        return termination
+
+
+    def result(self) -> str | None:
+        '''
+        Returns the result of a finished game, '1-0', '0-1' or '1/2-1/2', or None.
+        '''
+        if self.winner == None:
+            return None
+        return {WHITE: '1-0', BLACK: '0-1', 'DRAW': '1/2-1/2'}[self.winner]
+
+
+    def parse_move(self, move):
+        '''
+        Converts move of the side to move into a Game move ([[x0, y0], [x1, y1]] or 'KING'/'QUEEN').
+        move: A Game move, coordinate notation in either case ('e2e4', 'E7E8Q', the
+        KING's move 'e1g1' or 'kc'/'qc' for castles), or a move packed as an int
+        (see snapshot.pack_move).
+        Complains with Exception if move is ill formed or an underpromotion.
+        '''
+        if type(move) == int:
+            return unpack_move(move)
+        if type(move) == list:
+            return move
+        query = move.upper()
+        if query in KQSET:
+            return query
+        if query in ['KC', 'QC']:
+            return KING if query == 'KC' else QUEEN
+        if len(query) == 5 and query[4] in ['R', 'B', 'N']:
+            raise Exception('Underpromotion is not supported: '+move)
+        if len(query) == 5 and query[4] == 'Q':
+            query = query[:4]
+        if not well_formed(query):
+            raise Exception('Invalid move '+move)
+        pos, dest = algebraic_uniconverter(query[:2]), algebraic_uniconverter(query[2:])
+        piece = self.board.get_piece(pos)
+        if piece != None and piece.rank == KING and abs(dest[0] - pos[0]) == 2:
+            return KING if dest[0] > pos[0] else QUEEN
+        return [pos, dest]
+
+
+    def play(self, moves) -> str | None:
+        '''
+        Headless play: plays moves (see parse_move) in order, each for the side
+        to move, without rendering or reading input. Sets winner once the game ends.
+        Complains with Exception if a move is ill formed or illegal, or the game
+        is already over; the moves before it stay played.
+        Returns: result().
+        '''
+        for move in moves:
+            if self.winner != None:
+                raise Exception('Game is over')
+            player = convert_color_to_player(self, self.turn)
+            if not player.attempt_action(self.parse_move(move)):
+                raise Exception('Illegal move '+str(move))
+            self.update_winner()
+        return self.result()
+
+
+    def legal_moves(self, notation=False) -> list:
+        '''
+        Returns the legal moves of the side to move, as Game moves or in
+        lowercase coordinate notation if notation (see move_text).
+        '''
+        winner = self.winner
+        moves = convert_color_to_player(self, self.turn).get_all_legal_moves()
+        self.winner = winner
+        if notation:
+            return [self.move_text(move) for move in moves]
+        return moves
+
+
+    def move_text(self, move) -> str:
+        '''
+        Lowercase coordinate (UCI) notation of a Game move of the side to move,
+        with a 'q' suffix for PAWN promotions, eg 'e7e8q'.
+        '''
+        text = move_to_notation(move, self.turn)
+        if type(move) == list and move[1][1] in [1, 8]:
+            piece = self.board.get_piece(move[0])
+            if piece != None and piece.rank == PAWN:
+                text += 'q'
+        return text
+
+
+    def pack_move(self, move) -> int:
+        '''
+        Packs a Game move of the side to move as an int (see snapshot.pack_move).
+        '''
+        return pack_move(move, self.turn)
+
+
+    def engine_move(self, depth=3, movetime=None):
+        '''
+        Headless engine move: searches the position for the side to move (see
+        analyze.search_position) and plays the best move found, then sets
+        winner if the game ended.
+        Complains with Exception if the game is already over.
+        Returns: the Game move played.
+        '''
+        from analyze import search_position # analyze imports pgn, which plays on Games
+        if self.winner != None or self.update_winner() != None:
+            raise Exception('Game is over')
+        score, move, nodes, reached = search_position(self, depth, movetime)
+        self.play([move])
+        return move
+
+
+    def to_fen(self) -> str:
+        '''
+        Returns the FEN string of the current position.
+        '''
+        return format_fen(self.board, self.state)
 
 
     def reset(self):
         '''
-        Resets game state to a blank slate.
+        Resets game state to a blank slate. A loaded opening book and tablebases are kept,
+        and a clock is restarted with the same time control.
         '''
+        book, tablebase, clock = self.book, self.tablebase, self.clock
         self.__init__()
+        self.book, self.tablebase = book, tablebase
+        if clock != None:
+            self.clock = ChessClock(clock.control, now=clock.now)
 
 
-    def render(self):
+    def load_book(self, path):
         '''
-        Renders the game visuals.
+        Opens the Polyglot opening book at path, for make_best_move to consult
+        before searching.
+        '''
+        from book import PolyglotBook # loaded on demand, like the engine and tablebases
+        if self.book != None:
+            self.book.close()
+        self.book = PolyglotBook(path)
+
+
+    def load_tablebases(self, directory):
+        '''
+        Opens the endgame tablebases generated into directory (see tablebase.py),
+        for minimax to probe.
+        '''
+        from tablebase import Tablebases
+        if self.tablebase != None:
+            self.tablebase.close()
+        self.tablebase = Tablebases(directory)
+
+
+    def write_search_profile(self, profiler):
+        '''
+        Writes profiler's stats of a B search with profiling.write_profile,
+        and waits for Enter so the paths can be read before the next render.
+        '''
+        import pstats
+        from profiling import write_profile # profiling imports Game through its scenarios
+        paths = write_profile(pstats.Stats(profiler), 'ingame-search')
+        input('Profile written to '+paths[0]+' and '+paths[1]+'. Press Enter to continue.')
+        self.renderer.invalidate() # the profile output may have scrolled the screen
+
+
+    def frame(self) -> list:
+        '''
+        Lines of the game visuals.
         '''
-        clear_terminal()
-        print('Special commands: PAUSE, EXIT, FORFEIT, RESELECT, RANDOM (or R), QC or KC (to castle), B (best move), U (undo)')
-        print(str(self.board))
+        lines = ['Special commands: PAUSE, EXIT, FORFEIT, RESELECT, RANDOM (or R), QC or KC (to castle), B (best move), U (undo)']
+        lines += str(self.board).split('\n')
+        if self.clock != None:
+            lines.append(str(self.clock))
         if self.p1.in_check:
-            print(str(self.p1.color) +' is in check!')
+            lines.append(str(self.p1.color) +' is in check!')
         if self.p2.in_check:
-            print(str(self.p2.color) +' is in check!')
+            lines.append(str(self.p2.color) +' is in check!')
+        return lines
+
+
+    def render(self):
+        '''
+        Renders the game visuals.
+        '''
+        self.renderer.draw(self.frame())
 
 
     def start(self):
@@ -53,11 +380,16 @@ class Game:
         Starts a new game, or continues an existing game if it was paused.
         '''
         update_both_players_check(self) # for debug state mainly
+        flag_fall = False
+        draw_by = 'stalemate'
 
         while self.winner == None:
+            if self.clock != None and self.clock.running != self.turn:
+                self.clock.start(self.turn)
             self.render()
             cur_player = convert_color_to_player(self, self.turn)
             opponent = get_opponent(self, cur_player)
+            plies = len(self.undo_stack)
             query = input('['+str(self.turn)+'\'S TURN] Input move (e.g. e2e4 or kc/qc): ')
             query = query.upper() # uppercases query
             if query in special_command_set:
@@ -66,165 +398,152 @@ class Game:
                 if query == 'U':
                     self.unmake_turn()
                     continue
+                if query == 'PROFILE': # hidden, not listed in render
+                    self.profile_next_search = True
+                    continue
                 if query == 'B':
-                    cur_player.make_best_move(depth=3, shuffle=True)
+                    profiler = None
+                    if self.profile_next_search or self.search_profiles != None:
+                        import cProfile
+                        profiler = cProfile.Profile()
+                    print('Searching... press Ctrl+C to stop and play the best move found so far.')
+                    depth, soft_deadline, deadline = 3, None, None
+                    if self.clock != None:
+                        budget = TimeManager().allocate_clock(self.clock, cur_player.color, complexity(cur_player))
+                        depth, (soft_deadline, deadline) = MAX_CLOCKED_DEPTH, deadlines(budget)
+                    cur_player.make_best_move(depth=depth, shuffle=True, interruptible=True,
+                                              on_progress=print, profiler=profiler,
+                                              soft_deadline=soft_deadline, deadline=deadline)
+                    self.renderer.invalidate() # search messages may have scrolled the screen
+                    if profiler != None and len(profiler.getstats()) == 0:
+                        profiler = None # a book move was played without searching, keep PROFILE pending
+                    if profiler != None and self.search_profiles != None:
+                        self.search_profiles.append(profiler)
+                    if profiler != None and self.profile_next_search:
+                        self.profile_next_search = False
+                        self.write_search_profile(profiler)
                 if query == 'PAUSE':
+                    if self.clock != None:
+                        self.clock.stop()
                     break
             else:
-                n = len(query)
-                if n not in [2, 4]:
+                move = None
+                if len(query) == 4 and well_formed(query):
+                    move = [algebraic_uniconverter(query[:2]), algebraic_uniconverter(query[2:])]
+                if query in ['KC', 'QC']:
+                    move = KING if query == 'KC' else QUEEN
+                if move == None or not cur_player.attempt_action(move):
+                    self.renderer.invalidate() # redraw in full over the rejected input, which may have wrapped
                     continue
-                if n == 4:
-                    if not well_formed(query):
-                        continue
-                    pos = algebraic_uniconverter(query[:2])
-                    dest = algebraic_uniconverter(query[2:])
-                    move_success = cur_player.attempt_action([pos, dest]) # type: ignore
-                    if not move_success:
-                        continue
-                if n == 2:
-                    if query not in ['KC', 'QC']:
-                        continue
-                    castle_side = KING if query == 'KC' else QUEEN
-                    move_success = cur_player.attempt_action(castle_side)
-                    if not move_success:
-                        continue
+
+            if self.clock != None and len(self.undo_stack) > plies:
+                if self.clock.flagged(cur_player.color):
+                    self.winner, flag_fall = opponent.color, True
+                    self.clock.stop()
+                    break
+                self.clock.press()
             
-            if len(opponent.get_all_legal_moves()) == 0:
-                if opponent.in_check:
-                    self.winner = cur_player.color
-                else:
-                    self.winner = 'DRAW'
+            termination = self.update_winner()
+            if self.winner == 'DRAW':
+                draw_by = termination
 
+        if self.clock != None and self.winner != None:
+            self.clock.stop()
         self.render()
         if self.winner == None:
             print('')
         if self.winner == 'DRAW':
-            print('Match ends in a stalemate draw.')
+            print('Match ends in a '+draw_by+' draw.')
+        elif flag_fall:
+            print(swap_colors(self.winner)+' ran out of time! '+str(self.winner)+' wins!')
         else:
             print('Checkmate! '+str(self.winner)+ ' wins!')
 
 
     def unmake_turn(self, pseudomove=False):
         '''
-        Undos latest turn made, recorded on end of turn_log (pseudolegal or not). 
-        Handles updating turn_log w/ pop undone move from turn_log history.
+        Undos latest turn made, recorded on top of undo_stack (pseudolegal or not). 
+        Handles popping the undone move from undo_stack.
         Wrapper for unmake_move, unmake_castle.
-        psuedomove: Whether move is pseudolegal move, for assertions. TODO seems unnessessary?
+        psuedomove: Whether move is pseudolegal move, for assertions.
         '''
-        n = len(self.turn_log)
-        if n == 0:
+        stack = self.undo_stack
+        if len(stack) == 0:
             return # no move to revert back to
-        latest_turn = self.turn_log[-1]
-        assert(latest_turn.is_pseudomove == pseudomove)
-        if n >= 2:
-            for i in range(n-1):
-                assert(self.turn_log[i].is_pseudomove == False)
-
-        move_type = latest_turn.move_type
-        if move_type == MOVE:
-            self.unmake_move()
-        elif move_type == CASTLE:
+        flags = stack.top(FLAGS)
+        assert(bool(flags & PSEUDOMOVE_FLAG) == pseudomove)
+
+        if flags & CASTLE_FLAG:
             self.unmake_castle()
         else:
-            assert(False)
+            self.unmake_move()
 
-        self.turn_log.pop()
+        stack.pop()
 
 
     def unmake_move(self):
         '''
         Undos a pos->dest move and reverts game state to start of turn before that move.
         '''
-        latest_turn = self.turn_log[-1]
-        assert(not self.board.piece_exists(latest_turn.moved_piece_pos))
-        moved_piece_record = latest_turn.moved_piece # recorded piece
-        moved_piece_board = self.board.get_piece(latest_turn.moved_piece_dest) # that piece on board
-        if moved_piece_board != moved_piece_record:
-            print('Latest dest: ')
-            print('Record: '+str(moved_piece_record))
-            print('On board: '+str(moved_piece_board))
-            assert(False)
-
+        stack = self.undo_stack
+        flags = stack.top(FLAGS)
         board = self.board
-        old_pos = latest_turn.moved_piece_pos
-        dest = latest_turn.moved_piece_dest
+        old_pos = from_square(stack.top(FROM))
+        dest = from_square(stack.top(TO))
+        assert(not board.piece_exists(old_pos))
+        moved_piece = self.pieces_by_id[stack.top(PIECE)]
+        assert(board.get_piece(dest) is moved_piece)
+
         # move moved_piece back into original position and revert its position state
-        board.move_piece(old_pos, moved_piece_board)
+        board.move_piece(old_pos, moved_piece)
 
-        if latest_turn.pawn_promoted: # undo pawn promotion
-            assert(moved_piece_board.rank != PAWN)
-            undo_pawn_promotion(moved_piece_board)
+        if flags & PROMOTED_FLAG: # undo pawn promotion
+            assert(moved_piece.rank != PAWN)
+            undo_pawn_promotion(moved_piece)
 
-        moved_piece_board.moved = not latest_turn.pieces_first_move # piece didn't move
+        moved_piece.moved = not (flags & FIRST_MOVE_FLAG) # piece didn't move
 
         # move captured piece or none back into original position
-        captured_piece = latest_turn.captured_piece
-        if captured_piece != None:
-            captured_piece_orig_pos = latest_turn.captured_piece_pos
-            board.add_or_replace_piece(captured_piece_orig_pos, captured_piece)
-
-        # revert 2 leap statuses
-        moved_piece_board.pawn_two_leap_on_prev_turn = False # piece did not 2-leaped at start of this turn
-        player = convert_color_to_player(self, latest_turn.turn_color) # get player on this turn
-        opponent = get_opponent(self, player)
-        if len(self.turn_log) >= 2:
-            second_latest_turn = self.turn_log[-2]
-            opp_two_leap_code = second_latest_turn.code_of_piece_that_two_leaped # opponent two leaper on turn before latest turn
-            if opp_two_leap_code != None:
-                opponent.pieces[opp_two_leap_code].pawn_two_leap_on_prev_turn = True
-
-        # update check status
-        white_check, black_check = latest_turn.prev_players_check[0], latest_turn.prev_players_check[1]
-        self.p1.in_check = white_check if self.p1.color == WHITE else black_check
-        self.p2.in_check = white_check if self.p2.color == WHITE else black_check
-
-        # revert turn color
-        self.turn = latest_turn.turn_color
+        captured_id = stack.top(CAPTURED)
+        if captured_id != NO_PIECE:
+            board.add_or_replace_piece(from_square(stack.top(CAPTURED_SQUARE)), self.pieces_by_id[captured_id])
 
-        # revert winner status
-        self.winner = None
+        self.restore_turn_start(flags)
 
 
     def unmake_castle(self):
         '''
         Undos a castle and reverts game state to start of turn before that move.
         '''
-
-        latest_turn = self.turn_log[-1]
+        stack = self.undo_stack
+        flags = stack.top(FLAGS)
         board = self.board
-        castle_side = latest_turn.castle_side
-        player = convert_color_to_player(self, latest_turn.turn_color) # get player on this turn
-        turn_color = latest_turn.turn_color
-        king_code, rook_code = latest_turn.castle_king_code, latest_turn.castle_rook_code
-        assert(king_code in player.pieces and rook_code in player.pieces) # as castling last turn requires these still exist
-        king = player.pieces[king_code]
-        rook = player.pieces[rook_code]
-        y = 8 if turn_color == BLACK else 1
-        rx = 8 if castle_side == KING else 1 # rook_x_pos
+        king = self.pieces_by_id[stack.top(PIECE)]
+        rook = self.pieces_by_id[stack.top(CAPTURED)]
         # move king, rook back into their original positions
-        board.move_piece([5, y], king)
-        board.move_piece([rx, y], rook)
+        board.move_piece(from_square(stack.top(FROM)), king)
+        board.move_piece(from_square(stack.top(CAPTURED_SQUARE)), rook)
         
         # revert moved status
         king.moved = False
         rook.moved = False
 
-        # revert 2 leap statuses
-        opponent = get_opponent(self, player)
-        if len(self.turn_log) >= 2:
-            second_latest_turn = self.turn_log[-2]
-            opp_two_leap_code = second_latest_turn.code_of_piece_that_two_leaped # opponent two leaper on turn before latest turn
-            if opp_two_leap_code != None:
-                opponent.pieces[opp_two_leap_code].pawn_two_leap_on_prev_turn = True
+        self.restore_turn_start(flags)
 
-        # update check status
-        white_check, black_check = latest_turn.prev_players_check[0], latest_turn.prev_players_check[1]
+
+    def restore_turn_start(self, flags: int):
+        '''
+        Helper for unmaking the latest move, with undo stack flags of that move.
+        Reverts check statuses, position state and winner to the start of that move.
+        '''
+        white_check, black_check = bool(flags & WHITE_CHECK_FLAG), bool(flags & BLACK_CHECK_FLAG)
         self.p1.in_check = white_check if self.p1.color == WHITE else black_check
         self.p2.in_check = white_check if self.p2.color == WHITE else black_check
 
-        # revert turn color
-        self.turn = latest_turn.turn_color
+        # revert turn color, castling rights, en passant square and clocks
+        stack = self.undo_stack
+        self.state.unmake(BLACK if flags & BLACK_TURN_FLAG else WHITE, stack.top(PREV_CASTLING),
+                          stack.top(PREV_EP_SQUARE), stack.top(PREV_HALFMOVE_CLOCK))
 
         # revert winner status
         self.winner = None
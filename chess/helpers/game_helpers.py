@@ -1,6 +1,7 @@
 import os
 from misc.constants import *
 from .general_helpers import algebraic_uniconverter
+from movement_zone import get_movement_zone
 
 '''Helper functions specialized for game logic. The variable game refers to Game type.'''
 
@@ -35,4 +36,17 @@ def get_opponent(game, player):
     opponent = game.p1 if game.p1.color != player.color else game.p2
     return opponent
 
-    
\ No newline at end of file
+def has_legal_move(player) -> bool:
+    '''
+    Returns whether player has any legal move, stopping at the first one found
+    instead of generating them all.
+    '''
+    game = player.game
+    for piece in list(player.pieces.values()): # one piece's moves at a time
+        pos = piece.pos
+        for dest in get_movement_zone(board=player.board, piece=piece):
+            if player.attempt_action([pos, list(dest)], move_pseudolegal_assumption=True):
+                game.unmake_turn()
+                return True
+    opponent = get_opponent(game, player)
+    return player.castle_legal(KING, opponent) or player.castle_legal(QUEEN, opponent)
@@ -206,3 +206,15 @@ def rotate_coordinates(coord):
 
     
 
+
+def move_to_notation(move, color) -> str:
+    '''
+    Converts a move of player with color into lowercase coordinate notation,
+    eg [[5, 2], [5, 4]] -> 'e2e4'. Castles are written as the KING's move, 
+    eg 'KING' -> 'e1g1' for WHITE.
+    '''
+    if type(move) == str:
+        assert(move in KQSET)
+        row = 1 if color == WHITE else 8
+        move = [[5, row], [7 if move == KING else 3, row]]
+    return (algebraic_uniconverter(move[0]) + algebraic_uniconverter(move[1])).lower()
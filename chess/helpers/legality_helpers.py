@@ -1,5 +1,6 @@
 from misc.constants import *
 from .general_helpers import ordinal_direction
+from undo_stack import to_square
 
 '''
 Helper functions for move legality and error message handling flow.
@@ -230,7 +231,7 @@ def non_bool_en_passant_legal(piece, dest, player) -> tuple[bool, str]:
         return (False, 'You can only move '+str(player.board.get_piece(pos=pos).rank)
                 +' diagonally via capture or en passant!')
     else: # looked_at_piece is pawn and opponent color. 1) is cleared.
-        if not looked_at_piece.pawn_two_leap_on_prev_turn:
+        if player.game.state.ep_square != to_square(dest):
             return (False, 'Cannot en passant here as opposing PAWN did not move two '
                     +'tiles forward on the previous turn!')
         else:
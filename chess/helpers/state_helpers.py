@@ -85,33 +85,6 @@ def player_in_check(player, opponent) -> bool:
     return False # Player KING is out of check
 
 
-def update_player_pawns_leap_status(player, moved_piece=None, prev_pos=None, cur_pos=None, castled=False):
-    '''
-    Function that goes through the player's pieces, and updates the
-    pieces' pawn_two_leap_on_prev_turn param, both activating and deactivating.
-    Should be used after make_move() or castle() type methods.
-    player: Player
-    moved_piece: Piece that was moved from make_move(). Must not be None if player hasn't castled.
-    prev_pos: previous position of moved_piece. Must not be None if player hasn't castled.
-    cur_pos: current position of moved_piece. Must not be None if player hasn't castled.
-    castled: Whether player's move was castle or a traditional move.
-    '''
-    # FIXME Inefficient?
-        
-    for piece in player.pieces.values():
-        # global reset first
-        piece.pawn_two_leap_on_prev_turn = False
-
-    if not castled: # ie traditional move used
-        assert(moved_piece != None)
-        assert(prev_pos != None)
-        assert(cur_pos != None)
-        # find a two leaped pawn if it exists, set its param to True.
-        if (moved_piece.rank == 'PAWN' and abs(prev_pos[1] - cur_pos[1]) == 2
-            and prev_pos[0] == cur_pos[0]):
-            player.pieces[moved_piece.name].pawn_two_leap_on_prev_turn = True
-
-
 def undo_pawn_promotion(piece):
     '''
     Method takes promoted piece, and reverts it back to pawn status.
@@ -174,5 +147,11 @@ def is_endgame(game) -> bool:
     return True # condition 2 holds for endgame
 
 
-
-    
\ No newline at end of file
+def get_castling_rights(player) -> list:
+    '''
+    Returns [KING side, QUEEN side] castling rights of player, ie whether
+    its KING and that side's ROOK are both still unmoved on their starting tiles.
+    This does not consider whether castling is currently legal.
+    '''
+    state = player.game.state
+    return [state.has_castling_right(player.color, KING), state.has_castling_right(player.color, QUEEN)]
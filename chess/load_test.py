@@ -0,0 +1,191 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+from game import Game
+from server import GameServer, DEFAULT_PORT
+
+'''
+Load test client for server.py. Plays many simultaneous pvp games, two
+connections each, from scripted move lists, and measures moves/sec and the
+latency of every move (sending it to receiving its update).
+'''
+
+
+def make_scripts(count: int, plies: int, seed=0) -> list:
+    '''
+    count random legal games of up to plies plies (shorter if one ends),
+    as lists of UCI moves.
+    '''
+    rng = random.Random(seed)
+    scripts = []
+    for _ in range(count):
+        game = Game()
+        script = []
+        while len(script) < plies and game.winner == None:
+            move = rng.choice(game.legal_moves())
+            script.append(game.move_text(move))
+            game.play([move])
+        scripts.append(script)
+    return scripts
+
+
+def percentile(values: list, q: float) -> float:
+    '''
+    Nearest rank q-th percentile (0 <= q <= 100) of values, 0 if empty.
+    '''
+    if len(values) == 0:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, max(0, int(round(q / 100 * len(values) + 0.5)) - 1))]
+
+
+class Client:
+    '''
+    One connection to the server.
+    '''
+    def __init__(self, reader, writer):
+        self.reader, self.writer = reader, writer
+
+    @classmethod
+    async def connect(cls, host: str, port: int):
+        reader, writer = await asyncio.open_connection(host, port)
+        return cls(reader, writer)
+
+    async def send(self, message: dict):
+        self.writer.write((json.dumps(message)+'\n').encode())
+        await self.writer.drain()
+
+    async def receive(self) -> dict:
+        line = await self.reader.readline()
+        if line == b'':
+            raise Exception('Connection closed by server')
+        message = json.loads(line)
+        if message['type'] == 'error':
+            raise Exception(message['message'])
+        return message
+
+    async def close(self):
+        self.writer.close()
+        try:
+            await self.writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+async def play_pair(host: str, port: int, script: list, latencies: list, reconnect: bool, connect_limit) -> int:
+    '''
+    Plays script as both sides of a new pvp game, appending the latency of
+    every move to latencies. If reconnect, BLACK drops its connection halfway
+    through and resumes its seat from a new one.
+    Returns: number of moves played.
+    '''
+    async with connect_limit:
+        white = await Client.connect(host, port)
+        black = await Client.connect(host, port)
+    clients = [white, black]
+    try:
+        await white.send({'type': 'new', 'mode': 'pvp', 'color': 'WHITE'})
+        joined = await white.receive()
+        await black.send({'type': 'join', 'game': joined['game']})
+        token = (await black.receive())['token']
+        for ply, move in enumerate(script):
+            if reconnect and ply == len(script) // 2:
+                await black.close()
+                async with connect_limit:
+                    black = clients[1] = await Client.connect(host, port)
+                await black.send({'type': 'resume', 'token': token})
+                resumed = await black.receive()
+                assert(resumed['moves'] == script[:ply])
+            mover, other = (white, black) if ply % 2 == 0 else (black, white)
+            start = time.perf_counter()
+            await mover.send({'type': 'move', 'move': move})
+            update = await mover.receive()
+            latencies.append(time.perf_counter() - start)
+            assert(update['move'] == move)
+            await other.receive()
+        return len(script)
+    finally:
+        for client in clients:
+            await client.close()
+
+
+def raise_file_limit():
+    '''
+    Raises the soft open file limit to the hard one, since every game holds
+    two sockets (four with an in-process server).
+    '''
+    try:
+        import resource
+    except ImportError:
+        return # not on Unix
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft != hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def run_load_test(games=1000, plies=40, host='127.0.0.1', port=DEFAULT_PORT, local=False,
+                        reconnect_rate=0.0, scripts=16, connect_concurrency=256, seed=0, verbose=True) -> dict:
+    '''
+    Plays games simultaneous pvp games against the server at host:port, or
+    against a GameServer started in this process if local.
+    reconnect_rate: Fraction of games whose BLACK client reconnects mid game.
+    scripts: Number of distinct move lists the games cycle through.
+    connect_concurrency: Maximum connections being opened at once.
+    Returns: dict of games, moves, errors, seconds, moves_per_sec and latency
+    percentiles in ms.
+    '''
+    raise_file_limit()
+    move_lists = make_scripts(scripts, plies, seed)
+    server = None
+    if local:
+        server = GameServer()
+        await server.start(host, 0)
+        port = server.port
+    rng = random.Random(seed)
+    latencies = []
+    connect_limit = asyncio.Semaphore(connect_concurrency)
+    start = time.perf_counter()
+    try:
+        results = await asyncio.gather(*[play_pair(host, port, move_lists[index % len(move_lists)], latencies,
+                                                   rng.random() < reconnect_rate, connect_limit)
+                                          for index in range(games)], return_exceptions=True)
+    finally:
+        if server != None:
+            await server.close()
+    seconds = time.perf_counter() - start
+    errors = [result for result in results if isinstance(result, BaseException)]
+    moves = sum(result for result in results if not isinstance(result, BaseException))
+    report = {'games': games, 'moves': moves, 'errors': len(errors), 'seconds': seconds,
+              'moves_per_sec': moves / seconds if seconds > 0 else 0.0}
+    for q in [50, 90, 99, 100]:
+        report['p'+str(q)+'_ms'] = percentile(latencies, q) * 1000
+    if verbose:
+        print(format_report(report))
+        if len(errors) > 0:
+            print('first error: '+repr(errors[0]))
+    return report
+
+
+def format_report(report: dict) -> str:
+    return ('games '+str(report['games'])+', moves '+str(report['moves'])+', errors '+str(report['errors'])
+            +', '+str(round(report['seconds'], 2))+' s, '+str(round(report['moves_per_sec'], 1))+' moves/s\n'
+            +'latency ms: p50 '+str(round(report['p50_ms'], 2))+', p90 '+str(round(report['p90_ms'], 2))
+            +', p99 '+str(round(report['p99_ms'], 2))+', max '+str(round(report['p100_ms'], 2)))
+
+
+if __name__ == "__main__":
+    # usage: python load_test.py --games 2000 --plies 40 [--local | --host 127.0.0.1 --port 8765] [--reconnect 0.1]
+    parser = argparse.ArgumentParser(description='Load test of the multiplayer chess server.')
+    parser.add_argument('--games', type=int, default=1000, help='simultaneous games')
+    parser.add_argument('--plies', type=int, default=40, help='moves per game')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--local', action='store_true', help='run the server in this process')
+    parser.add_argument('--reconnect', type=float, default=0.0, help='fraction of games that reconnect mid game')
+    parser.add_argument('--connect-concurrency', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(run_load_test(args.games, args.plies, args.host, args.port, args.local, args.reconnect,
+                              connect_concurrency=args.connect_concurrency, seed=args.seed))
@@ -1,7 +1,18 @@
+import argparse
 from game import Game
-from tests import set_up_debug
+from debug import set_up_debug
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Terminal chess.')
+    parser.add_argument('--book', help='Polyglot .bin opening book for the B (best move) command')
+    parser.add_argument('--tablebases', help='directory of endgame tablebases generated by tablebase.py')
+    parser.add_argument('--clock', help="time control, eg '5+3' (minutes + increment) or '5d3' (3 second delay)")
+    parser.add_argument('--uci', action='store_true', help='speak UCI over stdin/stdout instead, see uci.py')
+    args = parser.parse_args()
+    if args.uci:
+        import uci
+        uci.main()
+        raise SystemExit(0)
     debug=None
     '''
     white_pieces = ['R-A1', 'N-B1', 'B-C1', 'Q-E1', 'K-D1', 'B-F1', 'N-G1', 'R-H1']
@@ -9,5 +20,12 @@ if __name__ == "__main__":
     debug = set_up_debug(white_pieces=white_pieces, black_pieces=black_pieces)
     '''
     my_game = Game(debug)
+    if args.book != None:
+        my_game.load_book(args.book)
+    if args.tablebases != None:
+        my_game.load_tablebases(args.tablebases)
+    if args.clock != None:
+        from clock import ChessClock, TimeControl
+        my_game.clock = ChessClock(TimeControl.parse(args.clock))
     my_game.start()
     
\ No newline at end of file
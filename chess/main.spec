@@ -1,4 +1,8 @@
 # -*- mode: python ; coding: utf-8 -*-
+import sys
+sys.path.insert(0, SPECPATH)
+from build_tables import write_tables
+write_tables() # precomputed board tables, see build_tables.py
 
 
 a = Analysis(
@@ -10,7 +14,7 @@ a = Analysis(
     hookspath=[],
     hooksconfig={},
     runtime_hooks=[],
-    excludes=[],
+    excludes=['unittest', 'doctest', 'pdb', 'pydoc', 'tkinter', 'test', 'lib2to3'], # tests and dev tools only
     noarchive=False,
     optimize=0,
 )
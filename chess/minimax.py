@@ -3,12 +3,53 @@ from helpers.general_helpers import swap_colors, get_tuple, rotate_coordinates,
 from helpers.state_helpers import is_endgame
 from misc.constants import *
 from misc.tables import *
+from pawns import pawn_score
 import random
+import time
 
 count = 0
 
+
+class SearchCancelled(Exception):
+    '''
+    Raised from inside minimax once a stop was requested on its SearchContext.
+    Game state is left mid-search; the caller is responsible for unmaking
+    back to the ply the search started from.
+    '''
+
+
+class SearchContext:
+    '''
+    Shared bookkeeping for a single search, threaded through minimax.
+    Counts visited nodes and the time spent in the evaluation, and carries
+    the stop flag used to cancel a search running on a worker thread, an
+    optional node budget, and optional time limits as time.monotonic()
+    deadlines (see clock.TimeManager).
+    '''
+    def __init__(self, stop_event=None, node_limit=None, deadline=None, soft_deadline=None):
+        self.nodes = 0 # minimax nodes entered so far
+        self.eval_time = 0.0 # seconds spent in value() so far
+        self.stop_event = stop_event # threading.Event or None, set to cancel search
+        self.node_limit = node_limit # nodes after which the search is cancelled, or None
+        self.deadline = deadline # time at which the search is cancelled, or None
+        self.soft_deadline = soft_deadline # time after which no new depth is started, or None
+
+    def visit(self):
+        '''
+        Called on entry of every minimax node. Counts the node, and raises 
+        SearchCancelled if a stop was requested or the node budget is spent.
+        '''
+        self.nodes += 1
+        if self.stop_event != None and self.stop_event.is_set():
+            raise SearchCancelled()
+        if self.node_limit != None and self.nodes > self.node_limit:
+            raise SearchCancelled()
+        if self.deadline != None and time.monotonic() >= self.deadline:
+            raise SearchCancelled()
+
+
 def minimax(cur_game, cur_player, depth, is_maximizing_player, alpha=-MAX, beta=MAX, 
-            alpha_beta_mode=True, shuffle=False, first_call=True):
+            alpha_beta_mode=True, shuffle=False, first_call=True, ctx=None, pv=None):
     '''
     Minimax algorithm.
     cur_game: a Game with state of current game.
@@ -22,9 +63,21 @@ def minimax(cur_game, cur_player, depth, is_maximizing_player, alpha=-MAX, beta=
     shuffle: Randomize order of all_legal_moves or not.
     first_call: Whether minimax was first called from non-minimax 
     (for progress bar).
+    ctx: Optional SearchContext, for node counting and cancellation.
+    pv: Optional list, filled in with the principal variation from this node.
 
     Returns: minimax value given cur_game state for cur_player.
     '''
+    if ctx != None:
+        ctx.visit()
+    state = cur_game.state
+    if not first_call and state.halfmove_clock >= 4 and state.repetitions() > 0:
+        return float(0), None # repetition, cur_player can claim the draw by repeating again
+    tablebase = cur_game.tablebase
+    if tablebase != None and not first_call:
+        tablebase_score = tablebase.probe_score(cur_game, cur_player)
+        if tablebase_score != None:
+            return tablebase_score, None # exact score, no need to search
     cur_opponent = get_opponent(cur_game, cur_player)
     all_legal_moves = cur_player.get_all_legal_moves()
     mvv_lva_sorted_moves = mvv_lva_order_moves(cur_game, cur_player, all_legal_moves)
@@ -32,6 +85,8 @@ def minimax(cur_game, cur_player, depth, is_maximizing_player, alpha=-MAX, beta=
     n = len(all_legal_moves)
     terminal_game = (n == 0) # whether cur_player has any other outs, 
                             # ie on if its stalemate or checkmate.
+    if not terminal_game and state.halfmove_clock >= 100:
+        return float(0), None # fifty move rule draw
     if depth == 0 or terminal_game:
         if terminal_game: # ie cur_player can't move
             if cur_player.in_check: # checkmate
@@ -39,6 +94,11 @@ def minimax(cur_game, cur_player, depth, is_maximizing_player, alpha=-MAX, beta=
                 return penalty_offset * MAX, None # MAX penalty on cur_player for getting checkmated.
             else: # stalemate
                 return float(0), None
+        elif ctx != None:
+            start = time.perf_counter()
+            score = value(cur_game, cur_player, is_maximizing_player)
+            ctx.eval_time += time.perf_counter() - start
+            return score, None
         else:
             return value(cur_game, cur_player, is_maximizing_player), None
         
@@ -46,16 +106,22 @@ def minimax(cur_game, cur_player, depth, is_maximizing_player, alpha=-MAX, beta=
     best_score = -MAX if is_maximizing_player else MAX # the best guarenteeable score for cur_player
     best_move = None
     i = 0
+    child_pv = None if pv == None else []
     for move in mvv_lva_sorted_moves:
         success_status = cur_player.attempt_action(move, True)
         assert(success_status)
+        if child_pv != None:
+            child_pv.clear()
         move_score, opponent_move = minimax(cur_game, cur_opponent, depth-1, 
                                             not is_maximizing_player,
                                             alpha, beta, alpha_beta_mode, 
-                                            shuffle, first_call=False)
+                                            shuffle, first_call=False,
+                                            ctx=ctx, pv=child_pv)
         if player_polarity * move_score > player_polarity * best_score:
             best_score = move_score
             best_move = move
+            if pv != None:
+                pv[:] = [move] + child_pv
 
         cur_game.unmake_turn()
 
@@ -83,23 +149,37 @@ def value(cur_game, cur_player, is_maximizing_player, fuzz=0) -> float:
     Value function for given cur_player and cur_game, based on the
     cur_player's remaining pieces, opponent's remaining pieces, 
     and cur_player's piece positions (and maybe opponent's piece
-    positions).
+    positions), plus the pawn structure, see pawns.py.
+    The static score is cached in cur_game.eval_cache, see eval_cache.py.
     fuzz: Variance parameter on amount of randomness added to value.
     Returns: Value
     '''
-    game_value = 0 # game_value is absolute, ie want >>0 for maximizing player, want << 0 for min player
     offset = 1 if is_maximizing_player else -1 # multiplicative offset for max/min player
-    is_end = is_endgame(cur_game)
-    opponent = convert_color_to_player(cur_game, color=swap_colors(cur_player.color))
-    player_score = get_player_score(cur_player, is_end)
-    opponent_score = get_player_score(opponent, is_end)
-    game_value = offset * (player_score - opponent_score)
+    if cur_player.color == BLACK:
+        offset = -offset # static scores are WHITE's
+    cache = cur_game.eval_cache
+    key = cur_game.state.key
+    static_score = cache.get(key)
+    if static_score == None:
+        static_score = get_static_score(cur_game)
+        cache.store(key, static_score)
+    game_value = offset * static_score # game_value is absolute, ie want >>0 for maximizing player, want << 0 for min player
     random.seed(42)
     randomness = 0 if fuzz == 0 else random.uniform(-fuzz, fuzz)
 
     return game_value + randomness
 
 
+def get_static_score(game) -> float:
+    '''
+    Uncached static score of game, >0 is good for WHITE: material and piece
+    square tables of both sides, plus the pawn structure.
+    '''
+    is_end = is_endgame(game)
+    white, black = (game.p1, game.p2) if game.p1.color == WHITE else (game.p2, game.p1)
+    return get_player_score(white, is_end) - get_player_score(black, is_end) + pawn_score(game, is_end)
+
+
 def get_player_score(player, is_endgame) -> float:
     '''
     Get pure material value of this player's pieces,
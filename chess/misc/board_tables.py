@@ -0,0 +1,607 @@
+'''Generated by build_tables.py, do not edit.'''
+
+# squares a KING moves to from each square
+KING_MOVES = [[9, 1, 8], [10, 8, 2, 0, 9], [11, 9, 3, 1, 10], [12, 10, 4, 2, 11], [13, 11, 5, 3, 12], [14, 12, 6, 4, 13],
+ [15, 13, 7, 5, 14], [14, 6, 15], [17, 1, 9, 16, 0], [18, 2, 16, 0, 10, 8, 17, 1], [19, 3, 17, 1, 11, 9, 18, 2],
+ [20, 4, 18, 2, 12, 10, 19, 3], [21, 5, 19, 3, 13, 11, 20, 4], [22, 6, 20, 4, 14, 12, 21, 5],
+ [23, 7, 21, 5, 15, 13, 22, 6], [22, 6, 14, 23, 7], [25, 9, 17, 24, 8], [26, 10, 24, 8, 18, 16, 25, 9],
+ [27, 11, 25, 9, 19, 17, 26, 10], [28, 12, 26, 10, 20, 18, 27, 11], [29, 13, 27, 11, 21, 19, 28, 12],
+ [30, 14, 28, 12, 22, 20, 29, 13], [31, 15, 29, 13, 23, 21, 30, 14], [30, 14, 22, 31, 15], [33, 17, 25, 32, 16],
+ [34, 18, 32, 16, 26, 24, 33, 17], [35, 19, 33, 17, 27, 25, 34, 18], [36, 20, 34, 18, 28, 26, 35, 19],
+ [37, 21, 35, 19, 29, 27, 36, 20], [38, 22, 36, 20, 30, 28, 37, 21], [39, 23, 37, 21, 31, 29, 38, 22],
+ [38, 22, 30, 39, 23], [41, 25, 33, 40, 24], [42, 26, 40, 24, 34, 32, 41, 25], [43, 27, 41, 25, 35, 33, 42, 26],
+ [44, 28, 42, 26, 36, 34, 43, 27], [45, 29, 43, 27, 37, 35, 44, 28], [46, 30, 44, 28, 38, 36, 45, 29],
+ [47, 31, 45, 29, 39, 37, 46, 30], [46, 30, 38, 47, 31], [49, 33, 41, 48, 32], [50, 34, 48, 32, 42, 40, 49, 33],
+ [51, 35, 49, 33, 43, 41, 50, 34], [52, 36, 50, 34, 44, 42, 51, 35], [53, 37, 51, 35, 45, 43, 52, 36],
+ [54, 38, 52, 36, 46, 44, 53, 37], [55, 39, 53, 37, 47, 45, 54, 38], [54, 38, 46, 55, 39], [57, 41, 49, 56, 40],
+ [58, 42, 56, 40, 50, 48, 57, 41], [59, 43, 57, 41, 51, 49, 58, 42], [60, 44, 58, 42, 52, 50, 59, 43],
+ [61, 45, 59, 43, 53, 51, 60, 44], [62, 46, 60, 44, 54, 52, 61, 45], [63, 47, 61, 45, 55, 53, 62, 46],
+ [62, 46, 54, 63, 47], [49, 57, 48], [50, 48, 58, 56, 49], [51, 49, 59, 57, 50], [52, 50, 60, 58, 51],
+ [53, 51, 61, 59, 52], [54, 52, 62, 60, 53], [55, 53, 63, 61, 54], [54, 62, 55]]
+
+# squares a KNIGHT moves to from each square
+KNIGHT_MOVES = [[17, 10], [18, 11, 16], [19, 12, 17, 8], [20, 13, 18, 9], [21, 14, 19, 10], [22, 15, 20, 11], [23, 21, 12], [22, 13],
+ [25, 18, 2], [26, 19, 24, 3], [27, 20, 25, 4, 16, 0], [28, 21, 26, 5, 17, 1], [29, 22, 27, 6, 18, 2],
+ [30, 23, 28, 7, 19, 3], [31, 29, 20, 4], [30, 21, 5], [33, 26, 10, 1], [34, 27, 32, 11, 2, 0],
+ [35, 28, 33, 12, 3, 24, 1, 8], [36, 29, 34, 13, 4, 25, 2, 9], [37, 30, 35, 14, 5, 26, 3, 10],
+ [38, 31, 36, 15, 6, 27, 4, 11], [39, 37, 7, 28, 5, 12], [38, 29, 6, 13], [41, 34, 18, 9], [42, 35, 40, 19, 10, 8],
+ [43, 36, 41, 20, 11, 32, 9, 16], [44, 37, 42, 21, 12, 33, 10, 17], [45, 38, 43, 22, 13, 34, 11, 18],
+ [46, 39, 44, 23, 14, 35, 12, 19], [47, 45, 15, 36, 13, 20], [46, 37, 14, 21], [49, 42, 26, 17],
+ [50, 43, 48, 27, 18, 16], [51, 44, 49, 28, 19, 40, 17, 24], [52, 45, 50, 29, 20, 41, 18, 25],
+ [53, 46, 51, 30, 21, 42, 19, 26], [54, 47, 52, 31, 22, 43, 20, 27], [55, 53, 23, 44, 21, 28], [54, 45, 22, 29],
+ [57, 50, 34, 25], [58, 51, 56, 35, 26, 24], [59, 52, 57, 36, 27, 48, 25, 32], [60, 53, 58, 37, 28, 49, 26, 33],
+ [61, 54, 59, 38, 29, 50, 27, 34], [62, 55, 60, 39, 30, 51, 28, 35], [63, 61, 31, 52, 29, 36], [62, 53, 30, 37],
+ [58, 42, 33], [59, 43, 34, 32], [60, 44, 35, 56, 33, 40], [61, 45, 36, 57, 34, 41], [62, 46, 37, 58, 35, 42],
+ [63, 47, 38, 59, 36, 43], [39, 60, 37, 44], [61, 38, 45], [50, 41], [51, 42, 40], [52, 43, 41, 48], [53, 44, 42, 49],
+ [54, 45, 43, 50], [55, 46, 44, 51], [47, 45, 52], [46, 53]]
+
+# KING_MOVES as bitmasks
+KING_MASK = [770, 1797, 3594, 7188, 14376, 28752, 57504, 49216, 197123, 460039, 920078, 1840156, 3680312, 7360624, 14721248,
+ 12599488, 50463488, 117769984, 235539968, 471079936, 942159872, 1884319744, 3768639488, 3225468928, 12918652928,
+ 30149115904, 60298231808, 120596463616, 241192927232, 482385854464, 964771708928, 825720045568, 3307175149568,
+ 7718173671424, 15436347342848, 30872694685696, 61745389371392, 123490778742784, 246981557485568, 211384331665408,
+ 846636838289408, 1975852459884544, 3951704919769088, 7903409839538176, 15806819679076352, 31613639358152704,
+ 63227278716305408, 54114388906344448, 216739030602088448, 505818229730443264, 1011636459460886528, 2023272918921773056,
+ 4046545837843546112, 8093091675687092224, 16186183351374184448, 13853283560024178688, 144959613005987840,
+ 362258295026614272, 724516590053228544, 1449033180106457088, 2898066360212914176, 5796132720425828352,
+ 11592265440851656704, 4665729213955833856]
+
+# KNIGHT_MOVES as bitmasks
+KNIGHT_MASK = [132096, 329728, 659712, 1319424, 2638848, 5277696, 10489856, 4202496, 33816580, 84410376, 168886289, 337772578,
+ 675545156, 1351090312, 2685403152, 1075839008, 8657044482, 21609056261, 43234889994, 86469779988, 172939559976,
+ 345879119952, 687463207072, 275414786112, 2216203387392, 5531918402816, 11068131838464, 22136263676928, 44272527353856,
+ 88545054707712, 175990581010432, 70506185244672, 567348067172352, 1416171111120896, 2833441750646784, 5666883501293568,
+ 11333767002587136, 22667534005174272, 45053588738670592, 18049583422636032, 145241105196122112, 362539804446949376,
+ 725361088165576704, 1450722176331153408, 2901444352662306816, 5802888705324613632, 11533718717099671552,
+ 4620693356194824192, 288234782788157440, 576469569871282176, 1224997833292120064, 2449995666584240128,
+ 4899991333168480256, 9799982666336960512, 1152939783987658752, 2305878468463689728, 1128098930098176, 2257297371824128,
+ 4796069720358912, 9592139440717824, 19184278881435648, 38368557762871296, 4679521487814656, 9077567998918656]
+
+# bitmasks of the squares a WHITE PAWN attacks from each square
+PAWN_ATTACK_MASK = [512, 1280, 2560, 5120, 10240, 20480, 40960, 16384, 131072, 327680, 655360, 1310720, 2621440, 5242880, 10485760,
+ 4194304, 33554432, 83886080, 167772160, 335544320, 671088640, 1342177280, 2684354560, 1073741824, 8589934592,
+ 21474836480, 42949672960, 85899345920, 171798691840, 343597383680, 687194767360, 274877906944, 2199023255552,
+ 5497558138880, 10995116277760, 21990232555520, 43980465111040, 87960930222080, 175921860444160, 70368744177664,
+ 562949953421312, 1407374883553280, 2814749767106560, 5629499534213120, 11258999068426240, 22517998136852480,
+ 45035996273704960, 18014398509481984, 144115188075855872, 360287970189639680, 720575940379279360, 1441151880758558720,
+ 2882303761517117440, 5764607523034234880, 11529215046068469760, 4611686018427387904, 0, 0, 0, 0, 0, 0, 0, 0]
+
+# (sq, is_diagonal) -> list of rays, each a list of squares moving outwards
+RAYS = {(0, False): [[1, 2, 3, 4, 5, 6, 7], [], [8, 16, 24, 32, 40, 48, 56], []],
+ (0, True): [[9, 18, 27, 36, 45, 54, 63], [], [], []],
+ (1, False): [[2, 3, 4, 5, 6, 7], [0], [9, 17, 25, 33, 41, 49, 57], []],
+ (1, True): [[10, 19, 28, 37, 46, 55], [], [8], []],
+ (2, False): [[3, 4, 5, 6, 7], [1, 0], [10, 18, 26, 34, 42, 50, 58], []],
+ (2, True): [[11, 20, 29, 38, 47], [], [9, 16], []],
+ (3, False): [[4, 5, 6, 7], [2, 1, 0], [11, 19, 27, 35, 43, 51, 59], []],
+ (3, True): [[12, 21, 30, 39], [], [10, 17, 24], []],
+ (4, False): [[5, 6, 7], [3, 2, 1, 0], [12, 20, 28, 36, 44, 52, 60], []],
+ (4, True): [[13, 22, 31], [], [11, 18, 25, 32], []],
+ (5, False): [[6, 7], [4, 3, 2, 1, 0], [13, 21, 29, 37, 45, 53, 61], []],
+ (5, True): [[14, 23], [], [12, 19, 26, 33, 40], []],
+ (6, False): [[7], [5, 4, 3, 2, 1, 0], [14, 22, 30, 38, 46, 54, 62], []],
+ (6, True): [[15], [], [13, 20, 27, 34, 41, 48], []],
+ (7, False): [[], [6, 5, 4, 3, 2, 1, 0], [15, 23, 31, 39, 47, 55, 63], []],
+ (7, True): [[], [], [14, 21, 28, 35, 42, 49, 56], []],
+ (8, False): [[9, 10, 11, 12, 13, 14, 15], [], [16, 24, 32, 40, 48, 56], [0]],
+ (8, True): [[17, 26, 35, 44, 53, 62], [1], [], []],
+ (9, False): [[10, 11, 12, 13, 14, 15], [8], [17, 25, 33, 41, 49, 57], [1]],
+ (9, True): [[18, 27, 36, 45, 54, 63], [2], [16], [0]],
+ (10, False): [[11, 12, 13, 14, 15], [9, 8], [18, 26, 34, 42, 50, 58], [2]],
+ (10, True): [[19, 28, 37, 46, 55], [3], [17, 24], [1]],
+ (11, False): [[12, 13, 14, 15], [10, 9, 8], [19, 27, 35, 43, 51, 59], [3]],
+ (11, True): [[20, 29, 38, 47], [4], [18, 25, 32], [2]],
+ (12, False): [[13, 14, 15], [11, 10, 9, 8], [20, 28, 36, 44, 52, 60], [4]],
+ (12, True): [[21, 30, 39], [5], [19, 26, 33, 40], [3]],
+ (13, False): [[14, 15], [12, 11, 10, 9, 8], [21, 29, 37, 45, 53, 61], [5]],
+ (13, True): [[22, 31], [6], [20, 27, 34, 41, 48], [4]],
+ (14, False): [[15], [13, 12, 11, 10, 9, 8], [22, 30, 38, 46, 54, 62], [6]],
+ (14, True): [[23], [7], [21, 28, 35, 42, 49, 56], [5]],
+ (15, False): [[], [14, 13, 12, 11, 10, 9, 8], [23, 31, 39, 47, 55, 63], [7]],
+ (15, True): [[], [], [22, 29, 36, 43, 50, 57], [6]],
+ (16, False): [[17, 18, 19, 20, 21, 22, 23], [], [24, 32, 40, 48, 56], [8, 0]],
+ (16, True): [[25, 34, 43, 52, 61], [9, 2], [], []],
+ (17, False): [[18, 19, 20, 21, 22, 23], [16], [25, 33, 41, 49, 57], [9, 1]],
+ (17, True): [[26, 35, 44, 53, 62], [10, 3], [24], [8]],
+ (18, False): [[19, 20, 21, 22, 23], [17, 16], [26, 34, 42, 50, 58], [10, 2]],
+ (18, True): [[27, 36, 45, 54, 63], [11, 4], [25, 32], [9, 0]],
+ (19, False): [[20, 21, 22, 23], [18, 17, 16], [27, 35, 43, 51, 59], [11, 3]],
+ (19, True): [[28, 37, 46, 55], [12, 5], [26, 33, 40], [10, 1]],
+ (20, False): [[21, 22, 23], [19, 18, 17, 16], [28, 36, 44, 52, 60], [12, 4]],
+ (20, True): [[29, 38, 47], [13, 6], [27, 34, 41, 48], [11, 2]],
+ (21, False): [[22, 23], [20, 19, 18, 17, 16], [29, 37, 45, 53, 61], [13, 5]],
+ (21, True): [[30, 39], [14, 7], [28, 35, 42, 49, 56], [12, 3]],
+ (22, False): [[23], [21, 20, 19, 18, 17, 16], [30, 38, 46, 54, 62], [14, 6]],
+ (22, True): [[31], [15], [29, 36, 43, 50, 57], [13, 4]],
+ (23, False): [[], [22, 21, 20, 19, 18, 17, 16], [31, 39, 47, 55, 63], [15, 7]],
+ (23, True): [[], [], [30, 37, 44, 51, 58], [14, 5]],
+ (24, False): [[25, 26, 27, 28, 29, 30, 31], [], [32, 40, 48, 56], [16, 8, 0]],
+ (24, True): [[33, 42, 51, 60], [17, 10, 3], [], []],
+ (25, False): [[26, 27, 28, 29, 30, 31], [24], [33, 41, 49, 57], [17, 9, 1]],
+ (25, True): [[34, 43, 52, 61], [18, 11, 4], [32], [16]],
+ (26, False): [[27, 28, 29, 30, 31], [25, 24], [34, 42, 50, 58], [18, 10, 2]],
+ (26, True): [[35, 44, 53, 62], [19, 12, 5], [33, 40], [17, 8]],
+ (27, False): [[28, 29, 30, 31], [26, 25, 24], [35, 43, 51, 59], [19, 11, 3]],
+ (27, True): [[36, 45, 54, 63], [20, 13, 6], [34, 41, 48], [18, 9, 0]],
+ (28, False): [[29, 30, 31], [27, 26, 25, 24], [36, 44, 52, 60], [20, 12, 4]],
+ (28, True): [[37, 46, 55], [21, 14, 7], [35, 42, 49, 56], [19, 10, 1]],
+ (29, False): [[30, 31], [28, 27, 26, 25, 24], [37, 45, 53, 61], [21, 13, 5]],
+ (29, True): [[38, 47], [22, 15], [36, 43, 50, 57], [20, 11, 2]],
+ (30, False): [[31], [29, 28, 27, 26, 25, 24], [38, 46, 54, 62], [22, 14, 6]],
+ (30, True): [[39], [23], [37, 44, 51, 58], [21, 12, 3]],
+ (31, False): [[], [30, 29, 28, 27, 26, 25, 24], [39, 47, 55, 63], [23, 15, 7]],
+ (31, True): [[], [], [38, 45, 52, 59], [22, 13, 4]],
+ (32, False): [[33, 34, 35, 36, 37, 38, 39], [], [40, 48, 56], [24, 16, 8, 0]],
+ (32, True): [[41, 50, 59], [25, 18, 11, 4], [], []],
+ (33, False): [[34, 35, 36, 37, 38, 39], [32], [41, 49, 57], [25, 17, 9, 1]],
+ (33, True): [[42, 51, 60], [26, 19, 12, 5], [40], [24]],
+ (34, False): [[35, 36, 37, 38, 39], [33, 32], [42, 50, 58], [26, 18, 10, 2]],
+ (34, True): [[43, 52, 61], [27, 20, 13, 6], [41, 48], [25, 16]],
+ (35, False): [[36, 37, 38, 39], [34, 33, 32], [43, 51, 59], [27, 19, 11, 3]],
+ (35, True): [[44, 53, 62], [28, 21, 14, 7], [42, 49, 56], [26, 17, 8]],
+ (36, False): [[37, 38, 39], [35, 34, 33, 32], [44, 52, 60], [28, 20, 12, 4]],
+ (36, True): [[45, 54, 63], [29, 22, 15], [43, 50, 57], [27, 18, 9, 0]],
+ (37, False): [[38, 39], [36, 35, 34, 33, 32], [45, 53, 61], [29, 21, 13, 5]],
+ (37, True): [[46, 55], [30, 23], [44, 51, 58], [28, 19, 10, 1]],
+ (38, False): [[39], [37, 36, 35, 34, 33, 32], [46, 54, 62], [30, 22, 14, 6]],
+ (38, True): [[47], [31], [45, 52, 59], [29, 20, 11, 2]],
+ (39, False): [[], [38, 37, 36, 35, 34, 33, 32], [47, 55, 63], [31, 23, 15, 7]],
+ (39, True): [[], [], [46, 53, 60], [30, 21, 12, 3]],
+ (40, False): [[41, 42, 43, 44, 45, 46, 47], [], [48, 56], [32, 24, 16, 8, 0]],
+ (40, True): [[49, 58], [33, 26, 19, 12, 5], [], []],
+ (41, False): [[42, 43, 44, 45, 46, 47], [40], [49, 57], [33, 25, 17, 9, 1]],
+ (41, True): [[50, 59], [34, 27, 20, 13, 6], [48], [32]],
+ (42, False): [[43, 44, 45, 46, 47], [41, 40], [50, 58], [34, 26, 18, 10, 2]],
+ (42, True): [[51, 60], [35, 28, 21, 14, 7], [49, 56], [33, 24]],
+ (43, False): [[44, 45, 46, 47], [42, 41, 40], [51, 59], [35, 27, 19, 11, 3]],
+ (43, True): [[52, 61], [36, 29, 22, 15], [50, 57], [34, 25, 16]],
+ (44, False): [[45, 46, 47], [43, 42, 41, 40], [52, 60], [36, 28, 20, 12, 4]],
+ (44, True): [[53, 62], [37, 30, 23], [51, 58], [35, 26, 17, 8]],
+ (45, False): [[46, 47], [44, 43, 42, 41, 40], [53, 61], [37, 29, 21, 13, 5]],
+ (45, True): [[54, 63], [38, 31], [52, 59], [36, 27, 18, 9, 0]],
+ (46, False): [[47], [45, 44, 43, 42, 41, 40], [54, 62], [38, 30, 22, 14, 6]],
+ (46, True): [[55], [39], [53, 60], [37, 28, 19, 10, 1]],
+ (47, False): [[], [46, 45, 44, 43, 42, 41, 40], [55, 63], [39, 31, 23, 15, 7]],
+ (47, True): [[], [], [54, 61], [38, 29, 20, 11, 2]],
+ (48, False): [[49, 50, 51, 52, 53, 54, 55], [], [56], [40, 32, 24, 16, 8, 0]],
+ (48, True): [[57], [41, 34, 27, 20, 13, 6], [], []],
+ (49, False): [[50, 51, 52, 53, 54, 55], [48], [57], [41, 33, 25, 17, 9, 1]],
+ (49, True): [[58], [42, 35, 28, 21, 14, 7], [56], [40]],
+ (50, False): [[51, 52, 53, 54, 55], [49, 48], [58], [42, 34, 26, 18, 10, 2]],
+ (50, True): [[59], [43, 36, 29, 22, 15], [57], [41, 32]],
+ (51, False): [[52, 53, 54, 55], [50, 49, 48], [59], [43, 35, 27, 19, 11, 3]],
+ (51, True): [[60], [44, 37, 30, 23], [58], [42, 33, 24]],
+ (52, False): [[53, 54, 55], [51, 50, 49, 48], [60], [44, 36, 28, 20, 12, 4]],
+ (52, True): [[61], [45, 38, 31], [59], [43, 34, 25, 16]],
+ (53, False): [[54, 55], [52, 51, 50, 49, 48], [61], [45, 37, 29, 21, 13, 5]],
+ (53, True): [[62], [46, 39], [60], [44, 35, 26, 17, 8]],
+ (54, False): [[55], [53, 52, 51, 50, 49, 48], [62], [46, 38, 30, 22, 14, 6]],
+ (54, True): [[63], [47], [61], [45, 36, 27, 18, 9, 0]],
+ (55, False): [[], [54, 53, 52, 51, 50, 49, 48], [63], [47, 39, 31, 23, 15, 7]],
+ (55, True): [[], [], [62], [46, 37, 28, 19, 10, 1]],
+ (56, False): [[57, 58, 59, 60, 61, 62, 63], [], [], [48, 40, 32, 24, 16, 8, 0]],
+ (56, True): [[], [49, 42, 35, 28, 21, 14, 7], [], []],
+ (57, False): [[58, 59, 60, 61, 62, 63], [56], [], [49, 41, 33, 25, 17, 9, 1]],
+ (57, True): [[], [50, 43, 36, 29, 22, 15], [], [48]],
+ (58, False): [[59, 60, 61, 62, 63], [57, 56], [], [50, 42, 34, 26, 18, 10, 2]],
+ (58, True): [[], [51, 44, 37, 30, 23], [], [49, 40]],
+ (59, False): [[60, 61, 62, 63], [58, 57, 56], [], [51, 43, 35, 27, 19, 11, 3]],
+ (59, True): [[], [52, 45, 38, 31], [], [50, 41, 32]],
+ (60, False): [[61, 62, 63], [59, 58, 57, 56], [], [52, 44, 36, 28, 20, 12, 4]],
+ (60, True): [[], [53, 46, 39], [], [51, 42, 33, 24]],
+ (61, False): [[62, 63], [60, 59, 58, 57, 56], [], [53, 45, 37, 29, 21, 13, 5]],
+ (61, True): [[], [54, 47], [], [52, 43, 34, 25, 16]],
+ (62, False): [[63], [61, 60, 59, 58, 57, 56], [], [54, 46, 38, 30, 22, 14, 6]],
+ (62, True): [[], [55], [], [53, 44, 35, 26, 17, 8]],
+ (63, False): [[], [62, 61, 60, 59, 58, 57, 56], [], [55, 47, 39, 31, 23, 15, 7]],
+ (63, True): [[], [], [], [54, 45, 36, 27, 18, 9, 0]]}
+
+# 1 if orthogonally aligned, 2 if diagonally
+LINE = [[0, 1, 1, 1, 1, 1, 1, 1, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0,
+  0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2],
+ [1, 0, 1, 1, 1, 1, 1, 1, 2, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0,
+  0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0],
+ [1, 1, 0, 1, 1, 1, 1, 1, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2,
+  0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0],
+ [1, 1, 1, 0, 1, 1, 1, 1, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0,
+  2, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
+ [1, 1, 1, 1, 0, 1, 1, 1, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0, 2, 2, 0, 0, 0, 1, 0, 0,
+  0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0],
+ [1, 1, 1, 1, 1, 0, 1, 1, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0,
+  0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0],
+ [1, 1, 1, 1, 1, 1, 0, 1, 0, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1,
+  0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0],
+ [1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0,
+  1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 2, 0, 0, 0, 0, 0, 0, 1],
+ [1, 2, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0,
+  0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0],
+ [2, 1, 2, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 1, 1, 1, 2, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0,
+  0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2],
+ [0, 2, 1, 2, 0, 0, 0, 0, 1, 1, 0, 1, 1, 1, 1, 1, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0,
+  0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0],
+ [0, 0, 2, 1, 2, 0, 0, 0, 1, 1, 1, 0, 1, 1, 1, 1, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0, 2,
+  0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0],
+ [0, 0, 0, 2, 1, 2, 0, 0, 1, 1, 1, 1, 0, 1, 1, 1, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0,
+  2, 2, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0],
+ [0, 0, 0, 0, 2, 1, 2, 0, 1, 1, 1, 1, 1, 0, 1, 1, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0,
+  0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0],
+ [0, 0, 0, 0, 0, 2, 1, 2, 1, 1, 1, 1, 1, 1, 0, 1, 0, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1,
+  0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0],
+ [0, 0, 0, 0, 0, 0, 2, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0,
+  1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1],
+ [1, 0, 2, 0, 0, 0, 0, 0, 1, 2, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0,
+  0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0],
+ [0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 1, 1, 1, 2, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0,
+  0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0],
+ [2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 1, 1, 0, 1, 1, 1, 1, 1, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0,
+  0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2],
+ [0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 1, 1, 1, 0, 1, 1, 1, 1, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0,
+  0, 2, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0],
+ [0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 1, 1, 1, 1, 0, 1, 1, 1, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2,
+  0, 0, 2, 0, 0, 1, 0, 0, 2, 2, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0],
+ [0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 1, 1, 1, 1, 1, 0, 1, 1, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0,
+  2, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0],
+ [0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2, 1, 2, 1, 1, 1, 1, 1, 1, 0, 1, 0, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1,
+  0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0],
+ [0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 2, 0,
+  1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1],
+ [1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 2, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 2, 0, 0, 0, 0, 0,
+  0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0],
+ [0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 1, 1, 1, 2, 1, 2, 0, 0, 0, 0,
+  0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0],
+ [0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 1, 1, 0, 1, 1, 1, 1, 1, 0, 2, 1, 2, 0, 0, 0,
+  0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0],
+ [2, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 1, 1, 1, 0, 1, 1, 1, 1, 0, 0, 2, 1, 2, 0, 0,
+  0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2],
+ [0, 2, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 1, 1, 1, 1, 0, 1, 1, 1, 0, 0, 0, 2, 1, 2, 0,
+  0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0, 2, 2, 0, 0, 0, 1, 0, 0, 0],
+ [0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 1, 1, 1, 1, 1, 0, 1, 1, 0, 0, 0, 0, 2, 1, 2,
+  0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0],
+ [0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2, 1, 2, 1, 1, 1, 1, 1, 1, 0, 1, 0, 0, 0, 0, 0, 2, 1,
+  2, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0],
+ [0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 2,
+  1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1],
+ [1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 2, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1,
+  1, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0],
+ [0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 1, 1,
+  1, 2, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0],
+ [0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 1, 1, 0, 1, 1, 1, 1,
+  1, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0],
+ [0, 0, 0, 1, 0, 0, 0, 2, 2, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 1, 1, 1, 0, 1, 1, 1,
+  1, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0, 2, 0],
+ [2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 1, 1, 1, 1, 0, 1, 1,
+  1, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0, 2],
+ [0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 1, 1, 1, 1, 1, 0, 1,
+  1, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 2, 0, 0, 1, 0, 0],
+ [0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2, 1, 2, 1, 1, 1, 1, 1, 1, 0,
+  1, 0, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0],
+ [0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2, 1, 1, 1, 1, 1, 1, 1, 1,
+  0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1],
+ [1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 2, 0, 0, 0, 0, 0,
+  0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0],
+ [0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0,
+  0, 1, 0, 1, 1, 1, 1, 1, 1, 2, 1, 2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0],
+ [0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0,
+  0, 1, 1, 0, 1, 1, 1, 1, 1, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0],
+ [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 2, 2, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0,
+  0, 1, 1, 1, 0, 1, 1, 1, 1, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0],
+ [0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0,
+  0, 1, 1, 1, 1, 0, 1, 1, 1, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0],
+ [2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2,
+  0, 1, 1, 1, 1, 1, 0, 1, 1, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0, 2],
+ [0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2, 1,
+  2, 1, 1, 1, 1, 1, 1, 0, 1, 0, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 2, 0, 1, 0],
+ [0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2,
+  1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 2, 0, 1],
+ [1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0,
+  0, 1, 2, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1, 1, 2, 0, 0, 0, 0, 0, 0],
+ [0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0,
+  0, 2, 1, 2, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 1, 1, 1, 2, 1, 2, 0, 0, 0, 0, 0],
+ [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0, 0,
+  0, 0, 2, 1, 2, 0, 0, 0, 0, 1, 1, 0, 1, 1, 1, 1, 1, 0, 2, 1, 2, 0, 0, 0, 0],
+ [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 2, 2, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2, 0,
+  0, 0, 0, 2, 1, 2, 0, 0, 0, 1, 1, 1, 0, 1, 1, 1, 1, 0, 0, 2, 1, 2, 0, 0, 0],
+ [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 2, 0, 0, 2, 0, 1, 0, 2,
+  0, 0, 0, 0, 2, 1, 2, 0, 0, 1, 1, 1, 1, 0, 1, 1, 1, 0, 0, 0, 2, 1, 2, 0, 0],
+ [0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0,
+  2, 0, 0, 0, 0, 2, 1, 2, 0, 1, 1, 1, 1, 1, 0, 1, 1, 0, 0, 0, 0, 2, 1, 2, 0],
+ [2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1,
+  0, 0, 0, 0, 0, 0, 2, 1, 2, 1, 1, 1, 1, 1, 1, 0, 1, 0, 0, 0, 0, 0, 2, 1, 2],
+ [0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0,
+  1, 0, 0, 0, 0, 0, 0, 2, 1, 1, 1, 1, 1, 1, 1, 1, 0, 0, 0, 0, 0, 0, 0, 2, 1],
+ [1, 0, 0, 0, 0, 0, 0, 2, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0,
+  0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 2, 0, 0, 0, 0, 0, 0, 0, 1, 1, 1, 1, 1, 1, 1],
+ [0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0, 0,
+  0, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 0, 1, 0, 1, 1, 1, 1, 1, 1],
+ [0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 2, 0,
+  0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 0, 1, 1, 0, 1, 1, 1, 1, 1],
+ [0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 2, 2, 0, 0, 1, 0, 0, 2,
+  0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 0, 1, 1, 1, 0, 1, 1, 1, 1],
+ [0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0, 0,
+  2, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 0, 1, 1, 1, 1, 0, 1, 1, 1],
+ [0, 0, 0, 0, 0, 1, 0, 0, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1, 0,
+  0, 0, 0, 0, 2, 0, 1, 0, 2, 0, 0, 0, 0, 2, 1, 2, 0, 1, 1, 1, 1, 1, 0, 1, 1],
+ [0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0, 1,
+  0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2, 1, 2, 1, 1, 1, 1, 1, 1, 0, 1],
+ [2, 0, 0, 0, 0, 0, 0, 1, 0, 2, 0, 0, 0, 0, 0, 1, 0, 0, 2, 0, 0, 0, 0, 1, 0, 0, 0, 2, 0, 0, 0, 1, 0, 0, 0, 0, 2, 0, 0,
+  1, 0, 0, 0, 0, 0, 2, 0, 1, 0, 0, 0, 0, 0, 0, 2, 1, 1, 1, 1, 1, 1, 1, 1, 0]]
+
+# bitmask of squares strictly between two aligned squares
+BETWEEN = [[0, 0, 2, 6, 14, 30, 62, 126, 0, 0, 0, 0, 0, 0, 0, 0, 256, 0, 512, 0, 0, 0, 0, 0, 65792, 0, 0, 262656, 0, 0, 0, 0,
+  16843008, 0, 0, 0, 134480384, 0, 0, 0, 4311810304, 0, 0, 0, 0, 68853957120, 0, 0, 1103823438080, 0, 0, 0, 0, 0,
+  35253226045952, 0, 282578800148736, 0, 0, 0, 0, 0, 0, 18049651735527936],
+ [0, 0, 0, 4, 12, 28, 60, 124, 0, 0, 0, 0, 0, 0, 0, 0, 0, 512, 0, 1024, 0, 0, 0, 0, 0, 131584, 0, 0, 525312, 0, 0, 0, 0,
+  33686016, 0, 0, 0, 268960768, 0, 0, 0, 8623620608, 0, 0, 0, 0, 137707914240, 0, 0, 2207646876160, 0, 0, 0, 0, 0,
+  70506452091904, 0, 565157600297472, 0, 0, 0, 0, 0, 0],
+ [2, 0, 0, 0, 8, 24, 56, 120, 0, 0, 0, 0, 0, 0, 0, 0, 512, 0, 1024, 0, 2048, 0, 0, 0, 0, 0, 263168, 0, 0, 1050624, 0, 0,
+  0, 0, 67372032, 0, 0, 0, 537921536, 0, 0, 0, 17247241216, 0, 0, 0, 0, 275415828480, 0, 0, 4415293752320, 0, 0, 0, 0,
+  0, 0, 0, 1130315200594944, 0, 0, 0, 0, 0],
+ [6, 4, 0, 0, 0, 16, 48, 112, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1024, 0, 2048, 0, 4096, 0, 0, 132096, 0, 0, 526336, 0, 0,
+  2101248, 0, 0, 0, 0, 134744064, 0, 0, 0, 1075843072, 0, 0, 0, 34494482432, 0, 0, 0, 0, 0, 0, 0, 8830587504640, 0, 0,
+  0, 0, 0, 0, 0, 2260630401189888, 0, 0, 0, 0],
+ [14, 12, 8, 0, 0, 0, 32, 96, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2048, 0, 4096, 0, 8192, 0, 0, 264192, 0, 0, 1052672, 0, 0,
+  4202496, 33818624, 0, 0, 0, 269488128, 0, 0, 0, 0, 0, 0, 0, 68988964864, 0, 0, 0, 0, 0, 0, 0, 17661175009280, 0, 0, 0,
+  0, 0, 0, 0, 4521260802379776, 0, 0, 0],
+ [30, 28, 24, 16, 0, 0, 0, 64, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4096, 0, 8192, 0, 16384, 0, 0, 528384, 0, 0, 2105344, 0,
+  0, 0, 67637248, 0, 0, 0, 538976256, 0, 0, 8657571840, 0, 0, 0, 0, 137977929728, 0, 0, 0, 0, 0, 0, 0, 35322350018560,
+  0, 0, 0, 0, 0, 0, 0, 9042521604759552, 0, 0],
+ [62, 60, 56, 48, 32, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 8192, 0, 16384, 0, 0, 0, 0, 1056768, 0, 0, 4210688,
+  0, 0, 0, 135274496, 0, 0, 0, 1077952512, 0, 0, 17315143680, 0, 0, 0, 0, 275955859456, 0, 2216338399232, 0, 0, 0, 0, 0,
+  70644700037120, 0, 0, 0, 0, 0, 0, 0, 18085043209519104, 0],
+ [126, 124, 120, 112, 96, 64, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 16384, 0, 32768, 0, 0, 0, 0, 2113536, 0, 0,
+  8421376, 0, 0, 0, 270548992, 0, 0, 0, 2155905024, 0, 0, 34630287360, 0, 0, 0, 0, 551911718912, 0, 4432676798464, 0, 0,
+  0, 0, 0, 141289400074240, 567382630219776, 0, 0, 0, 0, 0, 0, 36170086419038208],
+ [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 512, 1536, 3584, 7680, 15872, 32256, 0, 0, 0, 0, 0, 0, 0, 0, 65536, 0, 131072, 0, 0, 0,
+  0, 0, 16842752, 0, 0, 67239936, 0, 0, 0, 0, 4311810048, 0, 0, 0, 34426978304, 0, 0, 0, 1103823437824, 0, 0, 0, 0,
+  17626613022720, 0, 0, 282578800148480, 0, 0, 0, 0, 0, 9024825867763712, 0],
+ [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1024, 3072, 7168, 15360, 31744, 0, 0, 0, 0, 0, 0, 0, 0, 0, 131072, 0, 262144, 0, 0,
+  0, 0, 0, 33685504, 0, 0, 134479872, 0, 0, 0, 0, 8623620096, 0, 0, 0, 68853956608, 0, 0, 0, 2207646875648, 0, 0, 0, 0,
+  35253226045440, 0, 0, 565157600296960, 0, 0, 0, 0, 0, 18049651735527424],
+ [0, 0, 0, 0, 0, 0, 0, 0, 512, 0, 0, 0, 2048, 6144, 14336, 30720, 0, 0, 0, 0, 0, 0, 0, 0, 131072, 0, 262144, 0, 524288,
+  0, 0, 0, 0, 0, 67371008, 0, 0, 268959744, 0, 0, 0, 0, 17247240192, 0, 0, 0, 137707913216, 0, 0, 0, 4415293751296, 0,
+  0, 0, 0, 70506452090880, 0, 0, 1130315200593920, 0, 0, 0, 0, 0],
+ [0, 0, 0, 0, 0, 0, 0, 0, 1536, 1024, 0, 0, 0, 4096, 12288, 28672, 0, 0, 0, 0, 0, 0, 0, 0, 0, 262144, 0, 524288, 0,
+  1048576, 0, 0, 33816576, 0, 0, 134742016, 0, 0, 537919488, 0, 0, 0, 0, 34494480384, 0, 0, 0, 275415826432, 0, 0, 0,
+  8830587502592, 0, 0, 0, 0, 0, 0, 0, 2260630401187840, 0, 0, 0, 0],
+ [0, 0, 0, 0, 0, 0, 0, 0, 3584, 3072, 2048, 0, 0, 0, 8192, 24576, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 524288, 0, 1048576, 0,
+  2097152, 0, 0, 67633152, 0, 0, 269484032, 0, 0, 1075838976, 8657567744, 0, 0, 0, 68988960768, 0, 0, 0, 0, 0, 0, 0,
+  17661175005184, 0, 0, 0, 0, 0, 0, 0, 4521260802375680, 0, 0, 0],
+ [0, 0, 0, 0, 0, 0, 0, 0, 7680, 7168, 6144, 4096, 0, 0, 0, 16384, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1048576, 0, 2097152,
+  0, 4194304, 0, 0, 135266304, 0, 0, 538968064, 0, 0, 0, 17315135488, 0, 0, 0, 137977921536, 0, 0, 2216338391040, 0, 0,
+  0, 0, 35322350010368, 0, 0, 0, 0, 0, 0, 0, 9042521604751360, 0, 0],
+ [0, 0, 0, 0, 0, 0, 0, 0, 15872, 15360, 14336, 12288, 8192, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2097152, 0,
+  4194304, 0, 0, 0, 0, 270532608, 0, 0, 1077936128, 0, 0, 0, 34630270976, 0, 0, 0, 275955843072, 0, 0, 4432676782080, 0,
+  0, 0, 0, 70644700020736, 0, 567382630203392, 0, 0, 0, 0, 0, 18085043209502720, 0],
+ [0, 0, 0, 0, 0, 0, 0, 0, 32256, 31744, 30720, 28672, 24576, 16384, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  4194304, 0, 8388608, 0, 0, 0, 0, 541065216, 0, 0, 2155872256, 0, 0, 0, 69260541952, 0, 0, 0, 551911686144, 0, 0,
+  8865353564160, 0, 0, 0, 0, 141289400041472, 0, 1134765260406784, 0, 0, 0, 0, 0, 36170086419005440],
+ [256, 0, 512, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 131072, 393216, 917504, 1966080, 4063232, 8257536, 0, 0, 0,
+  0, 0, 0, 0, 0, 16777216, 0, 33554432, 0, 0, 0, 0, 0, 4311744512, 0, 0, 17213423616, 0, 0, 0, 0, 1103823372288, 0, 0,
+  0, 8813306445824, 0, 0, 0, 282578800082944, 0, 0, 0, 0, 4512412933816320, 0, 0],
+ [0, 512, 0, 1024, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 262144, 786432, 1835008, 3932160, 8126464, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 33554432, 0, 67108864, 0, 0, 0, 0, 0, 8623489024, 0, 0, 34426847232, 0, 0, 0, 0, 2207646744576, 0, 0,
+  0, 17626612891648, 0, 0, 0, 565157600165888, 0, 0, 0, 0, 9024825867632640, 0],
+ [512, 0, 1024, 0, 2048, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 131072, 0, 0, 0, 524288, 1572864, 3670016, 7864320, 0, 0, 0,
+  0, 0, 0, 0, 0, 33554432, 0, 67108864, 0, 134217728, 0, 0, 0, 0, 0, 17246978048, 0, 0, 68853694464, 0, 0, 0, 0,
+  4415293489152, 0, 0, 0, 35253225783296, 0, 0, 0, 1130315200331776, 0, 0, 0, 0, 18049651735265280],
+ [0, 1024, 0, 2048, 0, 4096, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 393216, 262144, 0, 0, 0, 1048576, 3145728, 7340032, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 67108864, 0, 134217728, 0, 268435456, 0, 0, 8657043456, 0, 0, 34493956096, 0, 0, 137707388928, 0, 0,
+  0, 0, 8830586978304, 0, 0, 0, 70506451566592, 0, 0, 0, 2260630400663552, 0, 0, 0, 0],
+ [0, 0, 2048, 0, 4096, 0, 8192, 0, 0, 0, 0, 0, 0, 0, 0, 0, 917504, 786432, 524288, 0, 0, 0, 2097152, 6291456, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 134217728, 0, 268435456, 0, 536870912, 0, 0, 17314086912, 0, 0, 68987912192, 0, 0, 275414777856,
+  2216337342464, 0, 0, 0, 17661173956608, 0, 0, 0, 0, 0, 0, 0, 4521260801327104, 0, 0, 0],
+ [0, 0, 0, 4096, 0, 8192, 0, 16384, 0, 0, 0, 0, 0, 0, 0, 0, 1966080, 1835008, 1572864, 1048576, 0, 0, 0, 4194304, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 268435456, 0, 536870912, 0, 1073741824, 0, 0, 34628173824, 0, 0, 137975824384, 0, 0, 0,
+  4432674684928, 0, 0, 0, 35322347913216, 0, 0, 567382628106240, 0, 0, 0, 0, 9042521602654208, 0, 0],
+ [0, 0, 0, 0, 8192, 0, 16384, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4063232, 3932160, 3670016, 3145728, 2097152, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 536870912, 0, 1073741824, 0, 0, 0, 0, 69256347648, 0, 0, 275951648768, 0, 0, 0,
+  8865349369856, 0, 0, 0, 70644695826432, 0, 0, 1134765256212480, 0, 0, 0, 0, 18085043205308416, 0],
+ [0, 0, 0, 0, 0, 16384, 0, 32768, 0, 0, 0, 0, 0, 0, 0, 0, 8257536, 8126464, 7864320, 7340032, 6291456, 4194304, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1073741824, 0, 2147483648, 0, 0, 0, 0, 138512695296, 0, 0, 551903297536, 0, 0, 0,
+  17730698739712, 0, 0, 0, 141289391652864, 0, 0, 2269530512424960, 0, 0, 0, 0, 36170086410616832],
+ [65792, 0, 0, 132096, 0, 0, 0, 0, 65536, 0, 131072, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 33554432, 100663296,
+  234881024, 503316480, 1040187392, 2113929216, 0, 0, 0, 0, 0, 0, 0, 0, 4294967296, 0, 8589934592, 0, 0, 0, 0, 0,
+  1103806595072, 0, 0, 4406636445696, 0, 0, 0, 0, 282578783305728, 0, 0, 0, 2256206450130944, 0, 0, 0],
+ [0, 131584, 0, 0, 264192, 0, 0, 0, 0, 131072, 0, 262144, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 67108864,
+  201326592, 469762048, 1006632960, 2080374784, 0, 0, 0, 0, 0, 0, 0, 0, 0, 8589934592, 0, 17179869184, 0, 0, 0, 0, 0,
+  2207613190144, 0, 0, 8813272891392, 0, 0, 0, 0, 565157566611456, 0, 0, 0, 4512412900261888, 0, 0],
+ [0, 0, 263168, 0, 0, 528384, 0, 0, 131072, 0, 262144, 0, 524288, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 33554432, 0, 0, 0,
+  134217728, 402653184, 939524096, 2013265920, 0, 0, 0, 0, 0, 0, 0, 0, 8589934592, 0, 17179869184, 0, 34359738368, 0, 0,
+  0, 0, 0, 4415226380288, 0, 0, 17626545782784, 0, 0, 0, 0, 1130315133222912, 0, 0, 0, 9024825800523776, 0],
+ [262656, 0, 0, 526336, 0, 0, 1056768, 0, 0, 262144, 0, 524288, 0, 1048576, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 100663296,
+  67108864, 0, 0, 0, 268435456, 805306368, 1879048192, 0, 0, 0, 0, 0, 0, 0, 0, 0, 17179869184, 0, 34359738368, 0,
+  68719476736, 0, 0, 2216203124736, 0, 0, 8830452760576, 0, 0, 35253091565568, 0, 0, 0, 0, 2260630266445824, 0, 0, 0,
+  18049651601047552],
+ [0, 525312, 0, 0, 1052672, 0, 0, 2113536, 0, 0, 524288, 0, 1048576, 0, 2097152, 0, 0, 0, 0, 0, 0, 0, 0, 0, 234881024,
+  201326592, 134217728, 0, 0, 0, 536870912, 1610612736, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 34359738368, 0, 68719476736, 0,
+  137438953472, 0, 0, 4432406249472, 0, 0, 17660905521152, 0, 0, 70506183131136, 567382359670784, 0, 0, 0,
+  4521260532891648, 0, 0, 0],
+ [0, 0, 1050624, 0, 0, 2105344, 0, 0, 0, 0, 0, 1048576, 0, 2097152, 0, 4194304, 0, 0, 0, 0, 0, 0, 0, 0, 503316480,
+  469762048, 402653184, 268435456, 0, 0, 0, 1073741824, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 68719476736, 0, 137438953472,
+  0, 274877906944, 0, 0, 8864812498944, 0, 0, 35321811042304, 0, 0, 0, 1134764719341568, 0, 0, 0, 9042521065783296, 0,
+  0],
+ [0, 0, 0, 2101248, 0, 0, 4210688, 0, 0, 0, 0, 0, 2097152, 0, 4194304, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1040187392,
+  1006632960, 939524096, 805306368, 536870912, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 137438953472, 0,
+  274877906944, 0, 0, 0, 0, 17729624997888, 0, 0, 70643622084608, 0, 0, 0, 2269529438683136, 0, 0, 0, 18085042131566592,
+  0],
+ [0, 0, 0, 0, 4202496, 0, 0, 8421376, 0, 0, 0, 0, 0, 4194304, 0, 8388608, 0, 0, 0, 0, 0, 0, 0, 0, 2113929216,
+  2080374784, 2013265920, 1879048192, 1610612736, 1073741824, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 274877906944,
+  0, 549755813888, 0, 0, 0, 0, 35459249995776, 0, 0, 141287244169216, 0, 0, 0, 4539058877366272, 0, 0, 0,
+  36170084263133184],
+ [16843008, 0, 0, 0, 33818624, 0, 0, 0, 16842752, 0, 0, 33816576, 0, 0, 0, 0, 16777216, 0, 33554432, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 8589934592, 25769803776, 60129542144, 128849018880, 266287972352, 541165879296, 0, 0, 0, 0,
+  0, 0, 0, 0, 1099511627776, 0, 2199023255552, 0, 0, 0, 0, 0, 282574488338432, 0, 0, 1128098930098176, 0, 0, 0, 0],
+ [0, 33686016, 0, 0, 0, 67637248, 0, 0, 0, 33685504, 0, 0, 67633152, 0, 0, 0, 0, 33554432, 0, 67108864, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 17179869184, 51539607552, 120259084288, 257698037760, 532575944704, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 2199023255552, 0, 4398046511104, 0, 0, 0, 0, 0, 565148976676864, 0, 0, 2256197860196352, 0, 0, 0],
+ [0, 0, 67372032, 0, 0, 0, 135274496, 0, 0, 0, 67371008, 0, 0, 135266304, 0, 0, 33554432, 0, 67108864, 0, 134217728, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 8589934592, 0, 0, 0, 34359738368, 103079215104, 240518168576, 515396075520, 0, 0, 0, 0,
+  0, 0, 0, 0, 2199023255552, 0, 4398046511104, 0, 8796093022208, 0, 0, 0, 0, 0, 1130297953353728, 0, 0,
+  4512395720392704, 0, 0],
+ [0, 0, 0, 134744064, 0, 0, 0, 270548992, 67239936, 0, 0, 134742016, 0, 0, 270532608, 0, 0, 67108864, 0, 134217728, 0,
+  268435456, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 25769803776, 17179869184, 0, 0, 0, 68719476736, 206158430208, 481036337152,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 4398046511104, 0, 8796093022208, 0, 17592186044416, 0, 0, 567347999932416, 0, 0,
+  2260595906707456, 0, 0, 9024791440785408, 0],
+ [134480384, 0, 0, 0, 269488128, 0, 0, 0, 0, 134479872, 0, 0, 269484032, 0, 0, 541065216, 0, 0, 134217728, 0, 268435456,
+  0, 536870912, 0, 0, 0, 0, 0, 0, 0, 0, 0, 60129542144, 51539607552, 34359738368, 0, 0, 0, 137438953472, 412316860416,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 8796093022208, 0, 17592186044416, 0, 35184372088832, 0, 0, 1134695999864832, 0, 0,
+  4521191813414912, 0, 0, 18049582881570816],
+ [0, 268960768, 0, 0, 0, 538976256, 0, 0, 0, 0, 268959744, 0, 0, 538968064, 0, 0, 0, 0, 0, 268435456, 0, 536870912, 0,
+  1073741824, 0, 0, 0, 0, 0, 0, 0, 0, 128849018880, 120259084288, 103079215104, 68719476736, 0, 0, 0, 274877906944, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 17592186044416, 0, 35184372088832, 0, 70368744177664, 0, 0, 2269391999729664, 0, 0,
+  9042383626829824, 0, 0],
+ [0, 0, 537921536, 0, 0, 0, 1077952512, 0, 0, 0, 0, 537919488, 0, 0, 1077936128, 0, 0, 0, 0, 0, 536870912, 0,
+  1073741824, 0, 0, 0, 0, 0, 0, 0, 0, 0, 266287972352, 257698037760, 240518168576, 206158430208, 137438953472, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 35184372088832, 0, 70368744177664, 0, 0, 0, 0, 4538783999459328, 0, 0,
+  18084767253659648, 0],
+ [0, 0, 0, 1075843072, 0, 0, 0, 2155905024, 0, 0, 0, 0, 1075838976, 0, 0, 2155872256, 0, 0, 0, 0, 0, 1073741824, 0,
+  2147483648, 0, 0, 0, 0, 0, 0, 0, 0, 541165879296, 532575944704, 515396075520, 481036337152, 412316860416,
+  274877906944, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 70368744177664, 0, 140737488355328, 0, 0, 0, 0,
+  9077567998918656, 0, 0, 36169534507319296],
+ [4311810304, 0, 0, 0, 0, 8657571840, 0, 0, 4311810048, 0, 0, 0, 8657567744, 0, 0, 0, 4311744512, 0, 0, 8657043456, 0,
+  0, 0, 0, 4294967296, 0, 8589934592, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2199023255552, 6597069766656,
+  15393162788864, 32985348833280, 68169720922112, 138538465099776, 0, 0, 0, 0, 0, 0, 0, 0, 281474976710656, 0,
+  562949953421312, 0, 0, 0, 0, 0],
+ [0, 8623620608, 0, 0, 0, 0, 17315143680, 0, 0, 8623620096, 0, 0, 0, 17315135488, 0, 0, 0, 8623489024, 0, 0,
+  17314086912, 0, 0, 0, 0, 8589934592, 0, 17179869184, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 4398046511104,
+  13194139533312, 30786325577728, 65970697666560, 136339441844224, 0, 0, 0, 0, 0, 0, 0, 0, 0, 562949953421312, 0,
+  1125899906842624, 0, 0, 0, 0],
+ [0, 0, 17247241216, 0, 0, 0, 0, 34630287360, 0, 0, 17247240192, 0, 0, 0, 34630270976, 0, 0, 0, 17246978048, 0, 0,
+  34628173824, 0, 0, 8589934592, 0, 17179869184, 0, 34359738368, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2199023255552, 0, 0,
+  0, 8796093022208, 26388279066624, 61572651155456, 131941395333120, 0, 0, 0, 0, 0, 0, 0, 0, 562949953421312, 0,
+  1125899906842624, 0, 2251799813685248, 0, 0, 0],
+ [0, 0, 0, 34494482432, 0, 0, 0, 0, 0, 0, 0, 34494480384, 0, 0, 0, 69260541952, 17213423616, 0, 0, 34493956096, 0, 0,
+  69256347648, 0, 0, 17179869184, 0, 34359738368, 0, 68719476736, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 6597069766656,
+  4398046511104, 0, 0, 0, 17592186044416, 52776558133248, 123145302310912, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1125899906842624,
+  0, 2251799813685248, 0, 4503599627370496, 0, 0],
+ [0, 0, 0, 0, 68988964864, 0, 0, 0, 34426978304, 0, 0, 0, 68988960768, 0, 0, 0, 0, 34426847232, 0, 0, 68987912192, 0, 0,
+  138512695296, 0, 0, 34359738368, 0, 68719476736, 0, 137438953472, 0, 0, 0, 0, 0, 0, 0, 0, 0, 15393162788864,
+  13194139533312, 8796093022208, 0, 0, 0, 35184372088832, 105553116266496, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  2251799813685248, 0, 4503599627370496, 0, 9007199254740992, 0],
+ [68853957120, 0, 0, 0, 0, 137977929728, 0, 0, 0, 68853956608, 0, 0, 0, 137977921536, 0, 0, 0, 0, 68853694464, 0, 0,
+  137975824384, 0, 0, 0, 0, 0, 68719476736, 0, 137438953472, 0, 274877906944, 0, 0, 0, 0, 0, 0, 0, 0, 32985348833280,
+  30786325577728, 26388279066624, 17592186044416, 0, 0, 0, 70368744177664, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  4503599627370496, 0, 9007199254740992, 0, 18014398509481984],
+ [0, 137707914240, 0, 0, 0, 0, 275955859456, 0, 0, 0, 137707913216, 0, 0, 0, 275955843072, 0, 0, 0, 0, 137707388928, 0,
+  0, 275951648768, 0, 0, 0, 0, 0, 137438953472, 0, 274877906944, 0, 0, 0, 0, 0, 0, 0, 0, 0, 68169720922112,
+  65970697666560, 61572651155456, 52776558133248, 35184372088832, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  9007199254740992, 0, 18014398509481984, 0],
+ [0, 0, 275415828480, 0, 0, 0, 0, 551911718912, 0, 0, 0, 275415826432, 0, 0, 0, 551911686144, 0, 0, 0, 0, 275414777856,
+  0, 0, 551903297536, 0, 0, 0, 0, 0, 274877906944, 0, 549755813888, 0, 0, 0, 0, 0, 0, 0, 0, 138538465099776,
+  136339441844224, 131941395333120, 123145302310912, 105553116266496, 70368744177664, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 18014398509481984, 0, 36028797018963968],
+ [1103823438080, 0, 0, 0, 0, 0, 2216338399232, 0, 1103823437824, 0, 0, 0, 0, 2216338391040, 0, 0, 1103823372288, 0, 0,
+  0, 2216337342464, 0, 0, 0, 1103806595072, 0, 0, 2216203124736, 0, 0, 0, 0, 1099511627776, 0, 2199023255552, 0, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 562949953421312, 1688849860263936, 3940649673949184, 8444249301319680,
+  17451448556060672, 35465847065542656, 0, 0, 0, 0, 0, 0, 0, 0],
+ [0, 2207646876160, 0, 0, 0, 0, 0, 4432676798464, 0, 2207646875648, 0, 0, 0, 0, 4432676782080, 0, 0, 2207646744576, 0,
+  0, 0, 4432674684928, 0, 0, 0, 2207613190144, 0, 0, 4432406249472, 0, 0, 0, 0, 2199023255552, 0, 4398046511104, 0, 0,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1125899906842624, 3377699720527872, 7881299347898368, 16888498602639360,
+  34902897112121344, 0, 0, 0, 0, 0, 0, 0, 0],
+ [0, 0, 4415293752320, 0, 0, 0, 0, 0, 0, 0, 4415293751296, 0, 0, 0, 0, 8865353564160, 0, 0, 4415293489152, 0, 0, 0,
+  8865349369856, 0, 0, 0, 4415226380288, 0, 0, 8864812498944, 0, 0, 2199023255552, 0, 4398046511104, 0, 8796093022208,
+  0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 562949953421312, 0, 0, 0, 2251799813685248, 6755399441055744, 15762598695796736,
+  33776997205278720, 0, 0, 0, 0, 0, 0, 0, 0],
+ [0, 0, 0, 8830587504640, 0, 0, 0, 0, 0, 0, 0, 8830587502592, 0, 0, 0, 0, 0, 0, 0, 8830586978304, 0, 0, 0,
+  17730698739712, 4406636445696, 0, 0, 8830452760576, 0, 0, 17729624997888, 0, 0, 4398046511104, 0, 8796093022208, 0,
+  17592186044416, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 1688849860263936, 1125899906842624, 0, 0, 0, 4503599627370496,
+  13510798882111488, 31525197391593472, 0, 0, 0, 0, 0, 0, 0, 0],
+ [0, 0, 0, 0, 17661175009280, 0, 0, 0, 0, 0, 0, 0, 17661175005184, 0, 0, 0, 8813306445824, 0, 0, 0, 17661173956608, 0,
+  0, 0, 0, 8813272891392, 0, 0, 17660905521152, 0, 0, 35459249995776, 0, 0, 8796093022208, 0, 17592186044416, 0,
+  35184372088832, 0, 0, 0, 0, 0, 0, 0, 0, 0, 3940649673949184, 3377699720527872, 2251799813685248, 0, 0, 0,
+  9007199254740992, 27021597764222976, 0, 0, 0, 0, 0, 0, 0, 0],
+ [0, 0, 0, 0, 0, 35322350018560, 0, 0, 17626613022720, 0, 0, 0, 0, 35322350010368, 0, 0, 0, 17626612891648, 0, 0, 0,
+  35322347913216, 0, 0, 0, 0, 17626545782784, 0, 0, 35321811042304, 0, 0, 0, 0, 0, 17592186044416, 0, 35184372088832, 0,
+  70368744177664, 0, 0, 0, 0, 0, 0, 0, 0, 8444249301319680, 7881299347898368, 6755399441055744, 4503599627370496, 0, 0,
+  0, 18014398509481984, 0, 0, 0, 0, 0, 0, 0, 0],
+ [35253226045952, 0, 0, 0, 0, 0, 70644700037120, 0, 0, 35253226045440, 0, 0, 0, 0, 70644700020736, 0, 0, 0,
+  35253225783296, 0, 0, 0, 70644695826432, 0, 0, 0, 0, 35253091565568, 0, 0, 70643622084608, 0, 0, 0, 0, 0,
+  35184372088832, 0, 70368744177664, 0, 0, 0, 0, 0, 0, 0, 0, 0, 17451448556060672, 16888498602639360, 15762598695796736,
+  13510798882111488, 9007199254740992, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+ [0, 70506452091904, 0, 0, 0, 0, 0, 141289400074240, 0, 0, 70506452090880, 0, 0, 0, 0, 141289400041472, 0, 0, 0,
+  70506451566592, 0, 0, 0, 141289391652864, 0, 0, 0, 0, 70506183131136, 0, 0, 141287244169216, 0, 0, 0, 0, 0,
+  70368744177664, 0, 140737488355328, 0, 0, 0, 0, 0, 0, 0, 0, 35465847065542656, 34902897112121344, 33776997205278720,
+  31525197391593472, 27021597764222976, 18014398509481984, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
+ [282578800148736, 0, 0, 0, 0, 0, 0, 567382630219776, 282578800148480, 0, 0, 0, 0, 0, 567382630203392, 0,
+  282578800082944, 0, 0, 0, 0, 567382628106240, 0, 0, 282578783305728, 0, 0, 0, 567382359670784, 0, 0, 0,
+  282574488338432, 0, 0, 567347999932416, 0, 0, 0, 0, 281474976710656, 0, 562949953421312, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  0, 0, 0, 0, 0, 144115188075855872, 432345564227567616, 1008806316530991104, 2161727821137838080, 4467570830351532032,
+  9079256848778919936],
+ [0, 565157600297472, 0, 0, 0, 0, 0, 0, 0, 565157600296960, 0, 0, 0, 0, 0, 1134765260406784, 0, 565157600165888, 0, 0,
+  0, 0, 1134765256212480, 0, 0, 565157566611456, 0, 0, 0, 1134764719341568, 0, 0, 0, 565148976676864, 0, 0,
+  1134695999864832, 0, 0, 0, 0, 562949953421312, 0, 1125899906842624, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  288230376151711744, 864691128455135232, 2017612633061982208, 4323455642275676160, 8935141660703064064],
+ [0, 0, 1130315200594944, 0, 0, 0, 0, 0, 0, 0, 1130315200593920, 0, 0, 0, 0, 0, 0, 0, 1130315200331776, 0, 0, 0, 0,
+  2269530512424960, 0, 0, 1130315133222912, 0, 0, 0, 2269529438683136, 0, 0, 0, 1130297953353728, 0, 0,
+  2269391999729664, 0, 0, 562949953421312, 0, 1125899906842624, 0, 2251799813685248, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  144115188075855872, 0, 0, 0, 576460752303423488, 1729382256910270464, 4035225266123964416, 8646911284551352320],
+ [0, 0, 0, 2260630401189888, 0, 0, 0, 0, 0, 0, 0, 2260630401187840, 0, 0, 0, 0, 0, 0, 0, 2260630400663552, 0, 0, 0, 0,
+  0, 0, 0, 2260630266445824, 0, 0, 0, 4539058877366272, 1128098930098176, 0, 0, 2260595906707456, 0, 0,
+  4538783999459328, 0, 0, 1125899906842624, 0, 2251799813685248, 0, 4503599627370496, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  432345564227567616, 288230376151711744, 0, 0, 0, 1152921504606846976, 3458764513820540928, 8070450532247928832],
+ [0, 0, 0, 0, 4521260802379776, 0, 0, 0, 0, 0, 0, 0, 4521260802375680, 0, 0, 0, 0, 0, 0, 0, 4521260801327104, 0, 0, 0,
+  2256206450130944, 0, 0, 0, 4521260532891648, 0, 0, 0, 0, 2256197860196352, 0, 0, 4521191813414912, 0, 0,
+  9077567998918656, 0, 0, 2251799813685248, 0, 4503599627370496, 0, 9007199254740992, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  1008806316530991104, 864691128455135232, 576460752303423488, 0, 0, 0, 2305843009213693952, 6917529027641081856],
+ [0, 0, 0, 0, 0, 9042521604759552, 0, 0, 0, 0, 0, 0, 0, 9042521604751360, 0, 0, 4512412933816320, 0, 0, 0, 0,
+  9042521602654208, 0, 0, 0, 4512412900261888, 0, 0, 0, 9042521065783296, 0, 0, 0, 0, 4512395720392704, 0, 0,
+  9042383626829824, 0, 0, 0, 0, 0, 4503599627370496, 0, 9007199254740992, 0, 18014398509481984, 0, 0, 0, 0, 0, 0, 0, 0,
+  2161727821137838080, 2017612633061982208, 1729382256910270464, 1152921504606846976, 0, 0, 0, 4611686018427387904],
+ [0, 0, 0, 0, 0, 0, 18085043209519104, 0, 9024825867763712, 0, 0, 0, 0, 0, 18085043209502720, 0, 0, 9024825867632640, 0,
+  0, 0, 0, 18085043205308416, 0, 0, 0, 9024825800523776, 0, 0, 0, 18085042131566592, 0, 0, 0, 0, 9024791440785408, 0, 0,
+  18084767253659648, 0, 0, 0, 0, 0, 9007199254740992, 0, 18014398509481984, 0, 0, 0, 0, 0, 0, 0, 0, 0,
+  4467570830351532032, 4323455642275676160, 4035225266123964416, 3458764513820540928, 2305843009213693952, 0, 0, 0],
+ [18049651735527936, 0, 0, 0, 0, 0, 0, 36170086419038208, 0, 18049651735527424, 0, 0, 0, 0, 0, 36170086419005440, 0, 0,
+  18049651735265280, 0, 0, 0, 0, 36170086410616832, 0, 0, 0, 18049651601047552, 0, 0, 0, 36170084263133184, 0, 0, 0, 0,
+  18049582881570816, 0, 0, 36169534507319296, 0, 0, 0, 0, 0, 18014398509481984, 0, 36028797018963968, 0, 0, 0, 0, 0, 0,
+  0, 0, 9079256848778919936, 8935141660703064064, 8646911284551352320, 8070450532247928832, 6917529027641081856,
+  4611686018427387904, 0, 0]]
+
+# bitmask of each file
+FILE_MASK = [72340172838076673, 144680345676153346, 289360691352306692, 578721382704613384, 1157442765409226768,
+ 2314885530818453536, 4629771061636907072, 9259542123273814144]
+
+# bitmask of the files next to each file
+ADJACENT_FILES_MASK = [144680345676153346, 361700864190383365, 723401728380766730, 1446803456761533460, 2893606913523066920,
+ 5787213827046133840, 11574427654092267680, 4629771061636907072]
+
+# bitmask of the squares ahead of a WHITE PAWN on its own and adjacent files
+WHITE_PASSED_MASK = [217020518514230016, 506381209866536704, 1012762419733073408, 2025524839466146816, 4051049678932293632,
+ 8102099357864587264, 16204198715729174528, 13889313184910721024, 217020518514229248, 506381209866534912,
+ 1012762419733069824, 2025524839466139648, 4051049678932279296, 8102099357864558592, 16204198715729117184,
+ 13889313184910671872, 217020518514032640, 506381209866076160, 1012762419732152320, 2025524839464304640,
+ 4051049678928609280, 8102099357857218560, 16204198715714437120, 13889313184898088960, 217020518463700992,
+ 506381209748635648, 1012762419497271296, 2025524838994542592, 4051049677989085184, 8102099355978170368,
+ 16204198711956340736, 13889313181676863488, 217020505578799104, 506381179683864576, 1012762359367729152,
+ 2025524718735458304, 4051049437470916608, 8102098874941833216, 16204197749883666432, 13889312357043142656,
+ 217017207043915776, 506373483102470144, 1012746966204940288, 2025493932409880576, 4050987864819761152,
+ 8101975729639522304, 16203951459279044608, 13889101250810609664, 216172782113783808, 504403158265495552,
+ 1008806316530991104, 2017612633061982208, 4035225266123964416, 8070450532247928832, 16140901064495857664,
+ 13835058055282163712, 0, 0, 0, 0, 0, 0, 0, 0]
+
+# bitmask of the squares ahead of a BLACK PAWN on its own and adjacent files
+BLACK_PASSED_MASK = [0, 0, 0, 0, 0, 0, 0, 0, 3, 7, 14, 28, 56, 112, 224, 192, 771, 1799, 3598, 7196, 14392, 28784, 57568, 49344, 197379,
+ 460551, 921102, 1842204, 3684408, 7368816, 14737632, 12632256, 50529027, 117901063, 235802126, 471604252, 943208504,
+ 1886417008, 3772834016, 3233857728, 12935430915, 30182672135, 60365344270, 120730688540, 241461377080, 482922754160,
+ 965845508320, 827867578560, 3311470314243, 7726764066567, 15453528133134, 30907056266268, 61814112532536,
+ 123628225065072, 247256450130144, 211934100111552, 847736400446211, 1978051601041159, 3956103202082318,
+ 7912206404164636, 15824412808329272, 31648825616658544, 63297651233317088, 54255129628557504]
+
+# bitmask of the two ranks in front of a WHITE KING, on its own and adjacent files
+WHITE_SHELTER_MASK = [197376, 460544, 921088, 1842176, 3684352, 7368704, 14737408, 12632064, 50528256, 117899264, 235798528, 471597056,
+ 943194112, 1886388224, 3772776448, 3233808384, 12935233536, 30182211584, 60364423168, 120728846336, 241457692672,
+ 482915385344, 965830770688, 827854946304, 3311419785216, 7726646165504, 15453292331008, 30906584662016, 61813169324032,
+ 123626338648064, 247252677296128, 211930866253824, 847723465015296, 1978021418369024, 3956042836738048,
+ 7912085673476096, 15824171346952192, 31648342693904384, 63296685387808768, 54254301760978944, 217017207043915776,
+ 506373483102470144, 1012746966204940288, 2025493932409880576, 4050987864819761152, 8101975729639522304,
+ 16203951459279044608, 13889101250810609664, 216172782113783808, 504403158265495552, 1008806316530991104,
+ 2017612633061982208, 4035225266123964416, 8070450532247928832, 16140901064495857664, 13835058055282163712, 0, 0, 0, 0,
+ 0, 0, 0, 0]
+
+# bitmask of the two ranks in front of a BLACK KING, on its own and adjacent files
+BLACK_SHELTER_MASK = [0, 0, 0, 0, 0, 0, 0, 0, 3, 7, 14, 28, 56, 112, 224, 192, 771, 1799, 3598, 7196, 14392, 28784, 57568, 49344, 197376,
+ 460544, 921088, 1842176, 3684352, 7368704, 14737408, 12632064, 50528256, 117899264, 235798528, 471597056, 943194112,
+ 1886388224, 3772776448, 3233808384, 12935233536, 30182211584, 60364423168, 120728846336, 241457692672, 482915385344,
+ 965830770688, 827854946304, 3311419785216, 7726646165504, 15453292331008, 30906584662016, 61813169324032,
+ 123626338648064, 247252677296128, 211930866253824, 847723465015296, 1978021418369024, 3956042836738048,
+ 7912085673476096, 15824171346952192, 31648342693904384, 63296685387808768, 54254301760978944]
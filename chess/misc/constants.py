@@ -1,7 +1,8 @@
 WHITE = 'WHITE'
 BLACK = 'BLACK'
 BWSET = set([BLACK, WHITE])
-MAX = float(1000)
+MAX = float(100000) # checkmate score, far above any evaluation
+MATE_BOUND = MAX - 1000 # scores beyond this are checkmates or tablebase wins
 MOVE = 'MOVE'
 CASTLE = 'CASTLE'
 KING = 'KING'
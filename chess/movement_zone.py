@@ -1,6 +1,8 @@
 from misc.constants import *
 from helpers.legality_helpers import get_all_cardinal_tiles_til_collider, get_all_ordinal_tiles_til_collider, bool_en_passant_legal
 from helpers.general_helpers import get_tiles_from_offset_pos, convert_to_movement_set
+from undo_stack import from_square
+from position_state import NO_SQUARE
 
 '''
 Functions for retrieving the movement zones of all 6 ranks of pieces.
@@ -43,19 +45,16 @@ def pawn_movement_zone(board, piece):
     colored_ordinal = ['NW', 'NE'] if piece.color == WHITE else ['SW', 'SE']
     colored_cardinal = 'N' if piece.color == WHITE else 'S'
 
-    # add en passant tiles first if they are permissible.
+    # add en passant tile first if it is permissible.
     player = piece.player
     assert(player != None)
     pos = piece.pos
     forward_offset = 1 if piece.color == WHITE else -1
-    for side_offset in [-1, 1]:
-        dest_x, dest_y = pos[0]+side_offset, pos[1]+forward_offset
-        if dest_x-1 not in range(8) or dest_y-1 not in range(8):
-            continue
-        dest = [dest_x, dest_y]
-        if board.get_piece(dest) != None:
-            continue
-        if bool_en_passant_legal(piece, dest, player):
+    ep_square = player.game.state.ep_square
+    if ep_square != NO_SQUARE:
+        dest = from_square(ep_square)
+        if (abs(dest[0]-pos[0]) == 1 and dest[1] == pos[1]+forward_offset
+            and bool_en_passant_legal(piece, dest, player)):
             movement_tiles.append(dest)
 
     # first retrieve diagonal tiles in the movement zone.
@@ -0,0 +1,123 @@
+from misc.constants import *
+from misc.board_tables import (FILE_MASK, ADJACENT_FILES_MASK, WHITE_PASSED_MASK, BLACK_PASSED_MASK,
+                               WHITE_SHELTER_MASK, BLACK_SHELTER_MASK)
+
+'''
+Pawn structure evaluation: passed, isolated and doubled PAWN terms from
+PAWN-only bitmasks (bit file + 8 * rank, A1 = 0), plus KING shelter by the
+PAWNs in front of each KING. The structure terms only depend on the PAWNs,
+which rarely move during a search, so they're cached in a PawnTable keyed
+by the position's PAWN-only Zobrist key (PositionState.pawn_key). The
+shelter depends on the KINGs too, but is a couple of mask lookups on the
+cached bitmasks. Scores are in the units of misc.tables.VALUE, >0 is good
+for WHITE.
+'''
+
+PASSED_BONUS = [0, 0, 10, 15, 25, 40, 65, 100, 0] # by rank counted from the PAWN's own side, 1..8
+ISOLATED_PENALTY = 15 # per PAWN with no friendly PAWN on an adjacent file
+DOUBLED_PENALTY = 10 # per PAWN beyond the first on a file
+SHELTER_BONUS = 8 # per PAWN shielding its KING, outside the endgame
+PAWN_TABLE_BITS = 14 # PawnTable of 16384 entries
+
+
+def pawn_masks(game) -> list:
+    '''
+    Returns: [WHITE PAWNs bitmask, BLACK PAWNs bitmask]
+    '''
+    masks = {WHITE: 0, BLACK: 0}
+    for player in [game.p1, game.p2]:
+        mask = 0
+        for piece in player.pieces.values():
+            if piece.rank == PAWN:
+                mask |= 1 << ((piece.pos[0] - 1) + 8 * (piece.pos[1] - 1))
+        masks[player.color] = mask
+    return [masks[WHITE], masks[BLACK]]
+
+
+def side_structure(own: int, enemy: int, passed_mask: list, is_white: bool) -> int:
+    '''
+    Structure score of own PAWNs against enemy PAWNs, raw (>0 is good for own).
+    '''
+    score = 0
+    for f in range(8):
+        on_file = own & FILE_MASK[f]
+        if on_file == 0:
+            continue
+        count = on_file.bit_count()
+        score -= DOUBLED_PENALTY * (count - 1)
+        if own & ADJACENT_FILES_MASK[f] == 0:
+            score -= ISOLATED_PENALTY * count
+        # only the most advanced PAWN of a file can be passed
+        sq = on_file.bit_length() - 1 if is_white else (on_file & -on_file).bit_length() - 1
+        if enemy & passed_mask[sq] == 0:
+            score += PASSED_BONUS[(sq >> 3) + 1 if is_white else 8 - (sq >> 3)]
+    return score
+
+
+def structure_score(white: int, black: int) -> int:
+    '''
+    Passed, isolated and doubled PAWN terms for PAWN bitmasks white and black.
+    '''
+    return side_structure(white, black, WHITE_PASSED_MASK, True) - side_structure(black, white, BLACK_PASSED_MASK, False)
+
+
+def shelter_score(white: int, black: int, white_king, black_king) -> int:
+    '''
+    KING shelter term, for PAWN bitmasks white and black and the KING Pieces
+    (None if missing).
+    '''
+    score = 0
+    if white_king != None:
+        score += SHELTER_BONUS * (white & WHITE_SHELTER_MASK[(white_king.pos[0] - 1) + 8 * (white_king.pos[1] - 1)]).bit_count()
+    if black_king != None:
+        score -= SHELTER_BONUS * (black & BLACK_SHELTER_MASK[(black_king.pos[0] - 1) + 8 * (black_king.pos[1] - 1)]).bit_count()
+    return score
+
+
+class PawnTable:
+    '''
+    Direct mapped cache of pawn structure entries, [pawn key, structure score,
+    WHITE PAWNs bitmask, BLACK PAWNs bitmask], indexed by the low bits of the
+    pawn key. A colliding entry replaces the old one. Entries only depend on
+    the PAWNs, so they stay valid across positions and games. Slots are
+    allocated on the first store, so Games that never search stay small.
+    '''
+    def __init__(self, bits=PAWN_TABLE_BITS):
+        self.mask = (1 << bits) - 1
+        self.entries: list | None = None
+        self.probes = 0 # lookups so far
+        self.hits = 0 # lookups that found their entry
+
+    def probe(self, game) -> list:
+        '''
+        Returns: Entry of game's PAWNs, computing and storing it on a miss.
+        '''
+        key = game.state.pawn_key
+        self.probes += 1
+        if self.entries != None:
+            entry = self.entries[key & self.mask]
+            if entry != None and entry[0] == key:
+                self.hits += 1
+                return entry
+        else:
+            self.entries = [None] * (self.mask + 1)
+        white, black = pawn_masks(game)
+        entry = [key, structure_score(white, black), white, black]
+        self.entries[key & self.mask] = entry
+        return entry
+
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / self.probes if self.probes > 0 else 0.0
+
+
+def pawn_score(game, is_endgame: bool) -> int:
+    '''
+    Pawn structure score of game, >0 is good for WHITE. Shelter only counts
+    outside the endgame, when KINGs should stay home.
+    '''
+    entry = game.pawn_table.probe(game)
+    if is_endgame:
+        return entry[1]
+    white_king, black_king = (game.p1.king, game.p2.king) if game.p1.color == WHITE else (game.p2.king, game.p1.king)
+    return entry[1] + shelter_score(entry[2], entry[3], white_king, black_king)
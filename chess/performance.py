@@ -3,17 +3,57 @@ import unittest.mock
 from unittest.mock import patch
 
 from game import Game
-from debug import Debug
+from debug import Debug, set_up_debug
 from piece import Piece
 import random
 import os
-from tests import set_up_debug
+import sys
 from helpers.game_helpers import clear_terminal
 from movement_zone import mass_movement_zone, get_movement_zone
+from search import analyze_position
+from benchmark import make_benchmark_position
 
-if __name__ == "__main__":
+'''
+Performance harness. Run with no arguments to play a scripted game
+(typically under cProfile), or with 'multipv [depth] [N]' to report the
+cost of multi-PV search relative to single-PV search.
+'''
 
+def scripted_game(search_profiles=None, random_moves=20, best_moves=6):
+    '''
+    Plays random_moves random moves then best_moves best moves through Game.start.
+    search_profiles: Optional list, see Game.search_profiles.
+    '''
     game = Game()
-    input_commands = ['r']*20 + ['b']*6 + ['PAUSE']
+    game.search_profiles = search_profiles
+    input_commands = ['r']*random_moves + ['b']*best_moves + ['PAUSE']
     with patch('builtins.input', side_effect=input_commands):
-        game.start()
\ No newline at end of file
+        game.start()
+
+
+def multipv_cost(depth=3, num_pv=3):
+    '''
+    Prints nodes and time of a single-PV and a num_pv multi-PV search from the
+    initial position and a scripted middlegame, along with their ratio.
+    '''
+    game = Game()
+    middlegame = make_benchmark_position('middlegame')
+    for name, position in [('initial', game), ('middlegame', middlegame)]:
+        player = position.p1 if position.turn == position.p1.color else position.p2
+        single = analyze_position(position, player, depth, multipv=1)
+        multi = analyze_position(position, player, depth, multipv=num_pv)
+        print(name+' depth '+str(depth))
+        print('  single-PV: '+str(single.nodes)+' nodes, '+str(round(single.elapsed, 3))+'s')
+        print('  '+str(num_pv)+'-PV: '+str(multi.nodes)+' nodes, '+str(round(multi.elapsed, 3))+'s')
+        print('  cost ratio: '+str(round(multi.nodes / single.nodes, 2))+'x nodes, '
+              +str(round(multi.elapsed / single.elapsed, 2))+'x time')
+        for line in multi.lines:
+            print('    '+str(line))
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == 'multipv':
+        args = [int(arg) for arg in sys.argv[2:4]]
+        multipv_cost(*args)
+    else:
+        scripted_game()
@@ -0,0 +1,150 @@
+import argparse
+import time
+from game import Game
+from debug import set_up_debug
+from book import polyglot_key
+from helpers.game_helpers import convert_color_to_player
+from helpers.general_helpers import move_to_notation
+from helpers.state_helpers import update_both_players_check
+from misc.constants import *
+
+'''
+Perft (performance test) move path enumeration.
+Counts the leaf nodes of the legal move tree to a fixed depth, using
+Player.get_all_legal_moves and attempt_action / unmake_turn. Comparing
+counts against known reference counts verifies move generation, and the
+time taken measures its raw throughput.
+'''
+
+# name: [white pieces, black pieces, side to move, reference leaf counts from depth 1].
+# None pieces means the standard initial setup.
+POSITIONS = {
+    'initial': [None, None, WHITE, [20, 400, 8902, 197281, 4865609]],
+    # r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq -
+    # the published depth 4 count (4085603) includes underpromotions, which this engine doesn't generate
+    'kiwipete': [['K-E1', 'R-A1', 'R-H1', 'P-A2', 'P-B2', 'P-C2', 'B-D2', 'B-E2', 'P-F2', 'P-G2',
+                  'P-H2', 'N-C3', 'Q-F3', 'P-E4', 'P-D5', 'N-E5'],
+                 ['K-E8', 'R-A8', 'R-H8', 'P-A7', 'P-C7', 'P-D7', 'Q-E7', 'P-F7', 'B-G7', 'B-A6',
+                  'N-B6', 'P-E6', 'N-F6', 'P-G6', 'P-B4', 'P-H3'],
+                 WHITE, [48, 2039, 97862]],
+    # 8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - -
+    'position3': [['K-A5', 'P-B5', 'R-B4', 'P-E2', 'P-G2'],
+                  ['K-H4', 'P-C7', 'P-D6', 'R-H5', 'P-F4'],
+                  WHITE, [14, 191, 2812, 43238, 674624]],
+}
+
+
+def make_position(white_pieces=None, black_pieces=None, turn=WHITE):
+    '''
+    Sets up a Game from set_up_debug piece lists with turn to move,
+    or the standard initial setup if both piece lists are None.
+    '''
+    if white_pieces == None and black_pieces == None:
+        game = Game()
+    else:
+        game = Game(set_up_debug(white_pieces=white_pieces, black_pieces=black_pieces, turn_state=turn))
+    update_both_players_check(game)
+    return game
+
+
+def make_named_position(name):
+    '''
+    Sets up the Game of a POSITIONS entry.
+    '''
+    white_pieces, black_pieces, turn, reference = POSITIONS[name]
+    return make_position(white_pieces, black_pieces, turn)
+
+
+def perft(game, depth, cache=None) -> int:
+    '''
+    Counts leaf nodes of the legal move tree depth plies deep from game's current
+    position, with the side of game.turn to move. Game state is restored afterwards.
+    cache: Optional dict, filled with subtree counts keyed by (position key, depth)
+    and reused across transpositions and calls.
+    '''
+    if depth == 0:
+        return 1
+    if cache != None:
+        key = (polyglot_key(game), depth)
+        if key in cache:
+            return cache[key]
+    player = convert_color_to_player(game, game.turn)
+    moves = player.get_all_legal_moves()
+    if depth == 1:
+        count = len(moves) # legality was already checked by making every move
+    else:
+        count = 0
+        for move in moves:
+            assert(player.attempt_action(move, True))
+            count += perft(game, depth - 1, cache)
+            game.unmake_turn()
+    if cache != None:
+        cache[key] = count
+    return count
+
+
+def divide(game, depth, cache=None) -> list:
+    '''
+    Returns [move notation, leaf count] for every legal root move of game,
+    as perft(depth) split by root move. Useful to find a mismatching subtree
+    against a reference move generator.
+    '''
+    assert(depth >= 1)
+    player = convert_color_to_player(game, game.turn)
+    counts = []
+    for move in player.get_all_legal_moves():
+        assert(player.attempt_action(move, True))
+        counts.append([move_to_notation(move, player.color), perft(game, depth - 1, cache)])
+        game.unmake_turn()
+    return counts
+
+
+def run_perft(game, max_depth, reference=None, cache=None, verbose=True) -> list:
+    '''
+    Runs perft on game for every depth 1 to max_depth, timing each.
+    reference: Optional list of expected leaf counts from depth 1.
+    cache: Optional dict of subtree counts, shared across the depths.
+    Returns: [depth, leaf count, seconds, leaf nodes/sec, matches reference or None] per depth.
+    '''
+    results = []
+    for depth in range(1, max_depth + 1):
+        start = time.perf_counter()
+        count = perft(game, depth, cache)
+        elapsed = time.perf_counter() - start
+        nps = count / elapsed if elapsed > 0 else 0.0
+        matches = None
+        if reference != None and depth <= len(reference):
+            matches = (count == reference[depth - 1])
+        results.append([depth, count, elapsed, nps, matches])
+        if verbose:
+            line = ('depth '+str(depth)+': '+str(count)+' nodes, '+str(round(elapsed, 3))+'s, '
+                    +str(int(nps))+' nodes/sec')
+            if matches == False:
+                line += ' MISMATCH, expected '+str(reference[depth - 1])
+            elif matches:
+                line += ' ok'
+            print(line)
+    return results
+
+
+if __name__ == "__main__":
+    # usage: python perft.py [position] [depth] [--divide] [--cache] [--fen FEN]
+    parser = argparse.ArgumentParser(description='Perft move generation test.')
+    parser.add_argument('position', nargs='?', default='initial', choices=list(POSITIONS.keys()))
+    parser.add_argument('depth', nargs='?', type=int, default=3)
+    parser.add_argument('--divide', action='store_true', help='print leaf counts per root move')
+    parser.add_argument('--cache', action='store_true', help='cache subtree counts by position')
+    parser.add_argument('--fen', help='run on this FEN position instead, with no reference counts')
+    args = parser.parse_args()
+
+    game = Game.from_fen(args.fen) if args.fen != None else make_named_position(args.position)
+    cache = {} if args.cache else None
+    if args.divide:
+        total = 0
+        for notation, count in divide(game, args.depth, cache):
+            print(notation+': '+str(count))
+            total += count
+        print('total: '+str(total))
+    else:
+        reference = POSITIONS[args.position][3] if args.fen == None else None
+        run_perft(game, args.depth, reference=reference, cache=cache)
@@ -0,0 +1,397 @@
+import argparse
+import gzip
+import re
+import time
+from fen import STARTING_FEN, FEN_RANKS, FILE_LETTERS
+from helpers.game_helpers import convert_color_to_player, get_opponent
+from undo_stack import to_square
+from misc.constants import *
+
+'''
+Streaming Portable Game Notation (PGN) reader and Standard Algebraic
+Notation (SAN) moves. read_games yields one PgnGame at a time from a file
+of any size, optionally gzip compressed, holding only the current game in
+memory. san_to_move decodes a SAN move against a Game: only pieces of the
+moved rank that attack the destination are considered, instead of
+generating every legal move. Making the decoded move is its legality check;
+trial moves are only made to break a tie between several candidates (eg
+when one of two KNIGHTs is pinned).
+'''
+
+RESULTS = set(['1-0', '0-1', '1/2-1/2', '*'])
+TAG = re.compile(r'\[\s*(\w+)\s+"((?:[^"\\]|\\.)*)"\s*\]')
+TOKEN = re.compile(r'\{[^}]*\}?|;[^\n]*|\$\d+|[()]|[^\s{}();$]+')
+MOVE_NUMBER = re.compile(r'^\d+\.*')
+SAN = re.compile(r'^([NBRQK])?([a-h])?([1-8])?(x)?([a-h][1-8])(?:=?([NBRQ]))?$')
+SAN_SUFFIX = '+#!?'
+
+
+class PgnGame:
+    '''
+    One game of a PGN file: its tag pairs, mainline SAN moves and result.
+    '''
+    def __init__(self, headers: dict, moves: list, result: str):
+        self.headers = headers # tag name -> value, eg 'White' -> 'Morphy'
+        self.moves = moves # SAN strings of the mainline, eg ['e4', 'e5', 'Nf3']
+        self.result = result # '1-0', '0-1', '1/2-1/2' or '*'
+
+    @property
+    def fen(self) -> str:
+        '''
+        FEN of the starting position, from the FEN tag if the game has one.
+        '''
+        return self.headers.get('FEN', STARTING_FEN)
+
+
+def open_pgn(path):
+    '''
+    Opens a PGN file for reading as text, decompressing it if path ends in .gz.
+    '''
+    if path.endswith('.gz'):
+        return gzip.open(path, 'rt', encoding='utf-8', errors='replace')
+    return open(path, encoding='utf-8', errors='replace')
+
+
+def parse_movetext(movetext: str) -> list:
+    '''
+    Parses the movetext of one game, skipping comments, NAGs, move numbers
+    and variations.
+    Returns: [mainline SAN moves, result or None].
+    '''
+    moves = []
+    result = None
+    depth = 0 # variation nesting
+    for token in TOKEN.findall(movetext):
+        first = token[0]
+        if first == '{' or first == ';' or first == '$':
+            continue
+        if token == '(':
+            depth += 1
+            continue
+        if token == ')':
+            depth = max(0, depth - 1)
+            continue
+        if depth > 0:
+            continue
+        if token in RESULTS:
+            result = token
+            continue
+        if first.isdigit():
+            token = MOVE_NUMBER.sub('', token) # eg '12.' or '12.e4'
+            if token == '' or token in RESULTS:
+                continue
+        if token.startswith('...'):
+            token = token[3:]
+            if token == '':
+                continue
+        moves.append(token)
+    return [moves, result]
+
+
+def read_games(source):
+    '''
+    Generator of the PgnGame's in source, a path (.pgn or .pgn.gz) or an
+    iterable of lines such as an open file. Lines are consumed lazily, so
+    memory use doesn't grow with the file.
+    '''
+    if type(source) == str:
+        with open_pgn(source) as file:
+            yield from read_games(file)
+        return
+
+    headers = {}
+    movetext = []
+    in_comment = False # inside a { } comment spanning lines
+    for line in source:
+        stripped = line.strip()
+        if not in_comment and stripped.startswith('['):
+            if len(movetext) > 0: # tags after movetext start the next game
+                yield make_game(headers, movetext)
+                headers, movetext = {}, []
+            match = TAG.match(stripped)
+            if match != None:
+                headers[match.group(1)] = match.group(2).replace('\\"', '"').replace('\\\\', '\\')
+            continue
+        if stripped == '' or stripped.startswith('%'): # blank or escaped line
+            continue
+        movetext.append(stripped)
+        # track comments left open at the end of the line, ignoring braces after a ;
+        for token in TOKEN.findall(('{' if in_comment else '') + stripped):
+            if token[0] == '{':
+                in_comment = not token.endswith('}')
+    if len(headers) > 0 or len(movetext) > 0:
+        yield make_game(headers, movetext)
+
+
+def make_game(headers: dict, movetext: list) -> PgnGame:
+    moves, result = parse_movetext('\n'.join(movetext))
+    if result == None:
+        result = headers.get('Result', '*')
+    return PgnGame(headers, moves, result)
+
+
+def piece_attacks(board, piece, dest) -> bool:
+    '''
+    Returns whether non PAWN piece attacks dest, ie dest is a step of its
+    pattern and no piece stands in between. What stands on dest isn't considered.
+    '''
+    dx, dy = dest[0] - piece.pos[0], dest[1] - piece.pos[1]
+    rank = piece.rank
+    if rank == KNIGHT:
+        return (abs(dx) == 1 and abs(dy) == 2) or (abs(dx) == 2 and abs(dy) == 1)
+    if rank == KING:
+        return max(abs(dx), abs(dy)) == 1
+    straight = (dx == 0) != (dy == 0)
+    diagonal = dx != 0 and abs(dx) == abs(dy)
+    if not ((straight and rank in [ROOK, QUEEN]) or (diagonal and rank in [BISHOP, QUEEN])):
+        return False
+    step_x = (dx > 0) - (dx < 0)
+    step_y = (dy > 0) - (dy < 0)
+    x, y = piece.pos[0] + step_x, piece.pos[1] + step_y
+    while [x, y] != dest:
+        if board.get_piece([x, y]) != None:
+            return False
+        x, y = x + step_x, y + step_y
+    return True
+
+
+def move_legal(game, player, move, keep=False) -> bool:
+    '''
+    Returns whether move is legal for player. The move is made if keep and
+    legal, otherwise game is left unchanged.
+    '''
+    if not player.attempt_action(move, move_pseudolegal_assumption=True):
+        return False
+    if not keep:
+        game.unmake_turn()
+    return True
+
+
+def pawn_origin(game, player, dest, from_file, capture: bool) -> list | None:
+    '''
+    Tile of the PAWN of player moving to dest, capturing from file from_file
+    if capture, or None if no such PAWN move is possible.
+    '''
+    board = game.board
+    forward = 1 if player.color == WHITE else -1
+    target = board.get_piece(dest)
+    if capture:
+        pos = [from_file, dest[1] - forward]
+        if abs(from_file - dest[0]) != 1:
+            return None
+        if target == None and to_square(dest) != game.state.ep_square:
+            return None
+        if target != None and (target.color == player.color or target.rank == KING):
+            return None
+    else:
+        if target != None:
+            return None
+        pos = [dest[0], dest[1] - forward]
+        if board.get_piece(pos) == None and dest[1] == (4 if player.color == WHITE else 5):
+            pos = [dest[0], dest[1] - 2 * forward] # two leap over an empty tile
+    if not 1 <= pos[1] <= 8:
+        return None
+    pawn = board.get_piece(pos)
+    if pawn == None or pawn.rank != PAWN or pawn.color != player.color:
+        return None
+    return pos
+
+
+def san_to_move(game, san: str, make=False):
+    '''
+    Decodes SAN move san, eg 'Nbd7', 'exd6', 'e8=Q+' or 'O-O', for the side to move,
+    and makes it if make. The legality check of the decoded move is the move
+    itself, so making it costs nothing extra.
+    Returns: the move as [[x_0, y_0], [x_1, y_1]] or 'KING'/'QUEEN' for castles.
+    Complains with Exception if san is ill formed, illegal, ambiguous or
+    an underpromotion (which Game doesn't support).
+    '''
+    player = convert_color_to_player(game, game.turn)
+    token = san.rstrip(SAN_SUFFIX)
+    if token in ['O-O', '0-0', 'O-O-O', '0-0-0']:
+        side = KING if len(token) == 3 else QUEEN
+        if not player.castle_legal(side, get_opponent(game, player)):
+            raise Exception('Illegal castle '+san)
+        if make:
+            assert(player.attempt_castle(side, castle_legal_assumption=True))
+        return side
+
+    match = SAN.match(token)
+    if match == None:
+        raise Exception('Invalid SAN move '+san)
+    letter, from_file, from_row, capture, square, promotion = match.groups()
+    if promotion != None and promotion != 'Q':
+        raise Exception('Underpromotion is not supported: '+san)
+    dest = [FILE_LETTERS.index(square[0]) + 1, int(square[1])]
+    from_file = FILE_LETTERS.index(from_file) + 1 if from_file != None else None
+    from_row = int(from_row) if from_row != None else None
+
+    if letter == None: # PAWN
+        if capture != None and from_file == None:
+            raise Exception('Invalid SAN PAWN capture '+san)
+        pos = pawn_origin(game, player, dest, from_file, capture != None)
+        if pos == None or not move_legal(game, player, [pos, dest], keep=make):
+            raise Exception('Illegal move '+san)
+        return [pos, dest]
+
+    target = game.board.get_piece(dest)
+    if target != None and (target.color == player.color or target.rank == KING):
+        raise Exception('Illegal move '+san)
+    rank = FEN_RANKS[letter.lower()]
+    candidates = []
+    for piece in player.pieces.values():
+        if (piece.rank == rank and (from_file == None or piece.pos[0] == from_file)
+            and (from_row == None or piece.pos[1] == from_row)
+            and piece_attacks(game.board, piece, dest)):
+            candidates.append([piece.pos, dest])
+    if len(candidates) > 1: # only legal moves disambiguate, eg when one piece is pinned
+        candidates = [move for move in candidates if move_legal(game, player, move)]
+        if len(candidates) == 1 and make:
+            assert(move_legal(game, player, candidates[0], keep=True))
+    elif len(candidates) == 1 and not move_legal(game, player, candidates[0], keep=make):
+        candidates = []
+    if len(candidates) != 1:
+        raise Exception(('Ambiguous' if len(candidates) > 1 else 'Illegal')+' move '+san)
+    return candidates[0]
+
+
+def play_san(game, san: str):
+    '''
+    Decodes SAN move san (see san_to_move) and makes it in game.
+    Returns: the move made.
+    '''
+    return san_to_move(game, san, make=True)
+
+
+def move_to_san(game, move) -> str:
+    '''
+    SAN of legal move of the side to move, eg 'Nbd7', 'exd6', 'e8=Q+' or 'O-O-O#'.
+    Leaves game unchanged.
+    '''
+    player = convert_color_to_player(game, game.turn)
+    board = game.board
+    if type(move) == str:
+        san = 'O-O' if move == KING else 'O-O-O'
+    else:
+        pos, dest = move
+        piece = board.get_piece(pos)
+        square = FILE_LETTERS[dest[0] - 1] + str(dest[1])
+        if piece.rank == PAWN:
+            san = square
+            if pos[0] != dest[0]:
+                san = FILE_LETTERS[pos[0] - 1] + 'x' + san
+            if dest[1] in [1, 8]:
+                san += '=Q'
+        else:
+            others = [other for other in player.pieces.values()
+                      if other.rank == piece.rank and other is not piece
+                      and piece_attacks(board, other, dest) and move_legal(game, player, [other.pos, dest])]
+            prefix = 'N' if piece.rank == KNIGHT else piece.rank[0]
+            if len(others) > 0:
+                if all(other.pos[0] != pos[0] for other in others):
+                    prefix += FILE_LETTERS[pos[0] - 1]
+                elif all(other.pos[1] != pos[1] for other in others):
+                    prefix += str(pos[1])
+                else:
+                    prefix += FILE_LETTERS[pos[0] - 1] + str(pos[1])
+            san = prefix + ('x' if board.get_piece(dest) != None else '') + square
+
+    assert(player.attempt_action(move))
+    opponent = get_opponent(game, player)
+    if opponent.in_check:
+        san += '#' if len(opponent.get_all_legal_moves()) == 0 else '+'
+    game.unmake_turn()
+    return san
+
+
+def format_pgn(headers: dict, moves: list, result: str) -> str:
+    '''
+    Formats a game as PGN text, the seven tag roster first, with movetext
+    lines of at most 80 characters. moves are SAN strings, played from the
+    FEN tag's position if there is one (whose side to move numbers the moves).
+    '''
+    headers = dict(headers)
+    headers['Result'] = result
+    roster = ['Event', 'Site', 'Date', 'Round', 'White', 'Black', 'Result']
+    tags = roster + [tag for tag in headers if tag not in roster]
+    lines = ['['+tag+' "'+str(headers.get(tag, '?')).replace('\\', '\\\\').replace('"', '\\"')+'"]'
+             for tag in tags]
+    lines.append('')
+    fields = headers.get('FEN', STARTING_FEN).split()
+    number = int(fields[5]) if len(fields) == 6 else 1
+    black_first = fields[1] == 'b'
+    tokens = []
+    for ply, san in enumerate(moves):
+        if (ply + black_first) % 2 == 0:
+            tokens.append(str(number)+'.')
+        elif ply == 0:
+            tokens.append(str(number)+'...')
+        tokens.append(san)
+        if (ply + black_first) % 2 == 1:
+            number += 1
+    tokens.append(result)
+    line = ''
+    for token in tokens:
+        if line != '' and len(line) + 1 + len(token) > 80:
+            lines.append(line)
+            line = ''
+        line = token if line == '' else line+' '+token
+    lines.append(line)
+    return '\n'.join(lines)+'\n\n'
+
+
+def replay(pgn_game: PgnGame, game) -> int:
+    '''
+    Sets game up from the start of pgn_game and plays its moves.
+    Returns: number of plies played.
+    Complains with Exception on the first move that can't be decoded.
+    '''
+    game.reset_to_fen(pgn_game.fen)
+    for ply, san in enumerate(pgn_game.moves):
+        try:
+            play_san(game, san)
+        except Exception as error:
+            raise Exception('Ply '+str(ply + 1)+': '+str(error))
+    return len(pgn_game.moves)
+
+
+def read_throughput(source, limit=None, replay_moves=True, verbose=False) -> list:
+    '''
+    Reads (and replays if replay_moves) up to limit games of source.
+    Games whose moves can't be replayed are counted as errors.
+    Returns: [games, plies, errors, seconds, games/sec, plies/sec].
+    '''
+    from game import Game
+    game = Game.from_fen(STARTING_FEN) if replay_moves else None
+    games, plies, errors = 0, 0, 0
+    start = time.perf_counter()
+    for pgn_game in read_games(source):
+        if limit != None and games >= limit:
+            break
+        games += 1
+        if not replay_moves:
+            plies += len(pgn_game.moves)
+            continue
+        try:
+            plies += replay(pgn_game, game)
+        except Exception as error:
+            errors += 1
+            if verbose:
+                print('game '+str(games)+' '+pgn_game.headers.get('White', '?')+' - '
+                      +pgn_game.headers.get('Black', '?')+': '+str(error))
+    elapsed = time.perf_counter() - start
+    return [games, plies, errors, elapsed, games / max(elapsed, 1e-9), plies / max(elapsed, 1e-9)]
+
+
+if __name__ == "__main__":
+    # usage: python pgn.py games.pgn[.gz] [--limit N] [--parse-only] [--verbose]
+    parser = argparse.ArgumentParser(description='Read and replay a PGN file, reporting throughput.')
+    parser.add_argument('path', help='.pgn or gzip compressed .pgn.gz file')
+    parser.add_argument('--limit', type=int, default=None, help='stop after this many games')
+    parser.add_argument('--parse-only', action='store_true', help="don't decode and play the moves")
+    parser.add_argument('--verbose', action='store_true', help='print games that fail to replay')
+    args = parser.parse_args()
+    games, plies, errors, elapsed, games_per_sec, plies_per_sec = read_throughput(
+        args.path, limit=args.limit, replay_moves=not args.parse_only, verbose=args.verbose)
+    print(str(games)+' games, '+str(plies)+' plies, '+str(errors)+' errors in '+str(round(elapsed, 2))+'s: '
+          +str(round(games_per_sec, 1))+' games/sec, '+str(int(plies_per_sec))+' plies/sec')
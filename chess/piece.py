@@ -14,9 +14,22 @@ class Piece:
         self.player = player # refers to the Player which this piece belongs to.
         self.visual = get_piece_visual(rank=self.rank, color=self.color) # ♟
         self.moved = False # True when piece moves; ie changes position from init pos.
-        self.pawn_two_leap_on_prev_turn = False # True if this piece if PAWN, it moved on previous turn, and 
-                                                # went two squares forward on said previous turn.
+        self.id = -1 # index in Game.pieces_by_id, set by Game
     
+    def reinit(self, color: str, rank: str, player, pos, name: str):
+        '''
+        Reinitializes this piece in place as a new, unmoved piece, 
+        so Piece objects can be reused (see Game.reset_to_fen).
+        '''
+        self.color = color
+        self.rank = rank
+        self.pos = pos
+        self.name = name
+        self.player = player
+        self.visual = get_piece_visual(rank=rank, color=color)
+        self.moved = False
+        self.id = -1
+
     def __str__(self):
         pos = "None" if self.pos == None else str(self.pos[0]) +', '+str(self.pos[1])
         return ("Name: " + str(self.name) + ", color: " + str(self.color) 
@@ -26,5 +39,4 @@ class Piece:
         if not isinstance(other, Piece):
             return False
         return (self.name == other.name and self.color == other.color 
-                and self.rank == other.rank and self.pos == other.pos and self.moved == other.moved
-                and self.pawn_two_leap_on_prev_turn == other.pawn_two_leap_on_prev_turn)
\ No newline at end of file
+                and self.rank == other.rank and self.pos == other.pos and self.moved == other.moved)
\ No newline at end of file
@@ -1,14 +1,14 @@
 from piece import Piece
 from board import Board
-from turn import Turn
+from undo_stack import (to_square, FLAGS, NO_PIECE, CASTLE_FLAG, KING_SIDE_FLAG, PROMOTED_FLAG, FIRST_MOVE_FLAG,
+                        TWO_LEAP_FLAG, PSEUDOMOVE_FLAG, BLACK_TURN_FLAG, WHITE_CHECK_FLAG, BLACK_CHECK_FLAG)
 from misc.constants import *
-from helpers.state_helpers import pawn_promotion, update_moved_piece, update_player_check, update_player_pawns_leap_status
+from position_state import PIECE_KEYS
+from helpers.state_helpers import pawn_promotion, update_moved_piece, update_player_check
 from helpers.general_helpers import (check_in_bounds, algebraic_uniconverter, convert_letter_to_rank, in_between_hori_tiles, swap_colors, 
 ordinal_direction)
 from helpers.game_helpers import convert_color_to_player, get_opponent
 from movement_zone import get_movement_zone, mass_movement_zone
-from minimax import minimax
-import random
 
 '''
 Player who gets to make chess moves.
@@ -52,9 +52,28 @@ class Player:
                 piece = Piece(color=self.color, rank=convert_letter_to_rank(code[0]), 
                               pos=algebraic_uniconverter(code[2:]), player=self)
                 assert(piece.name == code) # sanity check, helped catch a knight is N bug once
+                piece.moved = not self.on_home_square(piece)
                 self.pieces[piece.name] = piece 
 
 
+    def on_home_square(self, piece) -> bool:
+        '''
+        Whether piece stands where a PAWN, KING or ROOK of this player starts the game.
+        Debug pieces off their home square count as moved, so they don't get
+        pawn two leaps or castling rights they couldn't have in a real game.
+        Other ranks are always considered home, as their moved status doesn't matter.
+        '''
+        main_row_pos = 1 if self.color == WHITE else 8
+        pawn_row_pos = 2 if self.color == WHITE else 7
+        if piece.rank == PAWN:
+            return piece.pos[1] == pawn_row_pos
+        elif piece.rank == KING:
+            return piece.pos == [5, main_row_pos]
+        elif piece.rank == ROOK:
+            return piece.pos in [[1, main_row_pos], [8, main_row_pos]]
+        return True
+
+
     def set_pieces_on_board(self):
         '''
         Sets this player's pieces on the board, for the start of the game.
@@ -113,37 +132,56 @@ class Player:
             move_pseudolegal_assumption = self.move_pseudolegal(pos, dest)
         
         if move_pseudolegal_assumption:
-            turn_color_at_turn_start = self.color
-            opponent = get_opponent(self.game, self)
-            player_check = self.in_check
-            opponent_check = opponent.in_check
-            prev_check_status = [player_check, opponent_check] if self.color == WHITE else [opponent_check, player_check]
+            flags = self.turn_start_flags() | PSEUDOMOVE_FLAG
+            state = self.game.state
+            prev_castling, prev_ep_square, prev_halfmove_clock = state.castling, state.ep_square, state.halfmove_clock
 
             moved_piece = self.board.get_piece(pos)
             former_rank = moved_piece.rank
-            piece_first_move = not moved_piece.moved
+            if not moved_piece.moved:
+                flags |= FIRST_MOVE_FLAG
             captured_piece = self.make_pseudomove(pos, dest)
 
             assert(moved_piece.pos == dest)
+            from_square, dest_square = to_square(pos), to_square(dest)
+            rank_keys = PIECE_KEYS[self.color]
+            promoted = former_rank == PAWN and dest[1] in [1, 8]
+            placement_key = rank_keys[former_rank][from_square] ^ rank_keys[QUEEN if promoted else former_rank][dest_square]
+            pawn_placement_key = placement_key if former_rank == PAWN else 0
+            if promoted:
+                pawn_placement_key = rank_keys[PAWN][from_square]
+            if captured_piece != None:
+                captured_key = PIECE_KEYS[captured_piece.color][captured_piece.rank][to_square(captured_piece.pos)]
+                placement_key ^= captured_key
+                if captured_piece.rank == PAWN:
+                    pawn_placement_key ^= captured_key
+            ep_capturable = False
+            if former_rank == PAWN and abs(dest[1] - pos[1]) == 2:
+                for x in [dest[0] - 1, dest[0] + 1]:
+                    adjacent = self.board.get_piece([x, dest[1]]) if 1 <= x <= 8 else None
+                    if adjacent != None and adjacent.rank == PAWN and adjacent.color != self.color:
+                        ep_capturable = True
+            state.make_move(from_square, dest_square, former_rank == PAWN, captured_piece != None, placement_key,
+                            pawn_placement_key, ep_capturable)
             self.update_state([moved_piece], pos, dest)
 
-            new_rank = moved_piece.rank
-            pseudolegal_turn = Turn()
-            pawn_promoted = (former_rank != new_rank)
-            captured_piece_pos = None if captured_piece == None else captured_piece.pos
-            pawn_two_leap = moved_piece.pawn_two_leap_on_prev_turn
-            pseudolegal_turn.log_move(moved_piece, pos, dest, pawn_promoted, piece_first_move, 
-                                    pawn_two_leap, turn_color_at_turn_start, prev_check_status, True, 
-                                      captured_piece=captured_piece, 
-                                      captured_piece_pos=captured_piece_pos)
-            self.game.turn_log.append(pseudolegal_turn)
+            if former_rank != moved_piece.rank:
+                flags |= PROMOTED_FLAG
+            if former_rank == PAWN and abs(dest[1] - pos[1]) == 2:
+                flags |= TWO_LEAP_FLAG
+            captured_id, captured_square = NO_PIECE, 0
+            if captured_piece != None:
+                captured_id, captured_square = captured_piece.id, to_square(captured_piece.pos)
+            stack = self.game.undo_stack
+            stack.push(moved_piece.id, from_square, dest_square, captured_id, captured_square, flags,
+                       prev_castling, prev_ep_square, prev_halfmove_clock)
 
             if self.in_check: # illegal move
                 self.game.unmake_turn(pseudomove=True)
                 return False
             else:
                 # move is indeed legal
-                self.game.turn_log[-1].is_pseudomove = False
+                stack.clear_top_flag(PSEUDOMOVE_FLAG)
                 return True
             
         return False # not even pseudolegal
@@ -204,38 +242,62 @@ class Player:
 
         if castle_legal_assumption:
             # castling guarenteed to work
-            turn_color_at_turn_start = self.color
-            player_check = self.in_check
-            opponent_check = opponent.in_check
-            prev_check_status = [player_check, opponent_check] if self.color == WHITE else [opponent_check, player_check]
+            flags = self.turn_start_flags() | CASTLE_FLAG | FIRST_MOVE_FLAG
+            if side == KING:
+                flags |= KING_SIDE_FLAG
+            state = self.game.state
+            prev_castling, prev_ep_square, prev_halfmove_clock = state.castling, state.ep_square, state.halfmove_clock
+            king_square = to_square(self.king.pos)
+            rook_square = king_square + 3 if side == KING else king_square - 4
             
             moved_king, moved_rook = self.castle(side)
+            rank_keys = PIECE_KEYS[self.color]
+            state.make_castle(rank_keys[KING][king_square] ^ rank_keys[KING][to_square(moved_king.pos)]
+                              ^ rank_keys[ROOK][rook_square] ^ rank_keys[ROOK][to_square(moved_rook.pos)])
             self.update_state([moved_king, moved_rook])
-            turn = Turn()
-            turn.log_castle(side, moved_king.name, moved_rook.name, turn_color_at_turn_start, prev_check_status)
-            self.game.turn_log.append(turn)
+            self.game.undo_stack.push(moved_king.id, king_square, to_square(moved_king.pos), 
+                                      moved_rook.id, rook_square, flags,
+                                      prev_castling, prev_ep_square, prev_halfmove_clock)
             return True
         
         return False
 
 
+    def turn_start_flags(self) -> int:
+        '''
+        Undo stack flags of the state at the start of this player's turn,
+        ie turn color and check statuses.
+        '''
+        opponent = get_opponent(self.game, self)
+        white_check = self.in_check if self.color == WHITE else opponent.in_check
+        black_check = opponent.in_check if self.color == WHITE else self.in_check
+        flags = BLACK_TURN_FLAG if self.color == BLACK else 0
+        if white_check:
+            flags |= WHITE_CHECK_FLAG
+        if black_check:
+            flags |= BLACK_CHECK_FLAG
+        return flags
+
+
+    def castle_rook_pos(self, side) -> list:
+        '''
+        Starting tile of this player's ROOK castling on 'side'.
+        '''
+        return [8 if side == KING else 1, 1 if self.color == WHITE else 8]
+
+
     def castle_legal(self, side, opponent) -> bool:
         '''
         Returns whether player castling on 'side' is legal.
         '''
         assert(side in KQSET)
         assert(self.king != None)
-        if self.king.moved:
-            return False # 'Cannot castle as KING has already moved!'
-        rook_code = 'R-A' if side == QUEEN else 'R-H'
-        rook_code = rook_code + str(self.king.pos[1])
-        if rook_code not in self.pieces:
-            return False # 'Cannot castle on '+str(side)+'-side as this side\'s ROOK does not exist!'
-        rook = self.pieces[rook_code]
-        assert(rook != None)
-        if rook.moved:
-            return False # 'Cannot castle here as the '+str(side)+'-side ROOK has already moved!'
-        assert(self.king.pos[1] == rook.pos[1]) # must hold for standard position chess where king, rook haven't moved
+        if not self.game.state.has_castling_right(self.color, side):
+            return False # 'Cannot castle as the KING or the '+str(side)+'-side ROOK has already moved!'
+        rook = self.board.get_piece(self.castle_rook_pos(side))
+        # castling rights are lost when the KING or ROOK moves, or the ROOK is captured
+        assert(rook != None and rook.rank == ROOK and rook.color == self.color)
+        assert(self.king.pos == [5, rook.pos[1]])
         in_between_tiles = in_between_hori_tiles(pos_1=self.king.pos, pos_2=rook.pos) # exclude king, rook endpoints
         # ^ is [[x, y],...]
         for tile in in_between_tiles:
@@ -281,10 +343,8 @@ class Player:
         self.board.move_piece(pos=tile_to_land_on, piece=king)
 
         # Next move ROOK to the tile that KING crossed over.
-        rook_code = 'R-A' if side == QUEEN else 'R-H'
-        rook_code = rook_code + str(base_row)
         # this rook on 'side' must exist as legality is True
-        rook = self.pieces[rook_code]
+        rook = self.board.get_piece(self.castle_rook_pos(side))
         self.board.move_piece(pos=crossed_tile, piece=rook)
 
         return king, rook
@@ -320,17 +380,14 @@ class Player:
     def update_state(self, moved_piece_arr: list, former_pos=None, dest=None):
         '''
         Player updates game state, typically at end of every turn, to prepare for next turn.
-        Updates moved param of piece, both player's check status, pawn leap status, pawn
+        Updates moved param of piece, both player's check status, pawn
         promotion rank, and swap game turn color for next turn. 
         moved_piece_arr: list of pieces that this player moved, must be of len 1-2
         If None, we compute the player check status as usual.
         '''
         n = len(moved_piece_arr)
         assert(1<=n<=2)
-        castled = (n == 2)
         for moved_piece in moved_piece_arr:
-            update_player_pawns_leap_status(self, moved_piece, former_pos, 
-                                            dest, castled=castled)
             if moved_piece.rank == PAWN:
                 pawn_promotion(self, dest, moved_piece)
             update_moved_piece(moved_piece)
@@ -357,7 +414,7 @@ class Player:
             move_success = self.attempt_action(pseud_move, move_pseudolegal_assumption=True)
             if move_success:
                 all_truly_legal_moves.append(pseud_move)
-                assert(self.game.turn_log[-1].is_pseudomove == False)
+                assert(not self.game.undo_stack.top(FLAGS) & PSEUDOMOVE_FLAG)
                 self.game.unmake_turn()
 
         opponent = get_opponent(self.game, self)
@@ -367,6 +424,7 @@ class Player:
             all_truly_legal_moves.append(QUEEN)
 
         if shuffle:
+            import random
             random.seed(42)
             random.shuffle(all_truly_legal_moves)
 
@@ -406,7 +464,8 @@ class Player:
         return move_success
     
 
-    def make_best_move(self, depth:int, shuffle=False) -> bool:
+    def make_best_move(self, depth:int, shuffle=False, interruptible=False, on_progress=None,
+                       profiler=None, soft_deadline=None, deadline=None) -> bool:
         '''
         Given a game state where it is PLAYER's turn, makes the
         best move for PLAYER, based on minimax search 'depth' levels deep.
@@ -415,19 +474,24 @@ class Player:
         This method will take up PLAYER's turn.
         depth: Deepness of minimax search, integer greater than 0.
         shuffle: Whether to randomize order of generated legal moves.
+        interruptible: If True, Ctrl+C stops the search and the best move
+        found so far is made.
+        on_progress: Optional callback for the search's SearchProgress events.
+        profiler: Optional cProfile.Profile to profile the search with.
+        soft_deadline, deadline: Optional time.monotonic() times after which no
+        new depth is started, and at which the search stops (see clock.py).
+        If the game has an opening book with moves for this position, a book move
+        is played instead of searching.
         Return: Success status of best move.
         '''
-        game = self.game
-        is_maximizing_player = True if self.color == WHITE else False
-        minmax_val, best_move = minimax(game, self, depth, 
-                                        is_maximizing_player,
-                                        shuffle=shuffle)
-        assert(best_move != None)
-        move_taken = self.attempt_action(best_move)
+        if self.game.book != None:
+            book_move = self.game.book.pick_move(self.game)
+            if book_move != None and self.attempt_action(book_move):
+                return True
+        from search import start_search, wait_for_search # the engine is loaded on first use
+        handle = start_search(self.game, self, depth, shuffle=shuffle, profiler=profiler,
+                              soft_deadline=soft_deadline, deadline=deadline)
+        result = wait_for_search(handle, interruptible=interruptible, on_progress=on_progress)
+        assert(result.best_move != None)
+        move_taken = self.attempt_action(result.best_move)
         return move_taken
-
-
-
-
-    
-        
\ No newline at end of file
@@ -0,0 +1,183 @@
+from misc.constants import *
+from misc.polyglot import POLYGLOT_RANDOM64, POLYGLOT_KIND, CASTLE_OFFSET, EN_PASSANT_OFFSET, TURN_OFFSET
+
+'''
+Position level state of a Game besides piece placement: side to move,
+castling rights, en passant square and the move clocks. Make and unmake
+update it in O(1), with the previous values saved on the undo stack,
+and it's the single source for hashing and serialization.
+Squares are 0..63 indices, see undo_stack.to_square.
+
+The state also keeps the Zobrist key of the position (Polyglot's random
+numbers, see book.polyglot_key) and a history stack of the keys before each
+move, updated in O(1) by make and unmake, for repetition detection. As in
+Polyglot, the en passant file is only hashed when a PAWN of the side to move
+stands next to the two leaped PAWN, so a position after a two leap matches
+the same position reached later when en passant isn't possible.
+A second key of the PAWNs alone keys the pawn structure cache, see pawns.py.
+'''
+
+# castling rights bits, in Polyglot/FEN order KQkq
+WHITE_KING_SIDE = 1
+WHITE_QUEEN_SIDE = 2
+BLACK_KING_SIDE = 4
+BLACK_QUEEN_SIDE = 8
+ALL_CASTLING = 15
+
+NO_SQUARE = -1 # en passant square when the last move wasn't a PAWN two leap
+
+# CASTLING_MASK[square] clears the rights lost by moving from or capturing on square
+CASTLING_MASK = [ALL_CASTLING] * 64
+CASTLING_MASK[0] &= ~WHITE_QUEEN_SIDE # A1
+CASTLING_MASK[7] &= ~WHITE_KING_SIDE # H1
+CASTLING_MASK[4] &= ~(WHITE_KING_SIDE | WHITE_QUEEN_SIDE) # E1
+CASTLING_MASK[56] &= ~BLACK_QUEEN_SIDE # A8
+CASTLING_MASK[63] &= ~BLACK_KING_SIDE # H8
+CASTLING_MASK[60] &= ~(BLACK_KING_SIDE | BLACK_QUEEN_SIDE) # E8
+
+
+# PIECE_KEYS[color][rank][square], Zobrist keys of a piece on a square
+PIECE_KEYS = {color: {rank: [POLYGLOT_RANDOM64[64 * (2 * kind + (1 if color == WHITE else 0)) + square]
+                             for square in range(64)]
+                      for rank, kind in POLYGLOT_KIND.items()}
+              for color in [WHITE, BLACK]}
+# CASTLING_KEYS[castling], key of a castling rights bitmask
+CASTLING_KEYS = [0] * (ALL_CASTLING + 1)
+for castling in range(ALL_CASTLING + 1):
+    for i in range(4):
+        if castling & (1 << i):
+            CASTLING_KEYS[castling] ^= POLYGLOT_RANDOM64[CASTLE_OFFSET + i]
+# EP_KEYS[ep_square + 1], key of an en passant square (0 for NO_SQUARE)
+EP_KEYS = [0] + [POLYGLOT_RANDOM64[EN_PASSANT_OFFSET + square % 8] for square in range(64)]
+TURN_KEY = POLYGLOT_RANDOM64[TURN_OFFSET] # xored in when WHITE is to move
+
+
+def castling_bits(color: str) -> list:
+    '''
+    Returns [KING side, QUEEN side] castling rights bits of color.
+    '''
+    if color == WHITE:
+        return [WHITE_KING_SIDE, WHITE_QUEEN_SIDE]
+    return [BLACK_KING_SIDE, BLACK_QUEEN_SIDE]
+
+
+class PositionState:
+    def __init__(self, turn=WHITE, castling=ALL_CASTLING, ep_square=NO_SQUARE,
+                 halfmove_clock=0, fullmove_number=1):
+        self.turn = turn # color to move
+        self.castling = castling # bitwise or of castling rights bits
+        self.ep_square = ep_square # square a PAWN can capture en passant onto, or NO_SQUARE
+        self.halfmove_clock = halfmove_clock # plies since the last capture or PAWN move
+        self.fullmove_number = fullmove_number # starts at 1, incremented after BLACK moves
+        self.key = 0 # Zobrist key of the position, see set_key
+        self.key_history = [] # keys of the positions before each move made, oldest first
+        self.pawn_key = 0 # Zobrist key of the PAWNs alone
+        self.pawn_key_history = [] # pawn keys before each move made, oldest first
+        self.ep_key = 0 # EP_KEYS entry hashed into key, 0 unless en passant is possible
+        self.ep_key_history = [] # ep keys before each move made, oldest first
+
+    def state_key(self) -> int:
+        '''
+        Key of the state fields, ie of everything but piece placement.
+        '''
+        return CASTLING_KEYS[self.castling] ^ self.ep_key ^ (TURN_KEY if self.turn == WHITE else 0)
+
+    def set_key(self, pieces):
+        '''
+        Recomputes the key from scratch, for pieces (with color, rank and
+        [x, y] pos) on the board, and clears the key history.
+        '''
+        self.ep_key, pawn_key = 0, 0
+        squares = [(piece.pos[0] - 1) + 8 * (piece.pos[1] - 1) for piece in pieces]
+        if self.ep_square != NO_SQUARE:
+            leaped = self.ep_square + (8 if self.turn == BLACK else -8) # square of the two leaped PAWN
+            for piece, square in zip(pieces, squares):
+                if (piece.rank == PAWN and piece.color == self.turn and square >> 3 == leaped >> 3
+                        and abs((square & 7) - (leaped & 7)) == 1):
+                    self.ep_key = EP_KEYS[self.ep_square + 1]
+        key = self.state_key()
+        for piece, square in zip(pieces, squares):
+            piece_key = PIECE_KEYS[piece.color][piece.rank][square]
+            key ^= piece_key
+            if piece.rank == PAWN:
+                pawn_key ^= piece_key
+        self.key, self.pawn_key = key, pawn_key
+        self.key_history.clear()
+        self.pawn_key_history.clear()
+        self.ep_key_history.clear()
+
+    def repetitions(self) -> int:
+        '''
+        Number of earlier occurrences of the current position, scanning back
+        only to the last irreversible move (capture or PAWN move), given by the
+        halfmove clock, and only over positions with the same side to move.
+        '''
+        history, key = self.key_history, self.key
+        n = len(history)
+        count = 0
+        for ply in range(n - 2, n - 1 - min(self.halfmove_clock, n), -2):
+            if history[ply] == key:
+                count += 1
+        return count
+
+    def has_castling_right(self, color: str, side: str) -> bool:
+        king_side, queen_side = castling_bits(color)
+        return bool(self.castling & (king_side if side == KING else queen_side))
+
+    def make_move(self, from_square: int, to_square: int, pawn_moved: bool, captured: bool,
+                  placement_key: int, pawn_placement_key=0, ep_capturable=False):
+        '''
+        Updates state for a pos->dest move of the side to move.
+        Turn color is swapped by the caller.
+        placement_key: Xor of the piece keys the move removes and adds.
+        pawn_placement_key: Xor of the PAWN keys among them.
+        ep_capturable: Whether the move is a two leap next to an enemy PAWN.
+        '''
+        old_key = CASTLING_KEYS[self.castling] ^ self.ep_key
+        self.ep_key_history.append(self.ep_key)
+        self.castling &= CASTLING_MASK[from_square] & CASTLING_MASK[to_square]
+        if pawn_moved and abs(to_square - from_square) == 16: # two leap
+            self.ep_square = (from_square + to_square) // 2
+        else:
+            self.ep_square = NO_SQUARE
+        self.halfmove_clock = 0 if pawn_moved or captured else self.halfmove_clock + 1
+        if self.turn == BLACK:
+            self.fullmove_number += 1
+        self.key_history.append(self.key)
+        self.ep_key = EP_KEYS[self.ep_square + 1] if ep_capturable else 0
+        self.key ^= placement_key ^ old_key ^ CASTLING_KEYS[self.castling] ^ self.ep_key ^ TURN_KEY
+        self.pawn_key_history.append(self.pawn_key)
+        self.pawn_key ^= pawn_placement_key
+
+    def make_castle(self, placement_key: int):
+        '''
+        Updates state for a castle of the side to move.
+        Turn color is swapped by the caller.
+        placement_key: Xor of the KING and ROOK keys before and after the castle.
+        '''
+        old_key = CASTLING_KEYS[self.castling] ^ self.ep_key
+        self.ep_key_history.append(self.ep_key)
+        self.ep_key = 0
+        king_side, queen_side = castling_bits(self.turn)
+        self.castling &= ~(king_side | queen_side)
+        self.ep_square = NO_SQUARE
+        self.halfmove_clock += 1
+        if self.turn == BLACK:
+            self.fullmove_number += 1
+        self.key_history.append(self.key)
+        self.key ^= placement_key ^ old_key ^ CASTLING_KEYS[self.castling] ^ TURN_KEY
+        self.pawn_key_history.append(self.pawn_key)
+
+    def unmake(self, turn: str, castling: int, ep_square: int, halfmove_clock: int):
+        '''
+        Restores state to the start of a move made by turn, from values saved before it.
+        '''
+        if turn == BLACK:
+            self.fullmove_number -= 1
+        self.turn = turn
+        self.castling = castling
+        self.ep_square = ep_square
+        self.halfmove_clock = halfmove_clock
+        self.key = self.key_history.pop()
+        self.pawn_key = self.pawn_key_history.pop()
+        self.ep_key = self.ep_key_history.pop()
@@ -0,0 +1,168 @@
+import argparse
+import pstats
+import re
+
+'''
+Compares pstats (.prof) files, such as those written by profiling.py or the
+older snapshots at the repo root. Each profile after the first is compared to
+the first: per function deltas in cumulative time, self time and call count.
+Where both profiles count search nodes (calls of minimax), values are divided
+by the node count, so searches of different size or depth can be compared.
+Functions whose share of total self time grew are flagged.
+'''
+
+NODE_FUNCTION = 'minimax' # calls to this function are search nodes
+DEFAULT_TOP = 25
+DEFAULT_THRESHOLD = 1.0 # growth in percentage points of self time share that gets flagged
+
+
+def function_name(key) -> str:
+    '''
+    Name of a pstats function key (filename, line, function), as file basename
+    and function, eg 'state_helpers.py(player_in_check)'. Line numbers and
+    directories are dropped, so functions match across edits and machines.
+    '''
+    filename, line, function = key
+    if filename == '~': # builtins
+        return function
+    return re.split(r'[\\/]', filename)[-1]+'('+function+')'
+
+
+class ProfileSnapshot:
+    '''
+    Per function totals of a pstats file.
+    '''
+    def __init__(self, path, node_function=NODE_FUNCTION):
+        self.path = path
+        self.functions = {} # function name -> [call count, self time, cumulative time]
+        stats = pstats.Stats(path)
+        for key, (primitive_calls, calls, self_time, cumulative_time, callers) in stats.stats.items():
+            totals = self.functions.setdefault(function_name(key), [0, 0.0, 0.0])
+            totals[0] += calls
+            totals[1] += self_time
+            totals[2] += cumulative_time
+        self.total_time = stats.total_tt
+        self.nodes = None # number of search nodes, None if the profile has no search
+        for name, totals in self.functions.items():
+            if name.endswith('('+node_function+')'):
+                self.nodes = totals[0]
+
+    def share(self, name) -> float:
+        '''
+        Percentage of total self time spent in function name.
+        '''
+        if name not in self.functions or self.total_time == 0:
+            return 0.0
+        return 100.0 * self.functions[name][1] / self.total_time
+
+
+class FunctionDelta:
+    '''
+    One function's values in a base and a new profile, per node if normalized.
+    '''
+    def __init__(self, name, base: list, new: list, base_share: float, new_share: float,
+                 threshold: float):
+        self.name = name
+        self.base = base # [calls, self time, cumulative time]
+        self.new = new
+        self.base_share = base_share # % of total self time
+        self.new_share = new_share
+        self.flagged = (new_share - base_share) > threshold # share of time grew
+
+    @property
+    def calls_delta(self):
+        return self.new[0] - self.base[0]
+
+    @property
+    def self_delta(self):
+        return self.new[1] - self.base[1]
+
+    @property
+    def cumulative_delta(self):
+        return self.new[2] - self.base[2]
+
+
+def compare_snapshots(base: ProfileSnapshot, new: ProfileSnapshot,
+                      threshold=DEFAULT_THRESHOLD) -> list:
+    '''
+    Compares every function of base and new.
+    Values are per search node if both profiles have a node count.
+    Returns: [normalized, list of FunctionDelta].
+    '''
+    normalized = base.nodes != None and new.nodes != None and base.nodes > 0 and new.nodes > 0
+    base_scale = 1.0 / base.nodes if normalized else 1.0
+    new_scale = 1.0 / new.nodes if normalized else 1.0
+    deltas = []
+    for name in set(base.functions) | set(new.functions):
+        base_values = [value * base_scale for value in base.functions.get(name, [0, 0.0, 0.0])]
+        new_values = [value * new_scale for value in new.functions.get(name, [0, 0.0, 0.0])]
+        deltas.append(FunctionDelta(name, base_values, new_values, base.share(name),
+                                    new.share(name), threshold))
+    return [normalized, deltas]
+
+
+SORT_KEYS = {'cumulative': lambda delta: abs(delta.cumulative_delta),
+             'self': lambda delta: abs(delta.self_delta),
+             'calls': lambda delta: abs(delta.calls_delta),
+             'share': lambda delta: abs(delta.new_share - delta.base_share)}
+
+
+def format_comparison(base: ProfileSnapshot, new: ProfileSnapshot, normalized: bool, deltas: list,
+                      top=DEFAULT_TOP, sort='cumulative') -> str:
+    '''
+    Formats the top deltas of compare_snapshots as a text table, times in ms
+    (per node if normalized).
+    '''
+    unit = 'per node' if normalized else 'total'
+    lines = [base.path+' -> '+new.path,
+             '  total '+str(round(base.total_time, 3))+'s -> '+str(round(new.total_time, 3))+'s, nodes '
+             +str(base.nodes)+' -> '+str(new.nodes)+', values '+unit,
+             '  '+'cum ms'.rjust(20)+'self ms'.rjust(22)+'calls'.rjust(22)+'self %'.rjust(16)+'  function']
+    ranked = sorted(deltas, key=SORT_KEYS[sort], reverse=True)
+    for delta in ranked[:top]:
+        columns = []
+        for base_value, new_value, scale, digits in [(delta.base[2], delta.new[2], 1000, 3),
+                                                     (delta.base[1], delta.new[1], 1000, 3),
+                                                     (delta.base[0], delta.new[0], 1, 1)]:
+            columns.append((str(round(base_value * scale, digits))+'->'+str(round(new_value * scale, digits))).rjust(22))
+        share = (str(round(delta.base_share, 1))+'->'+str(round(delta.new_share, 1))).rjust(14)
+        flag = ' GREW' if delta.flagged else ''
+        lines.append(''.join(columns)+share+'  '+delta.name+flag)
+    flagged = sorted([delta for delta in deltas if delta.flagged],
+                     key=lambda delta: delta.new_share - delta.base_share, reverse=True)
+    lines.append('  time share grew: '+(', '.join(delta.name+' +'+str(round(delta.new_share - delta.base_share, 1))+'pp'
+                                                  for delta in flagged) if len(flagged) > 0 else 'none'))
+    return '\n'.join(lines)
+
+
+def compare_profiles(paths: list, top=DEFAULT_TOP, sort='cumulative', threshold=DEFAULT_THRESHOLD,
+                     node_function=NODE_FUNCTION) -> str:
+    '''
+    Compares each profile in paths after the first to the first.
+    Returns: the text report.
+    '''
+    assert(len(paths) >= 2)
+    snapshots = [ProfileSnapshot(path, node_function=node_function) for path in paths]
+    reports = []
+    for new in snapshots[1:]:
+        normalized, deltas = compare_snapshots(snapshots[0], new, threshold=threshold)
+        reports.append(format_comparison(snapshots[0], new, normalized, deltas, top=top, sort=sort))
+    return '\n\n'.join(reports)
+
+
+if __name__ == "__main__":
+    # usage: python profile_compare.py base.prof new.prof [more.prof ...]
+    parser = argparse.ArgumentParser(description='Compare pstats profiles against the first one.')
+    parser.add_argument('paths', nargs='+', help='two or more .prof files, the first is the base')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='functions per comparison')
+    parser.add_argument('--sort', default='cumulative', choices=list(SORT_KEYS.keys()),
+                        help='rank functions by absolute delta of this value')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='self time share growth in percentage points that gets flagged')
+    parser.add_argument('--node-function', default=NODE_FUNCTION,
+                        help='function whose call count is the number of search nodes')
+    args = parser.parse_args()
+    if len(args.paths) < 2:
+        parser.error('need at least two profiles')
+    print(compare_profiles(args.paths, top=args.top, sort=args.sort, threshold=args.threshold,
+                           node_function=args.node_function))
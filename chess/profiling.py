@@ -0,0 +1,179 @@
+import argparse
+import cProfile
+import io
+import os
+import pstats
+import sys
+import threading
+import time
+from benchmark import make_benchmark_position
+from perft import perft
+from minimax import SearchContext
+from search import iterative_deepening
+from performance import scripted_game
+from helpers.game_helpers import convert_color_to_player
+
+'''
+Profiling entry point for named scenarios:
+  search: iterative deepening search of a benchmark position to a depth,
+  game: the scripted game of performance.py, played through Game.start,
+  perft: perft of a benchmark position to a depth.
+A scenario runs under cProfile, and optionally under a sampling profiler too.
+Output is a timestamped .prof file (for pstats, snakeviz etc.) and a .txt report
+of the top hot functions, written to the profiles directory.
+'''
+
+SCENARIOS = ['search', 'game', 'perft']
+DEFAULT_OUT_DIR = 'profiles'
+DEFAULT_TOP = 30
+
+
+class SamplingProfiler:
+    '''
+    Statistical profiler, which samples the stacks of all other threads from a
+    background thread every interval seconds. It has much less overhead per call
+    than cProfile, so it's less biased against small hot functions, but it's
+    only accurate given enough samples.
+    '''
+    def __init__(self, interval=0.001):
+        self.interval = interval
+        self.samples = 0 # number of stacks sampled
+        self.self_counts = {} # function -> samples with function on top of stack
+        self.total_counts = {} # function -> samples with function anywhere on stack
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+
+    def _run(self):
+        own_id = threading.get_ident()
+        while not self._stop_event.wait(self.interval):
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id != own_id:
+                    self._sample(frame)
+
+    def _sample(self, frame):
+        self.samples += 1
+        on_stack = set()
+        leaf = True
+        while frame != None:
+            code = frame.f_code
+            function = (os.path.basename(code.co_filename)+':'+str(code.co_firstlineno)
+                        +'('+code.co_name+')')
+            if leaf:
+                self.self_counts[function] = self.self_counts.get(function, 0) + 1
+                leaf = False
+            if function not in on_stack: # count recursive functions once per sample
+                on_stack.add(function)
+                self.total_counts[function] = self.total_counts.get(function, 0) + 1
+            frame = frame.f_back
+
+    def report(self, top=DEFAULT_TOP) -> str:
+        '''
+        Returns the top functions by self and total samples, as text.
+        '''
+        lines = ['Sampling profile: '+str(self.samples)+' samples every '
+                 +str(self.interval * 1000)+'ms']
+        for title, counts in [('self', self.self_counts), ('total', self.total_counts)]:
+            lines.append('')
+            lines.append('   '+title+'%  samples  function')
+            ranked = sorted(counts.items(), key=lambda item: item[1], reverse=True)
+            for function, count in ranked[:top]:
+                share = 100.0 * count / self.samples if self.samples > 0 else 0.0
+                lines.append(str(round(share, 1)).rjust(8)+str(count).rjust(9)+'  '+function)
+        return '\n'.join(lines)+'\n'
+
+
+def run_scenario(scenario, position='opening', depth=3, search_profiles=None):
+    '''
+    Runs scenario once. For the game scenario, searches run on worker threads,
+    and their cProfile.Profiles are appended to search_profiles if given.
+    '''
+    if scenario == 'search':
+        game = make_benchmark_position(position)
+        player = convert_color_to_player(game, game.turn)
+        iterative_deepening(game, player, depth, SearchContext()) # on this thread, unlike start_search
+    elif scenario == 'perft':
+        perft(make_benchmark_position(position), depth)
+    elif scenario == 'game':
+        scripted_game(search_profiles=search_profiles)
+    else:
+        raise Exception('Unknown profiling scenario '+str(scenario))
+
+
+def write_profile(stats: pstats.Stats, label: str, out_dir=DEFAULT_OUT_DIR, top=DEFAULT_TOP,
+                  sampler=None) -> list:
+    '''
+    Writes stats to a timestamped label-YYYYmmdd-HHMMSS.prof file in out_dir,
+    and a .txt report next to it of the top functions by cumulative and self
+    time, plus sampler's report if given.
+    Returns: [.prof path, .txt path].
+    '''
+    os.makedirs(out_dir, exist_ok=True)
+    base = os.path.join(out_dir, label+'-'+time.strftime('%Y%m%d-%H%M%S'))
+    stats.dump_stats(base+'.prof')
+    report = io.StringIO()
+    stats.stream = report
+    report.write(label+': '+str(stats.total_calls)+' calls in '+str(round(stats.total_tt, 3))+'s\n')
+    stats.sort_stats('cumulative').print_stats(top)
+    stats.sort_stats('tottime').print_stats(top)
+    if sampler != None:
+        report.write(sampler.report(top))
+    with open(base+'.txt', 'w') as f:
+        f.write(report.getvalue())
+    return [base+'.prof', base+'.txt']
+
+
+def profile_scenario(scenario, position='opening', depth=3, out_dir=DEFAULT_OUT_DIR,
+                     top=DEFAULT_TOP, sample_interval=None) -> list:
+    '''
+    Runs scenario under cProfile, and under a SamplingProfiler if sample_interval
+    (seconds) is given, then writes the results with write_profile.
+    Profiles of the game scenario's worker thread searches are merged in, so its
+    total time counts each search twice: on the worker, and waiting on the main thread.
+    From 3.12 the main profiler sees the worker threads itself, and the
+    per-search profilers stay empty (only one profiler can be active).
+    Returns: [.prof path, .txt path].
+    '''
+    profiler = cProfile.Profile()
+    search_profiles = []
+    sampler = SamplingProfiler(sample_interval) if sample_interval != None else None
+    if sampler != None:
+        sampler.start()
+    profiler.enable()
+    try:
+        run_scenario(scenario, position=position, depth=depth, search_profiles=search_profiles)
+    finally:
+        profiler.disable()
+        if sampler != None:
+            sampler.stop()
+    stats = pstats.Stats(profiler)
+    for search_profile in search_profiles:
+        stats.add(search_profile)
+    label = scenario if scenario == 'game' else scenario+'-'+position+'-d'+str(depth)
+    return write_profile(stats, label, out_dir=out_dir, top=top, sampler=sampler)
+
+
+if __name__ == "__main__":
+    # usage: python profiling.py search --position middlegame --depth 3 --sample
+    parser = argparse.ArgumentParser(description='Profile a named scenario.')
+    parser.add_argument('scenario', choices=SCENARIOS)
+    parser.add_argument('--position', default='opening',
+                        choices=['opening', 'middlegame', 'tactical', 'endgame'])
+    parser.add_argument('--depth', type=int, default=3)
+    parser.add_argument('--out', default=DEFAULT_OUT_DIR, help='output directory')
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help='functions per report table')
+    parser.add_argument('--sample', action='store_true', help='also run a sampling profiler')
+    parser.add_argument('--interval', type=float, default=0.001, help='sampling interval in seconds')
+    args = parser.parse_args()
+
+    paths = profile_scenario(args.scenario, position=args.position, depth=args.depth,
+                             out_dir=args.out, top=args.top,
+                             sample_interval=args.interval if args.sample else None)
+    print('wrote '+paths[0]+' and '+paths[1])
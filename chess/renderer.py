@@ -0,0 +1,203 @@
+import os
+import sys
+from helpers.game_helpers import clear_terminal
+
+'''
+Terminal rendering of text frames (lists of lines) without spawning a shell.
+On an ANSI terminal the first frame is drawn in full after homing the cursor
+and clearing the screen; later frames only rewrite the changed span of each
+changed line (a move changes a couple of board squares), then move the cursor
+below the frame and clear the rest of the screen (the previous prompt and any
+messages printed since). The diff needs every frame line to take exactly one
+screen row, so lines wider than the terminal are split into rows before
+drawing. Frames are drawn in full again after invalidate(), which callers
+must call after writing anything but the prompt to the screen (it may have
+scrolled), after the terminal is resized, or if it's too short to hold the frame.
+When the output isn't a terminal (eg a pipe), frames are written in full as
+plain text, with no escape sequences.
+'''
+
+ESC = '\x1b['
+HOME = ESC+'H'
+CLEAR_SCREEN = ESC+'2J'+ESC+'3J' # screen and scrollback, like clear
+CLEAR_LINE = ESC+'K' # from the cursor to the end of the line
+CLEAR_BELOW = ESC+'J' # from the cursor to the end of the screen
+
+
+def move_to(row: int, column: int) -> str:
+    '''
+    Escape sequence moving the cursor to row and column, counted from 1.
+    '''
+    return ESC+str(row)+';'+str(column)+'H'
+
+
+def full_frame(lines: list) -> str:
+    '''
+    Escape sequences redrawing the whole screen with lines.
+    '''
+    return HOME+CLEAR_SCREEN+'\n'.join(lines)+'\n'
+
+
+def frame_diff(old: list, new: list) -> str:
+    '''
+    Escape sequences turning a screen showing old (drawn from the top, with the
+    cursor anywhere below it) into one showing new, with the cursor on the line
+    after it. Within a changed line only the span between its first and last
+    changed characters is written.
+    '''
+    parts = []
+    for row, line in enumerate(new):
+        if row >= len(old): # over the previous prompt
+            parts.append(move_to(row + 1, 1)+line+CLEAR_LINE)
+            continue
+        previous = old[row]
+        if line == previous:
+            continue
+        n = min(len(line), len(previous))
+        start = 0
+        while start < n and line[start] == previous[start]:
+            start += 1
+        if len(line) < len(previous): # rewrite the tail, and clear what's left of previous
+            parts.append(move_to(row + 1, start + 1)+line[start:]+CLEAR_LINE)
+            continue
+        end = 0
+        while end < n - start and line[-1 - end] == previous[-1 - end]:
+            end += 1
+        parts.append(move_to(row + 1, start + 1)+line[start:len(line) - end])
+    parts.append(move_to(len(new) + 1, 1)+CLEAR_BELOW)
+    return ''.join(parts)
+
+
+def is_terminal(stream) -> bool:
+    try:
+        return stream.isatty()
+    except (AttributeError, ValueError): # no isatty, or closed
+        return False
+
+
+def terminal_size(stream) -> list:
+    '''
+    [columns, rows] of the terminal of stream, 0s if unknown.
+    '''
+    try:
+        size = os.get_terminal_size(stream.fileno())
+        return [size.columns, size.lines]
+    except (AttributeError, ValueError, OSError):
+        return [0, 0]
+
+
+def fit_lines(lines: list, columns: int) -> list:
+    '''
+    Splits lines into screen rows of less than columns characters, so none
+    wraps (writing into the last column makes some terminals wrap early).
+    '''
+    width = max(columns - 1, 1)
+    rows = []
+    for line in lines:
+        if len(line) <= width:
+            rows.append(line)
+            continue
+        for start in range(0, len(line), width):
+            rows.append(line[start:start + width])
+    return rows
+
+
+def enable_ansi(stream) -> bool:
+    '''
+    Whether escape sequences can be written to stream: it must be a terminal,
+    and on Windows the console has to be switched to VT processing.
+    '''
+    if not is_terminal(stream):
+        return False
+    if os.name != 'nt':
+        return True
+    try:
+        import ctypes
+        import msvcrt
+        kernel32 = ctypes.windll.kernel32
+        handle = msvcrt.get_osfhandle(stream.fileno())
+        mode = ctypes.c_uint32()
+        if not kernel32.GetConsoleMode(handle, ctypes.byref(mode)):
+            return False
+        return bool(kernel32.SetConsoleMode(handle, mode.value | 4)) # ENABLE_VIRTUAL_TERMINAL_PROCESSING
+    except (ImportError, AttributeError, OSError, ValueError):
+        return False
+
+
+class TerminalRenderer:
+    '''
+    Draws frames to a stream, see the module docstring.
+    stream: Output stream, sys.stdout at the time of drawing if None.
+    ansi: Whether to use escape sequences, detected from the stream if None.
+    columns: Terminal width, measured on every draw if None.
+    '''
+    def __init__(self, stream=None, ansi=None, columns=None):
+        self.stream = stream
+        self.ansi = ansi
+        self.columns = columns
+        self.frame: list | None = None # screen rows on screen, None if unknown
+        self.frame_columns = 0 # terminal width frame was drawn at
+
+    def invalidate(self):
+        '''
+        Forgets the screen contents, so the next frame is drawn in full.
+        '''
+        self.frame = None
+
+    def draw(self, lines: list):
+        '''
+        Draws lines, only rewriting what changed since the last frame if possible.
+        '''
+        stream = self.stream if self.stream != None else sys.stdout
+        if self.ansi == None:
+            self.ansi = enable_ansi(stream)
+        if not self.ansi:
+            if is_terminal(stream):
+                clear_terminal() # console without escape sequences, eg legacy Windows
+            text = '\n'.join(lines)+'\n'
+            self.frame = None
+        else:
+            columns, rows = terminal_size(stream)
+            if self.columns != None:
+                columns = self.columns
+            if columns > 0:
+                lines = fit_lines(lines, columns)
+            if self.frame == None or columns != self.frame_columns or 0 < rows <= len(lines):
+                text = full_frame(lines)
+            else:
+                text = frame_diff(self.frame, lines)
+            self.frame, self.frame_columns = list(lines), columns
+        print(text, end='', file=stream, flush=True)
+
+
+if __name__ == "__main__":
+    # usage: python renderer.py ; compares per move render latency of diff and full redraws with clear
+    import random
+    import time
+    from game import Game
+    from helpers.game_helpers import convert_color_to_player
+
+    game = Game()
+    rng = random.Random(0)
+    frames = [game.frame()]
+    for _ in range(60):
+        player = convert_color_to_player(game, game.turn)
+        moves = player.get_all_legal_moves()
+        if len(moves) == 0:
+            break
+        player.attempt_action(rng.choice(moves))
+        frames.append(game.frame())
+    n = len(frames) - 1
+    start = time.perf_counter()
+    for _ in range(100):
+        game.frame()
+    print('frame: '+str(round((time.perf_counter() - start) / 100 * 1e6, 1))+' us')
+    for label, function in [['diff', frame_diff], ['full', lambda old, new: full_frame(new)]]:
+        start = time.perf_counter()
+        written = sum(len(function(old, new)) for old, new in zip(frames, frames[1:]))
+        print(label+': '+str(round((time.perf_counter() - start) / n * 1e6, 1))+' us, '
+              +str(written // n)+' bytes per move')
+    start = time.perf_counter()
+    for _ in range(5):
+        clear_terminal()
+    print('clear: '+str(round((time.perf_counter() - start) / 5 * 1e6, 1))+' us per call')
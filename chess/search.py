@@ -0,0 +1,319 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from helpers.game_helpers import get_opponent
+from minimax import minimax, mvv_lva_order_moves, SearchCancelled, SearchContext
+from misc.constants import *
+
+'''
+Search API that runs minimax on a worker thread, so the caller stays
+responsive. start_search() returns a SearchHandle, which can be cancelled,
+waited on through its result future, and iterated with async for to receive
+throttled progress events.
+
+The search runs on a thread and not a process, as it makes and unmakes moves
+on the live Game, which can't be cheaply shipped to another process.
+The caller must not touch the Game until the search is done.
+'''
+
+
+class PVLine:
+    '''
+    A scored root move together with its principal variation.
+    '''
+    def __init__(self, score: float, pv: list):
+        self.score = score # absolute score, >0 is good for WHITE
+        self.pv = pv # list of moves starting with the root move
+
+    @property
+    def move(self):
+        return self.pv[0]
+
+    def __str__(self):
+        return str(self.score) + ' ' + str(self.pv)
+
+
+class SearchProgress:
+    '''
+    Progress event of a running search.
+    '''
+    def __init__(self, depth: int, lines: list, nodes: int, elapsed: float,
+                 depth_complete: bool, pawn_hit_rate=0.0, eval_share=0.0, eval_hit_rate=0.0):
+        self.depth = depth # depth currently being searched
+        self.lines = lines # PVLines found so far at this depth, best first
+        self.score = lines[0].score # absolute score of best line, >0 is good for WHITE
+        self.pv = lines[0].pv # principal variation of best line
+        self.nodes = nodes # nodes searched so far
+        self.elapsed = elapsed # seconds since search start
+        self.depth_complete = depth_complete # whether depth was fully searched
+        self.pawn_hit_rate = pawn_hit_rate # fraction of pawn structure lookups served by the pawn table
+        self.eval_share = eval_share # fraction of elapsed time spent evaluating leaves
+        self.eval_hit_rate = eval_hit_rate # fraction of leaf evaluations served by the eval cache
+
+    @property
+    def nps(self) -> float:
+        return self.nodes / self.elapsed if self.elapsed > 0 else 0.0
+
+    def __str__(self):
+        return ('depth ' + str(self.depth) + ' score ' + str(self.score) + ' nodes ' + str(self.nodes)
+                + ' nps ' + str(int(self.nps)) + ' pawnhits ' + str(round(100 * self.pawn_hit_rate)) + '%'
+                + ' eval ' + str(round(100 * self.eval_share)) + '%' + ' evalhits ' + str(round(100 * self.eval_hit_rate))
+                + '%' + ' pv ' + str(self.pv))
+
+
+class SearchResult:
+    '''
+    Outcome of a finished (or cancelled) search.
+    '''
+    def __init__(self, lines: list, depth: int, nodes: int, elapsed: float, cancelled: bool,
+                 pawn_hit_rate=0.0, eval_share=0.0, eval_hit_rate=0.0):
+        self.lines = lines # PVLines, best first, up to multipv of them
+        self.best_move = lines[0].move if len(lines) > 0 else None # None only if there are no legal moves
+        self.score = lines[0].score if len(lines) > 0 else float(0)
+        self.pv = lines[0].pv if len(lines) > 0 else []
+        self.depth = depth # deepest depth the lines were taken from
+        self.nodes = nodes
+        self.elapsed = elapsed
+        self.cancelled = cancelled # whether search was stopped before reaching full depth
+        self.pawn_hit_rate = pawn_hit_rate # see SearchProgress
+        self.eval_share = eval_share
+        self.eval_hit_rate = eval_hit_rate
+
+
+class SearchHandle:
+    '''
+    Handle for a search running on a worker thread.
+    future: concurrent.futures.Future resolving to a SearchResult.
+    Iterate with async for to receive SearchProgress events, throttled so that
+    at most one in-depth update is emitted per progress_interval seconds
+    (completed depths are always emitted). Only one consumer should iterate.
+    '''
+    def __init__(self, progress_interval=0.25):
+        self.future = Future()
+        self.progress_interval = progress_interval
+        self.latest_progress: SearchProgress | None = None # latest emitted event
+        self._stop_event = threading.Event()
+        self._events = queue.SimpleQueue() # emitted events, None marks the end
+        self._pending: SearchProgress | None = None # throttled event not yet emitted
+        self._last_emit = 0.0
+        self._thread: threading.Thread | None = None
+
+    def cancel(self):
+        '''
+        Requests the search to stop. The future then resolves to the best
+        move found so far.
+        '''
+        self._stop_event.set()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout=None) -> SearchResult:
+        return self.future.result(timeout=timeout)
+
+    def _report(self, event: SearchProgress, force=False):
+        '''
+        Called from the worker. Emits event unless throttled.
+        '''
+        now = time.monotonic()
+        if force or now - self._last_emit >= self.progress_interval:
+            self._last_emit = now
+            self._pending = None
+            self.latest_progress = event
+            self._events.put(event)
+        else:
+            self._pending = event
+
+    def _finish(self):
+        if self._pending != None:
+            self.latest_progress = self._pending
+            self._events.put(self._pending)
+            self._pending = None
+        self._events.put(None)
+
+    def __aiter__(self):
+        return self._stream()
+
+    async def _stream(self):
+        import asyncio # only async consumers pay for it
+        while True:
+            event = await asyncio.to_thread(self._events.get)
+            if event == None:
+                return
+            yield event
+
+
+def start_search(game, player, depth: int, shuffle=False, progress_interval=0.25,
+                 multipv=1, profiler=None, node_limit=None, deadline=None,
+                 soft_deadline=None) -> SearchHandle:
+    '''
+    Starts an iterative deepening search for player up to 'depth' on a worker
+    thread, and returns its SearchHandle.
+    multipv: Number of best root moves to report lines for.
+    profiler: Optional cProfile.Profile, enabled on the worker thread for the
+    duration of the search (before 3.12 cProfile only sees the thread it was
+    enabled on). It's left empty if another profiler is already active.
+    node_limit: Optional number of nodes after which the search stops.
+    deadline, soft_deadline: Optional time.monotonic() times at which the search
+    stops, and after which it starts no new depth.
+    '''
+    handle = SearchHandle(progress_interval=progress_interval)
+    ctx = SearchContext(stop_event=handle._stop_event, node_limit=node_limit, deadline=deadline,
+                        soft_deadline=soft_deadline)
+
+    def work():
+        try:
+            active = profiler
+            if active != None:
+                try:
+                    active.enable()
+                except ValueError: # 3.12+ allows one profiler at a time, and an active one sees all threads
+                    active = None
+            try:
+                result = iterative_deepening(game, player, depth, ctx, shuffle=shuffle,
+                                             report=handle._report, multipv=multipv)
+            finally:
+                if active != None:
+                    active.disable() # before the result is visible to the caller
+            handle._finish()
+            handle.future.set_result(result)
+        except BaseException as e:
+            handle._finish()
+            handle.future.set_exception(e)
+
+    handle._thread = threading.Thread(target=work, daemon=True)
+    handle._thread.start()
+    return handle
+
+
+def wait_for_search(handle: SearchHandle, interruptible=False, on_progress=None, poll=0.1) -> SearchResult:
+    '''
+    Blocks until the search behind handle finishes.
+    interruptible: If True, a KeyboardInterrupt (Ctrl+C) cancels the search,
+    and we return with the best move found so far.
+    on_progress: Optional callback, called with each newly emitted SearchProgress.
+    '''
+    last_seen = None
+    while True:
+        try:
+            result = handle.result(timeout=poll)
+        except TimeoutError:
+            result = None
+        except KeyboardInterrupt:
+            if not interruptible:
+                handle.cancel()
+                raise
+            handle.cancel()
+            return handle.result()
+        if on_progress != None and handle.latest_progress is not last_seen:
+            last_seen = handle.latest_progress
+            on_progress(last_seen)
+        if result != None:
+            return result
+
+
+def analyze_position(game, player, depth: int, multipv=3) -> SearchResult:
+    '''
+    Synchronous multi-PV analysis of player's position, 'depth' levels deep.
+    Returns: SearchResult with the 'multipv' best root moves in its lines.
+    '''
+    return iterative_deepening(game, player, depth, SearchContext(), multipv=multipv)
+
+
+def iterative_deepening(game, player, depth: int, ctx: SearchContext, shuffle=False,
+                        report=None, multipv=1) -> SearchResult:
+    '''
+    Searches for player's best moves at depth 1, 2, ..., 'depth', each iteration
+    searching the previous iteration's best root moves first.
+    If the search is cancelled, game state is restored and we return the best
+    lines of the deepest depth searched, including a partially searched one.
+    report: Optional callback taking SearchProgress events, and force kwarg.
+    multipv: Number of best root moves to keep lines for.
+    Returns: SearchResult
+    '''
+    start_time = time.monotonic()
+    start_ply = len(game.undo_stack)
+    pawn_table, eval_cache = game.pawn_table, game.eval_cache
+    start_counts = [pawn_table.probes, pawn_table.hits, eval_cache.probes, eval_cache.hits]
+
+    def stats(elapsed) -> list:
+        '''
+        [pawn table hit rate, eval time share, eval cache hit rate] of this search so far.
+        '''
+        pawn_probes, pawn_hits, eval_probes, eval_hits = [count - start for count, start in zip(
+            [pawn_table.probes, pawn_table.hits, eval_cache.probes, eval_cache.hits], start_counts)]
+        return [pawn_hits / pawn_probes if pawn_probes > 0 else 0.0,
+                ctx.eval_time / elapsed if elapsed > 0 else 0.0,
+                eval_hits / eval_probes if eval_probes > 0 else 0.0]
+
+    root_moves = mvv_lva_order_moves(game, player, player.get_all_legal_moves(shuffle=shuffle))
+    best_lines, best_depth = [], 0
+    if len(root_moves) > 0:
+        best_lines = [PVLine(float(0), [root_moves[0]])] # fallback if cancelled before depth 1
+    cancelled = False
+
+    for cur_depth in range(1, depth+1):
+        def on_update(lines):
+            nonlocal best_lines, best_depth
+            best_lines, best_depth = lines, cur_depth
+            if report != None:
+                elapsed = time.monotonic() - start_time
+                report(SearchProgress(cur_depth, lines, ctx.nodes, elapsed, False, *stats(elapsed)))
+        try:
+            search_root(game, player, cur_depth, root_moves, ctx, on_update, multipv=multipv)
+        except SearchCancelled:
+            while len(game.undo_stack) > start_ply:
+                game.unmake_turn()
+            cancelled = True
+            break
+        if report != None and len(best_lines) > 0:
+            elapsed = time.monotonic() - start_time
+            report(SearchProgress(cur_depth, best_lines, ctx.nodes, elapsed, True, *stats(elapsed)), force=True)
+        if ctx.soft_deadline != None and time.monotonic() >= ctx.soft_deadline:
+            break # the next depth wouldn't finish in time
+        # search this iteration's best moves first on the next iteration
+        line_moves = [line.move for line in best_lines]
+        root_moves = line_moves + [move for move in root_moves if move not in line_moves]
+
+    elapsed = time.monotonic() - start_time
+    return SearchResult(best_lines, best_depth, ctx.nodes, elapsed, cancelled, *stats(elapsed))
+
+
+def search_root(game, player, depth: int, root_moves: list, ctx: SearchContext, on_update=None,
+                multipv=1) -> list:
+    '''
+    Alpha-beta search over root_moves for player, 'depth' levels deep, keeping
+    exact scores for the 'multipv' best root moves.
+    All lines share one window: a root move is searched with the score of the
+    current multipv-th best line as its bound, so moves that can't make the
+    cut fail low cheaply. With multipv=1 this is plain alpha-beta at the root.
+    on_update: Optional callback taking the list of best PVLines, called each
+    time it changes. Since root_moves[0] is searched first, the best line so
+    far is always at least as good as root_moves[0].
+    Returns: List of up to 'multipv' PVLines, best first.
+    '''
+    opponent = get_opponent(game, player)
+    is_maximizing_player = (player.color == WHITE)
+    player_polarity = 1 if is_maximizing_player else -1
+    lines = []
+    for move in root_moves:
+        bound = -player_polarity * MAX # score to beat to enter lines
+        if len(lines) == multipv:
+            bound = lines[-1].score
+        alpha, beta = (bound, MAX) if is_maximizing_player else (-MAX, bound)
+        success_status = player.attempt_action(move, True)
+        assert(success_status)
+        child_pv = []
+        move_score, _ = minimax(game, opponent, depth-1, not is_maximizing_player,
+                                alpha, beta, first_call=False, ctx=ctx, pv=child_pv)
+        game.unmake_turn()
+        if len(lines) < multipv or player_polarity * move_score > player_polarity * bound:
+            # move_score is exact, as it is within the window
+            lines.append(PVLine(move_score, [move] + child_pv))
+            lines.sort(key=lambda line: -player_polarity * line.score) # stable, earlier moves win ties
+            del lines[multipv:]
+            if on_update != None:
+                on_update(list(lines))
+
+    return lines
@@ -0,0 +1,331 @@
+import argparse
+import asyncio
+import itertools
+import json
+import multiprocessing
+import secrets
+from concurrent.futures import ProcessPoolExecutor
+from fen import STARTING_FEN
+from game import Game
+from helpers.general_helpers import swap_colors
+from misc.constants import *
+
+'''
+Asyncio TCP server hosting many concurrent games in one process.
+Clients send and receive newline delimited JSON objects:
+  {"type": "new", "mode": "pvp" or "bot", "color": "WHITE", "depth": 2} creates a game,
+  {"type": "join", "game": id} takes the open seat of a pvp game,
+  {"type": "resume", "token": token} reconnects to a seat after a dropped connection,
+  {"type": "move", "move": "e2e4"} plays a move (UCI notation, see uci.py),
+  {"type": "resign"} resigns.
+The server answers "joined" (game id, seat token, color, FEN, moves so far),
+pushes an "update" (move, FEN, turn, result) to both seats after every move,
+and answers bad requests with "error". Moves are validated by
+Game.play. Engine moves of bot games are searched on a process
+pool, so they never block the event loop. A game is dropped once neither
+seat is connected, at once if it's over, else after a grace period for
+resume.
+'''
+
+DEFAULT_PORT = 8765
+DEFAULT_BOT_DEPTH = 2
+RESUME_GRACE = 600 # seconds an unfinished game with no connected seat is kept for resume
+
+_worker_game = None # Game of a bot pool worker
+
+
+def bot_move(fen: str, depth: int) -> str:
+    '''
+    Runs on a pool worker: searches the position of fen for the side to move.
+    Returns: the best move in UCI notation.
+    '''
+    global _worker_game
+    from analyze import search_position
+    if _worker_game == None:
+        _worker_game = Game.from_fen(fen)
+    game = _worker_game
+    game.reset_to_fen(fen)
+    score, move, nodes, reached = search_position(game, depth)
+    return game.move_text(move)
+
+
+class Seat:
+    '''
+    One side of a GameSession: its reconnect token and current connection.
+    '''
+    def __init__(self, color: str):
+        self.color = color
+        self.token = secrets.token_hex(8)
+        self.writer = None # asyncio.StreamWriter, None while disconnected
+
+
+class GameSession:
+    '''
+    A hosted game with its seats. Moves are applied one at a time under lock.
+    '''
+    def __init__(self, game_id: int, mode: str, bot_color=None, bot_depth=DEFAULT_BOT_DEPTH):
+        self.id = game_id
+        self.mode = mode # 'pvp' or 'bot'
+        self.game = Game.from_fen(STARTING_FEN)
+        self.seats = {WHITE: Seat(WHITE), BLACK: Seat(BLACK)}
+        self.bot_color = bot_color # color the engine plays, None in pvp
+        self.bot_depth = bot_depth
+        self.moves = [] # UCI moves played
+        self.result = None # '1-0', '0-1', '1/2-1/2' once over
+        self.termination = None
+        self.lock = asyncio.Lock()
+        self.expiry = None # asyncio.TimerHandle dropping the game if nobody resumes, or None
+
+    def state(self) -> dict:
+        return {'game': self.id, 'fen': self.game.to_fen(), 'turn': self.game.turn, 'moves': self.moves,
+                'result': self.result, 'termination': self.termination}
+
+    def play(self, text: str):
+        '''
+        Validates and plays UCI move text for the side to move (see Game.play),
+        then records whether the game is over.
+        Complains with Exception if the move is ill formed or illegal.
+        '''
+        game = self.game
+        game.play([text])
+        self.moves.append(text)
+        if game.winner != None:
+            self.result, self.termination = game.result(), game.termination()
+
+    def end(self, result: str, termination: str):
+        self.result, self.termination = result, termination
+        self.game.winner = 'DRAW' if result == '1/2-1/2' else (WHITE if result == '1-0' else BLACK)
+
+
+class GameServer:
+    '''
+    Hosts GameSessions for any number of client connections.
+    bot_workers: Processes searching engine moves, os.cpu_count() if None.
+    resume_grace: Seconds an unfinished game with no connected seat is kept.
+    '''
+    def __init__(self, bot_workers=None, bot_depth=DEFAULT_BOT_DEPTH, resume_grace=RESUME_GRACE):
+        self.sessions = {} # game id -> GameSession
+        self.tokens = {} # seat token -> [GameSession, color]
+        self.bot_workers = bot_workers
+        self.bot_depth = bot_depth
+        self.resume_grace = resume_grace
+        self._pool = None # ProcessPoolExecutor, started with the first bot game
+        self._writers = set() # open client connections
+        self._ids = itertools.count(1)
+        self._bot_tasks = set() # running engine move tasks
+        self.server = None # asyncio.Server
+        self.moves_played = 0
+
+    async def start(self, host='127.0.0.1', port=DEFAULT_PORT):
+        '''
+        Starts listening. Port 0 picks a free port, see self.port.
+        '''
+        self.server = await asyncio.start_server(self.handle_client, host, port, backlog=1024)
+        return self.server
+
+    @property
+    def port(self) -> int:
+        return self.server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self.server != None:
+            self.server.close()
+            for writer in list(self._writers):
+                writer.close() # ends handle_client, which wait_closed waits for since 3.12
+            await self.server.wait_closed()
+        for task in list(self._bot_tasks):
+            task.cancel()
+        if self._pool != None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    async def send(self, writer, message: dict):
+        if writer == None or writer.is_closing():
+            return
+        writer.write((json.dumps(message)+'\n').encode())
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    async def broadcast(self, session: GameSession, message: dict):
+        await asyncio.gather(*[self.send(seat.writer, message) for seat in session.seats.values()])
+
+    async def handle_client(self, reader, writer):
+        '''
+        Serves one connection until it closes. Seats it holds stay in their
+        game, so the client can resume them from another connection.
+        '''
+        held = [] # seats bound to this connection
+        self._writers.add(writer)
+        try:
+            while True:
+                line = await reader.readline()
+                if line == b'':
+                    break
+                try:
+                    message = json.loads(line)
+                    await self.dispatch(message, writer, held)
+                except Exception as error:
+                    await self.send(writer, {'type': 'error', 'message': str(error)})
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            for seat in held:
+                if seat.writer is writer:
+                    seat.writer = None
+                    self.release(self.tokens[seat.token][0] if seat.token in self.tokens else None)
+            writer.close()
+
+    async def dispatch(self, message: dict, writer, held: list):
+        kind = message.get('type')
+        if kind == 'new':
+            mode = message.get('mode', 'pvp')
+            if mode not in ['pvp', 'bot']:
+                raise Exception('Unknown mode '+str(mode))
+            color = message.get('color', WHITE)
+            if color not in BWSET:
+                raise Exception('Unknown color '+str(color))
+            session = GameSession(next(self._ids), mode,
+                                  bot_color=swap_colors(color) if mode == 'bot' else None,
+                                  bot_depth=max(1, int(message.get('depth', self.bot_depth))))
+            self.sessions[session.id] = session
+            for seat in session.seats.values():
+                self.tokens[seat.token] = [session, seat.color]
+            await self.seat(session, color, writer, held)
+            self.schedule_bot(session)
+        elif kind == 'join':
+            session = self.sessions.get(message.get('game'))
+            if session == None or session.mode != 'pvp':
+                raise Exception('No pvp game '+str(message.get('game')))
+            open_seats = [seat for seat in session.seats.values() if seat.writer == None and seat not in held]
+            if len(open_seats) == 0 or len([seat for seat in session.seats.values() if seat.writer != None]) != 1:
+                raise Exception('Game '+str(session.id)+' has no open seat')
+            await self.seat(session, open_seats[0].color, writer, held)
+        elif kind == 'resume':
+            if message.get('token') not in self.tokens:
+                raise Exception('Unknown token')
+            session, color = self.tokens[message['token']]
+            await self.seat(session, color, writer, held)
+        elif kind == 'move':
+            session, color = self.held_session(message, held)
+            async with session.lock:
+                if session.result != None:
+                    raise Exception('Game is over')
+                if session.game.turn != color:
+                    raise Exception('Not your turn')
+                session.play(str(message.get('move')))
+                self.moves_played += 1
+            await self.broadcast(session, dict(type='update', move=message['move'], **session.state()))
+            self.schedule_bot(session)
+        elif kind == 'resign':
+            session, color = self.held_session(message, held)
+            async with session.lock:
+                if session.result == None:
+                    session.end('0-1' if color == WHITE else '1-0', 'resignation')
+            await self.broadcast(session, dict(type='update', move=None, **session.state()))
+            self.release(session)
+        else:
+            raise Exception('Unknown message type '+str(kind))
+
+    async def seat(self, session: GameSession, color: str, writer, held: list):
+        '''
+        Binds the color seat of session to writer and sends the game state.
+        '''
+        seat = session.seats[color]
+        seat.writer = writer
+        if seat not in held: # eg a retried resume
+            held.append(seat)
+        if session.expiry != None:
+            session.expiry.cancel()
+            session.expiry = None
+        await self.send(writer, dict(type='joined', token=seat.token, color=color, mode=session.mode,
+                                     **session.state()))
+
+    def held_session(self, message: dict, held: list) -> list:
+        '''
+        [GameSession, color] of the seat of this connection in message's game
+        (the only one if message doesn't name a game).
+        '''
+        seats = [[self.tokens[seat.token][0], seat.color] for seat in held if seat.token in self.tokens]
+        if 'game' in message:
+            seats = [[session, color] for session, color in seats if session.id == message['game']]
+        if len(seats) != 1:
+            raise Exception('Name the game of the move' if len(seats) > 1 else 'Not seated in that game')
+        return seats[0]
+
+    def release(self, session: GameSession | None):
+        '''
+        Drops session if none of its seats is connected: at once if it's over,
+        else after resume_grace seconds unless a seat is resumed meanwhile.
+        '''
+        if session == None or session.id not in self.sessions:
+            return
+        if any(seat.writer != None for seat in session.seats.values()):
+            return
+        if session.result != None:
+            self.drop(session)
+        elif session.expiry == None:
+            session.expiry = asyncio.get_running_loop().call_later(self.resume_grace, self.release_expired, session)
+
+    def release_expired(self, session: GameSession):
+        session.expiry = None
+        if all(seat.writer == None for seat in session.seats.values()):
+            self.drop(session)
+
+    def drop(self, session: GameSession):
+        if session.expiry != None:
+            session.expiry.cancel()
+            session.expiry = None
+        self.sessions.pop(session.id, None)
+        for seat in session.seats.values():
+            self.tokens.pop(seat.token, None)
+
+    def schedule_bot(self, session: GameSession):
+        '''
+        Starts the engine move if it's the bot's turn.
+        '''
+        if session.bot_color == session.game.turn and session.result == None:
+            task = asyncio.get_running_loop().create_task(self.play_bot(session))
+            self._bot_tasks.add(task)
+            task.add_done_callback(self._bot_tasks.discard)
+
+    async def play_bot(self, session: GameSession):
+        if self._pool == None:
+            # spawned, as forked workers would inherit the open sockets and keep them from closing
+            self._pool = ProcessPoolExecutor(max_workers=self.bot_workers,
+                                             mp_context=multiprocessing.get_context('spawn'))
+        fen = session.game.to_fen()
+        text = await asyncio.get_running_loop().run_in_executor(self._pool, bot_move, fen, session.bot_depth)
+        async with session.lock:
+            if session.result != None or session.game.to_fen() != fen:
+                return # resigned meanwhile
+            session.play(text)
+            self.moves_played += 1
+        await self.broadcast(session, dict(type='update', move=text, **session.state()))
+        self.release(session) # over while its player was away
+
+
+async def serve(host: str, port: int, bot_workers=None, bot_depth=DEFAULT_BOT_DEPTH):
+    server = GameServer(bot_workers=bot_workers, bot_depth=bot_depth)
+    await server.start(host, port)
+    print('Serving on '+host+':'+str(server.port))
+    try:
+        await server.server.serve_forever()
+    finally:
+        await server.close()
+
+
+if __name__ == "__main__":
+    # usage: python server.py [--host 127.0.0.1] [--port 8765] [--bot-workers N]
+    parser = argparse.ArgumentParser(description='Multiplayer chess server, newline delimited JSON over TCP.')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--bot-workers', type=int, default=None, help='engine processes (default: CPU count)')
+    parser.add_argument('--bot-depth', type=int, default=DEFAULT_BOT_DEPTH, help='default engine search depth')
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, args.bot_workers, args.bot_depth))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,248 @@
+import struct
+import sys
+from array import array
+from misc.constants import *
+from undo_stack import (STRIDE, PIECE, FROM, TO, CAPTURED, CAPTURED_SQUARE, FLAGS, PREV_CASTLING,
+                        PREV_EP_SQUARE, PREV_HALFMOVE_CLOCK, NO_PIECE, CASTLE_FLAG, PROMOTED_FLAG,
+                        BLACK_TURN_FLAG, WHITE_CHECK_FLAG, BLACK_CHECK_FLAG, to_square, from_square)
+
+'''
+Compact binary snapshots of positions and games, for shipping them to worker
+processes or persisting live games without pickling the Game object graph.
+
+A position snapshot is 38 bytes: 32 bytes of 4 bit piece codes (square 0 in
+the low nibble of byte 0), a flags byte (bit 0 set if BLACK is to move, bits
+1-4 the castling rights, bits 5 and 6 set if WHITE, BLACK is in check, so
+decoding skips the check computation), the signed en passant square, and the
+halfmove clock and fullmove number as little endian uint16.
+A game snapshot is the position snapshot of its start, a uint16 move count and
+a uint16 per move: from square | to square << 6, plus CASTLE_BIT for castles
+(given as the KING's move). PAWNs reaching the last row promote to QUEEN.
+'''
+
+POSITION = struct.Struct('<32sBbHH')
+POSITION_SIZE = POSITION.size
+MOVE_COUNT = struct.Struct('<H')
+CASTLE_BIT = 1 << 12
+BLACK_CODE = 8 # added to the piece code of BLACK pieces
+
+PIECE_CODES = {PAWN: 1, KNIGHT: 2, BISHOP: 3, ROOK: 4, QUEEN: 5, KING: 6}
+CODE_RANKS = [None] * 16 # piece code -> [color, rank], None for empty
+for rank, code in PIECE_CODES.items():
+    CODE_RANKS[code] = [WHITE, rank]
+    CODE_RANKS[code | BLACK_CODE] = [BLACK, rank]
+
+
+def piece_code(piece) -> int:
+    return PIECE_CODES[piece.rank] | (BLACK_CODE if piece.color == BLACK else 0)
+
+
+def pack_position(codes, turn: str, castling: int, ep_square: int, halfmove_clock: int,
+                  fullmove_number: int, checks: list) -> bytes:
+    '''
+    Packs 64 piece codes (0 for empty), the position state and
+    checks, [WHITE in check, BLACK in check].
+    '''
+    placement = bytes([codes[i] | codes[i + 1] << 4 for i in range(0, 64, 2)])
+    flags = (turn == BLACK) | castling << 1 | bool(checks[0]) << 5 | bool(checks[1]) << 6
+    return POSITION.pack(placement, flags, ep_square, halfmove_clock, fullmove_number)
+
+
+def game_checks(game) -> list:
+    '''
+    [WHITE in check, BLACK in check] in game.
+    '''
+    if game.p1.color == WHITE:
+        return [game.p1.in_check, game.p2.in_check]
+    return [game.p2.in_check, game.p1.in_check]
+
+
+def board_codes(game) -> bytearray:
+    '''
+    Piece codes of the 64 squares of game.
+    '''
+    codes = bytearray(64)
+    board = game.board
+    for piece in game.pieces_by_id:
+        pos = piece.pos
+        if pos != None and board.get_piece(pos) is piece:
+            codes[(pos[0] - 1) + 8 * (pos[1] - 1)] = piece_code(piece)
+    return codes
+
+
+def encode_position(game) -> bytes:
+    '''
+    Position snapshot of the current position of game.
+    '''
+    state = game.state
+    return pack_position(board_codes(game), state.turn, state.castling, state.ep_square,
+                         state.halfmove_clock, state.fullmove_number, game_checks(game))
+
+
+def unpack_position(data, offset=0) -> list:
+    '''
+    Unpacks a position snapshot at offset of data.
+    Returns: the reset_to_position arguments [placement, turn, castling,
+    ep_square, halfmove_clock, fullmove_number, checks], with placement in FEN order.
+    '''
+    packed, flags, ep_square, halfmove_clock, fullmove_number = POSITION.unpack_from(data, offset)
+    codes = [0] * 64
+    for i, byte in enumerate(packed):
+        codes[2 * i] = byte & 15
+        codes[2 * i + 1] = byte >> 4
+    placement = []
+    for y in range(8, 0, -1):
+        base = 8 * (y - 1)
+        for x in range(1, 9):
+            code = codes[base + x - 1]
+            if code != 0:
+                if CODE_RANKS[code] == None:
+                    raise Exception('Invalid piece code '+str(code)+' in position snapshot')
+                color, rank = CODE_RANKS[code]
+                placement.append([color, rank, [x, y]])
+    return [placement, BLACK if flags & 1 else WHITE, flags >> 1 & 15, ep_square, halfmove_clock, fullmove_number,
+            [bool(flags & 32), bool(flags & 64)]]
+
+
+def decode_position(data, game=None):
+    '''
+    Sets game (a new Game if None) up from a position snapshot.
+    Returns: game.
+    '''
+    if len(data) < POSITION_SIZE:
+        raise Exception('Truncated position snapshot')
+    fields = unpack_position(data)
+    if game == None:
+        from game import Game
+        from debug import Debug
+        game = Game(debug=Debug(board_state={})) # no pieces
+    game.reset_to_position(*fields)
+    return game
+
+
+def encode_game(game) -> bytes:
+    '''
+    Game snapshot of game: its start position and the moves on its undo stack.
+    The start position is recovered by walking the undo stack back over piece
+    codes, so game itself is left untouched.
+    '''
+    stack = game.undo_stack
+    data = stack.data
+    codes = board_codes(game)
+    pieces = game.pieces_by_id
+    state = game.state
+    castling, ep_square, halfmove_clock = state.castling, state.ep_square, state.halfmove_clock
+    fullmove_number, turn = state.fullmove_number, state.turn
+    checks = game_checks(game)
+    moves = array('H', bytes(2 * len(stack)))
+    for ply in range(len(stack) - 1, -1, -1):
+        i = ply * STRIDE
+        flags, start, end = data[i + FLAGS], data[i + FROM], data[i + TO]
+        if flags & CASTLE_FLAG:
+            rook_square = (start + end) // 2
+            codes[start], codes[end] = codes[end], 0
+            codes[data[i + CAPTURED_SQUARE]], codes[rook_square] = codes[rook_square], 0
+            moves[ply] = start | end << 6 | CASTLE_BIT
+        else:
+            code = codes[end]
+            if flags & PROMOTED_FLAG:
+                code = piece_code(pieces[data[i + PIECE]]) & BLACK_CODE | PIECE_CODES[PAWN]
+            codes[start], codes[end] = code, 0
+            if data[i + CAPTURED] != NO_PIECE:
+                codes[data[i + CAPTURED_SQUARE]] = piece_code(pieces[data[i + CAPTURED]])
+            moves[ply] = start | end << 6
+        turn = BLACK if flags & BLACK_TURN_FLAG else WHITE
+        checks = [bool(flags & WHITE_CHECK_FLAG), bool(flags & BLACK_CHECK_FLAG)]
+        if turn == BLACK:
+            fullmove_number -= 1
+        castling, ep_square, halfmove_clock = data[i + PREV_CASTLING], data[i + PREV_EP_SQUARE], data[i + PREV_HALFMOVE_CLOCK]
+    if sys.byteorder != 'little':
+        moves.byteswap()
+    return (pack_position(codes, turn, castling, ep_square, halfmove_clock, fullmove_number, checks)
+            + MOVE_COUNT.pack(len(moves)) + moves.tobytes())
+
+
+def pack_move(move, color: str) -> int:
+    '''
+    Packs a Game move of the player with color as a uint16.
+    '''
+    if type(move) == str:
+        row = 0 if color == WHITE else 56
+        return (row + 4) | (row + (6 if move == KING else 2)) << 6 | CASTLE_BIT
+    return to_square(move[0]) | to_square(move[1]) << 6
+
+
+def unpack_move(value: int):
+    '''
+    Game move ([[x0, y0], [x1, y1]] or 'KING'/'QUEEN') of a packed uint16.
+    '''
+    from_index, to_index = value & 63, value >> 6 & 63
+    if value & CASTLE_BIT:
+        return KING if to_index > from_index else QUEEN
+    return [from_square(from_index), from_square(to_index)]
+
+
+def unpack_moves(data) -> list:
+    '''
+    Moves of a game snapshot, as Game moves ([[x0, y0], [x1, y1]] or 'KING'/'QUEEN').
+    '''
+    count, = MOVE_COUNT.unpack_from(data, POSITION_SIZE)
+    start = POSITION_SIZE + MOVE_COUNT.size
+    if len(data) < start + 2 * count:
+        raise Exception('Truncated game snapshot')
+    packed = array('H', data[start:start + 2 * count])
+    if sys.byteorder != 'little':
+        packed.byteswap()
+    return [unpack_move(value) for value in packed]
+
+
+def decode_game(data, game=None, validate=False):
+    '''
+    Sets game (a new Game if None) up from a game snapshot, replaying its moves
+    so the undo stack matches the encoded game.
+    validate: Whether to check every move is legal. Without it moves are trusted
+    to be pseudolegal, and only checked not to leave the KING in check.
+    Complains with Exception if a move can't be played.
+    Returns: game.
+    '''
+    from helpers.game_helpers import convert_color_to_player
+    game = decode_position(data, game)
+    for move in unpack_moves(data):
+        player = convert_color_to_player(game, game.turn)
+        if not player.attempt_action(move, move_pseudolegal_assumption=not validate):
+            raise Exception('Illegal move in game snapshot: '+str(move))
+    return game
+
+
+if __name__ == "__main__":
+    # usage: python snapshot.py ; compares snapshot size and encode/decode rates with pickle
+    import pickle
+    import random
+    import time
+    from fen import STARTING_FEN
+    from game import Game
+    from helpers.game_helpers import convert_color_to_player
+
+    def rate(function, n: int) -> int:
+        start = time.perf_counter()
+        for _ in range(n):
+            function()
+        return int(n / (time.perf_counter() - start))
+
+    game = Game.from_fen(STARTING_FEN)
+    rng = random.Random(0)
+    for _ in range(60):
+        moves = convert_color_to_player(game, game.turn).get_all_legal_moves()
+        if len(moves) == 0:
+            break
+        convert_color_to_player(game, game.turn).attempt_action(rng.choice(moves))
+    target = Game.from_fen(STARTING_FEN)
+    position, record, pickled = encode_position(game), encode_game(game), pickle.dumps(game)
+    print('after '+str(len(game.undo_stack))+' plies: '+game.to_fen())
+    print('size: position '+str(len(position))+' B, game '+str(len(record))+' B, pickle '+str(len(pickled))+' B')
+    print('encode/s: position '+str(rate(lambda: encode_position(game), 5000))
+          +', game '+str(rate(lambda: encode_game(game), 2000))
+          +', pickle '+str(rate(lambda: pickle.dumps(game), 500)))
+    print('decode/s: position '+str(rate(lambda: decode_position(position, target), 2000))
+          +', game '+str(rate(lambda: decode_game(record, target), 20))
+          +', pickle '+str(rate(lambda: pickle.loads(pickled), 500)))
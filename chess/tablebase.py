@@ -0,0 +1,521 @@
+import mmap
+import os
+import struct
+import time
+from array import array
+from helpers.game_helpers import get_opponent
+from helpers.state_helpers import get_castling_rights
+from misc.constants import *
+from misc.board_tables import (KING_MOVES, KNIGHT_MOVES, KING_MASK, KNIGHT_MASK, PAWN_ATTACK_MASK, RAYS, LINE,
+                               BETWEEN) # precomputed by build_tables.py
+
+'''
+Locally generated endgame tablebases for small material sets, where the
+stronger side has a lone KING as opponent (KQK, KRK, KPK, KBNK).
+
+Generation is retrograde analysis over every position of the material set:
+checkmates are found first, then positions are resolved ply by ply by
+un-moving pieces from already resolved positions. Work is split across a
+process pool. Each table is written as a compact file of one byte per
+position, which is memory mapped for probing, so a probe is a single index
+computation and byte read.
+
+Tables are generated with WHITE as the stronger side. Positions where BLACK
+is stronger are probed with colors flipped. Squares here are 0-63, ie
+file + 8 * rank with A1 = 0. As the engine only promotes to QUEEN, so do
+the tables.
+'''
+
+MATERIALS = {'KQK': 'Q', 'KRK': 'R', 'KPK': 'P', 'KBNK': 'BN'} # stronger side's pieces besides its KING
+DEPENDENCIES = {'KPK': ['KQK']} # tables probed through promotions
+LETTER_ORDER = 'QRBNP' # order of pieces in material names
+RANK_LETTER = {QUEEN: 'Q', ROOK: 'R', BISHOP: 'B', KNIGHT: 'N', PAWN: 'P'}
+
+MAGIC = b'TCTB'
+VERSION = 1
+HEADER = struct.Struct('<4sB8sIB') # magic, version, material, number of entries, pawn layout
+FILE_SUFFIX = '.tctb'
+
+# per position byte codes, from the side to move's perspective
+DRAW_CODE = 0
+WIN_BASE = 0 # 1..127: side to move mates in that many plies
+LOSS_BASE = 128 # 128..254: side to move is mated in (code - 128) plies
+ILLEGAL = 255 # unreachable, or not the canonical index of its position
+
+# probe outcomes
+WIN = 'WIN'
+LOSS = 'LOSS'
+DRAW = 'DRAW'
+
+# generation time states
+UNRESOLVED = -1
+INVALID = -2
+ESCAPE = 0xFFFF # counter of BLACK positions with a drawing capture, can never be lost
+
+TRIANGLE = [f + 8 * r for r in range(4) for f in range(r, 4)] # A1-D1-D4, 10 squares
+HALF_BOARD = [f + 8 * r for r in range(8) for f in range(4)] # files A-D, 32 squares
+
+
+def attacked(target: int, letters: str, squares: list, occupied: int) -> bool:
+    '''
+    Whether target is attacked by WHITE pieces letters (eg 'KQ') on squares.
+    occupied: bitmask of occupied squares, for slider blocking.
+    '''
+    for letter, sq in zip(letters, squares):
+        if letter == 'K':
+            if KING_MASK[sq] >> target & 1:
+                return True
+        elif letter == 'N':
+            if KNIGHT_MASK[sq] >> target & 1:
+                return True
+        elif letter == 'P':
+            if PAWN_ATTACK_MASK[sq] >> target & 1:
+                return True
+        else:
+            line = LINE[sq][target]
+            if line == 0 or BETWEEN[sq][target] & occupied:
+                continue
+            if letter == 'Q' or (letter == 'R' and line == 1) or (letter == 'B' and line == 2):
+                return True
+    return False
+
+
+class Layout:
+    '''
+    Indexing scheme of a material set. An index is built from the WHITE KING's
+    square (reduced by symmetry), the squares of the other WHITE pieces, the
+    BLACK KING's square and the side to move (0 WHITE, 1 BLACK).
+    Pawnless sets use all 8 board symmetries, putting the WHITE KING in the
+    A1-D1-D4 triangle. Sets with pawns can only be mirrored left-right, putting
+    the WHITE KING on files A-D.
+    '''
+    def __init__(self, material: str):
+        self.material = material
+        self.letters = 'K' + MATERIALS[material] # WHITE pieces, in index order
+        self.pawns = 'P' in self.letters
+        self.king_squares = HALF_BOARD if self.pawns else TRIANGLE
+        self.king_index = {sq: i for i, sq in enumerate(self.king_squares)}
+        self.num_squares = len(self.letters) + 1 # with BLACK KING
+        self.size = len(self.king_squares) * 64 ** (self.num_squares - 1) * 2
+
+    def canonical(self, squares: list) -> list:
+        '''
+        Maps squares [WHITE KING, other WHITE pieces..., BLACK KING] to the
+        representative of its symmetry class.
+        '''
+        king = squares[0]
+        if king & 7 > 3:
+            squares = [sq ^ 7 for sq in squares] # mirror files
+        if self.pawns:
+            return squares
+        if squares[0] >> 3 > 3:
+            squares = [sq ^ 56 for sq in squares] # mirror ranks
+        file, rank = squares[0] & 7, squares[0] >> 3
+        if rank >= file:
+            transposed = [((sq & 7) << 3) | (sq >> 3) for sq in squares]
+            if rank > file or transposed < squares: # KING on the diagonal, tie break on other pieces
+                squares = transposed
+        return squares
+
+    def index(self, squares: list, black_to_move: int) -> int:
+        '''
+        Index of canonical squares with side to move.
+        '''
+        index = self.king_index[squares[0]]
+        for sq in squares[1:]:
+            index = index * 64 + sq
+        return index * 2 + black_to_move
+
+    def decode(self, index: int):
+        '''
+        Inverse of index. Returns squares, black_to_move.
+        '''
+        black_to_move = index & 1
+        index >>= 1
+        squares = []
+        for i in range(self.num_squares - 1):
+            squares.append(index & 63)
+            index >>= 6
+        squares.append(self.king_squares[index])
+        squares.reverse()
+        return squares, black_to_move
+
+    def valid(self, squares: list, black_to_move: int) -> bool:
+        '''
+        Whether decoded squares are a legal position stored at its own index.
+        '''
+        if len(set(squares)) != len(squares):
+            return False
+        white_king, black_king = squares[0], squares[-1]
+        if KING_MASK[white_king] >> black_king & 1:
+            return False
+        for letter, sq in zip(self.letters, squares):
+            if letter == 'P' and (sq < 8 or sq >= 56):
+                return False
+        if self.canonical(squares) != squares:
+            return False
+        if not black_to_move:
+            # BLACK can't be in check with WHITE to move
+            occupied = sum(1 << sq for sq in squares)
+            if attacked(black_king, self.letters, squares[:-1], occupied):
+                return False
+        return True
+
+
+class Tablebase:
+    '''
+    Memory mapped table of a single material set.
+    '''
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        header = self._file.read(HEADER.size)
+        magic, version, material, num_entries, pawns = HEADER.unpack(header)
+        if magic != MAGIC or version != VERSION:
+            self._file.close()
+            raise Exception('Not a version '+str(VERSION)+' tablebase file: '+str(path))
+        self.material = material.rstrip(b'\0').decode()
+        self.layout = Layout(self.material)
+        assert(num_entries == self.layout.size)
+        self._data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def close(self):
+        self._data.close()
+        self._file.close()
+
+    def probe_squares(self, squares: list, black_to_move: int) -> int:
+        '''
+        Returns byte code of position with squares [WHITE KING, other WHITE pieces..., BLACK KING].
+        '''
+        squares = self.layout.canonical(squares)
+        return self._data[HEADER.size + self.layout.index(squares, black_to_move)]
+
+
+class Tablebases:
+    '''
+    Collection of tablebases loaded from a directory, probed from Game positions.
+    '''
+    def __init__(self, directory):
+        self.directory = directory
+        self.tables: dict[str, Tablebase] = {}
+        for material in MATERIALS:
+            path = os.path.join(directory, material + FILE_SUFFIX)
+            if os.path.exists(path):
+                self.tables[material] = Tablebase(path)
+        self.max_pieces = max([len(material) for material in self.tables], default=0)
+        self.hits = 0 # successful probes
+
+    def close(self):
+        for table in self.tables.values():
+            table.close()
+
+    def probe(self, game, player):
+        '''
+        Probes game's position with player to move.
+        Returns: [WIN, LOSS or DRAW, plies to mate] from player's perspective,
+        or None if the position isn't covered by a loaded table.
+        '''
+        opponent = get_opponent(game, player)
+        if len(player.pieces) + len(opponent.pieces) > self.max_pieces:
+            return None
+        strong, weak = (player, opponent) if len(player.pieces) >= len(opponent.pieces) else (opponent, player)
+        if len(weak.pieces) != 1 or weak.king == None or strong.king == None:
+            return None
+        if len(strong.pieces) == 1:
+            return [DRAW, 0]
+        extras = [piece for piece in strong.pieces.values() if piece.rank != KING]
+        extras.sort(key=lambda piece: LETTER_ORDER.index(RANK_LETTER[piece.rank]))
+        material = 'K' + ''.join(RANK_LETTER[piece.rank] for piece in extras) + 'K'
+        table = self.tables.get(material)
+        if table == None or True in get_castling_rights(strong):
+            return None
+        flip = 56 if strong.color == BLACK else 0 # tables have WHITE as the stronger side
+        squares = [(piece.pos[0] - 1 + 8 * (piece.pos[1] - 1)) ^ flip
+                   for piece in [strong.king] + extras + [weak.king]]
+        code = table.probe_squares(squares, 0 if player is strong else 1)
+        if code == ILLEGAL:
+            return None
+        self.hits += 1
+        return decode_code(code)
+
+    def probe_score(self, game, player):
+        '''
+        Probes game's position with player to move, and returns its exact
+        minimax score (absolute, >0 is good for WHITE), or None.
+        '''
+        result = self.probe(game, player)
+        if result == None:
+            return None
+        outcome, plies = result
+        if outcome == DRAW:
+            return float(0)
+        polarity = 1 if player.color == WHITE else -1
+        if outcome == LOSS:
+            polarity = -polarity
+        return polarity * (MAX - plies)
+
+
+def decode_code(code: int):
+    '''
+    Converts a table byte into [WIN, LOSS or DRAW, plies to mate].
+    '''
+    if code == DRAW_CODE:
+        return [DRAW, 0]
+    if code < LOSS_BASE:
+        return [WIN, code - WIN_BASE]
+    return [LOSS, code - LOSS_BASE]
+
+
+# Generation
+
+def _black_moves(layout: Layout, squares: list):
+    '''
+    BLACK to move in squares. Returns (in_check, has_legal_move, has_capture, children),
+    where children is the set of canonical indices of non capturing moves.
+    '''
+    letters = layout.letters
+    black_king = squares[-1]
+    white = squares[:-1]
+    occupied = sum(1 << sq for sq in white) # without BLACK KING, so it can't block rays behind itself
+    in_check = attacked(black_king, letters, white, occupied)
+    has_move, has_capture = False, False
+    children = set()
+    for target in KING_MOVES[black_king]:
+        if target in white:
+            i = white.index(target)
+            if i == 0:
+                continue
+            remaining_letters = letters[:i] + letters[i+1:]
+            remaining = white[:i] + white[i+1:]
+            if not attacked(target, remaining_letters, remaining, occupied & ~(1 << target)):
+                has_move, has_capture = True, True
+        elif not attacked(target, letters, white, occupied):
+            has_move = True
+            children.add(layout.index(layout.canonical(white + [target]), 0))
+    return in_check, has_move, has_capture, children
+
+
+def _promotion_wins(layout: Layout, squares: list, queen_table: Tablebase) -> int:
+    '''
+    WHITE to move in squares. Returns fewest plies to mate over WHITE's
+    promotions into a lost position for BLACK, or -1 if there are none.
+    '''
+    best = -1
+    occupied = sum(1 << sq for sq in squares)
+    for i, letter in enumerate(layout.letters):
+        sq = squares[i]
+        if letter != 'P' or sq >> 3 != 6 or occupied >> (sq + 8) & 1:
+            continue
+        code = queen_table.probe_squares([squares[0], sq + 8, squares[-1]], 1)
+        if code != ILLEGAL and code >= LOSS_BASE:
+            plies = code - LOSS_BASE + 1
+            if best == -1 or plies < best:
+                best = plies
+    return best
+
+
+def _init_chunk(args):
+    '''
+    Worker: classifies indices [start, end). Returns start, state array, counter array
+    and [index, plies] of WHITE positions won through promotion.
+    '''
+    material, start, end, directory = args
+    layout = Layout(material)
+    queen_table = None
+    if layout.pawns:
+        queen_table = Tablebase(os.path.join(directory, 'KQK' + FILE_SUFFIX))
+    states = array('h', [UNRESOLVED]) * (end - start)
+    counters = array('H', [0]) * (end - start)
+    promotions = []
+    for index in range(start, end):
+        squares, black_to_move = layout.decode(index)
+        if not layout.valid(squares, black_to_move):
+            states[index - start] = INVALID
+            continue
+        if black_to_move:
+            in_check, has_move, has_capture, children = _black_moves(layout, squares)
+            if not has_move:
+                if in_check:
+                    states[index - start] = 0 # checkmated, lost in 0 plies
+                continue # stalemate stays unresolved, a draw
+            counters[index - start] = ESCAPE if has_capture else len(children)
+        elif queen_table != None:
+            plies = _promotion_wins(layout, squares, queen_table)
+            if plies != -1:
+                promotions.append([index, plies])
+    if queen_table != None:
+        queen_table.close()
+    return start, states, counters, promotions
+
+
+def _white_unmoves(layout: Layout, squares: list) -> set:
+    '''
+    BLACK to move in squares. Returns canonical indices of the WHITE to move
+    positions it can be reached from by one non capturing WHITE move.
+    '''
+    predecessors = set()
+    occupied = sum(1 << sq for sq in squares)
+    black_king = squares[-1]
+    for i, letter in enumerate(layout.letters):
+        sq = squares[i]
+        origins = []
+        if letter == 'K':
+            origins = [t for t in KING_MOVES[sq] if not occupied >> t & 1 and not KING_MASK[black_king] >> t & 1]
+        elif letter == 'N':
+            origins = [t for t in KNIGHT_MOVES[sq] if not occupied >> t & 1]
+        elif letter == 'P':
+            if sq >> 3 >= 2 and not occupied >> (sq - 8) & 1:
+                origins.append(sq - 8)
+                if sq >> 3 == 3 and not occupied >> (sq - 16) & 1:
+                    origins.append(sq - 16) # two leap from second rank
+        else:
+            rays = []
+            if letter in 'QR':
+                rays += RAYS[(sq, False)]
+            if letter in 'QB':
+                rays += RAYS[(sq, True)]
+            for ray in rays:
+                for t in ray:
+                    if occupied >> t & 1:
+                        break
+                    origins.append(t)
+        for origin in origins:
+            previous = squares[:i] + [origin] + squares[i+1:]
+            predecessors.add(layout.index(layout.canonical(previous), 0))
+    return predecessors
+
+
+def _black_unmoves(layout: Layout, squares: list) -> set:
+    '''
+    WHITE to move in squares. Returns canonical indices of the BLACK to move
+    positions it can be reached from by one non capturing BLACK KING move.
+    '''
+    predecessors = set()
+    occupied = sum(1 << sq for sq in squares)
+    white_king = squares[0]
+    for origin in KING_MOVES[squares[-1]]:
+        if occupied >> origin & 1 or KING_MASK[white_king] >> origin & 1:
+            continue
+        predecessors.add(layout.index(layout.canonical(squares[:-1] + [origin]), 1))
+    return predecessors
+
+
+def _unmove_chunk(args):
+    '''
+    Worker: for each index of a chunk of newly resolved positions, returns its
+    predecessors, flattened.
+    '''
+    material, indices = args
+    layout = Layout(material)
+    predecessors = []
+    for index in indices:
+        squares, black_to_move = layout.decode(index)
+        if black_to_move:
+            predecessors.extend(_white_unmoves(layout, squares))
+        else:
+            predecessors.extend(_black_unmoves(layout, squares))
+    return predecessors
+
+
+def _chunks(items, n):
+    size = max(1, (len(items) + n - 1) // n)
+    return [items[i:i+size] for i in range(0, len(items), size)]
+
+
+def generate(material: str, directory, processes=None, verbose=False) -> str:
+    '''
+    Generates the tablebase of material by retrograde analysis, and writes it
+    to directory. Tables it depends on must already exist in directory.
+    processes: Number of worker processes, os.cpu_count() if None. With 1,
+    everything runs in this process.
+    Returns: Path of the written table.
+    '''
+    assert(material in MATERIALS)
+    start_time = time.monotonic()
+    layout = Layout(material)
+    size = layout.size
+    processes = processes if processes != None else (os.cpu_count() or 1)
+    executor = None
+    if processes > 1:
+        from concurrent.futures import ProcessPoolExecutor # only generation needs the pool
+        executor = ProcessPoolExecutor(max_workers=processes)
+    run = executor.map if executor != None else map
+    num_chunks = processes * 8 if executor != None else 1
+
+    states = array('h')
+    counters = array('H')
+    promotions = {} # plies -> WHITE positions won through promotion in that many plies
+    bounds = list(range(0, size, (size + num_chunks - 1) // num_chunks)) + [size]
+    jobs = [(material, bounds[i], bounds[i+1], directory) for i in range(len(bounds) - 1)]
+    for chunk_start, chunk_states, chunk_counters, chunk_promotions in run(_init_chunk, jobs):
+        assert(chunk_start == len(states))
+        states.extend(chunk_states)
+        counters.extend(chunk_counters)
+        for index, plies in chunk_promotions:
+            promotions.setdefault(plies, []).append(index)
+
+    frontier = [index for index in range(1, size, 2) if states[index] == 0] # checkmates
+    plies = 0
+    while len(frontier) > 0 or any(p > plies for p in promotions):
+        if verbose:
+            print(material+': '+str(len(frontier))+' positions at '+str(plies)+' plies')
+        next_frontier = []
+        for index in promotions.pop(plies + 1, []):
+            if states[index] == UNRESOLVED:
+                states[index] = plies + 1
+                next_frontier.append(index)
+        jobs = [(material, chunk) for chunk in _chunks(frontier, num_chunks)]
+        for predecessors in run(_unmove_chunk, jobs):
+            for index in predecessors:
+                if states[index] != UNRESOLVED:
+                    continue
+                if index & 1 == 0: # WHITE to move, and can move into a lost position
+                    states[index] = plies + 1
+                    next_frontier.append(index)
+                elif counters[index] != ESCAPE:
+                    counters[index] -= 1
+                    if counters[index] == 0: # every BLACK move leads to a lost position
+                        states[index] = plies + 1
+                        next_frontier.append(index)
+        frontier = next_frontier
+        plies += 1
+    if executor != None:
+        executor.shutdown()
+
+    data = bytearray(size)
+    for index in range(size):
+        state = states[index]
+        if state == INVALID:
+            data[index] = ILLEGAL
+        elif state != UNRESOLVED:
+            data[index] = (WIN_BASE + state) if state & 1 else (LOSS_BASE + state)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, material + FILE_SUFFIX)
+    with open(path, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, material.encode(), size, 1 if layout.pawns else 0))
+        f.write(data)
+    if verbose:
+        print(material+': wrote '+path+' in '+str(round(time.monotonic() - start_time, 1))+'s')
+    return path
+
+
+def generate_all(materials: list, directory, processes=None, verbose=False):
+    '''
+    Generates tables of materials, along with tables they depend on which
+    are missing from directory.
+    '''
+    for material in materials:
+        for dependency in DEPENDENCIES.get(material, []):
+            if not os.path.exists(os.path.join(directory, dependency + FILE_SUFFIX)):
+                generate_all([dependency], directory, processes, verbose)
+        generate(material, directory, processes, verbose)
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description='Generate endgame tablebases.')
+    parser.add_argument('materials', nargs='*', default=list(MATERIALS), help='eg KQK KRK KPK KBNK')
+    parser.add_argument('--out', default='tablebases', help='output directory')
+    parser.add_argument('--processes', type=int, default=None)
+    args = parser.parse_args()
+    generate_all(args.materials, args.out, args.processes, verbose=True)
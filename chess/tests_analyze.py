@@ -0,0 +1,68 @@
+import json
+import os
+import tempfile
+import unittest
+
+from analyze import analyze_game, analyze_archive, load_progress
+from fen import STARTING_FEN
+
+GAMES = '''[White "A"]
+[Black "B"]
+[Result "*"]
+
+1. e4 e5 2. Qh5 Nc6 *
+
+[White "C"]
+[Black "D"]
+[Result "*"]
+
+1. d4 e5 2. dxe5 *
+
+[White "E"]
+[Black "F"]
+[Result "*"]
+
+1. e4 Ke3 *
+'''
+
+
+class TestAnalyze(unittest.TestCase):
+
+    '''
+    Tests batch PGN analysis and resuming it.
+    '''
+
+    def test_analyze_game(self):
+        record = analyze_game([7, STARTING_FEN, ['e4', 'e5', 'Qg4', 'd5'], 2, None, 200])
+        self.assertEqual(record['game'], 7)
+        self.assertEqual(record['positions'], 4)
+        plies = record['plies']
+        self.assertEqual([ply['move'] for ply in plies], ['e4', 'e5', 'Qg4', 'd5'])
+        self.assertEqual([ply['color'] for ply in plies[:2]], ['WHITE', 'BLACK'])
+        self.assertEqual(plies[3]['best'], 'Nf6')
+        self.assertTrue(plies[3]['blunder']) # d5 hangs the c8 BISHOP
+        self.assertEqual(plies[3]['played_score'] - plies[3]['score'], plies[3]['loss'])
+        self.assertFalse(any(ply['blunder'] for ply in plies[:3]))
+
+    def test_archive_and_resume(self):
+        with tempfile.TemporaryDirectory() as directory:
+            pgn_path = os.path.join(directory, 'games.pgn')
+            output = os.path.join(directory, 'out.jsonl')
+            with open(pgn_path, 'w') as file:
+                file.write(GAMES)
+            throughput = analyze_archive(pgn_path, output, depth=1, workers=2, limit=2, verbose=False)
+            self.assertEqual([throughput.games, throughput.positions], [2, 7])
+            with open(output, 'a') as file:
+                file.write('{"game": 2, "pli') # interrupted write
+            self.assertEqual(load_progress(output), set([0, 1]))
+            throughput = analyze_archive(pgn_path, output, depth=1, workers=1, verbose=False)
+            self.assertEqual([throughput.games, throughput.errors, throughput.skipped], [1, 1, 2])
+            with open(output) as file:
+                records = [json.loads(line) for line in file]
+            self.assertEqual(sorted(record['game'] for record in records), [0, 1, 2])
+            self.assertEqual(records[-1]['white'], 'E')
+            self.assertTrue(records[-1]['error'].startswith('ply 2'))
+
+
+if __name__ == '__main__':
+    unittest.main()
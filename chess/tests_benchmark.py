@@ -0,0 +1,70 @@
+import unittest
+import copy
+import subprocess
+import sys
+
+from benchmark import (BenchmarkCase, run_suite, compare, make_benchmark_position, measure_import_time, SEARCH, PERFT,
+                       IMPORT_BUDGET)
+from misc.constants import *
+
+
+class TestBenchmark(unittest.TestCase):
+
+    '''
+    Tests benchmark reports and their comparison against a baseline.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cases = [BenchmarkCase('endgame-search-d1', SEARCH, 'endgame', 1),
+                     BenchmarkCase('endgame-perft-d2', PERFT, 'endgame', 2)]
+        cls.report = run_suite(cls.cases, verbose=False, import_runs=1)
+        cls.import_time = cls.report['import_time']
+        cls.report['import_time'] = IMPORT_BUDGET / 2 # timing noise stays out of the comparisons
+
+    def test_report(self):
+        results = self.report['cases']
+        self.assertEqual(results['endgame-perft-d2']['nodes'], 191)
+        self.assertEqual(results['endgame-perft-d2']['best_move'], None)
+        self.assertTrue(results['endgame-search-d1']['peak_memory'] > 0)
+        self.assertTrue(self.import_time > 0)
+        self.assertEqual(run_suite(self.cases, measure_memory=False, verbose=False, import_runs=0)['signature'],
+                         self.report['signature']) # node counts are deterministic
+
+    def test_compare(self):
+        self.assertEqual(compare(self.report, self.report), [])
+        baseline = copy.deepcopy(self.report)
+        baseline['cases']['endgame-perft-d2']['wall_time'] /= 2
+        baseline['cases']['endgame-search-d1']['nodes'] += 1
+        baseline['signature'] = '0'
+        problems = compare(self.report, baseline, threshold=0.1)
+        self.assertEqual(len(problems), 3)
+        self.assertTrue(problems[0].startswith('endgame-search-d1: nodes'))
+        self.assertTrue('wall_time regressed' in problems[1])
+        self.assertTrue(problems[2].startswith('node signature changed'))
+
+    def test_import_budget(self):
+        report = copy.deepcopy(self.report)
+        report['import_time'] = IMPORT_BUDGET * 2
+        self.assertEqual(len(compare(report, self.report)), 1)
+        self.assertTrue(compare(report, self.report)[0].startswith('import time'))
+        report['import_time'] = None
+        self.assertEqual(compare(report, self.report), [])
+
+    def test_startup_imports(self):
+        code = 'import sys, main; print(" ".join(sorted(sys.modules)))'
+        loaded = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True,
+                                check=True).stdout.split()
+        for module in ['unittest', 'tests', 'asyncio', 'concurrent.futures', 'search', 'minimax', 'book',
+                       'tablebase', 'cProfile', 'pstats']:
+            self.assertNotIn(module, loaded) # loaded on demand only
+        self.assertTrue(measure_import_time('game', runs=1) < 1)
+
+    def test_positions(self):
+        game = make_benchmark_position('middlegame')
+        self.assertEqual(len(game.turn_log), 6)
+        self.assertEqual(game.turn, WHITE)
+
+
+if __name__ == '__main__':
+    unittest.main()
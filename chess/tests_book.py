@@ -0,0 +1,89 @@
+import unittest
+import os
+import random
+import tempfile
+
+from game import Game
+from book import PolyglotBook, polyglot_key, write_book, encode_move, decode_move
+from misc.constants import *
+
+
+class TestPolyglotKey(unittest.TestCase):
+
+    '''
+    Tests Polyglot keys against the reference keys of the book format specification.
+    '''
+
+    def test_reference_keys(self):
+        reference = [([], 0x463b96181691fc9c),
+                     (['E2E4'], 0x823c9b50fd114196),
+                     (['E2E4', 'D7D5'], 0x0756b94461c50fb0),
+                     (['E2E4', 'D7D5', 'E4E5'], 0x662fafb965db29d4),
+                     (['E2E4', 'D7D5', 'E4E5', 'F7F5'], 0x22a48b5a8e47ff78),
+                     (['E2E4', 'D7D5', 'E4E5', 'F7F5', 'E1E2'], 0x652a607ca3f242c1),
+                     (['E2E4', 'D7D5', 'E4E5', 'F7F5', 'E1E2', 'E8F7'], 0x00fdd303c946bdd9),
+                     (['A2A4', 'B7B5', 'H2H4', 'B5B4', 'C2C4'], 0x3c8123ea7b067637),
+                     (['A2A4', 'B7B5', 'H2H4', 'B5B4', 'C2C4', 'B4C3', 'A1A3'], 0x5c3f9b829b279560)]
+        for moves, key in reference:
+            game = Game()
+            game.play(moves)
+            self.assertEqual(polyglot_key(game), key, msg=str(moves))
+
+
+class TestPolyglotBook(unittest.TestCase):
+
+    '''
+    Tests lookups and move picking from a memory mapped book.
+    '''
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, 'book.bin')
+        game = Game()
+        start_key = polyglot_key(game)
+        game.play(['E2E4'])
+        e4_key = polyglot_key(game)
+        rng = random.Random(0)
+        filler = [[rng.getrandbits(64), 0, 1] for i in range(500)]
+        write_book(self.path, filler + [[start_key, encode_move([[5, 2], [5, 4]], WHITE), 3],
+                                        [start_key, encode_move([[4, 2], [4, 4]], WHITE), 1],
+                                        [start_key, encode_move([[1, 2], [1, 3]], WHITE), 0],
+                                        [e4_key, encode_move([[3, 7], [3, 5]], BLACK), 1]])
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_find_and_pick(self):
+        game = Game()
+        with PolyglotBook(self.path) as book:
+            self.assertEqual(len(book), 504)
+            moves = book.get_moves(game)
+            self.assertEqual(len(moves), 3)
+            self.assertEqual(moves[0], [[[5, 2], [5, 4]], 3])
+            picks = [str(book.pick_move(game, random.Random(i))) for i in range(200)]
+            self.assertTrue(str([[5, 2], [5, 4]]) in picks)
+            self.assertTrue(str([[4, 2], [4, 4]]) in picks)
+            self.assertFalse(str([[1, 2], [1, 3]]) in picks) # zero weight
+            self.assertEqual(book.find_entries(12345), [])
+
+    def test_make_best_move_uses_book(self):
+        game = Game()
+        game.load_book(self.path)
+        random.seed(1)
+        self.assertTrue(game.p1.make_best_move(depth=3)) # would take seconds if searched
+        self.assertEqual(len(game.turn_log), 1)
+        self.assertTrue(game.board.piece_exists([5, 4]) or game.board.piece_exists([4, 4]))
+        if game.board.piece_exists([5, 4]):
+            self.assertTrue(game.p2.make_best_move(depth=3))
+            self.assertEqual(game.board.get_piece([3, 5]).rank, PAWN)
+        game.book.close()
+
+    def test_decode_castle(self):
+        game = Game()
+        game.play(['E2E4', 'E7E5', 'G1F3', 'B8C6', 'F1C4', 'G8F6'])
+        self.assertEqual(decode_move(game, encode_move(KING, WHITE)), KING)
+        self.assertEqual(decode_move(game, encode_move([[5, 1], [7, 1]], WHITE)), [[5, 1], [7, 1]])
+
+
+if __name__ == '__main__':
+    unittest.main()
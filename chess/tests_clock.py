@@ -0,0 +1,103 @@
+import time
+import unittest
+
+from analyze import search_position
+from clock import ChessClock, TimeControl, TimeManager, format_time, complexity, deadlines
+from fen import STARTING_FEN
+from game import Game
+from tests_fen import KIWIPETE_FEN
+from tournament import EngineConfig, Adjudication, play_game
+from misc.constants import *
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestClock(unittest.TestCase):
+
+    '''
+    Tests chess clocks, the time manager and time limited searches.
+    '''
+
+    def test_time_control(self):
+        control = TimeControl.parse('5+3')
+        self.assertEqual([control.initial, control.increment, control.delay], [300, 3, 0])
+        self.assertEqual(str(control), '5+3')
+        self.assertEqual(str(TimeControl.parse('0.5d2')), '0.5d2')
+        self.assertEqual(TimeControl.parse('1').initial, 60)
+        for spec in ['5+', 'x', '-1']:
+            with self.assertRaises(Exception):
+                TimeControl.parse(spec)
+        self.assertEqual([format_time(3723), format_time(245), format_time(9.46), format_time(-1)],
+                         ['1:02:03', '4:05', '0:09.4', '0:00.0'])
+
+    def test_increment(self):
+        fake = FakeTime()
+        clock = ChessClock(TimeControl(60, increment=2), now=fake)
+        clock.start(WHITE)
+        fake.now = 5
+        self.assertEqual(clock.time_left(WHITE), 55)
+        self.assertEqual(clock.press(), 5)
+        self.assertEqual([clock.time_left(WHITE), clock.running], [57, BLACK])
+        fake.now = 15
+        clock.stop()
+        fake.now = 100 # paused
+        self.assertEqual(clock.time_left(BLACK), 50)
+        clock.start(BLACK)
+        fake.now = 160
+        self.assertTrue(clock.flagged(BLACK))
+        clock.press()
+        self.assertEqual(clock.remaining[BLACK], -10) # no increment after the flag fell
+        self.assertEqual(str(clock), 'WHITE 0:57*  BLACK 0:00.0')
+
+    def test_delay(self):
+        fake = FakeTime()
+        clock = ChessClock(TimeControl(60, delay=3), now=fake)
+        clock.start(WHITE)
+        fake.now = 2
+        self.assertEqual(clock.press(), 0) # within the delay
+        fake.now = 12
+        self.assertEqual(clock.press(), 7)
+        self.assertEqual([clock.remaining[WHITE], clock.remaining[BLACK], clock.moves[BLACK]], [60, 53, 1])
+
+    def test_time_manager(self):
+        manager = TimeManager()
+        soft, hard = manager.allocate(60, increment=1)
+        self.assertAlmostEqual(soft, 2.75)
+        self.assertAlmostEqual(hard, 8.25)
+        self.assertEqual(manager.allocate(1, moves_to_go=1), [0.5, 0.5]) # at most half the remaining time
+        self.assertTrue(manager.allocate(60, complexity=1.5)[0] > manager.allocate(60, complexity=0.6)[0])
+        self.assertAlmostEqual(TimeManager(overhead=0.5).allocate(60)[0], 1.5)
+        self.assertAlmostEqual(manager.allocate(60, delay=2)[0], 4.0) # the delay is free
+        busy, forced = Game.from_fen(KIWIPETE_FEN), Game.from_fen('7k/8/8/8/8/8/6q1/7K w - - 0 1')
+        self.assertTrue(complexity(busy.p1) > 1 > complexity(forced.p1))
+        self.assertEqual(deadlines([1, 2], start=10), [11, 12])
+
+    def test_search_deadlines(self):
+        game = Game.from_fen(KIWIPETE_FEN)
+        start = time.monotonic()
+        score, move, nodes, depth = search_position(game, 20, 0.3)
+        self.assertTrue(time.monotonic() - start < 2)
+        self.assertTrue(move != None and depth < 20)
+        self.assertEqual(game.to_fen(), KIWIPETE_FEN)
+        _, _, _, depth = search_position(Game.from_fen(STARTING_FEN), 20, 60, soft_time=0)
+        self.assertEqual(depth, 1) # no new depth started after the soft limit
+
+    def test_clocked_game(self):
+        game = Game()
+        game.clock = ChessClock(TimeControl.parse('1+1'))
+        game.reset()
+        self.assertEqual([str(game.clock.control), game.clock.running], ['1+1', None])
+        engines = [EngineConfig.parse('name=a,depth=20,tc=0.00001'), EngineConfig.parse('name=b,depth=20,tc=0.00001')]
+        record = play_game([0, [STARTING_FEN, []], engines[0], engines[1], Adjudication()])
+        self.assertEqual(record['termination'], 'time forfeit')
+        self.assertEqual([record['result'], record['plies']], ['0-1', 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from epd import parse_operations, parse_epd, run_suite, summarize
+
+SUITE = ['6k1/5ppp/8/8/8/8/8/R5K1 w - - bm Ra8#; id "mate1";',
+         '4k3/3p4/2p5/8/8/8/8/3QK3 w - - am Qxd7+; id "poisoned; pawn";',
+         '4k3/8/8/3q4/8/4N3/8/4K3 w - - bm Ke2; id "missed";',
+         '4k3/1P6/8/8/8/8/8/4K3 w - - bm b8=N; id "underpromotion";']
+
+
+class TestEpd(unittest.TestCase):
+
+    '''
+    Tests EPD parsing and the test suite runner.
+    '''
+
+    def test_parse(self):
+        self.assertEqual(parse_operations('bm Nf3 Ng5; id "a; b";c0 "x";'),
+                         {'bm': ['Nf3', 'Ng5'], 'id': ['a; b'], 'c0': ['x']})
+        fen, operations = parse_epd(SUITE[0])
+        self.assertEqual(fen, '6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+        self.assertEqual(operations, {'bm': ['Ra8#'], 'id': ['mate1']})
+        self.assertEqual(parse_epd('  # comment'), None)
+        with self.assertRaises(Exception):
+            parse_epd('8/8/8 w')
+
+    def test_run_suite(self):
+        results = run_suite([parse_epd(line) for line in SUITE], depth=2, workers=1)
+        self.assertEqual([result['id'] for result in results], ['mate1', 'poisoned; pawn', 'missed', 'underpromotion'])
+        self.assertTrue(results[0]['solved'])
+        self.assertEqual(results[0]['move'], 'Ra8#')
+        self.assertTrue(results[0]['time_to_solution'] <= results[0]['seconds'])
+        self.assertTrue(results[1]['solved'])
+        self.assertNotEqual(results[1]['move'], 'Qxd7+')
+        self.assertEqual([results[2]['solved'], results[2]['move'], results[2]['time_to_solution']],
+                         [False, 'Nxd5', None])
+        self.assertTrue('error' in results[3])
+        summary = summarize(results, 1.0)
+        self.assertEqual([summary['positions'], summary['solved'], summary['errors']], [4, 2, 1])
+        self.assertEqual(summary['nodes'], sum(result['nodes'] for result in results[:3]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+import unittest
+
+from game import Game
+from eval_cache import EvalCache
+from minimax import value, get_static_score
+from search import analyze_position
+from tests_fen import KIWIPETE_FEN
+from helpers.game_helpers import convert_color_to_player
+from misc.constants import *
+
+
+class TestEvalCache(unittest.TestCase):
+
+    '''
+    Tests the static evaluation cache and its use by value.
+    '''
+
+    def test_cache(self):
+        cache = EvalCache(bits=2)
+        self.assertEqual([cache.get(5), cache.keys], [None, None]) # allocated on first store
+        cache.store(5, 1.5)
+        self.assertEqual(cache.get(5), 1.5)
+        cache.store(9, -2.0) # same slot as 5
+        self.assertEqual([cache.get(5), cache.get(9)], [None, -2.0])
+        self.assertEqual(len(cache.keys), 4)
+        self.assertEqual([cache.probes, cache.hits, cache.hit_rate], [4, 2, 0.5])
+        cache.clear()
+        self.assertEqual([cache.get(9), cache.hits, cache.probes], [None, 0, 1])
+
+    def test_value(self):
+        game = Game.from_fen(KIWIPETE_FEN)
+        white, black = game.p1, game.p2
+        score = get_static_score(game)
+        self.assertEqual(value(game, white, True), score)
+        self.assertEqual(value(game, black, False), score)
+        self.assertEqual(value(game, white, False), -score)
+        self.assertEqual([game.eval_cache.probes, game.eval_cache.hits], [3, 2])
+        game.play(['e1g1', 'e8c8'])
+        self.assertEqual(value(game, white, True), get_static_score(game))
+        self.assertEqual(game.eval_cache.hits, 2)
+        game.unmake_turn()
+        game.unmake_turn()
+        self.assertEqual(value(game, white, True), score)
+        self.assertEqual(game.eval_cache.hits, 3)
+
+    def test_new_game(self):
+        game = Game.from_fen('6k1/5ppp/8/8/8/8/5PPP/R5K1 w - - 0 1')
+        result = analyze_position(game, convert_color_to_player(game, WHITE), 3) # with transpositions
+        self.assertTrue(0 < result.eval_hit_rate < 1)
+        self.assertTrue(game.eval_cache.hits > 0)
+        game.reset()
+        self.assertEqual([game.eval_cache.keys, game.eval_cache.probes], [None, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+
+from game import Game
+from fen import parse_fen, STARTING_FEN
+from perft import perft, POSITIONS
+from position_state import NO_SQUARE, WHITE_KING_SIDE, BLACK_QUEEN_SIDE
+from misc.constants import *
+
+KIWIPETE_FEN = 'r3k2r/p1ppqpb1/bn2pnp1/3PN3/1p2P3/2N2Q1p/PPPBBPPP/R3K2R w KQkq - 0 1'
+POSITION3_FEN = '8/2p5/3p4/KP5r/1R3p1k/8/4P1P1/8 w - - 0 1'
+
+
+class TestFen(unittest.TestCase):
+
+    '''
+    Tests FEN parsing, Game.from_fen, Game.reset_to_fen and Game.to_fen.
+    '''
+
+    def test_round_trip(self):
+        self.assertEqual(Game().to_fen(), STARTING_FEN)
+        for fen in [STARTING_FEN, KIWIPETE_FEN, POSITION3_FEN,
+                    'r1bqkbnr/pppp1ppp/2n5/4p3/4P3/5N2/PPPP1PPP/RNBQKB1R b KQkq - 2 3']:
+            self.assertEqual(Game.from_fen(fen).to_fen(), fen)
+
+    def test_state_fields(self):
+        game = Game.from_fen('rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w Kq f6 0 3')
+        self.assertEqual(game.turn, WHITE)
+        self.assertEqual(game.state.castling, WHITE_KING_SIDE | BLACK_QUEEN_SIDE)
+        self.assertEqual(game.state.ep_square, 45) # f6
+        self.assertEqual([game.state.halfmove_clock, game.state.fullmove_number], [0, 3])
+        self.assertEqual(game.p1.king.pos, [5, 1])
+        self.assertEqual(len(game.p2.pieces), 16)
+        game.play(['E5F6']) # en passant
+        self.assertEqual(game.board.get_piece([6, 5]), None)
+        self.assertEqual(game.to_fen(), 'rnbqkbnr/ppp1p1pp/5P2/3p4/8/8/PPPP1PPP/RNBQKBNR b Kq - 0 3')
+
+    def test_black_to_move_and_moves(self):
+        game = Game.from_fen('4k3/8/8/8/8/8/4P3/4K3 b - - 5 40')
+        self.assertEqual(game.turn, BLACK)
+        game.play(['E8D8', 'E2E4'])
+        self.assertEqual(game.to_fen(), '3k4/8/8/8/4P3/8/8/4K3 b - e3 0 41')
+        game.unmake_turn()
+        game.unmake_turn()
+        self.assertEqual(game.to_fen(), '4k3/8/8/8/8/8/4P3/4K3 b - - 5 40')
+
+    def test_castling_sanitized(self):
+        # no ROOK on h1 and the black KING has left e8
+        game = Game.from_fen('r6r/4k3/8/8/8/8/8/R3K3 w KQkq - 0 1')
+        self.assertEqual(game.to_fen(), 'r6r/4k3/8/8/8/8/8/R3K3 w Q - 0 1')
+
+    def test_epd_fields(self):
+        self.assertEqual(parse_fen('8/8/8/8/8/8/8/K6k w - -')[3:], [NO_SQUARE, 0, 1])
+
+    def test_invalid(self):
+        for fen in ['', 'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP w KQkq - 0 1',
+                    'rnbqkbnr/pppppppp/9/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+                    'rnbqkbnr/ppppxppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - 0 1',
+                    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR x KQkq - 0 1',
+                    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KX - 0 1',
+                    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq e4 0 1',
+                    'rnbqkbnr/pppppppp/8/8/8/8/PPPPPPPP/RNBQKBNR w KQkq - a 1']:
+            with self.assertRaises(Exception):
+                parse_fen(fen)
+
+    def test_reset_reuses_objects(self):
+        game = Game()
+        board, p1, pieces = game.board, game.p1, list(game.pieces_by_id)
+        game.play(['E2E4', 'E7E5'])
+        game.reset_to_fen(KIWIPETE_FEN)
+        self.assertTrue(game.board is board and game.p1 is p1)
+        self.assertTrue(all(piece is pieces[i] for i, piece in enumerate(game.pieces_by_id)))
+        self.assertEqual(len(game.turn_log), 0)
+        self.assertEqual(game.to_fen(), KIWIPETE_FEN)
+        self.assertEqual(perft(game, 2), POSITIONS['kiwipete'][3][1])
+        game.reset_to_fen(POSITION3_FEN)
+        self.assertEqual(len(game.pieces_by_id), 10)
+        self.assertEqual(perft(game, 3), POSITIONS['position3'][3][2])
+
+
+if __name__ == '__main__':
+    unittest.main()
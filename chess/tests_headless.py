@@ -0,0 +1,77 @@
+import unittest
+from unittest.mock import patch
+
+from game import Game
+from fen import STARTING_FEN
+from tests_fen import KIWIPETE_FEN
+from misc.constants import *
+
+
+class TestHeadless(unittest.TestCase):
+
+    '''
+    Tests the headless Game API: play, legal_moves, result and engine_move.
+    '''
+
+    def test_fools_mate(self):
+        game = Game()
+        with patch('builtins.input') as read, patch('builtins.print') as printed:
+            packed = game.pack_move([[5, 7], [5, 5]])
+            self.assertEqual(game.play(['f2f3']), None)
+            self.assertEqual(game.play([packed, [[7, 2], [7, 4]], 'D8H4']), '0-1')
+        read.assert_not_called()
+        printed.assert_not_called()
+        self.assertEqual([game.winner, game.termination()], [BLACK, 'checkmate'])
+        self.assertEqual(game.legal_moves(), [])
+        with self.assertRaisesRegex(Exception, 'Game is over'):
+            game.play(['a2a3'])
+
+    def test_bad_moves(self):
+        game = Game()
+        with self.assertRaisesRegex(Exception, 'Illegal move e2e5'):
+            game.play(['e2e4', 'e7e5', 'e2e5'])
+        self.assertEqual(len(game.undo_stack), 2) # the moves before it stay played
+        for move in ['e2', 'i2i4', 'e2e4x']:
+            with self.assertRaisesRegex(Exception, 'Invalid move'):
+                game.play([move])
+        with self.assertRaisesRegex(Exception, 'Underpromotion'):
+            game.play(['a7a8n'])
+        with self.assertRaisesRegex(Exception, 'Illegal move'):
+            game.play(['d7d5']) # BLACK's PAWN on WHITE's turn
+
+    def test_notations(self):
+        game = Game.from_fen('r3k3/1P6/8/8/8/8/8/R3K2R w KQq - 0 1')
+        self.assertEqual([game.parse_move('e1g1'), game.parse_move('kc'), game.parse_move('QUEEN')],
+                         [KING, KING, QUEEN])
+        self.assertEqual(game.move_text([[2, 7], [2, 8]]), 'b7b8q')
+        self.assertEqual(game.move_text(KING), 'e1g1')
+        self.assertEqual(game.play(['e1c1', 'e8f8', 'b7b8q']), None)
+        self.assertEqual(game.to_fen(), 'rQ3k2/8/8/8/8/8/8/2KR3R b - - 0 2')
+        game = Game.from_fen(KIWIPETE_FEN)
+        moves = game.legal_moves()
+        self.assertEqual(len(moves), 48)
+        self.assertEqual([game.parse_move(game.pack_move(move)) for move in moves], moves)
+        self.assertEqual(game.legal_moves(notation=True), [game.move_text(move) for move in moves])
+        self.assertEqual(len(Game().legal_moves(notation=True)), 20)
+
+    def test_draws(self):
+        game = Game()
+        shuffle = ['g1f3', 'g8f6', 'f3g1', 'f6g8']
+        self.assertEqual(game.play(shuffle + shuffle), '1/2-1/2')
+        self.assertEqual(game.termination(), 'threefold repetition')
+        game = Game.from_fen('7k/8/6Q1/8/8/8/8/K7 w - - 0 1')
+        self.assertEqual(game.play(['g6f7']), '1/2-1/2')
+        self.assertEqual([game.winner, game.termination()], ['DRAW', 'stalemate'])
+        game.reset_to_fen(STARTING_FEN)
+        self.assertEqual([game.winner, game.result()], [None, None])
+
+    def test_engine_move(self):
+        game = Game.from_fen('6k1/5ppp/8/8/8/8/8/R5K1 w - - 0 1')
+        self.assertEqual(game.engine_move(depth=2), [[1, 1], [1, 8]])
+        self.assertEqual(game.result(), '1-0')
+        with self.assertRaisesRegex(Exception, 'Game is over'):
+            game.engine_move(depth=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
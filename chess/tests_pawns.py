@@ -0,0 +1,86 @@
+import unittest
+
+from game import Game
+from pawns import (PawnTable, pawn_masks, pawn_score, structure_score, PASSED_BONUS, ISOLATED_PENALTY,
+                   DOUBLED_PENALTY, SHELTER_BONUS)
+from search import analyze_position
+from position_state import PIECE_KEYS
+from undo_stack import to_square
+from helpers.game_helpers import convert_color_to_player
+from misc.constants import *
+
+
+def expected_pawn_key(game) -> int:
+    '''
+    Pawn key recomputed from scratch.
+    '''
+    key = 0
+    for player in [game.p1, game.p2]:
+        for piece in player.pieces.values():
+            if piece.rank == PAWN:
+                key ^= PIECE_KEYS[piece.color][PAWN][to_square(piece.pos)]
+    return key
+
+
+class TestPawns(unittest.TestCase):
+
+    '''
+    Tests pawn structure terms, the pawn key and the pawn table.
+    '''
+
+    def test_structure(self):
+        game = Game.from_fen('4k3/8/8/3P4/8/8/PP3P1P/4K3 w - - 0 1')
+        white, black = pawn_masks(game)
+        self.assertEqual(black, 0)
+        self.assertEqual(white.bit_count(), 5)
+        # all passed, as BLACK has no PAWNs, and all but a2 and b2 isolated
+        self.assertEqual(structure_score(white, black),
+                         PASSED_BONUS[5] + 4 * PASSED_BONUS[2] - 3 * ISOLATED_PENALTY)
+        game = Game.from_fen('4k3/2p5/8/8/8/2P5/2P5/4K3 w - - 0 1')
+        white, black = pawn_masks(game)
+        # doubled and isolated c PAWNs, blocked so neither side is passed
+        self.assertEqual(structure_score(white, black), -DOUBLED_PENALTY - 2 * ISOLATED_PENALTY + ISOLATED_PENALTY)
+
+    def test_shelter(self):
+        sheltered = Game.from_fen('6k1/8/8/8/8/8/5PPP/6K1 w - - 0 1')
+        exposed = Game.from_fen('6k1/8/8/8/8/8/5PPP/3K4 w - - 0 1')
+        self.assertEqual(pawn_score(sheltered, False) - pawn_score(exposed, False), 3 * SHELTER_BONUS)
+        self.assertEqual(pawn_score(sheltered, True), pawn_score(exposed, True))
+
+    def test_pawn_key(self):
+        game = Game.from_fen('4k3/1P6/8/3pP3/8/8/8/4K3 w - d6 0 1')
+        start = game.state.pawn_key
+        self.assertEqual(start, expected_pawn_key(game))
+        for move in ['e5d6', 'e8d7', 'b7b8q']: # en passant, KING move, promotion
+            game.play([move])
+            self.assertEqual(game.state.pawn_key, expected_pawn_key(game))
+        self.assertEqual(pawn_masks(game), [1 << to_square([4, 6]), 0]) # only d6 is left
+        for _ in range(3):
+            game.unmake_turn()
+        self.assertEqual(game.state.pawn_key, start)
+
+    def test_table(self):
+        game = Game()
+        table = game.pawn_table
+        self.assertEqual(table.entries, None) # allocated on first use
+        score = pawn_score(game, False)
+        game.play(['g1f3'])
+        self.assertEqual(pawn_score(game, False), score) # same PAWNs, a hit
+        self.assertEqual([table.probes, table.hits], [2, 1])
+        game.play(['e7e5'])
+        pawn_score(game, False)
+        self.assertEqual([table.probes, table.hits, table.hit_rate], [3, 1, 1 / 3])
+        small = PawnTable(bits=0) # every PAWN structure collides
+        for position in [game, Game(), game]:
+            small.probe(position)
+        self.assertEqual(small.hits, 0)
+
+    def test_search_stats(self):
+        game = Game()
+        result = analyze_position(game, convert_color_to_player(game, WHITE), 2, multipv=1)
+        self.assertTrue(0 < result.pawn_hit_rate < 1)
+        self.assertTrue(0 < result.eval_share < 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from perft import POSITIONS, make_named_position, perft, divide, run_perft
+from book import polyglot_key
+from misc.constants import *
+
+
+class TestPerft(unittest.TestCase):
+
+    '''
+    Tests perft leaf counts against the reference counts of standard positions.
+    '''
+
+    def test_reference_counts(self):
+        for name, depth in [('initial', 3), ('position3', 3), ('kiwipete', 2)]:
+            game = make_named_position(name)
+            results = run_perft(game, depth, reference=POSITIONS[name][3], verbose=False)
+            self.assertEqual([result[4] for result in results], [True] * depth, msg=name)
+
+    def test_state_restored(self):
+        game = make_named_position('kiwipete')
+        key = polyglot_key(game)
+        perft(game, 2)
+        self.assertEqual(len(game.turn_log), 0)
+        self.assertEqual(game.turn, WHITE)
+        self.assertEqual(polyglot_key(game), key)
+
+    def test_cache(self):
+        game = make_named_position('initial')
+        cache = {}
+        self.assertEqual(perft(game, 3, cache), 8902)
+        self.assertTrue(len(cache) > 0)
+        self.assertEqual(perft(game, 3, cache), 8902) # answered from cache
+
+    def test_divide(self):
+        game = make_named_position('position3')
+        counts = divide(game, 2)
+        self.assertEqual(len(counts), 14)
+        self.assertEqual(sum(count for notation, count in counts), 191)
+        self.assertTrue('b4f4' in [notation for notation, count in counts])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,83 @@
+import gzip
+import io
+import os
+import tempfile
+import unittest
+
+from game import Game
+from pgn import read_games, replay, san_to_move, play_san, move_to_san, read_throughput
+
+OPERA_GAME = '''[Event "Paris"]
+[White "Morphy, Paul"]
+[Black "Duke Karl / Count Isouard"]
+[Result "1-0"]
+
+1. e4 e5 2. Nf3 d6 3. d4 Bg4 {This is a weak move
+already.} 4. dxe5 Bxf3 5. Qxf3 dxe5 6. Bc4 Nf6 7. Qb3 Qe7 8. Nc3 c6 9. Bg5 b5 $2
+10. Nxb5 cxb5 (10... Qb4+ 11. Qxb4) 11. Bxb5+ Nbd7 12. O-O-O Rd8 13. Rxd7 Rxd7
+14. Rd1 Qe6 15. Bxd7+ Nxd7 16. Qb8+ ; the queen sacrifice
+16... Nxb8 17. Rd8# 1-0
+
+[Event "Second"]
+[FEN "7k/8/8/8/1b6/8/3N4/4K1N1 w - - 0 1"]
+[SetUp "1"]
+
+1. Nf3 Kg8 *
+'''
+OPERA_FEN = '1n1Rkb1r/p4ppp/4q3/4p1B1/4P3/8/PPP2PPP/2K5 b k - 1 17'
+
+
+class TestPgn(unittest.TestCase):
+
+    '''
+    Tests PGN reading, SAN decoding and SAN writing.
+    '''
+
+    def test_read_games(self):
+        games = list(read_games(io.StringIO(OPERA_GAME)))
+        self.assertEqual(len(games), 2)
+        opera = games[0]
+        self.assertEqual(opera.headers['White'], 'Morphy, Paul')
+        self.assertEqual(opera.result, '1-0')
+        self.assertEqual(len(opera.moves), 33)
+        self.assertEqual(opera.moves[:3], ['e4', 'e5', 'Nf3'])
+        self.assertEqual(opera.moves[-1], 'Rd8#')
+        self.assertEqual([games[1].fen, games[1].moves, games[1].result],
+                         ['7k/8/8/8/1b6/8/3N4/4K1N1 w - - 0 1', ['Nf3', 'Kg8'], '*'])
+
+    def test_replay_and_gzip(self):
+        game = Game()
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.pgn.gz')
+            with gzip.open(path, 'wt') as file:
+                file.write(OPERA_GAME)
+            pgn_games = read_games(path)
+            self.assertEqual(replay(next(pgn_games), game), 33)
+            self.assertEqual(game.to_fen(), OPERA_FEN)
+            replay(next(pgn_games), game)
+            self.assertEqual(game.board.get_piece([6, 3]).name, 'N-G1') # the d2 KNIGHT is pinned
+            games, plies, errors = read_throughput(path)[:3]
+            self.assertEqual([games, plies, errors], [2, 35, 0])
+
+    def test_move_to_san(self):
+        game = Game()
+        for san in next(read_games(io.StringIO(OPERA_GAME))).moves:
+            move = san_to_move(game, san)
+            self.assertEqual(move_to_san(game, move), san)
+            play_san(game, san)
+
+    def test_special_moves(self):
+        game = Game.from_fen('4k3/1P6/8/3pP3/8/8/8/R3K2R w KQ d6 0 1')
+        self.assertEqual(play_san(game, 'exd6'), [[5, 5], [4, 6]])
+        self.assertEqual(game.board.get_piece([4, 5]), None)
+        play_san(game, 'Kf7')
+        self.assertEqual(move_to_san(game, [[2, 7], [2, 8]]), 'b8=Q')
+        for san in ['b8=N', 'Rb2', 'Ke3', 'exd7', 'Nf3', 'e9']:
+            with self.assertRaises(Exception):
+                san_to_move(game, san)
+        self.assertEqual(play_san(game, 'O-O'), 'KING')
+        self.assertEqual(game.to_fen(), '8/1P3k2/3P4/8/8/8/8/R4RK1 b - - 2 2')
+
+
+if __name__ == '__main__':
+    unittest.main()
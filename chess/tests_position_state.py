@@ -0,0 +1,157 @@
+import unittest
+from unittest.mock import patch
+
+from book import polyglot_key
+from game import Game
+from minimax import minimax
+from tests import set_up_debug
+from position_state import (NO_SQUARE, ALL_CASTLING, WHITE_KING_SIDE, WHITE_QUEEN_SIDE,
+                            BLACK_KING_SIDE, BLACK_QUEEN_SIDE)
+from undo_stack import to_square
+from helpers.general_helpers import algebraic_uniconverter
+from misc.constants import *
+
+
+def state_tuple(game):
+    state = game.state
+    return (state.turn, state.castling, state.ep_square, state.halfmove_clock, state.fullmove_number)
+
+
+class TestPositionState(unittest.TestCase):
+
+    '''
+    Tests position state updates on make and their restoration on unmake.
+    '''
+
+    def test_initial(self):
+        self.assertEqual(state_tuple(Game()), (WHITE, ALL_CASTLING, NO_SQUARE, 0, 1))
+        game = Game(set_up_debug(white_pieces=['K-E1', 'R-H1', 'R-B1'], black_pieces=['K-E8', 'R-A8'],
+                                 turn_state=BLACK))
+        self.assertEqual(state_tuple(game), (BLACK, WHITE_KING_SIDE | BLACK_QUEEN_SIDE, NO_SQUARE, 0, 1))
+        game = Game(set_up_debug(white_pieces=['K-D1', 'R-H1'], black_pieces=['K-E8']))
+        self.assertEqual(game.state.castling, 0)
+
+    def test_clocks_and_en_passant(self):
+        game = Game()
+        game.play(['E2E4'])
+        self.assertEqual(state_tuple(game), (BLACK, ALL_CASTLING, to_square([5, 3]), 0, 1))
+        game.play(['G8F6'])
+        self.assertEqual(state_tuple(game), (WHITE, ALL_CASTLING, NO_SQUARE, 1, 2))
+        game.play(['E4E5', 'D7D5'])
+        self.assertEqual(game.state.ep_square, to_square([4, 6]))
+        game.play(['E5D6']) # en passant
+        self.assertEqual(state_tuple(game), (BLACK, ALL_CASTLING, NO_SQUARE, 0, 3))
+        game.unmake_turn()
+        game.play(['B1C3', 'B8C6'])
+        player = game.p1
+        self.assertFalse(player.attempt_action([algebraic_uniconverter('E5'), algebraic_uniconverter('D6')]))
+
+    def test_castling_rights(self):
+        game = Game()
+        game.play(['E2E4', 'E7E5', 'G1F3', 'B8C6', 'F1C4', 'G8F6', 'H1G1'])
+        self.assertEqual(game.state.castling, ALL_CASTLING & ~WHITE_KING_SIDE)
+        game.play(['E8E7'])
+        self.assertEqual(game.state.castling, WHITE_QUEEN_SIDE)
+        self.assertFalse(game.p1.castle_legal(KING, game.p2))
+        game.unmake_turn()
+        game.unmake_turn()
+        self.assertEqual(game.state.castling, ALL_CASTLING)
+        self.assertTrue(game.p1.castle_legal(KING, game.p2))
+        game.play(['KING'])
+        self.assertEqual(game.state.castling, BLACK_KING_SIDE | BLACK_QUEEN_SIDE)
+        self.assertEqual(game.state.halfmove_clock, 5)
+
+    def test_rook_captured(self):
+        game = Game(set_up_debug(white_pieces=['K-E1', 'R-H1', 'B-B7'], black_pieces=['K-E8', 'R-A8']))
+        game.play(['B7A8'])
+        self.assertEqual(game.state.castling, WHITE_KING_SIDE)
+        game.unmake_turn()
+        self.assertEqual(game.state.castling, WHITE_KING_SIDE | BLACK_QUEEN_SIDE)
+
+    def test_unmake_restores(self):
+        game = Game()
+        moves = ['E2E4', 'D7D5', 'E4D5', 'G8F6', 'G1F3', 'C7C5', 'D5C6', 'B8C6', 'F1B5', 'E7E6', 'KING', 'E8E7']
+        states = [state_tuple(game)]
+        for move in moves:
+            game.play([move])
+            states.append(state_tuple(game))
+        for i in range(len(moves)):
+            game.unmake_turn()
+            self.assertEqual(state_tuple(game), states[-2 - i])
+
+
+class TestDrawRules(unittest.TestCase):
+
+    '''
+    Tests incremental position keys, repetition detection and the fifty move rule.
+    '''
+
+    def test_keys(self):
+        game = Game()
+        self.assertEqual(game.state.key, polyglot_key(game))
+        moves = ['E2E4', 'D7D5', 'E4D5', 'G8F6', 'G1F3', 'C7C5', 'D5C6', 'B8C6', 'F1B5', 'E7E6', 'KING', 'E8E7',
+                 'B5C6', 'B7C6', 'F3E5', 'C6C5', 'E5F7', 'C5C4', 'F7H8', 'C4C3', 'H8F7', 'C3B2', 'F7D8', 'B2A1']
+        keys = [game.state.key]
+        for move in moves:
+            game.play([move]) # captures, en passant, castling and promotion
+            self.assertEqual(game.state.key, Game.from_fen(game.to_fen()).state.key)
+            self.assertEqual(game.state.key, polyglot_key(game))
+            keys.append(game.state.key)
+        self.assertEqual(len(set(keys)), len(keys))
+        for i in range(len(moves)):
+            game.unmake_turn()
+            self.assertEqual(game.state.key, keys[-2 - i])
+        self.assertEqual(game.state.key_history, [])
+
+    def test_repetition_after_two_leap(self):
+        game = Game()
+        game.play(['E2E4', 'G8F6', 'G1F3', 'F6G8', 'F3G1']) # en passant isn't possible after 1.e4
+        self.assertEqual(game.state.repetitions(), 1)
+        game.play(['G8F6', 'G1F3', 'F6G8', 'F3G1'])
+        self.assertEqual([game.state.repetitions(), game.draw_reason()], [2, 'threefold repetition'])
+        game = Game.from_fen('4k3/8/8/8/5p2/8/4P3/4K3 w - - 0 1')
+        game.play(['E2E4']) # f4 can take en passant, so this position differs from the one without the right
+        self.assertNotEqual(game.state.key, Game.from_fen('4k3/8/8/8/4Pp2/8/8/4K3 b - - 0 1').state.key)
+        self.assertEqual(game.state.key, Game.from_fen(game.to_fen()).state.key)
+
+    def test_threefold_repetition(self):
+        game = Game()
+        shuffle = ['G1F3', 'G8F6', 'F3G1', 'F6G8']
+        game.play(shuffle)
+        self.assertEqual([game.state.repetitions(), game.draw_reason()], [1, None])
+        game.play(shuffle[:2])
+        self.assertEqual(game.state.repetitions(), 1)
+        game.play(shuffle[2:])
+        self.assertEqual([game.state.repetitions(), game.draw_reason()], [2, 'threefold repetition'])
+        game.state.halfmove_clock = 3 # scans back to the last irreversible move only
+        self.assertEqual(game.state.repetitions(), 0)
+        game.unmake_turn()
+        self.assertEqual(game.draw_reason(), None)
+
+    def test_fifty_moves(self):
+        game = Game.from_fen('7k/8/8/8/8/8/8/R3K3 w - - 99 80')
+        self.assertEqual(game.draw_reason(), None)
+        game.play(['A1A2'])
+        self.assertEqual(game.draw_reason(), 'fifty moves')
+        self.assertEqual(minimax(game, game.p2, 2, False, first_call=False)[0], 0)
+
+    def test_search_takes_repetition(self):
+        game = Game.from_fen('7k/8/8/8/8/8/8/R3K3 w - - 0 1')
+        game.play(['E1E2', 'H8G8', 'E2E1'])
+        score, move = minimax(game, game.p2, 1, False, first_call=False)
+        self.assertEqual([score, move], [0, [[7, 8], [8, 8]]]) # down a ROOK, BLACK heads for the repetition
+        game.play(['G8F8'])
+        self.assertTrue(minimax(game, game.p1, 1, True, first_call=False)[0] > 0)
+
+    def test_game_loop_declares_draw(self):
+        game = Game()
+        with patch('builtins.input', side_effect=['G1F3', 'G8F6', 'F3G1', 'F6G8'] * 2):
+            with patch('builtins.print') as printed:
+                game.start()
+        self.assertEqual(game.winner, 'DRAW')
+        self.assertEqual(len(game.undo_stack), 8)
+        printed.assert_called_with('Match ends in a threefold repetition draw.')
+
+
+if __name__ == '__main__':
+    unittest.main()
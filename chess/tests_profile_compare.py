@@ -0,0 +1,50 @@
+import unittest
+import tempfile
+
+from profiling import profile_scenario
+from profile_compare import ProfileSnapshot, compare_snapshots, compare_profiles, function_name
+
+
+class TestProfileCompare(unittest.TestCase):
+
+    '''
+    Tests comparing pstats profiles of searches and perft.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.TemporaryDirectory()
+        cls.shallow = profile_scenario('search', position='endgame', depth=1, out_dir=cls.dir.name)[0]
+        cls.deep = profile_scenario('search', position='endgame', depth=2, out_dir=cls.dir.name)[0]
+        cls.perft = profile_scenario('perft', position='endgame', depth=1, out_dir=cls.dir.name)[0]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.dir.cleanup()
+
+    def test_function_name(self):
+        self.assertEqual(function_name(('C:\\Chess\\chess\\minimax.py', 46, 'minimax')), 'minimax.py(minimax)')
+        self.assertEqual(function_name(('/root/chess/helpers/state_helpers.py', 36, 'player_in_check')),
+                         'state_helpers.py(player_in_check)')
+        self.assertEqual(function_name(('~', 0, '<built-in method builtins.len>')), '<built-in method builtins.len>')
+
+    def test_normalized(self):
+        shallow, deep = ProfileSnapshot(self.shallow), ProfileSnapshot(self.deep)
+        self.assertTrue(deep.nodes > shallow.nodes)
+        normalized, deltas = compare_snapshots(shallow, deep)
+        self.assertTrue(normalized)
+        minimax = [delta for delta in deltas if delta.name == 'minimax.py(minimax)'][0]
+        self.assertEqual(minimax.base[0], 1.0) # one call per node
+        self.assertEqual(minimax.new[0], 1.0)
+
+    def test_unnormalized(self):
+        normalized, deltas = compare_snapshots(ProfileSnapshot(self.perft), ProfileSnapshot(self.deep),
+                                               threshold=-100.0)
+        self.assertFalse(normalized) # perft has no search nodes
+        self.assertTrue(all(delta.flagged for delta in deltas))
+        report = compare_profiles([self.shallow, self.deep, self.perft], top=5)
+        self.assertEqual(report.count('time share grew'), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
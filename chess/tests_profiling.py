@@ -0,0 +1,108 @@
+import contextlib
+import cProfile
+import io
+import unittest
+import os
+import tempfile
+from unittest.mock import patch
+
+from game import Game
+from tests import set_up_debug
+from profiling import SamplingProfiler, profile_scenario
+from performance import scripted_game
+from book import polyglot_key, encode_move, write_book
+from misc.constants import *
+
+
+class TestProfiling(unittest.TestCase):
+
+    '''
+    Tests profiling scenarios and the hidden in-game PROFILE command.
+    '''
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_profile_scenario(self):
+        prof_path, txt_path = profile_scenario('perft', position='endgame', depth=2,
+                                               out_dir=self.dir.name, sample_interval=0.0005)
+        self.assertTrue(os.path.basename(prof_path).startswith('perft-endgame-d2-'))
+        self.assertTrue(os.path.exists(prof_path))
+        with open(txt_path) as f:
+            report = f.read()
+        self.assertTrue('get_all_legal_moves' in report)
+        self.assertTrue('Sampling profile' in report)
+
+    def test_game_scenario(self):
+        # like cProfile from 3.12, allow only one enabled profiler
+        enabled = []
+        real_enable, real_disable = cProfile.Profile.enable, cProfile.Profile.disable
+        def enable(profiler, *args, **kwargs):
+            if len(enabled) > 0:
+                raise ValueError('Another profiling tool is already active')
+            enabled.append(profiler)
+            real_enable(profiler, *args, **kwargs)
+        def disable(profiler):
+            if profiler in enabled:
+                enabled.remove(profiler)
+            real_disable(profiler)
+        short_game = lambda search_profiles: scripted_game(search_profiles, random_moves=2, best_moves=1)
+        with patch.object(cProfile.Profile, 'enable', enable), patch.object(cProfile.Profile, 'disable', disable):
+            with patch('profiling.scripted_game', short_game), contextlib.redirect_stdout(io.StringIO()):
+                prof_path, txt_path = profile_scenario('game', out_dir=self.dir.name)
+        self.assertTrue(os.path.basename(prof_path).startswith('game-'))
+        with open(txt_path) as f:
+            self.assertTrue('make_best_move' in f.read())
+
+    def test_sampling_profiler(self):
+        sampler = SamplingProfiler(interval=0.0005)
+        sampler.start()
+        total = 0
+        for i in range(300000):
+            total += i
+        sampler.stop()
+        self.assertTrue(sampler.samples > 0)
+        self.assertTrue(any('test_sampling_profiler' in function for function in sampler.total_counts))
+
+    def test_profile_command(self):
+        game = Game(set_up_debug(white_pieces=['K-A1', 'Q-B2'], black_pieces=['K-H8']))
+        cwd = os.getcwd()
+        os.chdir(self.dir.name) # profiles are written to the profiles directory of cwd
+        try:
+            with patch('builtins.input', side_effect=['PROFILE', 'B', '', 'PAUSE']):
+                with patch('builtins.print'):
+                    game.start()
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(len(game.turn_log), 1)
+        self.assertFalse(game.profile_next_search)
+        written = sorted(os.listdir(os.path.join(self.dir.name, 'profiles')))
+        self.assertEqual(len(written), 2)
+        self.assertTrue(written[0].startswith('ingame-search-'))
+
+    def test_profile_command_with_book_move(self):
+        game = Game()
+        path = os.path.join(self.dir.name, 'book.bin')
+        write_book(path, [[polyglot_key(game), encode_move([[5, 2], [5, 4]], WHITE), 1]])
+        game.load_book(path)
+        game.search_profiles = []
+        cwd = os.getcwd()
+        os.chdir(self.dir.name)
+        try:
+            with patch('builtins.input', side_effect=['PROFILE', 'B', 'PAUSE']):
+                with patch('builtins.print'):
+                    game.start()
+        finally:
+            os.chdir(cwd)
+            game.book.close()
+        self.assertEqual(len(game.turn_log), 1) # the book move, no search
+        self.assertTrue(game.profile_next_search) # still pending for the next search
+        self.assertEqual(game.search_profiles, [])
+        self.assertFalse(os.path.exists(os.path.join(self.dir.name, 'profiles')))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import contextlib
+import io
+import unittest
+from unittest.mock import patch
+
+from game import Game
+from renderer import TerminalRenderer, frame_diff, full_frame, fit_lines, move_to, CLEAR_LINE, CLEAR_BELOW, HOME
+
+
+class TestRenderer(unittest.TestCase):
+
+    '''
+    Tests diff based terminal rendering.
+    '''
+
+    def test_frame_diff(self):
+        old = ['abcdef', 'same', 'longer line']
+        new = ['abXYef', 'same', 'short', 'added']
+        self.assertEqual(frame_diff(old, new),
+                         move_to(1, 3)+'XY'
+                         +move_to(3, 1)+'short'+CLEAR_LINE
+                         +move_to(4, 1)+'added'+CLEAR_LINE
+                         +move_to(5, 1)+CLEAR_BELOW)
+        self.assertEqual(frame_diff(new, new), move_to(5, 1)+CLEAR_BELOW)
+        self.assertEqual(frame_diff(['ab'], ['abc']), move_to(1, 3)+'c'+move_to(2, 1)+CLEAR_BELOW)
+        self.assertEqual(full_frame(['a', 'b'])[:len(HOME)], HOME)
+
+    def test_game_frames(self):
+        stream = io.StringIO()
+        game = Game()
+        game.renderer = TerminalRenderer(stream=stream, ansi=True)
+        game.render()
+        first = stream.getvalue()
+        self.assertTrue(first.startswith(HOME) and first.endswith(str(game.board)+'\n'))
+        game.play(['E2E4'])
+        game.render()
+        diff = stream.getvalue()[len(first):]
+        self.assertEqual(diff.count(';'), 3) # the two changed squares, then below the frame
+        self.assertTrue(len(diff) < 40)
+        game.renderer.invalidate()
+        game.render()
+        self.assertTrue(stream.getvalue().endswith(full_frame(game.frame())))
+
+    def test_narrow_terminal(self):
+        self.assertEqual(fit_lines(['abcdefg', 'abc'], 4), ['abc', 'def', 'g', 'abc'])
+        stream = io.StringIO()
+        game = Game()
+        game.renderer = TerminalRenderer(stream=stream, ansi=True, columns=80)
+        header = game.frame()[0]
+        self.assertTrue(len(header) > 80)
+        game.render()
+        self.assertEqual(game.renderer.frame[:2], [header[:79], header[79:]]) # one row per frame line
+        start = len(stream.getvalue())
+        game.play(['E2E4'])
+        game.render()
+        board_top = 3 # the header takes rows 1 and 2
+        rank_4, rank_2 = board_top + 2 * (8 - 4), board_top + 2 * (8 - 2)
+        diff = stream.getvalue()[start:]
+        self.assertTrue(diff.startswith(move_to(rank_4, 25)))
+        self.assertIn(move_to(rank_2, 25), diff)
+        game.renderer.columns = 60 # resized
+        game.render()
+        self.assertTrue(stream.getvalue().endswith(full_frame(fit_lines(game.frame(), 60))))
+
+    def test_rejected_input_redraws(self):
+        stream = io.StringIO()
+        game = Game()
+        game.renderer = TerminalRenderer(stream=stream, ansi=True, columns=80)
+        frames = []
+        draw = game.renderer.draw
+        def record(lines):
+            start = len(stream.getvalue())
+            draw(lines)
+            frames.append(stream.getvalue()[start:])
+        game.renderer.draw = record
+        with patch('builtins.input', side_effect=['e2e5', 'PAUSE']), contextlib.redirect_stdout(io.StringIO()):
+            game.start()
+        # illegal move, so the next frame is drawn in full; PAUSE draws a diff
+        self.assertEqual([frame.startswith(HOME) for frame in frames], [True, True, False])
+
+    def test_pipe(self):
+        stream = io.StringIO()
+        game = Game()
+        game.renderer = TerminalRenderer(stream=stream) # not a terminal
+        game.render()
+        game.play(['E2E4'])
+        game.render()
+        self.assertEqual(game.renderer.ansi, False)
+        self.assertNotIn('\x1b', stream.getvalue())
+        self.assertTrue(stream.getvalue().endswith('\n'.join(game.frame())+'\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
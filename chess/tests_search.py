@@ -0,0 +1,121 @@
+import unittest
+import asyncio
+import threading
+
+from game import Game
+from tests import set_up_debug
+from minimax import minimax, SearchContext
+from search import start_search, iterative_deepening, analyze_position
+from helpers.state_helpers import update_both_players_check
+
+
+class TestSearchHandle(unittest.TestCase):
+
+    '''
+    Tests the asynchronous search handle.
+    '''
+
+    def test_search_matches_minimax(self):
+        '''
+        Tests that the handle's result has the same score as a plain minimax call,
+        and that the game is left untouched.
+        '''
+        game = Game()
+        expected_score, _ = minimax(game, game.p1, 2, True, first_call=False)
+        handle = start_search(game, game.p1, 2)
+        result = handle.result(timeout=60)
+        self.assertEqual(result.score, expected_score)
+        self.assertEqual(result.depth, 2)
+        self.assertFalse(result.cancelled)
+        self.assertEqual(result.pv[0], result.best_move)
+        self.assertTrue(result.nodes > 0)
+        self.assertEqual(len(game.turn_log), 0)
+        self.assertTrue(game.p1.attempt_action(result.best_move))
+
+    def test_progress_events(self):
+        '''
+        Tests that progress events are streamed through async for, and that
+        every completed depth is reported.
+        '''
+        debug = set_up_debug(white_pieces=['K-E1', 'Q-D1', 'P-A2'], black_pieces=['K-E8', 'R-H8'])
+        game = Game(debug)
+        update_both_players_check(game)
+        handle = start_search(game, game.p1, 3, progress_interval=10)
+
+        async def collect():
+            return [event async for event in handle]
+
+        events = asyncio.run(collect())
+        completed_depths = [event.depth for event in events if event.depth_complete]
+        self.assertEqual(completed_depths, [1, 2, 3])
+        self.assertEqual(events[-1].pv, handle.result().pv)
+
+    def test_cancel_keeps_best_move_so_far(self):
+        '''
+        Tests that a cancelled search restores the game state and still
+        returns a legal move.
+        '''
+        game = Game()
+        stop_event = threading.Event()
+        ctx = SearchContext(stop_event=stop_event)
+        depth_1_done = []
+
+        def report(event, force=False):
+            if event.depth_complete:
+                depth_1_done.append(event)
+                stop_event.set() # cancel right after depth 1
+
+        result = iterative_deepening(game, game.p1, 3, ctx, report=report)
+        self.assertTrue(result.cancelled)
+        self.assertEqual(len(depth_1_done), 1)
+        self.assertTrue(result.depth >= 1)
+        self.assertEqual(len(game.turn_log), 0)
+        self.assertEqual(game.turn, 'WHITE')
+        self.assertEqual(len(game.p1.pieces), 16)
+        self.assertTrue(result.best_move in game.p1.get_all_legal_moves())
+
+        handle = start_search(game, game.p1, 6)
+        handle.cancel()
+        result = handle.result(timeout=60)
+        self.assertTrue(result.cancelled)
+        self.assertTrue(result.best_move in game.p1.get_all_legal_moves())
+
+
+class TestMultiPV(unittest.TestCase):
+
+    '''
+    Tests multi-PV analysis.
+    '''
+
+    def test_multipv_matches_separate_searches(self):
+        '''
+        Tests that the N reported lines have the same scores as the N best
+        root moves searched separately with a full window.
+        '''
+        white_pieces = ['K-E1', 'Q-D1', 'N-B1', 'P-E2', 'P-D2']
+        black_pieces = ['K-E8', 'R-A8', 'B-C8', 'P-E7', 'P-D7']
+        debug = set_up_debug(white_pieces=white_pieces, black_pieces=black_pieces)
+        game = Game(debug)
+        update_both_players_check(game)
+        exact_scores = []
+        for move in game.p1.get_all_legal_moves():
+            game.p1.attempt_action(move, True)
+            score, _ = minimax(game, game.p2, 1, False, first_call=False)
+            game.unmake_turn()
+            exact_scores.append(score)
+        exact_scores.sort(reverse=True)
+
+        result = analyze_position(game, game.p1, 2, multipv=3)
+        self.assertEqual([line.score for line in result.lines], exact_scores[:3])
+        self.assertEqual(len(set(str(line.move) for line in result.lines)), 3)
+        for line in result.lines:
+            self.assertTrue(len(line.pv) >= 1)
+        self.assertEqual(result.best_move, result.lines[0].move)
+
+        single = analyze_position(game, game.p1, 2, multipv=1)
+        self.assertEqual(single.score, exact_scores[0])
+        self.assertTrue(single.nodes <= result.nodes)
+
+
+if __name__ == '__main__':
+    unittest.main()
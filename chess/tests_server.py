@@ -0,0 +1,135 @@
+import asyncio
+import unittest
+
+from load_test import Client, run_load_test, percentile, make_scripts
+from server import GameServer
+
+
+class TestServer(unittest.IsolatedAsyncioTestCase):
+
+    '''
+    Tests the multiplayer server over localhost, and the load test client.
+    '''
+
+    async def asyncSetUp(self):
+        self.server = GameServer(bot_workers=1)
+        await self.server.start('127.0.0.1', 0)
+        self.clients = []
+
+    async def asyncTearDown(self):
+        for client in self.clients:
+            await client.close()
+        await self.server.close()
+
+    async def connect(self) -> Client:
+        client = await Client.connect('127.0.0.1', self.server.port)
+        self.clients.append(client)
+        return client
+
+    async def test_pvp_game(self):
+        white, black = await self.connect(), await self.connect()
+        await white.send({'type': 'new', 'mode': 'pvp', 'color': 'WHITE'})
+        joined = await white.receive()
+        self.assertEqual([joined['type'], joined['color'], joined['turn']], ['joined', 'WHITE', 'WHITE'])
+        await black.send({'type': 'join', 'game': joined['game']})
+        self.assertEqual((await black.receive())['color'], 'BLACK')
+        await black.send({'type': 'move', 'move': 'e7e5'})
+        with self.assertRaisesRegex(Exception, 'Not your turn'):
+            await black.receive()
+        await white.send({'type': 'move', 'move': 'e2e5'})
+        with self.assertRaisesRegex(Exception, 'Illegal move'):
+            await white.receive()
+        for mover, move in zip([white, black, white, black], ['f2f3', 'e7e5', 'g2g4', 'd8h4']):
+            await mover.send({'type': 'move', 'move': move})
+            updates = [await white.receive(), await black.receive()]
+            self.assertEqual(updates[0], updates[1])
+            self.assertEqual(updates[0]['move'], move)
+        self.assertEqual([updates[0]['result'], updates[0]['termination']], ['0-1', 'checkmate'])
+        self.assertEqual(updates[0]['fen'], 'rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 3')
+        await white.send({'type': 'move', 'move': 'a2a3'})
+        with self.assertRaisesRegex(Exception, 'Game is over'):
+            await white.receive()
+
+    async def test_reconnect(self):
+        white, black = await self.connect(), await self.connect()
+        await white.send({'type': 'new'})
+        joined = await white.receive()
+        await black.send({'type': 'join', 'game': joined['game']})
+        await black.receive()
+        await white.send({'type': 'move', 'move': 'e2e4'})
+        await white.receive()
+        await white.close()
+        await black.receive()
+        await black.send({'type': 'move', 'move': 'e7e5'}) # WHITE is away, its update is dropped
+        await black.receive()
+        white = await self.connect()
+        await white.send({'type': 'resume', 'token': joined['token']})
+        resumed = await white.receive()
+        self.assertEqual([resumed['color'], resumed['moves'], resumed['turn']], ['WHITE', ['e2e4', 'e7e5'], 'WHITE'])
+        await white.send({'type': 'resume', 'token': joined['token']}) # a retry holds the seat once
+        self.assertEqual((await white.receive())['color'], 'WHITE')
+        await white.send({'type': 'move', 'move': 'g1f3'})
+        self.assertEqual((await black.receive())['move'], 'g1f3')
+        self.assertEqual((await white.receive())['move'], 'g1f3')
+        await white.send({'type': 'resume', 'token': 'nope'})
+        with self.assertRaisesRegex(Exception, 'Unknown token'):
+            await white.receive()
+
+    async def test_bot_game(self):
+        client = await self.connect()
+        await client.send({'type': 'new', 'mode': 'bot', 'color': 'BLACK', 'depth': 1})
+        self.assertEqual((await client.receive())['color'], 'BLACK')
+        update = await asyncio.wait_for(client.receive(), 60)
+        self.assertEqual([update['type'], update['turn'], len(update['moves'])], ['update', 'BLACK', 1])
+        await client.send({'type': 'resign'})
+        self.assertEqual((await client.receive())['result'], '1-0')
+
+    async def test_close_with_bot_worker(self):
+        client = await self.connect()
+        await client.send({'type': 'new', 'mode': 'bot', 'color': 'BLACK', 'depth': 1})
+        await client.receive()
+        await asyncio.wait_for(client.receive(), 60) # the bot's move, so its worker process is running
+        await asyncio.wait_for(self.server.close(), 10)
+        self.assertEqual(await asyncio.wait_for(client.reader.read(), 10), b'')
+
+    async def test_sessions_are_dropped(self):
+        self.server.resume_grace = 0.05
+        white, black = await self.connect(), await self.connect()
+        await white.send({'type': 'new'})
+        joined = await white.receive()
+        await black.send({'type': 'new'})
+        finished = await black.receive()
+        await black.send({'type': 'resign'})
+        await black.receive()
+        await black.close()
+        await asyncio.sleep(0.01)
+        self.assertEqual(list(self.server.sessions), [joined['game']]) # over and left, dropped at once
+        await white.close()
+        await asyncio.sleep(0.01)
+        self.assertEqual(list(self.server.sessions), [joined['game']]) # kept for resume
+        white = await self.connect()
+        await white.send({'type': 'resume', 'token': joined['token']})
+        await white.receive()
+        await asyncio.sleep(0.1)
+        self.assertEqual(list(self.server.sessions), [joined['game']]) # resumed in time
+        await white.close()
+        await asyncio.sleep(0.1)
+        self.assertEqual([self.server.sessions, self.server.tokens], [{}, {}])
+        self.assertNotEqual(finished['game'], joined['game'])
+
+    async def test_load_test(self):
+        report = await run_load_test(games=20, plies=6, local=True, reconnect_rate=0.5, scripts=2, verbose=False)
+        self.assertEqual([report['games'], report['moves'], report['errors']], [20, 120, 0])
+        self.assertTrue(0 < report['p50_ms'] <= report['p99_ms'] <= report['p100_ms'])
+
+    def test_helpers(self):
+        self.assertEqual(percentile([3, 1, 2, 4], 50), 2)
+        self.assertEqual(percentile([3, 1, 2, 4], 100), 4)
+        self.assertEqual(percentile([], 99), 0.0)
+        scripts = make_scripts(2, 5, seed=1)
+        self.assertEqual([len(script) for script in scripts], [5, 5])
+        self.assertEqual(scripts, make_scripts(2, 5, seed=1))
+
+
+if __name__ == '__main__':
+    unittest.main()
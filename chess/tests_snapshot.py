@@ -0,0 +1,75 @@
+import pickle
+import random
+import unittest
+
+from game import Game
+from fen import STARTING_FEN
+from snapshot import (encode_position, decode_position, encode_game, decode_game, unpack_moves,
+                      POSITION_SIZE)
+from tests_fen import KIWIPETE_FEN, POSITION3_FEN
+from helpers.game_helpers import convert_color_to_player
+from misc.constants import *
+
+
+class TestSnapshot(unittest.TestCase):
+
+    '''
+    Tests binary position and game snapshots.
+    '''
+
+    def test_position_round_trip(self):
+        for fen in [STARTING_FEN, KIWIPETE_FEN, POSITION3_FEN,
+                    'rnbqkbnr/ppp1p1pp/8/3pPp2/8/8/PPPP1PPP/RNBQKBNR w Kq f6 0 3',
+                    'rnb1kbnr/pppp1ppp/8/4p3/6Pq/5P2/PPPPP2P/RNBQKBNR w KQkq - 1 300']:
+            game = Game.from_fen(fen)
+            data = encode_position(game)
+            self.assertEqual(len(data), POSITION_SIZE)
+            decoded = decode_position(data)
+            self.assertEqual(decoded.to_fen(), fen)
+            self.assertEqual([decoded.p1.in_check, decoded.p2.in_check], [game.p1.in_check, game.p2.in_check])
+        self.assertTrue(decoded.p1.in_check)
+        target = Game()
+        self.assertIs(decode_position(encode_position(Game.from_fen(KIWIPETE_FEN)), target), target)
+        self.assertEqual(target.to_fen(), KIWIPETE_FEN)
+        with self.assertRaises(Exception):
+            decode_position(data[:10])
+
+    def test_game_round_trip(self):
+        start = 'r3k3/1P6/8/8/8/8/2p5/R3K2R w KQq - 0 1'
+        game = Game.from_fen(start)
+        game.play(['KING', 'QUEEN', 'B7B8', 'C8B8', 'F1F8', 'C2C1', 'A1C1', 'D8F8']) # promotions, captures
+        data = encode_game(game)
+        self.assertEqual(len(data), POSITION_SIZE + 2 + 2 * 8)
+        self.assertEqual(unpack_moves(data)[:2], [KING, QUEEN])
+        decoded = decode_game(data)
+        self.assertEqual(decoded.to_fen(), game.to_fen())
+        self.assertEqual(len(decoded.undo_stack), 8)
+        for _ in range(8):
+            decoded.unmake_turn()
+        self.assertEqual(decoded.to_fen(), start)
+        self.assertEqual(game.to_fen(), '1k3r2/8/8/8/8/8/8/2R3K1 w - - 0 5') # left untouched
+
+    def test_random_games(self):
+        rng = random.Random(7)
+        game = Game()
+        for _ in range(80):
+            player = convert_color_to_player(game, game.turn)
+            moves = player.get_all_legal_moves()
+            if len(moves) == 0:
+                break
+            player.attempt_action(rng.choice(moves))
+        data = encode_game(game)
+        decoded = decode_game(data, Game(), validate=True)
+        self.assertEqual(decoded.to_fen(), game.to_fen())
+        self.assertEqual(encode_game(decoded), data)
+        self.assertTrue(len(data) * 20 < len(pickle.dumps(game)))
+
+    def test_illegal_game(self):
+        data = bytearray(encode_game(Game()))
+        data[POSITION_SIZE:POSITION_SIZE + 4] = bytes([1, 0, 12, 1]) # 1 move, B1 to E3
+        with self.assertRaises(Exception):
+            decode_game(bytes(data), validate=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
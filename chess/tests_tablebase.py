@@ -0,0 +1,81 @@
+import unittest
+import tempfile
+
+from game import Game
+from tests import set_up_debug
+from tablebase import generate_all, Tablebases, WIN, LOSS, DRAW
+from build_tables import make_tables, format_tables, TABLES_PATH
+from search import analyze_position
+from uci import UciEngine
+from helpers.state_helpers import update_both_players_check
+from misc.constants import *
+
+
+class TestTablebase(unittest.TestCase):
+
+    '''
+    Tests generated tablebases and probing them from games.
+    '''
+
+    @classmethod
+    def setUpClass(cls):
+        cls.dir = tempfile.TemporaryDirectory()
+        generate_all(['KQK'], cls.dir.name, processes=2)
+        cls.tablebases = Tablebases(cls.dir.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tablebases.close()
+        cls.dir.cleanup()
+
+    def make_game(self, white_pieces, black_pieces):
+        game = Game(set_up_debug(white_pieces=white_pieces, black_pieces=black_pieces))
+        update_both_players_check(game)
+        game.tablebase = self.tablebases
+        return game
+
+    def test_probe(self):
+        game = self.make_game(['K-F6', 'Q-G1'], ['K-H8'])
+        self.assertEqual(game.tablebase.probe(game, game.p1), [WIN, 1]) # Qg7# is mate in 1
+        self.assertEqual(game.tablebase.probe(game, game.p2), [LOSS, 2])
+        game = self.make_game(['K-F7', 'Q-G6'], ['K-H8'])
+        self.assertEqual(game.tablebase.probe(game, game.p2), [DRAW, 0]) # stalemate
+        game = self.make_game(['K-A1', 'Q-C2'], ['K-D3'])
+        self.assertEqual(game.tablebase.probe(game, game.p2), [DRAW, 0]) # KxQ
+        game = self.make_game(['K-A1', 'Q-B2', 'P-H2'], ['K-C3'])
+        self.assertEqual(game.tablebase.probe(game, game.p1), None) # no KQPK table
+
+    def test_probe_black_stronger(self):
+        game = self.make_game(['K-H1'], ['K-F3', 'Q-G8'])
+        self.assertEqual(game.tablebase.probe(game, game.p2), [WIN, 1])
+        self.assertEqual(game.tablebase.probe_score(game, game.p2), -(MAX - 1))
+
+    def test_uci_mate_distance(self):
+        lines = []
+        engine = UciEngine(send=lines.append)
+        for command in ['setoption name TablebasePath value '+self.dir.name,
+                        'position fen 8/8/8/4k3/8/8/8/KQ6 w - - 0 1', 'go depth 2']:
+            engine.handle_command(command)
+        engine.watcher.join()
+        self.assertEqual(engine.game.tablebase.probe(engine.game, engine.game.p1), [WIN, 17])
+        infos = [line for line in lines if line.startswith('info ') and ' score ' in line]
+        self.assertTrue(len(infos) > 0)
+        self.assertTrue(' score mate 9 ' in infos[-1]) # 17 plies, not the length of the pv
+        engine.handle_command('setoption name TablebasePath value') # closes the tables
+
+    def test_search_finds_mate(self):
+        game = self.make_game(['K-F6', 'Q-G1'], ['K-H8'])
+        result = analyze_position(game, game.p1, 1, multipv=1)
+        self.assertEqual(result.best_move, [[7, 1], [7, 7]])
+        self.assertEqual(result.score, MAX) # checkmated after the move
+        game.p1.attempt_action(result.best_move)
+        self.assertEqual(len(game.p2.get_all_legal_moves()), 0)
+        self.assertTrue(game.p2.in_check)
+
+
+    def test_board_tables(self):
+        with open(TABLES_PATH) as f:
+            self.assertEqual(f.read(), format_tables(make_tables())) # rerun build_tables.py if this fails
+
+if __name__ == '__main__':
+    unittest.main()
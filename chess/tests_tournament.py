@@ -0,0 +1,70 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pgn import read_games
+from fen import STARTING_FEN
+from tournament import (EngineConfig, Adjudication, MatchScore, play_game, run_tournament,
+                        elo_difference, sprt_llr, sprt_bounds, logistic_score, score_elo)
+
+
+class TestTournament(unittest.TestCase):
+
+    '''
+    Tests self-play games, the Elo estimate and the SPRT stopping rule.
+    '''
+
+    def test_elo_and_sprt(self):
+        self.assertAlmostEqual(score_elo(logistic_score(35.0)), 35.0)
+        self.assertEqual(elo_difference(30, 40, 30)[0], 0.0)
+        elo, margin = elo_difference(60, 30, 10)
+        self.assertTrue(150 < elo < 250 and 0 < margin < elo)
+        lower, upper = sprt_bounds(0.05, 0.05)
+        self.assertAlmostEqual(lower, -upper)
+        self.assertTrue(sprt_llr(60, 30, 10, 0, 10) > 0)
+        self.assertTrue(sprt_llr(30, 40, 30, 0, 100) < lower)
+        self.assertTrue(sprt_llr(4, 0, 0, 0, 10) > 0) # defined without any draws or losses
+
+    def test_engine_config(self):
+        config = EngineConfig.parse('name=new,depth=3,movetime=0.5')
+        self.assertEqual([config.name, config.depth, config.movetime, config.book], ['new', 3, 0.5, None])
+        with self.assertRaises(Exception):
+            EngineConfig.parse('name=new,speed=3')
+
+    def test_play_game(self):
+        white, black = EngineConfig('a', depth=1), EngineConfig('b', depth=1)
+        record = play_game([0, [STARTING_FEN, ['e4', 'e5']], white, black, Adjudication(max_plies=4)])
+        self.assertEqual([record['result'], record['termination'], record['plies']], ['1/2-1/2', 'max moves', 4])
+        self.assertEqual(record['moves'][:2], ['e4', 'e5'])
+        mated = play_game([1, ['7k/8/6K1/8/8/8/8/R7 w - - 0 1', []], white, black, Adjudication()])
+        self.assertEqual([mated['result'], mated['termination'], mated['moves']], ['1-0', 'checkmate', ['Ra8#']])
+
+    def test_run_tournament(self):
+        engines = [EngineConfig('a', depth=1), EngineConfig('b', depth=1)]
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'games.pgn')
+            match = run_tournament(engines, games=2, workers=1, pgn_path=path,
+                                   adjudication=Adjudication(max_plies=2), verbose=False)
+            self.assertEqual([match.games, match.draws], [2, 2])
+            games = list(read_games(path))
+        self.assertEqual([[game.headers['White'], game.headers['Black']] for game in games], [['a', 'b'], ['b', 'a']])
+        self.assertEqual(games[0].moves[:4], games[1].moves[:4]) # same opening
+        self.assertEqual(len(games[0].moves), 6)
+
+    def test_sprt_stops(self):
+        def win_for_a(task):
+            index, opening, white, black, adjudication = task
+            return {'index': index, 'white': white.name, 'black': black.name,
+                    'result': '1-0' if white.name == 'a' else '0-1', 'termination': 'checkmate',
+                    'fen': STARTING_FEN, 'moves': [], 'plies': 0, 'nodes': 0}
+        engines = [EngineConfig('a'), EngineConfig('b')]
+        with patch('tournament.play_game', side_effect=win_for_a):
+            match = run_tournament(engines, games=1000, workers=1, elo1=50, verbose=False)
+        self.assertEqual(match.decision, 'H1')
+        self.assertTrue(match.games < 100)
+        self.assertEqual(match.wins, match.games)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,81 @@
+import time
+import unittest
+
+from game import Game
+from uci import UciEngine, parse_uci_move, pv_to_uci, time_budget, uci_score
+from misc.constants import *
+
+
+class TestUci(unittest.TestCase):
+
+    '''
+    Tests the UCI front-end.
+    '''
+
+    def setUp(self):
+        self.lines = []
+        self.engine = UciEngine(send=self.lines.append)
+
+    def run_commands(self, commands):
+        for command in commands:
+            self.assertTrue(self.engine.handle_command(command))
+
+    def test_moves(self):
+        game = Game.from_fen('r3k3/1P6/8/3pP3/8/8/8/R3K2R w KQq d6 0 1')
+        self.assertEqual(parse_uci_move(game, 'e1g1'), KING)
+        self.assertEqual(parse_uci_move(game, 'b7b8q'), [[2, 7], [2, 8]])
+        for text in ['b7b8n', 'e8d8', 'e9e4', 'e2e4']:
+            with self.assertRaises(Exception):
+                parse_uci_move(game, text)
+        ranks = {(2, 7): PAWN, (5, 5): PAWN, (4, 5): PAWN, (5, 1): KING, (8, 1): ROOK, (5, 8): KING, (1, 8): ROOK}
+        pv = [[[2, 7], [2, 8]], QUEEN, [[5, 5], [4, 6]], [[5, 8], [4, 8]], [[2, 8], [2, 1]]]
+        self.assertEqual(pv_to_uci(ranks, pv, WHITE), ['b7b8q', 'e8c8', 'e5d6', 'e8d8', 'b8b1'])
+
+    def test_time_budget(self):
+        self.assertEqual([round(limit, 6) for limit in time_budget({'movetime': 1000}, WHITE, 0.05)], [0.95, 0.95])
+        soft, hard = time_budget({'wtime': 60000, 'btime': 1000, 'winc': 1000}, WHITE, 0)
+        self.assertAlmostEqual(soft, 2.75)
+        self.assertAlmostEqual(hard, 8.25)
+        self.assertAlmostEqual(time_budget({'wtime': 60000, 'btime': 1000, 'movestogo': 1}, BLACK, 0)[0], 0.5)
+        self.assertTrue(time_budget({'wtime': 60000}, WHITE, 0, 1.5)[0] > time_budget({'wtime': 60000}, WHITE, 0)[0])
+        self.assertEqual(time_budget({'depth': 3}, WHITE, 0), None)
+        self.assertEqual([uci_score(-120, [], BLACK), uci_score(MAX, [1, 2, 3], WHITE)], ['cp 120', 'mate 2'])
+
+    def test_session(self):
+        self.run_commands(['uci', 'setoption name multipv value 2', 'position startpos moves e2e4 e7e5 g1f3',
+                           'go depth 2'])
+        self.engine.watcher.join()
+        self.assertTrue('uciok' in self.lines)
+        self.assertTrue(any(' multipv 2 ' in line for line in self.lines))
+        self.assertTrue(self.lines[-1].startswith('bestmove '))
+        self.assertEqual(self.engine.game.turn, BLACK)
+        self.assertEqual(len(self.engine.game.turn_log), 3) # search left the game as it was
+
+    def test_material_lead_is_not_mate(self):
+        self.run_commands(['position fen 4k3/8/8/8/8/8/8/QQQ1K3 w - - 0 1', 'go depth 1'])
+        self.engine.watcher.join()
+        infos = [line for line in self.lines if line.startswith('info ')]
+        self.assertTrue(len(infos) > 0)
+        self.assertTrue(all(' score cp ' in line for line in infos))
+        self.assertEqual(uci_score(MATE_BOUND, [1], WHITE), 'cp '+str(int(MATE_BOUND)))
+        self.assertEqual(uci_score(-(MAX - 16), [1], WHITE), 'mate -9') # tablebase loss probed after one ply
+
+    def test_infinite_and_stop(self):
+        self.run_commands(['position fen 7k/8/6K1/8/8/8/8/R7 w - - 0 1', 'go infinite', 'isready'])
+        self.assertEqual(self.lines[-1], 'readyok') # answered while searching
+        self.assertFalse(self.engine.handle.done())
+        while self.engine.handle.latest_progress == None or self.engine.handle.latest_progress.depth < 2:
+            time.sleep(0.01)
+        self.run_commands(['stop'])
+        self.engine.watcher.join()
+        self.assertEqual(self.lines[-1], 'bestmove a1a8')
+        self.assertFalse(self.engine.handle_command('quit'))
+
+    def test_errors(self):
+        self.run_commands(['position startpos moves e2e5', 'setoption name Speed value 3', 'bogus'])
+        self.assertEqual(len(self.lines), 2)
+        self.assertTrue(all(line.startswith('info string error') for line in self.lines))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+import unittest
+
+from game import Game
+from tests import set_up_debug
+from undo_stack import UndoStack, to_square, from_square, PIECE, FLAGS, CASTLE_FLAG
+from book import polyglot_key
+from misc.constants import *
+
+
+class TestUndoStack(unittest.TestCase):
+
+    '''
+    Tests the integer undo stack and the Turn views built from it.
+    '''
+
+    def test_push_pop_grow(self):
+        stack = UndoStack(capacity=2)
+        for i in range(5):
+            stack.push(i, i + 1, i + 2, -1, 0, CASTLE_FLAG if i % 2 else 0, 15, -1, i)
+        self.assertEqual(len(stack), 5)
+        self.assertEqual(stack.get(3, PIECE), 3)
+        self.assertEqual(stack.top(FLAGS), 0)
+        stack.pop()
+        self.assertEqual(stack.top(FLAGS), CASTLE_FLAG)
+        self.assertEqual(from_square(to_square([3, 7])), [3, 7])
+
+    def test_turn_views(self):
+        game = Game()
+        game.play(['E2E4', 'D7D5', 'E4D5', 'G8F6', 'G1F3', 'C7C5', 'D5C6', 'B8C6', 'F1B5', 'E7E6', 'KING'])
+        self.assertEqual(len(game.turn_log), 11)
+        first = game.turn_log[0]
+        self.assertEqual(first.move_type, MOVE)
+        self.assertEqual(first.moved_piece.name, 'P-E2')
+        self.assertEqual([first.moved_piece_pos, first.moved_piece_dest], [[5, 2], [5, 4]])
+        self.assertEqual(first.code_of_piece_that_two_leaped, 'P-E2')
+        self.assertEqual(first.turn_color, WHITE)
+        capture = game.turn_log[2]
+        self.assertEqual(capture.captured_piece.name, 'P-D7')
+        self.assertEqual(capture.captured_piece_pos, [4, 5])
+        en_passant = game.turn_log[6]
+        self.assertEqual(en_passant.captured_piece.name, 'P-C7')
+        self.assertEqual(en_passant.captured_piece_pos, [3, 5]) # not the dest of the move
+        castle = game.turn_log[-1]
+        self.assertEqual([castle.move_type, castle.castle_side], [CASTLE, KING])
+        self.assertEqual([castle.castle_king_code, castle.castle_rook_code], ['K-E1', 'R-H1'])
+        self.assertEqual([turn.turn_color for turn in game.turn_log][:2], [WHITE, BLACK])
+
+    def test_unmake_restores(self):
+        game = Game()
+        keys = [polyglot_key(game)]
+        moves = ['E2E4', 'D7D5', 'E4D5', 'G8F6', 'G1F3', 'C7C5', 'D5C6', 'B8C6', 'F1B5', 'E7E6', 'KING']
+        for move in moves:
+            game.play([move])
+            keys.append(polyglot_key(game))
+        for i in range(len(moves)):
+            game.unmake_turn()
+            self.assertEqual(polyglot_key(game), keys[-2 - i])
+        self.assertEqual(len(game.turn_log), 0)
+        self.assertTrue(game.board.get_piece([3, 7]).name == 'P-C7')
+
+    def test_promotion_unmake(self):
+        game = Game(set_up_debug(white_pieces=['K-A1', 'P-B7'], black_pieces=['K-H8', 'N-A8']))
+        game.play(['B7A8'])
+        self.assertEqual(game.board.get_piece([1, 8]).rank, QUEEN)
+        self.assertTrue(game.turn_log[0].pawn_promoted)
+        game.unmake_turn()
+        self.assertEqual(game.board.get_piece([2, 7]).rank, PAWN)
+        self.assertEqual(game.board.get_piece([1, 8]).name, 'N-A8')
+        self.assertTrue('N-A8' in game.p2.pieces)
+
+
+if __name__ == '__main__':
+    unittest.main()
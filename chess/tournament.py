@@ -0,0 +1,425 @@
+import argparse
+import math
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from analyze import search_position
+from clock import ChessClock, TimeControl, TimeManager, complexity, format_number
+from fen import STARTING_FEN
+from helpers.game_helpers import convert_color_to_player
+from misc.constants import *
+from pgn import read_games, play_san, move_to_san, format_pgn
+from epd import parse_epd
+
+'''
+Self-play tournament between two engine configurations. Each opening is
+played twice with colors swapped, games run concurrently on a process pool,
+and every finished game is appended to a PGN file. Games end by checkmate,
+stalemate, the fifty move rule, threefold repetition, a move limit,
+adjudication once both engines have agreed on a decisive score for a number
+of plies in a row, or on time if the engines play under a clock (tc=).
+After each game the Elo difference of the first engine over the second is
+estimated, and a sequential probability ratio test (SPRT) stops the match
+as soon as it can tell elo0 from elo1 with the requested error rates.
+'''
+
+# short, balanced openings, each played from both sides
+OPENINGS = [['e4', 'e5', 'Nf3', 'Nc6'], ['e4', 'c5', 'Nf3', 'd6'], ['e4', 'e6', 'd4', 'd5'],
+            ['e4', 'c6', 'd4', 'd5'], ['d4', 'd5', 'c4', 'e6'], ['d4', 'Nf6', 'c4', 'g6'],
+            ['d4', 'Nf6', 'c4', 'e6'], ['c4', 'e5', 'Nc3', 'Nf6'], ['Nf3', 'd5', 'g3', 'Nf6'],
+            ['e4', 'e5', 'Nf3', 'Nc6', 'Bb5', 'a6'], ['e4', 'd5', 'exd5', 'Qxd5'], ['d4', 'f5', 'g3', 'Nf6']]
+
+_worker_game = None # Game of a pool worker, reused for each of its games
+_worker_resources = {} # opened books and tablebases of a pool worker, by path
+
+
+class EngineConfig:
+    '''
+    Settings of one engine of a match: search depth, optional time per move
+    or time control, and optional opening book and tablebases.
+    '''
+    def __init__(self, name: str, depth=2, movetime=None, book=None, tablebases=None, tc=None):
+        self.name = name
+        self.depth = depth # search depth, or depth cap if movetime or tc is set
+        self.movetime = movetime # seconds per move, or None to always search to depth
+        self.tc = tc # TimeControl of a clocked game, the engine's time managed by clock.TimeManager
+        self.book = book # Polyglot book path or None
+        self.tablebases = tablebases # tablebase directory or None
+
+    @classmethod
+    def parse(cls, spec: str):
+        '''
+        Parses 'name=new,depth=3,movetime=0.5,book=book.bin,tablebases=tb' (or tc=1+0.1
+        instead of movetime, see clock.TimeControl.parse).
+        Complains with Exception on unknown keys.
+        '''
+        values = {}
+        for item in spec.split(','):
+            key, _, value = item.partition('=')
+            key = key.strip()
+            if key not in ['name', 'depth', 'movetime', 'tc', 'book', 'tablebases']:
+                raise Exception('Unknown engine option '+key+' in '+spec)
+            values[key] = value.strip()
+        config = cls(values.get('name', spec))
+        if 'depth' in values:
+            config.depth = int(values['depth'])
+        if 'movetime' in values:
+            config.movetime = float(values['movetime'])
+        if 'tc' in values:
+            config.tc = TimeControl.parse(values['tc'])
+        config.book = values.get('book')
+        config.tablebases = values.get('tablebases')
+        return config
+
+    def __str__(self):
+        return (self.name+' (depth '+str(self.depth)
+                +(', movetime '+str(self.movetime) if self.movetime != None else '')
+                +(', tc '+str(self.tc) if self.tc != None else '')
+                +(', book' if self.book != None else '')+(', tablebases' if self.tablebases != None else '')+')')
+
+
+class Adjudication:
+    '''
+    Rules for ending games early.
+    '''
+    def __init__(self, max_plies=200, score=800, score_plies=6):
+        self.max_plies = max_plies # plies after the opening before a game is drawn
+        self.score = score # absolute centipawn score that counts as decisive
+        self.score_plies = score_plies # consecutive searched plies with a decisive score of one sign
+
+
+def load_openings(path) -> list:
+    '''
+    Openings of a .pgn/.pgn.gz file (each game's start position and moves) or an
+    EPD/FEN file (positions only).
+    Returns: list of [FEN, SAN moves].
+    '''
+    if path.endswith('.pgn') or path.endswith('.pgn.gz'):
+        return [[pgn_game.fen, pgn_game.moves] for pgn_game in read_games(path)]
+    openings = []
+    with open(path) as file:
+        for line in file:
+            fields = line.split()
+            if len(fields) >= 6 and fields[4].isdigit() and fields[5].isdigit(): # FEN
+                openings.append([' '.join(fields[:6]), []])
+                continue
+            position = parse_epd(line)
+            if position != None:
+                openings.append([position[0], []])
+    return openings
+
+
+def worker_resource(kind: str, path):
+    '''
+    Opened PolyglotBook or Tablebases at path, shared by the games of a worker.
+    '''
+    if path == None:
+        return None
+    if (kind, path) not in _worker_resources:
+        if kind == 'book':
+            from book import PolyglotBook
+            _worker_resources[(kind, path)] = PolyglotBook(path)
+        else:
+            from tablebase import Tablebases
+            _worker_resources[(kind, path)] = Tablebases(path)
+    return _worker_resources[(kind, path)]
+
+
+def play_game(task: list) -> dict:
+    '''
+    Plays one game. task is [index, [FEN, opening SAN moves], white EngineConfig,
+    black EngineConfig, Adjudication]. With a time control (white's tc), the
+    clocks start after the opening.
+    Returns: dict of the index, engine names, result ('1-0', '0-1' or '1/2-1/2'),
+    termination, start FEN, SAN moves (opening included), plies and nodes.
+    '''
+    global _worker_game
+    index, (fen, opening), white, black, adjudication = task
+    if _worker_game == None:
+        from game import Game
+        _worker_game = Game.from_fen(fen)
+    game = _worker_game
+    game.reset_to_fen(fen)
+    game.eval_cache.clear()
+    moves = list(opening)
+    for san in opening:
+        play_san(game, san)
+    rng = random.Random(index) # book moves are picked reproducibly
+    clock = ChessClock(white.tc) if white.tc != None else None
+    manager = TimeManager()
+    if clock != None:
+        clock.start(game.turn)
+    result, termination = None, None
+    nodes, plies = 0, 0
+    streak, streak_sign = 0, 0 # consecutive plies with a decisive score of one sign
+    while result == None:
+        config = white if game.turn == WHITE else black
+        game.book = worker_resource('book', config.book)
+        game.tablebase = worker_resource('tablebases', config.tablebases)
+        move = game.book.pick_move(game, rng) if game.book != None else None
+        searched = move == None
+        if searched and clock != None:
+            soft, hard = manager.allocate_clock(clock, game.turn, complexity(convert_color_to_player(game, game.turn)))
+            score, move, move_nodes, _ = search_position(game, config.depth, hard, soft_time=soft)
+            nodes += move_nodes
+        elif searched:
+            score, move, move_nodes, _ = search_position(game, config.depth, config.movetime)
+            nodes += move_nodes
+        if move == None: # no legal moves
+            if score == 0:
+                result, termination = '1/2-1/2', 'stalemate'
+            else:
+                result, termination = ('0-1' if game.turn == WHITE else '1-0'), 'checkmate'
+            break
+        if clock != None and clock.flagged(game.turn):
+            result, termination = ('0-1' if game.turn == WHITE else '1-0'), 'time forfeit'
+            break
+        moves.append(move_to_san(game, move))
+        assert(convert_color_to_player(game, game.turn).attempt_action(move))
+        plies += 1
+        if clock != None:
+            clock.press()
+        if searched:
+            sign = (score > 0) - (score < 0)
+            if abs(score) >= adjudication.score:
+                streak = streak + 1 if sign == streak_sign else 1
+                streak_sign = sign
+            else:
+                streak, streak_sign = 0, 0
+        if streak >= adjudication.score_plies:
+            result, termination = ('1-0' if streak_sign > 0 else '0-1'), 'adjudication'
+        elif game.draw_reason() != None:
+            result, termination = '1/2-1/2', game.draw_reason()
+        elif plies >= adjudication.max_plies:
+            result, termination = '1/2-1/2', 'max moves'
+    game.book, game.tablebase = None, None
+    return {'index': index, 'white': white.name, 'black': black.name, 'result': result,
+            'termination': termination, 'fen': fen, 'moves': moves, 'plies': plies, 'nodes': nodes}
+
+
+def logistic_score(elo: float) -> float:
+    '''
+    Expected score of a player elo points stronger.
+    '''
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def score_elo(score: float) -> float:
+    '''
+    Elo difference giving expected score, the inverse of logistic_score.
+    '''
+    score = min(max(score, 1e-6), 1 - 1e-6)
+    return -400 * math.log10(1 / score - 1)
+
+
+def score_stats(wins: int, draws: int, losses: int) -> list:
+    '''
+    Returns: [mean score per game, variance of the score of one game].
+    The variance counts half a game of each outcome extra, so that it is
+    defined (nonzero) from the first game, eg after only wins.
+    '''
+    n = wins + draws + losses
+    score = (wins + 0.5 * draws) / n
+    wins, draws, losses = wins + 0.5, draws + 0.5, losses + 0.5
+    variance = (wins * (1 - score) ** 2 + draws * (0.5 - score) ** 2 + losses * score ** 2) / (n + 1.5)
+    return [score, variance]
+
+
+def elo_difference(wins: int, draws: int, losses: int) -> list:
+    '''
+    Elo difference from a win/draw/loss record.
+    Returns: [Elo, 95% confidence margin], both 0 before any game.
+    '''
+    n = wins + draws + losses
+    if n == 0:
+        return [0.0, 0.0]
+    score, variance = score_stats(wins, draws, losses)
+    deviation = 1.96 * math.sqrt(variance / n)
+    return [score_elo(score), (score_elo(score + deviation) - score_elo(score - deviation)) / 2]
+
+
+def sprt_llr(wins: int, draws: int, losses: int, elo0: float, elo1: float) -> float:
+    '''
+    Log likelihood ratio of H1 (Elo difference is elo1) over H0 (it's elo0),
+    with the normal approximation of the trinomial (win/draw/loss) model.
+    '''
+    n = wins + draws + losses
+    if n == 0:
+        return 0.0
+    score, variance = score_stats(wins, draws, losses)
+    score0, score1 = logistic_score(elo0), logistic_score(elo1)
+    return n * (score1 - score0) * (2 * score - score0 - score1) / (2 * variance)
+
+
+def sprt_bounds(alpha: float, beta: float) -> list:
+    '''
+    Returns: [lower, upper] LLR bounds; H0 is accepted below lower, H1 above upper.
+    '''
+    return [math.log(beta / (1 - alpha)), math.log((1 - beta) / alpha)]
+
+
+class MatchScore:
+    '''
+    Running record of the first engine against the second, with its Elo and SPRT state.
+    '''
+    def __init__(self, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05):
+        self.wins = 0
+        self.draws = 0
+        self.losses = 0
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.bounds = sprt_bounds(alpha, beta)
+        self.terminations = {} # termination -> count
+
+    def add(self, record: dict, first_name: str):
+        if record['result'] == '1/2-1/2':
+            self.draws += 1
+        elif (record['result'] == '1-0') == (record['white'] == first_name):
+            self.wins += 1
+        else:
+            self.losses += 1
+        self.terminations[record['termination']] = self.terminations.get(record['termination'], 0) + 1
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.draws + self.losses
+
+    @property
+    def llr(self) -> float:
+        return sprt_llr(self.wins, self.draws, self.losses, self.elo0, self.elo1)
+
+    @property
+    def decision(self) -> str | None:
+        '''
+        'H1' (first engine is elo1 stronger), 'H0' (it's not), or None while undecided.
+        '''
+        llr = self.llr
+        if llr >= self.bounds[1]:
+            return 'H1'
+        if llr <= self.bounds[0]:
+            return 'H0'
+        return None
+
+    def __str__(self):
+        elo, margin = elo_difference(self.wins, self.draws, self.losses)
+        return ('games '+str(self.games)+' +'+str(self.wins)+' ='+str(self.draws)+' -'+str(self.losses)
+                +', elo '+str(round(elo, 1))+' +/- '+str(round(margin, 1))
+                +', LLR '+str(round(self.llr, 2))+' ['+str(round(self.bounds[0], 2))+', '
+                +str(round(self.bounds[1], 2))+'] for elo0 '+str(self.elo0)+' elo1 '+str(self.elo1))
+
+
+def make_tasks(engines: list, openings: list, games: int, adjudication: Adjudication):
+    '''
+    Generator of play_game tasks: each opening twice, first engine WHITE then BLACK.
+    '''
+    for index in range(games):
+        opening = openings[(index // 2) % len(openings)]
+        white, black = engines if index % 2 == 0 else engines[::-1]
+        yield [index, opening, white, black, adjudication]
+
+
+def run_tournament(engines: list, games=100, openings=None, workers=None, pgn_path=None,
+                   adjudication=None, elo0=0.0, elo1=10.0, alpha=0.05, beta=0.05,
+                   verbose=True) -> MatchScore:
+    '''
+    Plays up to 'games' games between engines[0] and engines[1], stopping
+    early once the SPRT decides. Finished games are appended to pgn_path if given.
+    openings: list of [FEN, SAN moves], OPENINGS from the initial position if None.
+    workers: Number of processes, os.cpu_count() if None, games run in this process if 1.
+    Returns: MatchScore of engines[0].
+    '''
+    assert(len(engines) == 2 and engines[0].name != engines[1].name)
+    if str(engines[0].tc) != str(engines[1].tc):
+        raise Exception('Engines must play under the same time control')
+    openings = openings if openings != None else [[STARTING_FEN, moves] for moves in OPENINGS]
+    adjudication = adjudication if adjudication != None else Adjudication()
+    workers = workers if workers != None else (os.cpu_count() or 1)
+    match = MatchScore(elo0=elo0, elo1=elo1, alpha=alpha, beta=beta)
+    tasks = make_tasks(engines, openings, games, adjudication)
+    out = open(pgn_path, 'a') if pgn_path != None else None
+    date = time.strftime('%Y.%m.%d')
+
+    def record_done(record) -> bool:
+        '''
+        Records a finished game. Returns whether the match is decided.
+        '''
+        if out != None:
+            headers = {'Event': 'tournament', 'Date': date, 'Round': str(record['index'] + 1),
+                       'White': record['white'], 'Black': record['black'],
+                       'Termination': record['termination'], 'PlyCount': str(len(record['moves']))}
+            if record['fen'] != STARTING_FEN:
+                headers['FEN'], headers['SetUp'] = record['fen'], '1'
+            if engines[0].tc != None:
+                tc = engines[0].tc
+                headers['TimeControl'] = format_number(tc.initial)+('+'+format_number(tc.increment) if tc.increment > 0 else '')
+            out.write(format_pgn(headers, record['moves'], record['result']))
+            out.flush()
+        match.add(record, engines[0].name)
+        if verbose:
+            print(record['white']+' - '+record['black']+' '+record['result']+' ('+record['termination']+'), '
+                  +str(match))
+        return match.decision != None
+
+    try:
+        if workers == 1:
+            for task in tasks:
+                if record_done(play_game(task)):
+                    break
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = set()
+                decided = False
+                for task in tasks:
+                    while len(pending) >= 2 * workers and not decided:
+                        finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in finished:
+                            decided = record_done(future.result()) or decided
+                    if decided:
+                        break
+                    pending.add(pool.submit(play_game, task))
+                if decided:
+                    pool.shutdown(wait=False, cancel_futures=True)
+                else:
+                    for future in as_completed(pending):
+                        if record_done(future.result()):
+                            pool.shutdown(wait=False, cancel_futures=True)
+                            break
+    finally:
+        if out != None:
+            out.close()
+    if verbose:
+        decision = match.decision
+        print('SPRT: '+('H1 accepted, '+engines[0].name+' is stronger' if decision == 'H1' else
+                        'H0 accepted, '+engines[0].name+' is not '+str(elo1)+' Elo stronger' if decision == 'H0'
+                        else 'undecided')
+              +'; terminations '+str(match.terminations))
+    return match
+
+
+if __name__ == "__main__":
+    # usage: python tournament.py --engine name=new,depth=3 --engine name=base,depth=2 [--games N] [--pgn out.pgn]
+    parser = argparse.ArgumentParser(description='Self-play match between two engine configurations, with SPRT.')
+    parser.add_argument('--engine', action='append', required=True,
+                        help='name=..,depth=..,movetime=..,tc=..,book=..,tablebases=.. ; give twice, the first is tested')
+    parser.add_argument('--games', type=int, default=100, help='maximum number of games')
+    parser.add_argument('--openings', default=None, help='.pgn or EPD/FEN file of openings (default: built in)')
+    parser.add_argument('--workers', type=int, default=None, help='processes (default: CPU count)')
+    parser.add_argument('--pgn', default=None, help='append finished games to this PGN file')
+    parser.add_argument('--max-plies', type=int, default=200, help='draw after this many plies past the opening')
+    parser.add_argument('--adjudicate-score', type=float, default=800, help='decisive centipawn score')
+    parser.add_argument('--adjudicate-plies', type=int, default=6, help='plies in a row with a decisive score')
+    parser.add_argument('--elo0', type=float, default=0.0)
+    parser.add_argument('--elo1', type=float, default=10.0)
+    parser.add_argument('--alpha', type=float, default=0.05)
+    parser.add_argument('--beta', type=float, default=0.05)
+    args = parser.parse_args()
+    if len(args.engine) != 2:
+        parser.error('give exactly two --engine options')
+    engines = [EngineConfig.parse(spec) for spec in args.engine]
+    print(str(engines[0])+' vs '+str(engines[1]))
+    run_tournament(engines, games=args.games,
+                   openings=load_openings(args.openings) if args.openings != None else None,
+                   workers=args.workers, pgn_path=args.pgn,
+                   adjudication=Adjudication(args.max_plies, args.adjudicate_score, args.adjudicate_plies),
+                   elo0=args.elo0, elo1=args.elo1, alpha=args.alpha, beta=args.beta)
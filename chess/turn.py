@@ -1,9 +1,11 @@
 from misc.constants import *
 from piece import Piece
+from undo_stack import *
 
 class Turn:
     '''
     A class to log the previous turn's action and state.
+    Built on demand from a Game's undo stack by TurnLog.
     '''
     def __init__(self):
         self.move_type: str # 'CASTLE' or 'MOVE'
@@ -72,3 +74,52 @@ class Turn:
 
 
 
+
+
+class TurnLog:
+    '''
+    Read only, list like view of a Game's UndoStack, where entries are built
+    into Turns on demand, eg for the UI. Indexing supports negative indices.
+    '''
+    def __init__(self, game):
+        self.game = game
+
+    def __len__(self):
+        return len(self.game.undo_stack)
+
+    def __getitem__(self, i: int) -> Turn:
+        n = len(self)
+        if i < 0:
+            i += n
+        if i not in range(n):
+            raise IndexError('turn log index out of range')
+        return self.build_turn(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self.build_turn(i)
+
+    def build_turn(self, ply: int) -> Turn:
+        '''
+        Builds the Turn of the undo stack entry of move number ply.
+        '''
+        stack = self.game.undo_stack
+        pieces = self.game.pieces_by_id
+        flags = stack.get(ply, FLAGS)
+        turn_color = BLACK if flags & BLACK_TURN_FLAG else WHITE
+        prev_players_check = [bool(flags & WHITE_CHECK_FLAG), bool(flags & BLACK_CHECK_FLAG)]
+        turn = Turn()
+        if flags & CASTLE_FLAG:
+            turn.log_castle(KING if flags & KING_SIDE_FLAG else QUEEN, pieces[stack.get(ply, PIECE)].name,
+                            pieces[stack.get(ply, CAPTURED)].name, turn_color, prev_players_check)
+            return turn
+        captured_piece, captured_piece_pos = None, None
+        if stack.get(ply, CAPTURED) != NO_PIECE:
+            captured_piece = pieces[stack.get(ply, CAPTURED)]
+            captured_piece_pos = from_square(stack.get(ply, CAPTURED_SQUARE))
+        turn.log_move(pieces[stack.get(ply, PIECE)], from_square(stack.get(ply, FROM)),
+                      from_square(stack.get(ply, TO)), bool(flags & PROMOTED_FLAG),
+                      bool(flags & FIRST_MOVE_FLAG), bool(flags & TWO_LEAP_FLAG), turn_color,
+                      prev_players_check, bool(flags & PSEUDOMOVE_FLAG),
+                      captured_piece=captured_piece, captured_piece_pos=captured_piece_pos)
+        return turn
@@ -0,0 +1,339 @@
+import asyncio
+import sys
+import threading
+import time
+from clock import TimeManager, complexity, deadlines
+from fen import STARTING_FEN, FILE_LETTERS
+from game import Game
+from helpers.game_helpers import convert_color_to_player
+from helpers.general_helpers import move_to_notation, swap_colors
+from search import start_search
+from misc.constants import *
+
+'''
+Universal Chess Interface (UCI) front-end, so the engine can be driven by
+GUIs and match tools over stdin/stdout. Run with python uci.py (or
+python main.py --uci). Commands are read on the main thread and the search
+runs on a worker thread (search.start_search), with a watcher thread
+printing its info lines and bestmove, so stop and isready are answered
+while a search is running.
+Supported: uci, isready, setoption, ucinewgame, position (startpos/fen +
+moves), go (depth, movetime, wtime/btime/winc/binc/movestogo, nodes,
+infinite), stop and quit.
+'''
+
+ENGINE_NAME = 'TerminalChess'
+ENGINE_AUTHOR = 'Empth'
+MAX_DEPTH = 20 # depth cap of searches limited by time, nodes or stop
+
+# name: [type, default, min, max]
+OPTIONS = {'Depth': ['spin', 3, 1, MAX_DEPTH], # depth of go without limits
+           'MultiPV': ['spin', 1, 1, 8],
+           'MoveOverhead': ['spin', 50, 0, 5000], # ms kept back per move for communication lag
+           'OwnBook': ['check', False, None, None],
+           'BookFile': ['string', '', None, None],
+           'TablebasePath': ['string', '', None, None]}
+
+
+def parse_uci_move(game, text: str):
+    '''
+    Converts UCI move text of the side to move, eg 'e2e4', 'e1g1' or 'e7e8q',
+    into a Game move. Complains with Exception if text is ill formed, not a
+    move of a piece of the side to move, or an underpromotion.
+    '''
+    if (len(text) not in [4, 5] or text[0] not in FILE_LETTERS or text[2] not in FILE_LETTERS
+        or text[1] not in '12345678' or text[3] not in '12345678'):
+        raise Exception('Invalid UCI move '+text)
+    if len(text) == 5 and text[4] != 'q':
+        raise Exception('Underpromotion is not supported: '+text)
+    pos = [FILE_LETTERS.index(text[0]) + 1, int(text[1])]
+    dest = [FILE_LETTERS.index(text[2]) + 1, int(text[3])]
+    piece = game.board.get_piece(pos)
+    if piece == None or piece.color != game.turn:
+        raise Exception('No piece of the side to move on '+text[:2])
+    if piece.rank == KING and abs(dest[0] - pos[0]) == 2:
+        return KING if dest[0] > pos[0] else QUEEN
+    return [pos, dest]
+
+
+def pv_to_uci(ranks: dict, pv: list, color: str) -> list:
+    '''
+    UCI notation of the moves of pv, played from a position whose pieces are
+    given as ranks, a dict of (x, y) -> rank. A promoting PAWN gets the 'q'
+    suffix. ranks is left unchanged.
+    '''
+    ranks = dict(ranks)
+    notations = []
+    for move in pv:
+        notation = move_to_notation(move, color)
+        if type(move) == str:
+            row = 1 if color == WHITE else 8
+            rook_from, rook_to = ((8, row), (6, row)) if move == KING else ((1, row), (4, row))
+            ranks[(7 if move == KING else 3, row)] = ranks.pop((5, row), KING)
+            ranks[rook_to] = ranks.pop(rook_from, ROOK)
+        else:
+            pos, dest = tuple(move[0]), tuple(move[1])
+            rank = ranks.pop(pos, None)
+            if rank == PAWN and dest[1] in [1, 8]:
+                notation += 'q'
+                rank = QUEEN
+            if rank == PAWN and dest[0] != pos[0] and dest not in ranks: # en passant
+                ranks.pop((dest[0], pos[1]), None)
+            ranks[dest] = rank
+        notations.append(notation)
+        color = swap_colors(color)
+    return notations
+
+
+def time_budget(params: dict, color: str, overhead: float, position_complexity=1.0) -> list | None:
+    '''
+    [soft, hard] seconds to search for (see clock.TimeManager), from go
+    parameters params (times in ms), or None if no time limit was given.
+    '''
+    if 'movetime' in params:
+        budget = max(params['movetime'] / 1000 - overhead, 0.001)
+        return [budget, budget]
+    remaining = params.get('wtime' if color == WHITE else 'btime')
+    if remaining == None:
+        return None
+    increment = params.get('winc' if color == WHITE else 'binc', 0) / 1000
+    return TimeManager(overhead=overhead).allocate(remaining / 1000, increment, moves_to_go=params.get('movestogo'),
+                                                   complexity=position_complexity)
+
+
+def uci_score(score: float, pv: list, color: str) -> str:
+    '''
+    UCI score of absolute score (>0 is good for WHITE), from the view of color
+    to move, eg 'cp 35' or 'mate -2'.
+    '''
+    relative = score if color == WHITE else -score
+    if abs(relative) > MATE_BOUND:
+        # checkmate (MAX) at the end of pv, or a tablebase win (MAX - plies to
+        # mate) probed at the end of pv, see tablebase.probe_score
+        plies = len(pv) + int(MAX - abs(relative))
+        moves = (plies + 1) // 2
+        return 'mate '+str(moves if relative > 0 else -moves)
+    return 'cp '+str(int(relative))
+
+
+class UciEngine:
+    '''
+    State of a UCI session: the Game, option values and the running search.
+    send: Callable taking each output line, printing to stdout by default.
+    '''
+    def __init__(self, send=None):
+        self.game = Game()
+        self.options = {name: spec[1] for name, spec in OPTIONS.items()}
+        self._send = send
+        self._output_lock = threading.Lock() # main and watcher threads both send
+        self.handle = None # SearchHandle of the running search
+        self.watcher = None # thread reporting the running search
+        self._stop_requested = threading.Event() # releases the bestmove of go infinite
+
+    def send(self, line: str):
+        with self._output_lock:
+            if self._send != None:
+                self._send(line)
+            else:
+                sys.stdout.write(line+'\n')
+                sys.stdout.flush()
+
+    def handle_command(self, line: str) -> bool:
+        '''
+        Handles one line of input. Unknown commands are ignored, as UCI asks.
+        Returns: False on quit, True otherwise.
+        '''
+        tokens = line.split()
+        if len(tokens) == 0:
+            return True
+        command, args = tokens[0], tokens[1:]
+        try:
+            if command == 'uci':
+                self.send('id name '+ENGINE_NAME)
+                self.send('id author '+ENGINE_AUTHOR)
+                for name, (kind, default, low, high) in OPTIONS.items():
+                    option = 'option name '+name+' type '+kind
+                    if kind == 'check':
+                        option += ' default '+('true' if default else 'false')
+                    elif kind == 'spin':
+                        option += ' default '+str(default)+' min '+str(low)+' max '+str(high)
+                    else:
+                        option += ' default '+(default if default != '' else '<empty>')
+                    self.send(option)
+                self.send('uciok')
+            elif command == 'isready':
+                self.send('readyok')
+            elif command == 'setoption':
+                self.set_option(args)
+            elif command == 'ucinewgame':
+                self.stop(wait=True)
+                self.game.reset_to_fen(STARTING_FEN)
+                self.game.eval_cache.clear()
+            elif command == 'position':
+                self.stop(wait=True)
+                self.set_position(args)
+            elif command == 'go':
+                self.stop(wait=True)
+                self.go(args)
+            elif command == 'stop':
+                self.stop()
+            elif command == 'quit':
+                self.stop(wait=True)
+                return False
+        except Exception as error:
+            self.send('info string error: '+str(error))
+        return True
+
+    def set_option(self, args: list):
+        '''
+        Handles 'setoption name <name> [value <value>]', names are case insensitive.
+        '''
+        if 'name' not in args:
+            raise Exception('setoption without name')
+        value_at = args.index('value') if 'value' in args else len(args)
+        name = ' '.join(args[args.index('name') + 1:value_at])
+        value = ' '.join(args[value_at + 1:])
+        matches = [option for option in OPTIONS if option.lower() == name.lower()]
+        if len(matches) == 0:
+            raise Exception('unknown option '+name)
+        name = matches[0]
+        kind, default, low, high = OPTIONS[name]
+        if kind == 'spin':
+            self.options[name] = min(max(int(value), low), high)
+        elif kind == 'check':
+            self.options[name] = value.lower() == 'true'
+        else:
+            self.options[name] = '' if value == '<empty>' else value
+        if name in ['OwnBook', 'BookFile']:
+            if self.options['OwnBook'] and self.options['BookFile'] != '':
+                self.game.load_book(self.options['BookFile'])
+            elif self.game.book != None:
+                self.game.book.close()
+                self.game.book = None
+        elif name == 'TablebasePath':
+            if value != '':
+                self.game.load_tablebases(value)
+            elif self.game.tablebase != None:
+                self.game.tablebase.close()
+                self.game.tablebase = None
+
+    def set_position(self, args: list):
+        '''
+        Handles 'position startpos|fen <FEN> [moves <move> ...]'.
+        '''
+        moves_at = args.index('moves') if 'moves' in args else len(args)
+        if len(args) > 0 and args[0] == 'startpos':
+            fen = STARTING_FEN
+        elif len(args) > 0 and args[0] == 'fen':
+            fen = ' '.join(args[1:moves_at])
+        else:
+            raise Exception('position needs startpos or fen')
+        game = self.game
+        game.reset_to_fen(fen)
+        for text in args[moves_at + 1:]:
+            move = parse_uci_move(game, text)
+            if not convert_color_to_player(game, game.turn).attempt_action(move):
+                raise Exception('Illegal move '+text)
+
+    def go(self, args: list):
+        '''
+        Handles 'go', starting the search and its watcher.
+        '''
+        params = {}
+        infinite = False
+        i = 0
+        while i < len(args):
+            if args[i] == 'infinite':
+                infinite = True
+            elif args[i] in ['depth', 'movetime', 'wtime', 'btime', 'winc', 'binc', 'movestogo', 'nodes'] and i + 1 < len(args):
+                params[args[i]] = int(args[i + 1])
+                i += 1
+            i += 1
+        game = self.game
+        color = game.turn
+        player = convert_color_to_player(game, color)
+        self._stop_requested.clear()
+
+        if game.book != None and not infinite:
+            book_move = game.book.pick_move(game)
+            if book_move != None:
+                self.send('bestmove '+pv_to_uci(self.board_ranks(), [book_move], color)[0])
+                return
+        if len(player.get_all_legal_moves()) == 0:
+            self.send('info depth 0 score '+('mate 0' if player.in_check else 'cp 0'))
+            self.send('bestmove 0000')
+            return
+
+        limited = infinite or any(key in params for key in ['movetime', 'wtime', 'btime', 'nodes'])
+        depth = params.get('depth', MAX_DEPTH if limited else self.options['Depth'])
+        start = time.monotonic()
+        budget = None
+        if not infinite:
+            clocked = 'movetime' not in params and ('wtime' if color == WHITE else 'btime') in params
+            budget = time_budget(params, color, self.options['MoveOverhead'] / 1000,
+                                 complexity(player) if clocked else 1.0)
+        soft_deadline, deadline = [None, None] if budget == None else deadlines(budget, start)
+        ranks = self.board_ranks()
+        handle = start_search(game, player, depth, multipv=self.options['MultiPV'],
+                              node_limit=params.get('nodes'), soft_deadline=soft_deadline, deadline=deadline)
+        self.handle = handle
+
+        def watch():
+            asyncio.run(self.report(handle, ranks, color))
+            result = handle.result()
+            if infinite: # UCI: bestmove only after stop
+                self._stop_requested.wait()
+            pv = pv_to_uci(ranks, result.pv, color)
+            self.send('bestmove '+pv[0]+(' ponder '+pv[1] if len(pv) > 1 else ''))
+
+        self.watcher = threading.Thread(target=watch, daemon=True)
+        self.watcher.start()
+
+    async def report(self, handle, ranks: dict, color: str):
+        '''
+        Sends an info line per PV line of each progress event of handle.
+        '''
+        async for event in handle:
+            for i, line in enumerate(event.lines):
+                info = 'info depth '+str(event.depth)
+                if len(event.lines) > 1:
+                    info += ' multipv '+str(i + 1)
+                info += (' score '+uci_score(line.score, line.pv, color)+' nodes '+str(event.nodes)
+                         +' nps '+str(int(event.nps))+' time '+str(int(event.elapsed * 1000))
+                         +' pv '+' '.join(pv_to_uci(ranks, line.pv, color)))
+                self.send(info)
+
+    def board_ranks(self) -> dict:
+        '''
+        (x, y) -> rank of every piece, for pv_to_uci.
+        '''
+        return {tuple(piece.pos): piece.rank for piece in self.game.pieces_by_id if piece.pos != None
+                and self.game.board.get_piece(piece.pos) is piece}
+
+    def stop(self, wait=False):
+        '''
+        Stops the running search, if any. Its bestmove is still sent.
+        wait: Whether to block until it has been sent.
+        '''
+        self._stop_requested.set()
+        if self.handle != None:
+            self.handle.cancel()
+        if wait and self.watcher != None:
+            self.watcher.join()
+            self.watcher = None
+            self.handle = None
+
+
+def main(stream=None):
+    '''
+    Runs a UCI session on stream (stdin by default) until quit or end of input.
+    '''
+    engine = UciEngine()
+    for line in (stream if stream != None else sys.stdin):
+        if not engine.handle_command(line):
+            return
+    engine.stop(wait=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+from array import array
+
+'''
+Undo stack of the moves made in a Game, stored as fixed-field integer entries
+in one preallocated array, so making and unmaking a move (including every
+pseudolegal trial move of move generation) pushes and pops a few integers
+instead of allocating a Turn. Pieces are referred to by their Game piece id,
+squares by 0..63 index (see to_square). Turn objects are only built from
+entries on demand, by TurnLog.
+'''
+
+# fields of an entry
+PIECE = 0 # id of the moved piece, the KING for castles
+FROM = 1 # square moved from
+TO = 2 # square moved to
+CAPTURED = 3 # id of the captured piece, or of the ROOK for castles, NO_PIECE if none
+CAPTURED_SQUARE = 4 # square the captured piece (or castled ROOK) stood on
+FLAGS = 5 # bitwise or of the flags below
+PREV_CASTLING = 6 # PositionState castling rights before the move
+PREV_EP_SQUARE = 7 # PositionState en passant square before the move
+PREV_HALFMOVE_CLOCK = 8 # PositionState halfmove clock before the move
+STRIDE = 9 # number of fields of an entry
+
+NO_PIECE = -1
+
+# flags
+CASTLE_FLAG = 1 # entry is a castle, else a pos->dest move
+KING_SIDE_FLAG = 2 # castle was on KING side
+PROMOTED_FLAG = 4 # PAWN was promoted by the move
+FIRST_MOVE_FLAG = 8 # first move of the moved piece (both pieces for castles)
+TWO_LEAP_FLAG = 16 # PAWN two leaped on the move
+PSEUDOMOVE_FLAG = 32 # move is pseudolegal and not yet known to be legal
+BLACK_TURN_FLAG = 64 # move was made by BLACK
+WHITE_CHECK_FLAG = 128 # WHITE was in check at the start of the move
+BLACK_CHECK_FLAG = 256 # BLACK was in check at the start of the move
+
+
+def to_square(pos) -> int:
+    '''
+    Converts [x, y] in [8]^2 to its square index, eg [1, 1] -> 0, [8, 8] -> 63.
+    '''
+    return (pos[0] - 1) + 8 * (pos[1] - 1)
+
+
+def from_square(square: int) -> list:
+    '''
+    Converts a square index back to [x, y] in [8]^2.
+    '''
+    return [square % 8 + 1, square // 8 + 1]
+
+
+class UndoStack:
+    '''
+    Stack of fixed-field integer entries. Push and pop are O(1); the array
+    doubles when full, which is amortized O(1) and rare after the first game.
+    '''
+    def __init__(self, capacity=512):
+        self.data = array('i', [0]) * (capacity * STRIDE)
+        self.size = 0 # number of entries
+
+    def __len__(self):
+        return self.size
+
+    def push(self, piece: int, from_square: int, to_square: int, captured: int,
+             captured_square: int, flags: int, prev_castling: int, prev_ep_square: int,
+             prev_halfmove_clock: int):
+        i = self.size * STRIDE
+        data = self.data
+        if i + STRIDE > len(data):
+            data.extend(array('i', [0]) * len(data))
+        data[i] = piece
+        data[i + 1] = from_square
+        data[i + 2] = to_square
+        data[i + 3] = captured
+        data[i + 4] = captured_square
+        data[i + 5] = flags
+        data[i + 6] = prev_castling
+        data[i + 7] = prev_ep_square
+        data[i + 8] = prev_halfmove_clock
+        self.size += 1
+
+    def clear(self):
+        self.size = 0
+
+    def pop(self):
+        assert(self.size > 0)
+        self.size -= 1
+
+    def get(self, ply: int, field: int) -> int:
+        '''
+        Field of the entry of move number ply (0 for the first move).
+        '''
+        return self.data[ply * STRIDE + field]
+
+    def top(self, field: int) -> int:
+        '''
+        Field of the latest entry.
+        '''
+        return self.data[(self.size - 1) * STRIDE + field]
+
+    def clear_top_flag(self, flag: int):
+        self.data[(self.size - 1) * STRIDE + FLAGS] &= ~flag